@@ -0,0 +1 @@
+"""音声分離ベンチマーク"""
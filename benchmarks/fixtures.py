@@ -0,0 +1,170 @@
+"""
+ベンチマーク用の合成音声フィクスチャ
+
+N人の「話者」（声らしい倍音＋音節状の振幅変調）が交代で話し、
+一部が重なる会話を、BGM（和音＋ドラム状のノイズバースト）の上にミックスした
+決定的な（シード固定の）音声を生成する
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Tuple, Dict, Any
+
+import numpy as np
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors.speaker_processor import SpeakerSegment
+
+
+# 生成に使う既定値
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_NUM_SPEAKERS = 3
+DEFAULT_SEED = 20240601
+
+# 話者ごとの基本周波数（Hz）
+SPEAKER_F0 = [110.0, 165.0, 220.0, 135.0, 195.0, 250.0]
+
+
+def _speaker_voice(rng: np.random.Generator, f0: float, duration: float, sample_rate: int) -> np.ndarray:
+    """ビブラートと音節状の振幅変調を持つ声らしい信号を生成"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    
+    # ゆらぎのある基本周波数
+    vibrato = 1.0 + 0.02 * np.sin(2 * np.pi * rng.uniform(4.0, 6.0) * t)
+    phase = 2 * np.pi * np.cumsum(f0 * vibrato) / sample_rate
+    
+    # 倍音（高次ほど減衰）
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    
+    # 音節（約4Hz）の振幅変調
+    syllables = 0.5 * (1.0 + np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t + rng.uniform(0, np.pi)))
+    return (voice * syllables * 0.3).astype(np.float32)
+
+
+def _music_bed(rng: np.random.Generator, duration: float, sample_rate: int) -> np.ndarray:
+    """和音とドラム状ノイズバーストのBGMを生成"""
+    num_samples = int(duration * sample_rate)
+    t = np.arange(num_samples) / sample_rate
+    
+    # 2秒ごとに切り替わる和音
+    chords = [(261.6, 329.6, 392.0), (220.0, 261.6, 329.6), (174.6, 220.0, 261.6), (196.0, 246.9, 293.7)]
+    bed = np.zeros(num_samples, dtype=np.float32)
+    for start in range(0, num_samples, 2 * sample_rate):
+        end = min(start + 2 * sample_rate, num_samples)
+        chord = chords[(start // (2 * sample_rate)) % len(chords)]
+        bed[start:end] = sum(np.sin(2 * np.pi * f * t[start:end]) for f in chord) / len(chord)
+    
+    # 0.5秒ごとのノイズバースト（指数減衰）
+    burst_length = int(0.08 * sample_rate)
+    envelope = np.exp(-np.linspace(0, 6, burst_length)).astype(np.float32)
+    for start in range(0, num_samples - burst_length, sample_rate // 2):
+        bed[start:start + burst_length] += rng.standard_normal(burst_length).astype(np.float32) * envelope * 0.5
+    
+    return bed * 0.15
+
+
+def generate_mixture(
+    duration: float,
+    num_speakers: int = DEFAULT_NUM_SPEAKERS,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    seed: int = DEFAULT_SEED,
+    overlap_ratio: float = 0.1
+) -> Tuple[np.ndarray, List[SpeakerSegment]]:
+    """
+    複数話者＋BGMの合成音声を生成
+    
+    Args:
+        duration: 長さ（秒）
+        num_speakers: 話者数
+        sample_rate: サンプリングレート
+        seed: 乱数シード（同じ引数なら同じ音声になる）
+        overlap_ratio: 発話が前の発話と重なる割合
+    
+    Returns:
+        Tuple[np.ndarray, List[SpeakerSegment]]: (音声データ, 正解話者セグメント)
+    """
+    if num_speakers < 1 or num_speakers > len(SPEAKER_F0):
+        raise ValueError(f"話者数は1-{len(SPEAKER_F0)}の範囲で指定してください: {num_speakers}")
+    
+    rng = np.random.default_rng(seed)
+    num_samples = int(duration * sample_rate)
+    mixture = _music_bed(rng, duration, sample_rate)
+    
+    segments = []
+    current_time = 0.3
+    speaker_idx = 0
+    while current_time < duration - 0.5:
+        turn_length = min(rng.uniform(1.0, 4.0), duration - current_time)
+        start = int(current_time * sample_rate)
+        voice = _speaker_voice(rng, SPEAKER_F0[speaker_idx], turn_length, sample_rate)
+        end = min(start + len(voice), num_samples)
+        mixture[start:end] += voice[:end - start]
+        segments.append(SpeakerSegment(current_time, end / sample_rate, f"SPEAKER_{speaker_idx:02d}"))
+        
+        # 次の話者へ（一部は前の発話に重ねる）
+        overlap = turn_length * overlap_ratio if rng.random() < 0.5 else -rng.uniform(0.2, 0.8)
+        current_time += turn_length - overlap
+        speaker_idx = (speaker_idx + 1 + int(rng.integers(0, max(num_speakers - 1, 1)))) % num_speakers
+    
+    peak = np.max(np.abs(mixture))
+    if peak > 0:
+        mixture = mixture * (0.9 / peak)
+    
+    return mixture.astype(np.float32), segments
+
+
+def generate_segments(count: int, duration: float, num_speakers: int = DEFAULT_NUM_SPEAKERS, seed: int = DEFAULT_SEED) -> List[SpeakerSegment]:
+    """
+    重なりを含むランダムな話者セグメントを生成（セグメント処理単体の計測用）
+    
+    Args:
+        count: セグメント数
+        duration: 全体の長さ（秒）
+        num_speakers: 話者数
+        seed: 乱数シード
+    
+    Returns:
+        List[SpeakerSegment]: 話者セグメントのリスト
+    """
+    rng = np.random.default_rng(seed)
+    starts = np.sort(rng.uniform(0.0, duration, count))
+    lengths = rng.uniform(0.3, 5.0, count)
+    speakers = rng.integers(0, num_speakers, count)
+    return [
+        SpeakerSegment(float(start), float(min(start + length, duration)), f"SPEAKER_{speaker:02d}")
+        for start, length, speaker in zip(starts, lengths, speakers)
+    ]
+
+
+def write_fixture(
+    output_dir: Path,
+    duration: float,
+    num_speakers: int = DEFAULT_NUM_SPEAKERS,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    seed: int = DEFAULT_SEED
+) -> Dict[str, Any]:
+    """
+    合成音声をWAVファイルに書き出す（既に存在する場合は再利用）
+    
+    Args:
+        output_dir: 出力ディレクトリ
+        duration: 長さ（秒）
+        num_speakers: 話者数
+        sample_rate: サンプリングレート
+        seed: 乱数シード
+    
+    Returns:
+        Dict[str, Any]: フィクスチャ情報（path, duration, segments）
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"mix_{int(duration)}s_{num_speakers}spk_{sample_rate}hz_seed{seed}.wav"
+    
+    audio, segments = generate_mixture(duration, num_speakers, sample_rate, seed)
+    if not path.exists():
+        sf.write(str(path), audio, sample_rate, subtype='PCM_16')
+    
+    return {'path': path, 'duration': duration, 'num_speakers': num_speakers, 'segments': segments}
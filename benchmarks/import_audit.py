@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+起動時の読み込み時間の監査
+
+新しいプロセスで `python -X importtime` を実行し、GUI起動時に読み込まれる
+モジュールの時間を集計する。重いモジュール（torch・librosa など）が起動時に
+読み込まれている場合や、合計時間が予算を超えた場合は終了コード1を返す。
+
+使用方法:
+    python benchmarks/import_audit.py
+    python benchmarks/import_audit.py --module src.audio_separator.service.server --budget 1.0 --top 30
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# プロジェクトルートディレクトリをパスに追加
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.audio_separator.utils.lazy_import import HEAVY_MODULES, measure_import_times
+
+
+DEFAULT_MODULE = 'src.audio_separator.gui.views.main_window'
+
+# GUIのモジュール読み込みに許容する時間（秒）
+DEFAULT_BUDGET = 1.0
+
+# 起動時に読み込まれてはいけないパッケージ
+FORBIDDEN_PACKAGES = sorted({name.split('.')[0] for name in HEAVY_MODULES} | {'numba', 'sklearn'})
+
+
+def audit(module: str = DEFAULT_MODULE) -> Tuple[float, List[str], Dict[str, Tuple[int, int]]]:
+    """
+    モジュールの読み込みを監査
+    
+    Args:
+        module: 読み込むモジュール名
+    
+    Returns:
+        Tuple[float, List[str], Dict[str, Tuple[int, int]]]:
+            (モジュールの累積読み込み時間（秒）, 読み込まれた禁止モジュール, 全モジュールの時間)
+    """
+    times = measure_import_times(module, cwd=str(PROJECT_ROOT))
+    total = times[module][1] / 1e6
+    forbidden = [name for name in times if name.split('.')[0] in FORBIDDEN_PACKAGES]
+    return total, forbidden, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時の読み込み時間の監査")
+    parser.add_argument('--module', default=DEFAULT_MODULE, help="計測するモジュール")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help="許容する読み込み時間（秒）")
+    parser.add_argument('--top', type=int, default=20, help="表示する上位モジュール数")
+    args = parser.parse_args()
+    
+    total, forbidden, times = audit(args.module)
+    
+    print(f"{'自身(ms)':>10} {'累積(ms)':>10}  モジュール")
+    for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda kv: -kv[1][0])[:args.top]:
+        print(f"{self_us / 1000:10.1f} {cumulative_us / 1000:10.1f}  {name}")
+    print(f"\n合計: {total:.3f}秒（予算 {args.budget:.3f}秒）")
+    
+    ok = True
+    if forbidden:
+        print(f"❌ 起動時に重いモジュールが読み込まれています: {', '.join(sorted(forbidden)[:10])}")
+        ok = False
+    if total > args.budget:
+        print("❌ 読み込み時間が予算を超えています")
+        ok = False
+    if ok:
+        print("✅ 予算内です")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
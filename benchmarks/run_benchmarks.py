@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+音声分離ベンチマーク
+
+合成フィクスチャ（benchmarks/fixtures.py）に対して主要な処理の実行時間を計測し、
+ベースラインとの比較で性能劣化を検出する。
+モデルが無い環境でも動くよう、既定では簡易フォールバック処理で計測する。
+
+使用方法:
+    python benchmarks/run_benchmarks.py                          # 計測のみ
+    python benchmarks/run_benchmarks.py --save-baseline          # ベースラインを保存
+    python benchmarks/run_benchmarks.py --compare                # ベースラインと比較（劣化時は終了コード1）
+    python benchmarks/run_benchmarks.py --lengths 10 60 --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Optional
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixtures import write_fixture, generate_segments, DEFAULT_NUM_SPEAKERS
+from src.audio_separator.utils.audio_utils import AudioUtils
+from src.audio_separator.processors.demucs_processor import DemucsProcessor
+from src.audio_separator.processors.speaker_processor import SpeakerProcessor
+
+
+BENCHMARK_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_FIXTURE_DIR = BENCHMARK_DIR / ".fixtures"
+DEFAULT_LENGTHS = [10.0, 60.0, 180.0]
+
+# 劣化と判定する既定の許容率（中央値が25%以上遅くなったら劣化）
+DEFAULT_TOLERANCE = 0.25
+# これ未満の差（秒）は計測誤差として無視
+DEFAULT_MIN_DELTA = 0.005
+
+
+def get_machine_info() -> Dict[str, Any]:
+    """計測環境の情報を取得"""
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version()
+    }
+
+
+def force_offline(demucs_processor: DemucsProcessor, speaker_processor: SpeakerProcessor) -> None:
+    """
+    モデルを読み込まず簡易フォールバック処理を使うようにプロセッサを初期化
+    
+    Args:
+        demucs_processor: Demucsプロセッサ
+        speaker_processor: 話者分離プロセッサ
+    """
+    demucs_processor.model = f"simple_{demucs_processor.model_name}"
+    demucs_processor._demucs_available = False
+    demucs_processor._is_initialized = True
+    
+    speaker_processor.pipeline = None
+    speaker_processor._pyannote_available = False
+    speaker_processor._is_initialized = True
+
+
+def _time_case(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """関数をrepeat回実行して経過時間を集計（初回の遅延読み込み等を除くため1回空実行する）"""
+    func()
+    
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    
+    return {
+        'median': statistics.median(runs),
+        'min': min(runs),
+        'runs': runs
+    }
+
+
+def run_suite(
+    lengths: List[float],
+    repeat: int = 3,
+    num_speakers: int = DEFAULT_NUM_SPEAKERS,
+    fixture_dir: Path = DEFAULT_FIXTURE_DIR,
+    offline: bool = True
+) -> Dict[str, Any]:
+    """
+    ベンチマークを実行
+    
+    Args:
+        lengths: 計測する音声長（秒）のリスト
+        repeat: 各ケースの繰り返し回数
+        num_speakers: 合成音声の話者数
+        fixture_dir: フィクスチャの保存先
+        offline: 簡易フォールバック処理で計測するか（Falseの場合は利用可能なモデルを使用）
+    
+    Returns:
+        Dict[str, Any]: 計測結果
+    """
+    demucs_processor = DemucsProcessor(device='cpu')
+    speaker_processor = SpeakerProcessor(device='cpu')
+    if offline:
+        force_offline(demucs_processor, speaker_processor)
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="toyosatomimi_bench_") as work_dir:
+        work_dir = Path(work_dir)
+        
+        for length in lengths:
+            fixture = write_fixture(fixture_dir, length, num_speakers)
+            path = fixture['path']
+            label = f"{int(length)}s"
+            overlap_segments = generate_segments(int(length * 4), length, num_speakers)
+            print(f"▶ {path.name}")
+            
+            cases = {
+                'load_audio': lambda: AudioUtils.load_audio(path),
+                'separate': lambda: demucs_processor.separate(str(path), str(work_dir / f"bgm_{label}")),
+                'diarize': lambda: speaker_processor.diarize(str(path), min_duration=0.5),
+                'extract_speaker_audio': lambda: speaker_processor.extract_speaker_audio(
+                    str(path), fixture['segments'], str(work_dir / f"speakers_{label}")
+                ),
+                '_remove_overlapping_speech': lambda: speaker_processor._remove_overlapping_speech(overlap_segments)
+            }
+            
+            for case_name, func in cases.items():
+                key = f"{case_name}/{label}"
+                results[key] = _time_case(func, repeat)
+                print(f"  {key:<36} 中央値 {results[key]['median']:8.4f}秒  最小 {results[key]['min']:8.4f}秒")
+    
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': get_machine_info(),
+        'config': {
+            'lengths': lengths,
+            'repeat': repeat,
+            'num_speakers': num_speakers,
+            'offline': offline,
+            'demucs_model': demucs_processor.model,
+            'speaker_backend': 'pyannote' if getattr(speaker_processor, '_pyannote_available', False) else 'simple'
+        },
+        'results': results
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_delta: float = DEFAULT_MIN_DELTA
+) -> List[Dict[str, Any]]:
+    """
+    計測結果をベースラインと比較
+    
+    Args:
+        current: 今回の計測結果
+        baseline: ベースラインの計測結果
+        tolerance: 劣化と判定する許容率（0.25 = 25%）
+        min_delta: 劣化と判定する最小の差（秒）
+    
+    Returns:
+        List[Dict[str, Any]]: ケースごとの比較結果（regressionキーで劣化を示す）
+    """
+    comparisons = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        
+        delta = result['median'] - base['median']
+        ratio = result['median'] / base['median'] if base['median'] > 0 else float('inf')
+        comparisons.append({
+            'case': key,
+            'baseline': base['median'],
+            'current': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1.0 + tolerance and delta > min_delta
+        })
+    
+    return comparisons
+
+
+def _print_comparison(comparisons: List[Dict[str, Any]]) -> None:
+    """比較結果を表示"""
+    print()
+    print(f"{'ケース':<36} {'基準(秒)':>10} {'今回(秒)':>10} {'比率':>7}")
+    for row in comparisons:
+        mark = "❌" if row['regression'] else "  "
+        print(f"{row['case']:<36} {row['baseline']:>10.4f} {row['current']:>10.4f} {row['ratio']:>6.2f}x {mark}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ベンチマークのエントリーポイント"""
+    parser = argparse.ArgumentParser(description="音声分離ベンチマーク")
+    parser.add_argument('--lengths', type=float, nargs='+', default=DEFAULT_LENGTHS, help='計測する音声長（秒）')
+    parser.add_argument('--repeat', type=int, default=3, help='各ケースの繰り返し回数')
+    parser.add_argument('--speakers', type=int, default=DEFAULT_NUM_SPEAKERS, help='合成音声の話者数')
+    parser.add_argument('--use-models', action='store_true', help='利用可能ならDemucs/pyannoteモデルで計測')
+    parser.add_argument('--output', type=Path, help='計測結果JSONの保存先')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, type=Path, help='計測結果をベースラインとして保存')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, type=Path, help='ベースラインと比較')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='劣化と判定する許容率')
+    parser.add_argument('--verbose', action='store_true', help='処理ログを表示')
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    
+    current = run_suite(args.lengths, args.repeat, args.speakers, offline=not args.use_models)
+    
+    for path in filter(None, [args.output, args.save_baseline]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"💾 計測結果保存: {path}")
+    
+    if args.compare:
+        if not args.compare.exists():
+            print(f"❌ ベースラインが見つかりません: {args.compare}")
+            return 2
+        
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        
+        if baseline.get('machine') != current['machine']:
+            print("⚠️ ベースラインと計測環境が異なります（比較結果は参考値です）")
+        if baseline.get('config', {}).get('offline') != current['config']['offline']:
+            print("⚠️ ベースラインとモデル使用有無が異なります")
+        
+        comparisons = compare_results(current, baseline, args.tolerance)
+        _print_comparison(comparisons)
+        
+        regressions = [row for row in comparisons if row['regression']]
+        if regressions:
+            print(f"\n❌ {len(regressions)}件の性能劣化を検出しました（許容率 {args.tolerance:.0%}）")
+            return 1
+        print("\n✅ 性能劣化はありません")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,8 @@ from .progress_display import ProgressDisplay
 # from .log_display import LogDisplay
 from .control_buttons import ControlButtons
 from .preview_panel import PreviewPanel
+from .speaker_timeline import SpeakerTimeline
+from .waveform_view import WaveformView
 
 __all__ = [
     'FileSelector',
@@ -19,5 +21,7 @@ __all__ = [
     'ProgressDisplay',
     # 'LogDisplay',
     'ControlButtons',
-    'PreviewPanel'
+    'PreviewPanel',
+    'SpeakerTimeline',
+    'WaveformView'
 ]
\ No newline at end of file
@@ -117,6 +117,15 @@ class ControlButtons(ttk.Frame):
             self.status_label.config(text="設定保存エラー", foreground='red')
             self.after(2000, lambda: self.status_label.config(text="待機中", foreground='black'))
     
+    def set_paused(self, paused: bool):
+        """一時停止状態に合わせて表示を更新"""
+        if paused:
+            self.pause_button.config(text="▶️ 再開")
+            self.status_label.config(text="一時停止中", foreground='orange')
+        else:
+            self.pause_button.config(text="⏸️ 一時停止")
+            self.status_label.config(text="処理中...", foreground='blue')
+    
     def update_button_states(self, is_processing: bool, has_file: bool):
         """ボタンの状態を更新"""
         try:
@@ -129,7 +138,7 @@ class ControlButtons(ttk.Frame):
                 
             else:
                 # 待機中
-                self.pause_button.config(state=tk.DISABLED)
+                self.pause_button.config(state=tk.DISABLED, text="⏸️ 一時停止")
                 self.stop_button.config(state=tk.DISABLED)
                 self.save_button.config(state=tk.NORMAL)
                 
@@ -6,8 +6,9 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 import logging
 
 try:
@@ -36,12 +37,19 @@ class FileSelector(ttk.Frame):
         '.ogg': 'OGG Files'
     }
     
+    # ファイル確認の完了を確認する間隔（ミリ秒）
+    PROBE_POLL_MS = 30
+    
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.selected_file: Optional[Path] = None
         self.file_info: Optional[dict] = None
         
+        # ファイルの確認（存在・形式・ヘッダ読み込み）はワーカースレッドで行う
+        self._probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-probe")
+        self._probe_generation = 0
+        
         self._create_widgets()
         self._setup_layout()
         self._setup_dnd()
@@ -194,46 +202,71 @@ class FileSelector(ttk.Frame):
             )
     
     def _process_file(self, file_path: Path):
-        """ファイルを処理"""
+        """ファイルを処理（確認はワーカースレッドで行い、結果は after() で反映する）"""
+        self._probe_generation += 1
+        generation = self._probe_generation
+        
+        self.drop_label.config(text=f"🔍 確認中: {file_path.name}", fg='#0066cc')
+        future = self._probe_executor.submit(self._probe_file, file_path)
+        self.after(self.PROBE_POLL_MS, self._poll_probe, future, generation, file_path)
+    
+    def _probe_file(self, file_path: Path) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        ファイルを確認（ワーカースレッドで実行）
+        
+        Returns:
+            Tuple[Optional[dict], Optional[str]]: (ファイル情報, エラーメッセージ)
+        """
+        # ファイル形式チェック
+        if file_path.suffix.lower() not in self.SUPPORTED_FORMATS:
+            return None, (
+                f"サポートされていないファイル形式です:\n{file_path.suffix}\n\n"
+                f"対応形式: {', '.join(self.SUPPORTED_FORMATS.keys())}"
+            )
+        
+        # ヘッダを1回だけ読み込み、存在・有効性の確認と情報取得を兼ねる
         try:
-            # ファイル存在チェック
-            if not file_path.exists():
-                messagebox.showerror("エラー", f"ファイルが見つかりません:\\n{file_path}")
-                return
-            
-            # ファイル形式チェック
-            if file_path.suffix.lower() not in self.SUPPORTED_FORMATS:
-                messagebox.showerror(
-                    "エラー", 
-                    f"サポートされていないファイル形式です:\\n{file_path.suffix}\\n\\n"
-                    f"対応形式: {', '.join(self.SUPPORTED_FORMATS.keys())}"
-                )
-                return
-            
-            # 音声ファイルの検証
-            if not AudioUtils.validate_audio_file(file_path):
-                messagebox.showerror("エラー", "無効な音声ファイルです。")
-                return
-            
-            # ファイル情報を取得
-            try:
-                self.file_info = AudioUtils.get_audio_info(file_path)
-            except Exception as e:
-                messagebox.showerror("エラー", f"ファイル情報の取得に失敗:\\n{e}")
-                return
-            
-            # ファイル選択を更新
-            self.selected_file = file_path
-            self._update_display()
-            
-            # コントローラーに通知
-            self.controller.on_file_selected(file_path, self.file_info)
-            
-            logging.info(f"ファイル選択: {file_path}")
-            
+            info = AudioUtils.probe_audio_file(file_path)
+        except FileNotFoundError:
+            return None, f"ファイルが見つかりません:\n{file_path}"
+        except ValueError as e:
+            return None, f"ファイル情報の取得に失敗:\n{e}"
+        
+        if info['duration'] <= 0 or info['sample_rate'] <= 0:
+            return None, "無効な音声ファイルです。"
+        return info, None
+    
+    def _poll_probe(self, future: Future, generation: int, file_path: Path):
+        """ファイル確認の完了を待ち、結果を表示に反映"""
+        if not future.done():
+            self.after(self.PROBE_POLL_MS, self._poll_probe, future, generation, file_path)
+            return
+        
+        # 確認中に別のファイルが選択された場合は破棄
+        if generation != self._probe_generation:
+            return
+        
+        try:
+            info, error = future.result()
         except Exception as e:
             logging.error(f"ファイル処理エラー: {e}")
-            messagebox.showerror("エラー", f"ファイルの処理中にエラーが発生しました:\\n{e}")
+            info, error = None, f"ファイルの処理中にエラーが発生しました:\n{e}"
+        
+        if error:
+            self._update_display()
+            self._reset_drop_visual()
+            messagebox.showerror("エラー", error)
+            return
+        
+        # ファイル選択を更新
+        self.selected_file = file_path
+        self.file_info = info
+        self._update_display()
+        
+        # コントローラーに通知
+        self.controller.on_file_selected(file_path, self.file_info)
+        
+        logging.info(f"ファイル選択: {file_path}")
     
     def _update_display(self):
         """表示を更新"""
@@ -286,6 +319,7 @@ class FileSelector(ttk.Frame):
     
     def _clear_selection(self):
         """選択をクリア"""
+        self._probe_generation += 1
         self.selected_file = None
         self.file_info = None
         self._update_display()
@@ -305,7 +339,7 @@ class FileSelector(ttk.Frame):
         return self.file_info
     
     def set_file(self, file_path: Path):
-        """外部からファイルを設定"""
+        """外部からファイルを設定（確認後に選択状態が更新される）"""
         self._process_file(file_path)
     
     def is_file_selected(self) -> bool:
@@ -23,7 +23,9 @@ class OutputPanel(ttk.Frame):
             'output_dir': Path.cwd() / 'output',
             'create_combined': True,
             'create_individual': True,
+            'segment_container': False,
             'create_bgm': True,
+            'force_bgm_separation': False,
             'audio_format': 'wav',
             'sample_rate': 44100,
             'bit_depth': 16,
@@ -83,6 +85,14 @@ class OutputPanel(ttk.Frame):
             variable=self.individual_var
         ).pack(anchor=tk.W, pady=(0, 2))
         
+        self.container_var = tk.BooleanVar(value=self.settings['segment_container'])
+        self.container_var.trace('w', self._on_setting_change)
+        ttk.Checkbutton(
+            content_frame,
+            text="    話者ごとに1ファイルにまとめる (索引から個別に読み出し)",
+            variable=self.container_var
+        ).pack(anchor=tk.W, pady=(0, 2))
+        
         self.bgm_var = tk.BooleanVar(value=self.settings['create_bgm'])
         self.bgm_var.trace('w', self._on_setting_change)
         ttk.Checkbutton(
@@ -91,6 +101,14 @@ class OutputPanel(ttk.Frame):
             variable=self.bgm_var
         ).pack(anchor=tk.W, pady=(0, 2))
         
+        self.force_bgm_var = tk.BooleanVar(value=self.settings['force_bgm_separation'])
+        self.force_bgm_var.trace('w', self._on_setting_change)
+        ttk.Checkbutton(
+            content_frame,
+            text="    BGMの自動判定をせず常にBGM分離する",
+            variable=self.force_bgm_var
+        ).pack(anchor=tk.W, pady=(0, 2))
+        
         self.report_var = tk.BooleanVar(value=self.settings['create_report'])
         self.report_var.trace('w', self._on_setting_change)
         ttk.Checkbutton(
@@ -115,7 +133,7 @@ class OutputPanel(ttk.Frame):
         format_combo = ttk.Combobox(
             format_select_frame,
             textvariable=self.format_var,
-            values=['wav', 'mp3', 'flac'],
+            values=['wav', 'flac', 'ogg', 'opus', 'mp3'],
             state='readonly',
             width=10
         )
@@ -185,7 +203,9 @@ class OutputPanel(ttk.Frame):
         self.settings.update({
             'create_combined': self.combined_var.get(),
             'create_individual': self.individual_var.get(),
+            'segment_container': self.container_var.get(),
             'create_bgm': self.bgm_var.get(),
+            'force_bgm_separation': self.force_bgm_var.get(),
             'audio_format': self.format_var.get(),
             'sample_rate': self.sr_var.get(),
             'naming_style': self.naming_var.get(),
@@ -217,9 +237,15 @@ class OutputPanel(ttk.Frame):
         if 'create_individual' in settings:
             self.individual_var.set(settings['create_individual'])
         
+        if 'segment_container' in settings:
+            self.container_var.set(settings['segment_container'])
+        
         if 'create_bgm' in settings:
             self.bgm_var.set(settings['create_bgm'])
         
+        if 'force_bgm_separation' in settings:
+            self.force_bgm_var.set(settings['force_bgm_separation'])
+        
         if 'audio_format' in settings:
             self.format_var.set(settings['audio_format'])
         
@@ -12,10 +12,22 @@ import logging
 import subprocess
 import platform
 
+from ..utils.audio_player import AudioPlayer
+from ..utils.file_metadata import FileMetadataLoader
+from .speaker_timeline import SpeakerTimeline
+from .waveform_view import WaveformView
+
 
 class PreviewPanel(ttk.Frame):
     """プレビューパネル"""
     
+    # ノードを展開したときに一度に表示するファイル数
+    FILES_PAGE_SIZE = 200
+    
+    # ファイル情報を反映する間隔（ミリ秒）と1回あたりの件数
+    METADATA_POLL_MS = 100
+    METADATA_BATCH_SIZE = 100
+    
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -23,6 +35,17 @@ class PreviewPanel(ttk.Frame):
         # 現在の結果データ
         self.current_results = None
         
+        # ファイル一覧の遅延読み込み状態
+        self._metadata_loader = FileMetadataLoader()
+        self._metadata_polling = False
+        self._node_files: Dict[str, List[tuple]] = {}   # グループノード → (パス, アイコン, 種類) のリスト
+        self._node_loaded: Dict[str, int] = {}          # グループノード → 表示済みファイル数
+        self._more_items: Dict[str, str] = {}           # 「さらに表示」アイテム → グループノード
+        self._item_paths: Dict[str, Path] = {}          # ファイルアイテム → パス
+        
+        # アプリ内再生（最初の再生時に作成）
+        self._audio_player: Optional[AudioPlayer] = None
+        
         self._create_widgets()
         self._setup_layout()
         
@@ -51,6 +74,12 @@ class PreviewPanel(ttk.Frame):
         self.analysis_frame = ttk.Frame(self.result_notebook)
         self.result_notebook.add(self.analysis_frame, text="🔍 分析結果")
         
+        # 波形タブ
+        self.waveform_frame = ttk.Frame(self.result_notebook)
+        self.result_notebook.add(self.waveform_frame, text="🌊 波形")
+        self.waveform_view = WaveformView(self.waveform_frame)
+        self.waveform_view.pack(fill=tk.BOTH, expand=True)
+        
         # 概要タブのコンテンツ
         self._create_overview_tab()
         
@@ -154,11 +183,18 @@ class PreviewPanel(ttk.Frame):
         # ダブルクリックでファイルを開く
         self.files_tree.bind('<Double-1>', self._on_file_double_click)
         
+        # ノード展開時にファイルを読み込む
+        self.files_tree.bind('<<TreeviewOpen>>', self._on_tree_open)
+        
         # 右クリックメニュー
         self._create_file_context_menu()
     
     def _create_analysis_tab(self):
         """分析タブのコンテンツを作成"""
+        # 話者タイムライン
+        self.speaker_timeline = SpeakerTimeline(self.analysis_frame, on_segment_activate=self._play_input_range)
+        self.speaker_timeline.pack(fill=tk.X, pady=(0, 10))
+        
         # スクロール可能テキストエリア
         text_frame = ttk.Frame(self.analysis_frame)
         text_frame.pack(fill=tk.BOTH, expand=True)
@@ -211,6 +247,9 @@ class PreviewPanel(ttk.Frame):
     def _create_file_context_menu(self):
         """ファイル右クリックメニューを作成"""
         self.file_context_menu = tk.Menu(self, tearoff=0)
+        self.file_context_menu.add_command(label="▶️ 再生", command=self._play_selected_file)
+        self.file_context_menu.add_command(label="⏹️ 停止", command=self._stop_playback)
+        self.file_context_menu.add_separator()
         self.file_context_menu.add_command(label="ファイルを開く", command=self._open_selected_file)
         self.file_context_menu.add_command(label="フォルダで表示", command=self._show_in_folder)
         self.file_context_menu.add_separator()
@@ -275,6 +314,9 @@ toyosatomimi 音声分離アプリケーション
             # 分析タブを更新
             self._update_analysis(results)
             
+            # 波形タブを更新
+            self.waveform_view.load_results(results)
+            
             # ボタン状態を更新
             self._update_button_states(True)
             
@@ -325,95 +367,134 @@ toyosatomimi 音声分離アプリケーション
             self.overview_labels['processing_speed'].config(text="処理速度: 計算不可")
     
     def _update_files_list(self, results: Dict[str, Any]):
-        """ファイル一覧タブを更新"""
-        # 既存のアイテムをクリア
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
+        """ファイル一覧タブを更新（ファイルはノード展開時に読み込む）"""
+        self._clear_files_tree()
         
         output_files = results.get('output_files', {})
         
         for speaker_id, files in output_files.items():
-            # 話者ノードを追加
-            speaker_node = self.files_tree.insert(
-                '',
-                'end',
-                text=f"🎤 {speaker_id}",
-                values=('', '', '話者'),
-                open=True
-            )
-            
+            entries = []
             for file_path in files:
                 file_path = Path(file_path)
                 
-                # ファイル情報を取得
-                file_size = 0
-                try:
-                    if file_path.exists():
-                        file_size = file_path.stat().st_size
-                except:
-                    pass
-                
                 # ファイルタイプを判定
                 if 'combined' in file_path.name:
-                    file_type = "統合音声"
-                    icon = "🎵"
+                    entries.append((file_path, "🎵", "統合音声"))
                 else:
-                    file_type = "セグメント"
-                    icon = "📄"
-                
-                # ファイルノードを追加
-                self.files_tree.insert(
-                    speaker_node,
-                    'end',
-                    text=f"{icon} {file_path.name}",
-                    values=(
-                        self._format_size(file_size),
-                        "",  # 音声長は後で実装
-                        file_type
-                    )
-                )
+                    entries.append((file_path, "📄", "セグメント"))
+            
+            self._add_group_node(f"🎤 {speaker_id}", '話者', entries)
         
         # BGM分離ファイルも追加
         bgm_files = results.get('bgm_files', [])
         if bgm_files:
-            bgm_node = self.files_tree.insert(
-                '',
-                'end',
-                text="🎼 BGM分離",
-                values=('', '', 'BGM'),
-                open=True
-            )
-            
+            entries = []
             for file_path in bgm_files:
                 file_path = Path(file_path)
-                
-                file_size = 0
-                try:
-                    if file_path.exists():
-                        file_size = file_path.stat().st_size
-                except:
-                    pass
-                
                 if 'vocals' in file_path.name:
-                    icon = "🎤"
-                    file_type = "ボーカル"
+                    entries.append((file_path, "🎤", "ボーカル"))
                 else:
-                    icon = "🎼"
-                    file_type = "BGM"
-                
-                self.files_tree.insert(
-                    bgm_node,
-                    'end',
-                    text=f"{icon} {file_path.name}",
-                    values=(
-                        self._format_size(file_size),
-                        "",
-                        file_type
-                    )
-                )
+                    entries.append((file_path, "🎼", "BGM"))
+            
+            node = self._add_group_node("🎼 BGM分離", 'BGM', entries)
+            self.files_tree.item(node, open=True)
+            self._load_files_page(node)
+    
+    def _add_group_node(self, text: str, group_type: str, entries: List[tuple]) -> str:
+        """グループノードを追加（子は展開されるまで仮のアイテムのみ）"""
+        node = self.files_tree.insert(
+            '',
+            'end',
+            text=text,
+            values=(f"{len(entries)}件", '', group_type),
+            open=False
+        )
+        self._node_files[node] = entries
+        self._node_loaded[node] = 0
+        
+        # 展開ボタンを表示するための仮のアイテム
+        if entries:
+            self.files_tree.insert(node, 'end', text="読み込み中...")
+        return node
+    
+    def _on_tree_open(self, event):
+        """ノード展開時に未読み込みのファイルを表示"""
+        node = self.files_tree.focus()
+        if node in self._node_files and self._node_loaded.get(node) == 0:
+            self._load_files_page(node)
+    
+    def _load_files_page(self, node: str):
+        """グループノードに次のページのファイルを追加"""
+        entries = self._node_files.get(node, [])
+        start = self._node_loaded.get(node, 0)
+        
+        # 仮のアイテム・「さらに表示」アイテムを削除
+        for child in self.files_tree.get_children(node):
+            if child not in self._item_paths:
+                self.files_tree.delete(child)
+                self._more_items.pop(child, None)
+        
+        page = entries[start:start + self.FILES_PAGE_SIZE]
+        for file_path, icon, file_type in page:
+            item = self.files_tree.insert(
+                node,
+                'end',
+                text=f"{icon} {file_path.name}",
+                values=("...", "...", file_type)
+            )
+            self._item_paths[item] = file_path
+            self._metadata_loader.request(item, file_path)
+        
+        loaded = start + len(page)
+        self._node_loaded[node] = loaded
+        
+        remaining = len(entries) - loaded
+        if remaining > 0:
+            more_item = self.files_tree.insert(
+                node,
+                'end',
+                text=f"⬇️ さらに表示（残り{remaining}件）",
+                values=('', '', '')
+            )
+            self._more_items[more_item] = node
+        
+        self._start_metadata_polling()
+    
+    def _start_metadata_polling(self):
+        """ファイル情報の反映を開始"""
+        if not self._metadata_polling:
+            self._metadata_polling = True
+            self.after(self.METADATA_POLL_MS, self._apply_metadata_batch)
+    
+    def _apply_metadata_batch(self):
+        """バックグラウンドで取得したファイル情報をまとめて反映"""
+        for item, size, duration in self._metadata_loader.drain(self.METADATA_BATCH_SIZE):
+            if not self.files_tree.exists(item):
+                continue
+            self.files_tree.set(item, 'size', self._format_size(size))
+            self.files_tree.set(item, 'duration', self._format_duration(duration) if duration is not None else "")
+        
+        if self._metadata_loader.has_pending():
+            self.after(self.METADATA_POLL_MS, self._apply_metadata_batch)
+        else:
+            self._metadata_polling = False
+    
+    def _clear_files_tree(self):
+        """ファイル一覧と遅延読み込み状態をクリア"""
+        self._metadata_loader.clear()
+        self._node_files.clear()
+        self._node_loaded.clear()
+        self._more_items.clear()
+        self._item_paths.clear()
+        
+        for item in self.files_tree.get_children():
+            self.files_tree.delete(item)
     
     def _update_analysis(self, results: Dict[str, Any]):
         """分析タブを更新"""
+        # 話者タイムラインを更新
+        self.speaker_timeline.load_results(results)
+        
         # テキストエリアを有効化
         self.analysis_text.config(state=tk.NORMAL)
         self.analysis_text.delete(1.0, tk.END)
@@ -532,14 +613,19 @@ toyosatomimi 音声分離アプリケーション
             widget.destroy()
         
         # ファイル一覧をクリア
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
+        self._clear_files_tree()
+        
+        # 話者タイムラインをクリア
+        self.speaker_timeline.clear()
         
         # 分析テキストをクリア
         self.analysis_text.config(state=tk.NORMAL)
         self.analysis_text.delete(1.0, tk.END)
         self.analysis_text.config(state=tk.DISABLED)
         
+        # 波形をクリア
+        self.waveform_view.clear()
+        
         # 初期状態を表示
         self._show_initial_state()
         
@@ -548,6 +634,7 @@ toyosatomimi 音声分離アプリケーション
     
     def _clear_results(self):
         """結果をクリア"""
+        self._stop_playback()
         self.current_results = None
         self._clear_display()
         logging.info("プレビュー結果クリア")
@@ -594,7 +681,11 @@ toyosatomimi 音声分離アプリケーション
             messagebox.showerror("エラー", f"レポート保存でエラー:\n{e}")
     
     def _on_file_double_click(self, event):
-        """ファイルダブルクリック"""
+        """ファイルダブルクリック（「さらに表示」の場合は次のページを読み込む）"""
+        selection = self.files_tree.selection()
+        if selection and selection[0] in self._more_items:
+            self._load_files_page(self._more_items[selection[0]])
+            return
         self._open_selected_file()
     
     def _show_file_context_menu(self, event):
@@ -611,16 +702,9 @@ toyosatomimi 音声分離アプリケーション
             return
         
         try:
-            item = selection[0]
-            file_name = self.files_tree.item(item, 'text')
-            
-            # アイコンを除去してファイル名を取得
-            clean_name = file_name.split(' ', 1)[-1] if ' ' in file_name else file_name
-            
             # ファイルパスを構築
             if self.current_results:
-                output_dir = Path(self.current_results.get('output_directory', ''))
-                file_path = self._find_file_in_results(clean_name)
+                file_path = self._get_item_path(selection[0])
                 
                 if file_path and file_path.exists():
                     self._open_path_in_explorer(str(file_path))
@@ -631,6 +715,50 @@ toyosatomimi 音声分離アプリケーション
             logging.error(f"ファイル開くエラー: {e}")
             messagebox.showerror("エラー", f"ファイルを開けませんでした:\n{e}")
     
+    def _get_audio_player(self) -> Optional[AudioPlayer]:
+        """アプリ内再生用のプレイヤーを取得（再生できない環境ではNone）"""
+        if self._audio_player is None:
+            self._audio_player = AudioPlayer()
+        return self._audio_player if self._audio_player.is_available else None
+    
+    def _play_selected_file(self):
+        """選択されたファイルをアプリ内で再生（再生できない環境では関連付けられたアプリで開く）"""
+        selection = self.files_tree.selection()
+        if not selection:
+            return
+        
+        file_path = self._get_item_path(selection[0])
+        if not file_path or not file_path.exists():
+            messagebox.showerror("エラー", "ファイルが見つかりません。")
+            return
+        
+        player = self._get_audio_player()
+        if player is None:
+            self._open_path_in_explorer(str(file_path))
+            return
+        player.play(file_path)
+    
+    def _play_input_range(self, speaker_id: str, start_time: float, end_time: float):
+        """入力音声の区間をアプリ内で再生（タイムラインの区間ダブルクリック）"""
+        if not self.current_results:
+            return
+        
+        player = self._get_audio_player()
+        if player is None:
+            messagebox.showinfo("情報", "アプリ内再生にはpygameが必要です。")
+            return
+        
+        try:
+            player.play(self.current_results['input_file'], start_time, end_time)
+            logging.info(f"区間再生: {speaker_id} {start_time:.2f}-{end_time:.2f}秒")
+        except FileNotFoundError as e:
+            messagebox.showerror("エラー", str(e))
+    
+    def _stop_playback(self):
+        """アプリ内再生を停止"""
+        if self._audio_player is not None:
+            self._audio_player.stop()
+    
     def _show_in_folder(self):
         """フォルダで表示"""
         selection = self.files_tree.selection()
@@ -638,11 +766,7 @@ toyosatomimi 音声分離アプリケーション
             return
         
         try:
-            item = selection[0]
-            file_name = self.files_tree.item(item, 'text')
-            
-            clean_name = file_name.split(' ', 1)[-1] if ' ' in file_name else file_name
-            file_path = self._find_file_in_results(clean_name)
+            file_path = self._get_item_path(selection[0])
             
             if file_path and file_path.exists():
                 self._show_file_in_explorer(str(file_path))
@@ -659,11 +783,7 @@ toyosatomimi 音声分離アプリケーション
             return
         
         try:
-            item = selection[0]
-            file_name = self.files_tree.item(item, 'text')
-            
-            clean_name = file_name.split(' ', 1)[-1] if ' ' in file_name else file_name
-            file_path = self._find_file_in_results(clean_name)
+            file_path = self._get_item_path(selection[0])
             
             if file_path:
                 # クリップボードにコピー
@@ -674,6 +794,16 @@ toyosatomimi 音声分離アプリケーション
         except Exception as e:
             logging.error(f"パスコピーエラー: {e}")
     
+    def _get_item_path(self, item: str) -> Optional[Path]:
+        """ツリーのアイテムに対応するファイルパスを取得"""
+        if item in self._item_paths:
+            return self._item_paths[item]
+        
+        # アイコンを除去してファイル名で検索
+        file_name = self.files_tree.item(item, 'text')
+        clean_name = file_name.split(' ', 1)[-1] if ' ' in file_name else file_name
+        return self._find_file_in_results(clean_name)
+    
     def _find_file_in_results(self, file_name: str) -> Optional[Path]:
         """結果からファイルを検索"""
         if not self.current_results:
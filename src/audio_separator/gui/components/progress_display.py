@@ -115,9 +115,6 @@ class ProgressDisplay(ttk.Frame):
             else:
                 self.status_label.config(foreground='black')
             
-            # 強制更新
-            self.update_idletasks()
-            
         except Exception as e:
             logging.error(f"進捗更新エラー: {e}")
     
@@ -0,0 +1,123 @@
+"""
+話者タイムライン
+
+話者ごとのレーンに発話区間を表示するUIコンポーネント。区間インデックスで
+表示範囲内の区間だけを取り出し、1ピクセル未満の区間・隙間はまとめて描画するため、
+発話数の多い会議録音でもスクロール・ズームが重くならない
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Any, Optional
+
+import numpy as np
+
+from .timeline_canvas import TimelineCanvas
+from ...processors.segment_index import SpeakerTimelineIndex
+
+
+class SpeakerTimeline(TimelineCanvas):
+    """話者ごとの発話区間を表示するタイムライン"""
+    
+    LANE_HEIGHT = 28
+    
+    def __init__(
+        self,
+        parent,
+        height: int = 160,
+        on_segment_activate: Optional[Callable[[str, float, float], None]] = None
+    ):
+        """
+        タイムラインを初期化
+        
+        Args:
+            parent: 親ウィジェット
+            height: キャンバスの高さ（ピクセル）
+            on_segment_activate: 区間をダブルクリックしたときのコールバック (話者ID, 開始時刻, 終了時刻)
+        """
+        self._timeline: Optional[SpeakerTimelineIndex] = None
+        self.on_segment_activate = on_segment_activate
+        super().__init__(parent, height=height)
+        
+        # カーソル位置の情報
+        self.info_label = ttk.Label(self.toolbar, text="")
+        self.info_label.pack(side=tk.RIGHT, padx=(0, 15))
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Double-Button-1>", self._on_double_click)
+    
+    def load_results(self, results: Dict[str, Any]):
+        """
+        分離結果のセグメントから表示内容を作成
+        
+        Args:
+            results: パイプラインの処理結果
+        """
+        self._timeline = SpeakerTimelineIndex.from_segments(results.get('segments', []))
+        self.set_duration(max(results.get('duration', 0.0), self._timeline.duration))
+    
+    def clear(self):
+        """表示をクリア"""
+        self._timeline = None
+        self.set_duration(0.0)
+    
+    def _draw_content(self, width: int, start: float, end: float):
+        """表示範囲の発話区間を描画"""
+        if self._timeline is None:
+            return
+        
+        seconds_per_pixel = (end - start) / width
+        for index, (speaker_id, intervals) in enumerate(self._timeline.indexes.items()):
+            top = self.RULER_HEIGHT + index * self.LANE_HEIGHT + 4
+            bottom = top + self.LANE_HEIGHT - 8
+            color = self.SPEAKER_COLORS[index % len(self.SPEAKER_COLORS)]
+            
+            # 1ピクセル未満の隙間で隣り合う区間は1つの矩形として描く
+            starts, ends = intervals.query_coalesced(start, end, seconds_per_pixel)
+            x0 = (starts - start) / seconds_per_pixel
+            x1 = (ends - start) / seconds_per_pixel
+            for left, right in zip(x0.clip(0, width).tolist(), x1.clip(0, width).tolist()):
+                self.canvas.create_rectangle(left, top, max(right, left + 1), bottom, fill=color, outline='')
+            
+            self._draw_lane_frame(index, width, speaker_id)
+    
+    def segment_at(self, x: float, y: float) -> Optional[tuple]:
+        """
+        キャンバス上の位置にある区間を取得
+        
+        Args:
+            x: x座標
+            y: y座標
+        
+        Returns:
+            Optional[tuple]: (話者ID, 開始時刻, 終了時刻)。区間が無い場合はNone
+        """
+        if self._timeline is None or self._view_span <= 0:
+            return None
+        
+        lane = int((y - self.RULER_HEIGHT) // self.LANE_HEIGHT)
+        speakers = self._timeline.speakers
+        if y < self.RULER_HEIGHT or lane >= len(speakers):
+            return None
+        
+        # 1ピクセル以内の区間も拾えるよう、カーソル前後1ピクセル分を検索する
+        seconds_per_pixel = self._view_span / max(self.canvas.winfo_width(), 1)
+        time = self._time_at(x)
+        starts, ends = self._timeline.indexes[speakers[lane]].query(time - seconds_per_pixel, time + seconds_per_pixel)
+        if len(starts) == 0:
+            return None
+        nearest = int(np.argmin(np.abs((starts + ends) / 2 - time)))
+        return speakers[lane], float(starts[nearest]), float(ends[nearest])
+    
+    def _on_double_click(self, event):
+        """区間のダブルクリック"""
+        segment = self.segment_at(event.x, event.y)
+        if segment and self.on_segment_activate:
+            self.on_segment_activate(*segment)
+    
+    def _on_motion(self, event):
+        """カーソル位置の時刻と発話中の話者を表示"""
+        if self._timeline is None or self._view_span <= 0:
+            return
+        time = self._time_at(event.x)
+        speakers = self._timeline.speakers_at(time)
+        self.info_label.config(text=f"{self._format_time(time)}  {', '.join(speakers) if speakers else '-'}")
@@ -0,0 +1,204 @@
+"""
+タイムラインキャンバス
+
+時間軸に沿ったレーン表示の共通部分（ズーム・スクロール・ドラッグ移動・
+時間目盛り・再描画の間引き）を提供する基底UIコンポーネント
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+import numpy as np
+
+
+class TimelineCanvas(ttk.Frame):
+    """ズーム・スクロールできるタイムライン表示の基底クラス"""
+    
+    # レーンの高さ・目盛りの高さ（ピクセル）
+    LANE_HEIGHT = 60
+    RULER_HEIGHT = 20
+    
+    # ズーム倍率と最小表示幅（秒）
+    ZOOM_STEP = 1.5
+    MIN_SPAN = 0.05
+    
+    # 話者ごとの色
+    SPEAKER_COLORS = ['#e53935', '#8e24aa', '#fb8c00', '#00897b', '#3949ab', '#6d4c41']
+    
+    def __init__(self, parent, height: Optional[int] = None):
+        super().__init__(parent)
+        
+        self._duration = 0.0
+        self._view_start = 0.0
+        self._view_span = 0.0
+        self._redraw_pending = False
+        self._drag_x: Optional[int] = None
+        
+        self._create_widgets(height)
+    
+    def _create_widgets(self, height: Optional[int]):
+        """ウィジェットを作成"""
+        # ズーム操作
+        self.toolbar = ttk.Frame(self)
+        self.toolbar.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Button(self.toolbar, text="＋", width=3, command=lambda: self.zoom(1 / self.ZOOM_STEP)).pack(side=tk.LEFT)
+        ttk.Button(self.toolbar, text="－", width=3, command=lambda: self.zoom(self.ZOOM_STEP)).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(self.toolbar, text="全体", command=self.show_all).pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.range_label = ttk.Label(self.toolbar, text="")
+        self.range_label.pack(side=tk.RIGHT)
+        
+        # キャンバスとスクロールバー
+        self.canvas = tk.Canvas(self, background='white', highlightthickness=0)
+        if height:
+            self.canvas.config(height=height)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._on_scroll)
+        self.scrollbar.pack(fill=tk.X)
+        
+        self.canvas.bind("<Configure>", lambda e: self._schedule_redraw())
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_drag_end)
+    
+    # --- ズーム・スクロール ---
+    
+    def set_duration(self, duration: float):
+        """表示対象の長さを設定して全体を表示"""
+        self._duration = max(duration, 0.0)
+        self.show_all()
+    
+    def show_all(self):
+        """全体を表示"""
+        self._view_start = 0.0
+        self._view_span = self._duration
+        self._schedule_redraw()
+    
+    def zoom(self, factor: float, center: Optional[float] = None):
+        """
+        表示範囲を拡大・縮小
+        
+        Args:
+            factor: 表示幅の倍率（1未満で拡大）
+            center: 固定する時刻（Noneの場合は表示範囲の中央）
+        """
+        if self._duration <= 0:
+            return
+        if center is None:
+            center = self._view_start + self._view_span / 2
+        
+        ratio = (center - self._view_start) / self._view_span if self._view_span else 0.5
+        span = min(max(self._view_span * factor, self.MIN_SPAN), self._duration)
+        self._view_span = span
+        self._set_view_start(center - span * ratio)
+    
+    def _set_view_start(self, start: float):
+        """表示開始時刻を範囲内に収めて再描画"""
+        self._view_start = min(max(start, 0.0), max(self._duration - self._view_span, 0.0))
+        self._schedule_redraw()
+    
+    def _time_at(self, x: float) -> float:
+        """キャンバス上のx座標に対応する時刻"""
+        width = max(self.canvas.winfo_width(), 1)
+        return self._view_start + self._view_span * x / width
+    
+    def _on_scroll(self, *args):
+        """スクロールバー操作"""
+        if self._duration <= 0:
+            return
+        if args[0] == 'moveto':
+            self._set_view_start(float(args[1]) * self._duration)
+        elif args[0] == 'scroll':
+            step = self._view_span * (0.9 if args[2] == 'pages' else 0.1)
+            self._set_view_start(self._view_start + int(args[1]) * step)
+    
+    def _on_mouse_wheel(self, event):
+        """マウスホイールでカーソル位置を中心に拡大・縮小"""
+        if self.canvas.winfo_width() <= 1:
+            return
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.zoom(1 / self.ZOOM_STEP if zoom_in else self.ZOOM_STEP, self._time_at(event.x))
+    
+    def _on_drag_start(self, event):
+        """ドラッグ移動の開始"""
+        self._drag_x = event.x
+    
+    def _on_drag(self, event):
+        """ドラッグで表示範囲を移動"""
+        if self._drag_x is None or self.canvas.winfo_width() <= 1:
+            return
+        shift = (self._drag_x - event.x) * self._view_span / self.canvas.winfo_width()
+        self._drag_x = event.x
+        self._set_view_start(self._view_start + shift)
+    
+    def _on_drag_end(self, event):
+        """ドラッグ移動の終了"""
+        self._drag_x = None
+    
+    # --- 描画 ---
+    
+    def _schedule_redraw(self):
+        """アイドル時に1回だけ再描画（連続したスクロール・ズームをまとめる）"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+    
+    def _redraw(self):
+        """目盛りと表示範囲の内容を描画"""
+        self._redraw_pending = False
+        self.canvas.delete('all')
+        
+        width = self.canvas.winfo_width()
+        if width <= 1 or self._view_span <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            self.range_label.config(text="")
+            return
+        
+        start, end = self._view_start, self._view_start + self._view_span
+        self.scrollbar.set(start / self._duration, end / self._duration)
+        self.range_label.config(text=f"{self._format_time(start)} - {self._format_time(end)}")
+        
+        self._draw_ruler(width, start, end)
+        self._draw_content(width, start, end)
+    
+    def _draw_content(self, width: int, start: float, end: float):
+        """
+        表示範囲の内容を描画（サブクラスで実装）
+        
+        Args:
+            width: 描画幅（ピクセル）
+            start: 表示開始時刻（秒）
+            end: 表示終了時刻（秒）
+        """
+        raise NotImplementedError
+    
+    def _draw_lane_frame(self, index: int, width: int, label: str):
+        """レーンの区切り線とラベルを描画"""
+        top = self.RULER_HEIGHT + index * self.LANE_HEIGHT
+        self.canvas.create_line(0, top + self.LANE_HEIGHT, width, top + self.LANE_HEIGHT, fill='#e0e0e0')
+        self.canvas.create_text(4, top + 2, text=label, anchor=tk.NW, font=('Arial', 9))
+    
+    def _draw_ruler(self, width: int, start: float, end: float):
+        """時間目盛りを描画（目盛り間隔は表示幅に合わせて選ぶ）"""
+        span = end - start
+        step = next((s for s in (0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600) if span / s <= 10), 7200)
+        
+        tick = np.ceil(start / step) * step
+        while tick <= end:
+            x = (tick - start) / span * width
+            self.canvas.create_line(x, self.RULER_HEIGHT - 6, x, self.RULER_HEIGHT, fill='#9e9e9e')
+            self.canvas.create_text(x + 2, 2, text=self._format_time(tick), anchor=tk.NW, font=('Arial', 8))
+            tick += step
+        self.canvas.create_line(0, self.RULER_HEIGHT, width, self.RULER_HEIGHT, fill='#9e9e9e')
+    
+    @staticmethod
+    def _format_time(seconds: float) -> str:
+        """時刻を分:秒形式に変換"""
+        minutes, secs = divmod(max(seconds, 0.0), 60)
+        return f"{int(minutes)}:{secs:04.1f}"
@@ -0,0 +1,108 @@
+"""
+波形ビュー
+
+波形ピークピラミッドを使い、入力・ボーカル・BGM・話者ごとのレーンを
+タイムライン上に表示するUIコンポーネント。表示範囲と表示幅に合った段の
+ピークだけを参照するため、ファイル長に関係なくズーム・スクロールできる
+"""
+
+from typing import List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from .timeline_canvas import TimelineCanvas
+from ...processors.segment_index import IntervalIndex, SpeakerTimelineIndex
+from ...utils.waveform_peaks import PeakPyramid
+
+
+class WaveformView(TimelineCanvas):
+    """レーンごとに波形を表示するタイムラインビュー"""
+    
+    # レーンの色
+    LANE_COLORS = {
+        'input': '#607d8b',
+        'vocals': '#1e88e5',
+        'bgm': '#43a047',
+    }
+    
+    def __init__(self, parent):
+        # レーン: (ラベル, ピラミッド, 色, 表示区間 または None)
+        self._lanes: List[Tuple[str, PeakPyramid, str, Optional[IntervalIndex]]] = []
+        super().__init__(parent)
+    
+    # --- 表示内容 ---
+    
+    def set_lanes(self, lanes: List[Tuple[str, PeakPyramid, str, Optional[IntervalIndex]]]):
+        """
+        表示するレーンを設定
+        
+        Args:
+            lanes: (ラベル, ピラミッド, 色, 表示区間) のリスト。
+                表示区間を指定したレーンは区間外の波形を表示しない
+        """
+        self._lanes = lanes
+        self.set_duration(max((pyramid.duration for _, pyramid, _, _ in lanes), default=0.0))
+    
+    def load_results(self, results: dict):
+        """
+        分離結果のピークファイルからレーンを作成
+        
+        話者ごとの統合音声は発話区間を詰めて連結しているため時間軸が揃わない。
+        話者レーンはボーカル（BGM分離しない場合は入力）の波形を発話区間で切り出して表示する
+        
+        Args:
+            results: パイプラインの処理結果
+        """
+        peak_files = results.get('peak_files') or {}
+        lanes = []
+        
+        pyramids = {}
+        for kind in ('input', 'vocals', 'bgm'):
+            if peak_files.get(kind):
+                try:
+                    pyramids[kind] = PeakPyramid.load(peak_files[kind])
+                except (OSError, ValueError) as e:
+                    logging.warning(f"波形データ読み込みエラー: {peak_files[kind]}: {e}")
+        
+        labels = {'input': "入力", 'vocals': "ボーカル", 'bgm': "BGM"}
+        for kind, pyramid in pyramids.items():
+            lanes.append((labels[kind], pyramid, self.LANE_COLORS[kind], None))
+        
+        speech = pyramids.get('vocals') or pyramids.get('input')
+        if speech is not None:
+            timeline = SpeakerTimelineIndex.from_segments(results.get('segments', []))
+            for index, (speaker_id, intervals) in enumerate(timeline.indexes.items()):
+                color = self.SPEAKER_COLORS[index % len(self.SPEAKER_COLORS)]
+                lanes.append((speaker_id, speech, color, intervals))
+        
+        self.set_lanes(lanes)
+    
+    def clear(self):
+        """表示をクリア"""
+        self.set_lanes([])
+    
+    # --- 描画 ---
+    
+    def _draw_content(self, width: int, start: float, end: float):
+        """表示範囲の波形を描画"""
+        xs = np.arange(width, dtype=np.float64)
+        pixel_times = start + (xs + 0.5) * (end - start) / width
+        half = self.LANE_HEIGHT / 2 - 4
+        
+        for index, (label, pyramid, color, intervals) in enumerate(self._lanes):
+            center = self.RULER_HEIGHT + index * self.LANE_HEIGHT + self.LANE_HEIGHT / 2
+            
+            mins, maxs = pyramid.get_peaks(start, end, width)
+            if intervals is not None:
+                inside = intervals.contains(pixel_times)
+                mins = np.where(inside, mins, 0.0)
+                maxs = np.where(inside, maxs, 0.0)
+            
+            # 上側（最大値）を左から、下側（最小値）を右から辿る多角形
+            upper = np.column_stack([xs, center - maxs * half])
+            lower = np.column_stack([xs[::-1], center - mins[::-1] * half])
+            points = np.concatenate([upper, lower]).ravel().tolist()
+            self.canvas.create_polygon(points, fill=color, outline=color)
+            
+            self._draw_lane_frame(index, width, label)
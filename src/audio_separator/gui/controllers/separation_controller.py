@@ -5,12 +5,14 @@ GUIとモデル間の制御ロジックを提供します。
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 import json
 from tkinter import messagebox, filedialog
 
 from ..models.gui_model import AudioSeparationModel, ProcessingProgress
+from ..utils.progress_bus import ProgressBus
+from ...service.jobs import JobManager, SeparationJob
 
 
 class SeparationController:
@@ -20,9 +22,17 @@ class SeparationController:
         self.model = model
         self.view = view
         
+        # ワーカースレッドからの通知は一定間隔でまとめてGUIスレッドに反映する
+        self.progress_bus = ProgressBus(view if hasattr(view, 'after') else None)
+        self.progress_bus.subscribe('progress', self._on_progress_update)
+        self.progress_bus.subscribe('model_state', self._apply_model_state)
+        
         # モデルのコールバックを設定
-        self.model.add_progress_callback(self._on_progress_update)
-        self.model.add_completion_callback(self._on_completion)
+        self.model.add_progress_callback(self._publish_progress)
+        self.model.add_completion_callback(self._post_completion)
+        self.model.add_model_state_callback(self._on_model_state_changed)
+        
+        self.progress_bus.start()
         
         logging.info("SeparationController初期化完了")
     
@@ -32,6 +42,9 @@ class SeparationController:
             # モデルに設定
             self.model.set_input_file(file_path, file_info)
             
+            # 開始ボタンを押すまでにモデルを読み込んでおく
+            self.model.prewarm_models()
+            
             # UI状態を更新
             self._update_ui_state()
             
@@ -126,9 +139,24 @@ class SeparationController:
             logging.error(f"音声分離停止エラー: {e}")
     
     def pause_separation(self):
-        """音声分離を一時停止（将来実装）"""
-        # TODO: 一時停止機能の実装
-        messagebox.showinfo("情報", "一時停止機能は今後実装予定です。")
+        """音声分離を一時停止・再開（一時停止中の場合は再開する）"""
+        try:
+            if not self.model.is_processing():
+                return
+            
+            if self.model.is_paused():
+                self.model.resume_separation()
+                logging.info("音声分離再開")
+            else:
+                self.model.pause_separation()
+                logging.info("音声分離一時停止")
+            
+            # 一時停止ボタンの表示を更新
+            if hasattr(self.view, 'control_buttons'):
+                self.view.control_buttons.set_paused(self.model.is_paused())
+            
+        except Exception as e:
+            logging.error(f"音声分離一時停止エラー: {e}")
     
     def new_project(self):
         """新しいプロジェクト"""
@@ -258,10 +286,65 @@ class SeparationController:
         """分離結果を取得"""
         return self.model.get_separation_results()
     
+    def prewarm_models(self):
+        """アプリの待機中にモデルの事前読み込みを開始"""
+        if self.model.prewarm_models():
+            logging.info("モデルの事前読み込みを開始")
+    
+    def get_job_manager(self) -> JobManager:
+        """バッチ処理のジョブ管理を取得"""
+        return self.model.get_job_manager()
+    
+    def submit_batch_files(self, file_paths: List[Path], priority: int = 0) -> List[SeparationJob]:
+        """
+        バッチジョブを投入（投入できなかったファイルはまとめてエラー表示する）
+        
+        Args:
+            file_paths: 入力音声ファイルのリスト
+            priority: 優先度（大きいほど先に実行）
+        
+        Returns:
+            List[SeparationJob]: 投入できたジョブ
+        """
+        submitted = []
+        errors = []
+        for file_path in file_paths:
+            try:
+                submitted.append(self.model.submit_batch_job(Path(file_path), priority))
+            except Exception as e:
+                logging.error(f"バッチジョブ投入エラー: {file_path}: {e}")
+                errors.append(f"{Path(file_path).name}: {e}")
+        
+        if errors:
+            messagebox.showerror("エラー", "一部のファイルを追加できませんでした:\n" + "\n".join(errors[:10]))
+        return submitted
+    
+    def shutdown(self):
+        """終了時の後処理（通知の反映を止め、処理中のジョブを停止する）"""
+        self.progress_bus.stop()
+        self.model.shutdown()
+    
+    def _publish_progress(self, progress: ProcessingProgress):
+        """進捗通知（ワーカースレッドから呼ばれ、最新の値だけを残す）"""
+        self.progress_bus.publish('progress', progress)
+    
+    def _post_completion(self, success: bool, error_message: Optional[str]):
+        """完了通知（ワーカースレッドから呼ばれ、最後の進捗の反映後にGUIスレッドで処理する）"""
+        self.progress_bus.post(self._on_completion, success, error_message)
+    
+    def _on_model_state_changed(self, state: str):
+        """モデル読み込み状態の変更（ワーカースレッドから呼ばれる）"""
+        self.progress_bus.publish('model_state', state)
+    
+    def _apply_model_state(self, state: str):
+        """モデル読み込み状態を表示に反映"""
+        if hasattr(self.view, 'update_model_state'):
+            self.view.update_model_state(state)
+    
     def _on_progress_update(self, progress: ProcessingProgress):
-        """進捗更新時のコールバック"""
+        """進捗を表示に反映（GUIスレッドで表示間隔ごとに最新の値だけが届く）"""
         try:
-            # プログレスバーを更新
+            # プログレスバーを更新（ボタン状態は開始・完了時に更新する）
             if hasattr(self.view, 'progress_display'):
                 self.view.progress_display.update_progress(
                     progress.percentage,
@@ -270,14 +353,11 @@ class SeparationController:
                     progress.processing_speed
                 )
             
-            # UI状態を更新
-            self._update_ui_state()
-            
         except Exception as e:
             logging.error(f"進捗更新エラー: {e}")
     
     def _on_completion(self, success: bool, error_message: Optional[str]):
-        """処理完了時のコールバック"""
+        """処理完了時の処理（GUIスレッドで実行）"""
         try:
             if success:
                 # 成功時の処理
@@ -299,6 +379,10 @@ class SeparationController:
                 if hasattr(self.view, 'preview_panel'):
                     self.view.preview_panel.update_results(results)
             
+            elif error_message == AudioSeparationModel.CANCELLED_MESSAGE:
+                # 停止時はエラー表示しない
+                logging.info("音声分離処理を停止しました")
+            
             else:
                 # エラー時の処理
                 logging.error(f"音声分離処理エラー: {error_message}")
@@ -0,0 +1,9 @@
+"""
+GUI モデルパッケージ
+
+GUIアプリケーションの状態と処理を管理するモデルを提供します。
+"""
+
+from .gui_model import AudioSeparationModel, ProcessingProgress
+
+__all__ = ['AudioSeparationModel', 'ProcessingProgress']
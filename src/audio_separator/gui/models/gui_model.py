@@ -0,0 +1,437 @@
+"""
+GUI用音声分離モデル
+
+入力ファイル・パラメータ・出力設定の状態を保持し、
+SeparationPipelineをバックグラウンドスレッドで実行して進捗と結果を通知します。
+"""
+
+import sys
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List
+
+from ...processors.separation_pipeline import SeparationPipeline
+from ...service.jobs import JobManager, SeparationJob
+from ...utils.audio_utils import AudioUtils
+from ...utils.cancellation import CancellationToken, OperationCancelledError
+from ...utils.progress import ProgressUpdate
+from ...utils.time_estimator import ProcessingTimeEstimator, TimeEstimate
+
+
+class ProcessingProgress:
+    """処理進捗を表すクラス"""
+    
+    def __init__(
+        self,
+        percentage: float = 0.0,
+        message: str = "",
+        time_remaining: Optional[float] = None,
+        processing_speed: Optional[float] = None,
+        stage: Optional[str] = None
+    ):
+        """
+        進捗情報を初期化
+        
+        Args:
+            percentage: 進捗率（0-100）
+            message: 進捗メッセージ
+            time_remaining: 推定残り時間（秒）
+            processing_speed: 処理速度（1秒あたりに処理した音声の秒数）
+            stage: ステージ名（例: 'demucs.inference'）
+        """
+        self.percentage = percentage
+        self.message = message
+        self.time_remaining = time_remaining
+        self.processing_speed = processing_speed
+        self.stage = stage
+
+
+class AudioSeparationModel:
+    """GUIの状態と音声分離処理を管理するモデル"""
+    
+    # パラメータパネルの既定値に合わせた分離パラメータ
+    DEFAULT_SEPARATION_PARAMS = {
+        'clustering_threshold': 0.3,
+        'segmentation_onset': 0.2,
+        'segmentation_offset': 0.2,
+        'force_num_speakers': None,
+        'min_segment_duration': 0.5,
+        'overlap_removal': True,
+        'audio_preprocessing': True
+    }
+    
+    # 出力パネルの既定値に合わせた出力設定
+    DEFAULT_OUTPUT_SETTINGS = {
+        'output_dir': None,
+        'create_combined': True,
+        'create_individual': True,
+        'create_bgm': True,
+        'force_bgm_separation': False,
+        'naming_style': 'detailed',
+        'segment_container': False,
+        'audio_format': 'wav',
+        'bit_depth': 16
+    }
+    
+    # 停止された場合の完了メッセージ
+    CANCELLED_MESSAGE = "処理が停止されました"
+    
+    # モデルの読み込み状態
+    MODEL_COLD = 'cold'
+    MODEL_WARMING = 'warming'
+    MODEL_WARM = 'warm'
+    
+    def __init__(self, pipeline: Optional[SeparationPipeline] = None, device: str = 'auto'):
+        """
+        モデルを初期化
+        
+        Args:
+            pipeline: 使用するパイプライン（Noneの場合は初回実行時に作成）
+            device: パイプラインを作成する場合の処理デバイス
+        """
+        self.pipeline = pipeline
+        self.device = device
+        
+        self.input_file: Optional[Path] = None
+        self.file_info: Optional[Dict[str, Any]] = None
+        self.separation_params: Dict[str, Any] = self.DEFAULT_SEPARATION_PARAMS.copy()
+        self.output_settings: Dict[str, Any] = self.DEFAULT_OUTPUT_SETTINGS.copy()
+        
+        self._progress_callbacks: List[Callable[[ProcessingProgress], None]] = []
+        self._completion_callbacks: List[Callable[[bool, Optional[str]], None]] = []
+        self._model_state_callbacks: List[Callable[[str], None]] = []
+        
+        self._thread: Optional[threading.Thread] = None
+        self._processing = False
+        self._token: Optional[CancellationToken] = None
+        self._results: Optional[Dict[str, Any]] = None
+        self._estimated_time: Optional[TimeEstimate] = None
+        
+        # モデルの事前読み込み
+        self._pipeline_lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._model_state = self.MODEL_WARM if pipeline is not None and pipeline.is_warm else self.MODEL_COLD
+        
+        # バッチ処理（単体処理とパイプラインを共有する）
+        self._job_manager: Optional[JobManager] = None
+    
+    # --- コールバック登録 ---
+    
+    def add_progress_callback(self, callback: Callable[[ProcessingProgress], None]):
+        """進捗コールバックを登録"""
+        self._progress_callbacks.append(callback)
+    
+    def add_completion_callback(self, callback: Callable[[bool, Optional[str]], None]):
+        """完了コールバックを登録 (成功したか, エラーメッセージ)"""
+        self._completion_callbacks.append(callback)
+    
+    def add_model_state_callback(self, callback: Callable[[str], None]):
+        """モデル読み込み状態の変更コールバックを登録（'cold', 'warming', 'warm'）"""
+        self._model_state_callbacks.append(callback)
+    
+    # --- 状態設定 ---
+    
+    def set_input_file(self, file_path: Path, file_info: Optional[Dict[str, Any]] = None):
+        """入力ファイルを設定"""
+        self.input_file = Path(file_path)
+        self.file_info = file_info
+        self._results = None
+        self._estimated_time = None
+    
+    def set_separation_parameters(self, parameters: Dict[str, Any]):
+        """分離パラメータを設定"""
+        self.separation_params.update(parameters)
+    
+    def set_output_settings(self, settings: Dict[str, Any]):
+        """出力設定を設定"""
+        self.output_settings.update(settings)
+    
+    def reset(self):
+        """状態をリセット（処理中の場合は停止を要求）"""
+        if self._processing:
+            self.stop_separation()
+        
+        self.input_file = None
+        self.file_info = None
+        self._results = None
+        self._estimated_time = None
+    
+    # --- 処理制御 ---
+    
+    def _get_pipeline(self) -> SeparationPipeline:
+        """パイプラインを取得（初回のみ作成）"""
+        with self._pipeline_lock:
+            if self.pipeline is None:
+                self.pipeline = SeparationPipeline(device=self.device)
+            return self.pipeline
+    
+    # --- モデルの事前読み込み ---
+    
+    def prewarm_models(self) -> bool:
+        """
+        Demucsとpyannoteのモデルをバックグラウンドで読み込み始める
+        
+        ファイル選択時やアプリの待機中に呼び、開始ボタンを押した時点で
+        モデルの読み込みが終わっているようにする
+        
+        Returns:
+            bool: 読み込みを開始した場合True（読み込み済み・読み込み中・処理中の場合False）
+        """
+        if self._processing or self._model_state != self.MODEL_COLD:
+            return False
+        
+        self._set_model_state(self.MODEL_WARMING)
+        self._warmup_thread = threading.Thread(target=self._run_warmup, name="gui-model-warmup", daemon=True)
+        self._warmup_thread.start()
+        return True
+    
+    def get_model_state(self) -> str:
+        """モデルの読み込み状態を取得（'cold', 'warming', 'warm'）"""
+        return self._model_state
+    
+    def _run_warmup(self):
+        """バックグラウンドスレッドでモデルを読み込む"""
+        try:
+            self._get_pipeline().warmup()
+        except Exception as e:
+            logging.warning(f"モデルの事前読み込みに失敗: {e}")
+        finally:
+            self._refresh_model_state()
+    
+    def _wait_for_warmup(self, token: CancellationToken):
+        """事前読み込み中の場合は完了を待つ（待機中もキャンセルを受け付ける）"""
+        thread = self._warmup_thread
+        if thread is None or not thread.is_alive():
+            return
+        
+        self._notify_progress(ProcessingProgress(0.0, "モデル読み込み完了を待機中..."))
+        while thread.is_alive():
+            token.check()
+            thread.join(CancellationToken.POLL_INTERVAL)
+    
+    def _refresh_model_state(self):
+        """パイプラインの状態から読み込み状態を更新"""
+        warmup = self._warmup_thread
+        if warmup is not None and warmup.is_alive() and warmup is not threading.current_thread():
+            return
+        
+        warm = self.pipeline is not None and self.pipeline.is_warm
+        self._set_model_state(self.MODEL_WARM if warm else self.MODEL_COLD)
+    
+    def _set_model_state(self, state: str):
+        """読み込み状態を変更して通知"""
+        if state == self._model_state:
+            return
+        self._model_state = state
+        for callback in self._model_state_callbacks:
+            try:
+                callback(state)
+            except Exception as e:
+                logging.error(f"モデル状態コールバックエラー: {e}")
+    
+    # --- バッチ処理 ---
+    
+    def get_job_manager(self) -> JobManager:
+        """バッチ処理のジョブ管理を取得（初回のみ作成し、単体処理と読み込み済みのモデルを共有する）"""
+        if self._job_manager is None:
+            self._job_manager = JobManager(pipeline=self._get_pipeline())
+            self._job_manager.start(warmup=False)
+        return self._job_manager
+    
+    def submit_batch_job(self, input_file: Path, priority: int = 0) -> SeparationJob:
+        """
+        現在のパラメータ・出力設定でバッチジョブを投入（出力先/入力ファイル名 に出力）
+        
+        Args:
+            input_file: 入力音声ファイル
+            priority: 優先度（大きいほど先に実行）
+        
+        Returns:
+            SeparationJob: 投入されたジョブ
+        
+        Raises:
+            ValueError: 出力ディレクトリが設定されていない場合
+            FileNotFoundError: 入力ファイルが見つからない場合
+        """
+        output_root = self.output_settings.get('output_dir')
+        if not output_root:
+            raise ValueError("出力ディレクトリが設定されていません")
+        
+        input_file = Path(input_file)
+        return self.get_job_manager().submit(
+            str(input_file), str(Path(output_root) / input_file.stem), self._build_pipeline_params(), priority
+        )
+    
+    def shutdown(self):
+        """終了時の後処理（処理中の単体処理・バッチジョブを停止）"""
+        if self._processing:
+            self.stop_separation()
+        if self._job_manager is not None:
+            for job in self._job_manager.list_jobs():
+                self._job_manager.cancel(job.job_id)
+            self._job_manager.shutdown(wait=False)
+    
+    def _build_pipeline_params(self) -> Dict[str, Any]:
+        """GUIのパラメータ・出力設定をパイプラインのパラメータに変換"""
+        force_num_speakers = self.separation_params.get('force_num_speakers')
+        return {
+            'enable_bgm_separation': self.output_settings.get('create_bgm', True),
+            'force_bgm_separation': self.output_settings.get('force_bgm_separation', False),
+            'create_individual': self.output_settings.get('create_individual', True),
+            'create_combined': self.output_settings.get('create_combined', True),
+            'naming_style': self.output_settings.get('naming_style', 'detailed'),
+            'segment_container': self.output_settings.get('segment_container', False),
+            'output_format': self.output_settings.get('audio_format', 'wav'),
+            'bit_depth': self.output_settings.get('bit_depth', 16),
+            'min_segment_length': self.separation_params.get('min_segment_duration', 0.5),
+            'clustering_threshold': self.separation_params.get('clustering_threshold', 0.3),
+            'segmentation_onset': self.separation_params.get('segmentation_onset', 0.2),
+            'segmentation_offset': self.separation_params.get('segmentation_offset', 0.2),
+            'force_num_speakers': force_num_speakers if force_num_speakers else None
+        }
+    
+    def get_output_directory(self) -> Optional[Path]:
+        """今回の処理の出力ディレクトリ（出力先/入力ファイル名）を取得"""
+        if self.input_file is None or not self.output_settings.get('output_dir'):
+            return None
+        return Path(self.output_settings['output_dir']) / self.input_file.stem
+    
+    def start_separation(self) -> bool:
+        """
+        音声分離をバックグラウンドで開始
+        
+        Returns:
+            bool: 開始できたかどうか
+        """
+        if self._processing or self.input_file is None:
+            return False
+        
+        output_dir = self.get_output_directory()
+        if output_dir is None:
+            return False
+        
+        self._processing = True
+        self._token = CancellationToken()
+        self._results = None
+        
+        self._thread = threading.Thread(
+            target=self._run_separation,
+            args=(self.input_file, output_dir, self._build_pipeline_params(), self._token),
+            name="gui-separation",
+            daemon=True
+        )
+        self._thread.start()
+        return True
+    
+    def stop_separation(self):
+        """処理の停止を要求（推論中は次の推論区間の境界で中断し、一括処理が動いていなければモデルのメモリを解放する）"""
+        if self._processing and self._token is not None:
+            self._token.cancel()
+            self._notify_progress(ProcessingProgress(0.0, "停止中..."))
+    
+    def pause_separation(self):
+        """処理の一時停止を要求（次のチャンク・バッチ・ファイル書き出しの前で停止する）"""
+        if self._processing and self._token is not None:
+            self._token.pause()
+    
+    def resume_separation(self):
+        """一時停止した処理を再開"""
+        if self._token is not None:
+            self._token.resume()
+    
+    def is_processing(self) -> bool:
+        """処理中かどうか"""
+        return self._processing
+    
+    def is_paused(self) -> bool:
+        """一時停止中かどうか"""
+        return self._processing and self._token is not None and self._token.is_paused
+    
+    def get_separation_results(self) -> Optional[Dict[str, Any]]:
+        """分離結果を取得"""
+        return self._results
+    
+    def get_estimated_time(self) -> Optional[TimeEstimate]:
+        """今回の処理の推定処理時間を取得"""
+        return self._estimated_time
+    
+    # --- 処理本体 ---
+    
+    def _run_separation(self, input_file: Path, output_dir: Path, params: Dict[str, Any], token: CancellationToken):
+        """バックグラウンドスレッドで分離処理を実行"""
+        try:
+            self._wait_for_warmup(token)
+            self._notify_progress(ProcessingProgress(0.0, "モデル準備中..."))
+            pipeline = self._get_pipeline()
+            
+            # 実測記録に基づいて処理時間を推定
+            duration = (self.file_info or {}).get('duration') or AudioUtils.get_audio_info(input_file)['duration']
+            self._estimated_time = pipeline.estimate_time(duration, params)['total']
+            logging.info(f"推定処理時間: {self._estimated_time}")
+            
+            def on_update(update: ProgressUpdate):
+                time_remaining = ProcessingTimeEstimator.estimate_remaining(
+                    self._estimated_time.estimate, update.elapsed, update.progress
+                )
+                self._notify_progress(ProcessingProgress(
+                    update.progress * 100.0, update.message, time_remaining, update.throughput, update.stage
+                ))
+            
+            self._notify_progress(ProcessingProgress(0.0, "処理開始", self._estimated_time.estimate))
+            results = pipeline.run(input_file, output_dir, params, update_callback=on_update, cancellation_token=token)
+            
+            results['gpu_info'] = self._get_gpu_info()
+            results['estimated_time'] = self._estimated_time.to_dict()
+            self._results = results
+            self._finish(True, None)
+        
+        except OperationCancelledError:
+            logging.info("音声分離処理を停止しました")
+            self._release_models_if_idle()
+            self._finish(False, self.CANCELLED_MESSAGE)
+        except Exception as e:
+            logging.error(f"音声分離処理エラー: {e}")
+            self._finish(False, str(e))
+    
+    def _finish(self, success: bool, error_message: Optional[str]):
+        """処理終了を通知"""
+        self._processing = False
+        self._token = None
+        
+        # 停止時はモデルを解放している場合があるため状態を更新する
+        self._refresh_model_state()
+        for callback in self._completion_callbacks:
+            try:
+                callback(success, error_message)
+            except Exception as e:
+                logging.error(f"完了コールバックエラー: {e}")
+    
+    def _release_models_if_idle(self):
+        """一括処理のジョブが無ければモデルを解放する（共有中のモデルは読み込んだまま残す）"""
+        pipeline = self.pipeline
+        if pipeline is None:
+            return
+        manager = self._job_manager
+        if manager is not None and any(not job.is_finished for job in manager.list_jobs()):
+            logging.info("一括処理のジョブが残っているため、モデルを読み込んだまま残します")
+            return
+        pipeline.release_models()
+    
+    def _notify_progress(self, progress: ProcessingProgress):
+        """進捗を通知"""
+        for callback in self._progress_callbacks:
+            try:
+                callback(progress)
+            except Exception as e:
+                logging.error(f"進捗コールバックエラー: {e}")
+    
+    def _get_gpu_info(self) -> str:
+        """処理に使ったデバイス情報を取得（PyTorch読み込み済みの場合のみGPU名を取得）"""
+        torch = sys.modules.get('torch')
+        try:
+            if torch is not None and torch.cuda.is_available() and self.device != 'cpu':
+                return f"GPU: {torch.cuda.get_device_name(0)}"
+        except Exception:
+            pass
+        return "CPU"
@@ -0,0 +1,277 @@
+"""
+音声のストリーミング再生
+
+音声ファイルの指定範囲を、ファイル全体をデコードせずにブロック単位で
+読み込みながら再生する。再生先（シンク）は差し替え可能で、pygameが
+使えない環境やテストでは再生しないNullSinkを使う
+"""
+
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+
+class AudioSink:
+    """再生先の基底クラス"""
+    
+    # 実際に音を出すかどうか
+    is_audible = False
+    
+    def open(self, sample_rate: int, channels: int) -> None:
+        """
+        再生を開始
+        
+        Args:
+            sample_rate: サンプリングレート
+            channels: チャンネル数
+        """
+    
+    def write(self, block: np.ndarray) -> None:
+        """
+        音声ブロックを再生キューに追加（キューが埋まっている間は待機する）
+        
+        Args:
+            block: 音声データ [frames, channels]（float32、-1.0〜1.0）
+        """
+        raise NotImplementedError
+    
+    def drain(self) -> None:
+        """キューに残った音声の再生完了を待つ"""
+    
+    def stop(self) -> None:
+        """再生を即座に停止"""
+    
+    def close(self) -> None:
+        """再生を終了"""
+
+
+class NullSink(AudioSink):
+    """音を出さない再生先（書き込まれたブロックを記録する）"""
+    
+    def __init__(self, realtime: bool = False):
+        """
+        シンクを初期化
+        
+        Args:
+            realtime: Trueの場合は実際の再生と同じ速さで書き込みを待機する
+        """
+        self.realtime = realtime
+        self.sample_rate = 0
+        self.channels = 0
+        self.frames_written = 0
+        self.first_write_time: Optional[float] = None
+    
+    def open(self, sample_rate: int, channels: int) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_written = 0
+        self.first_write_time = None
+    
+    def write(self, block: np.ndarray) -> None:
+        if self.first_write_time is None:
+            self.first_write_time = time.monotonic()
+        self.frames_written += len(block)
+        if self.realtime and self.sample_rate:
+            time.sleep(len(block) / self.sample_rate)
+
+
+class PygameSink(AudioSink):
+    """pygame.mixer のチャンネルキューで再生する再生先"""
+    
+    is_audible = True
+    
+    # キュー待ちの確認間隔（秒）
+    POLL_INTERVAL = 0.005
+    
+    def __init__(self):
+        """シンクを初期化（pygameが無い場合は ImportError）"""
+        import pygame
+        self._pygame = pygame
+        self._channel = None
+    
+    def open(self, sample_rate: int, channels: int) -> None:
+        mixer = self._pygame.mixer
+        # ミキサーの形式が異なる場合は初期化し直す
+        if mixer.get_init() != (sample_rate, -16, channels):
+            if mixer.get_init():
+                mixer.quit()
+            mixer.init(frequency=sample_rate, size=-16, channels=channels, buffer=1024)
+        self._channel = mixer.find_channel(True)
+    
+    def write(self, block: np.ndarray) -> None:
+        pcm = (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
+        sound = self._pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm).tobytes())
+        
+        # チャンネルのキューは1つだけなので、空くまで待ってから追加する
+        if not self._channel.get_busy():
+            self._channel.play(sound)
+            return
+        while self._channel.get_queue() is not None:
+            time.sleep(self.POLL_INTERVAL)
+        self._channel.queue(sound)
+    
+    def drain(self) -> None:
+        while self._channel is not None and self._channel.get_busy():
+            time.sleep(self.POLL_INTERVAL)
+    
+    def stop(self) -> None:
+        if self._channel is not None:
+            self._channel.stop()
+    
+    def close(self) -> None:
+        self._channel = None
+
+
+def create_default_sink() -> AudioSink:
+    """
+    利用できる再生先を作成
+    
+    Returns:
+        AudioSink: pygameが使える場合は PygameSink、使えない場合は NullSink
+    """
+    try:
+        return PygameSink()
+    except ImportError:
+        logging.warning("pygameが見つからないため、アプリ内再生は無効です")
+        return NullSink()
+
+
+class AudioPlayer:
+    """音声ファイルの範囲をストリーミング再生するプレイヤー"""
+    
+    # 最初のブロックは短くして再生開始までの時間を抑える（秒）
+    FIRST_BLOCK_SECONDS = 0.05
+    BLOCK_SECONDS = 0.25
+    
+    def __init__(self, sink: Optional[AudioSink] = None):
+        """
+        プレイヤーを初期化
+        
+        Args:
+            sink: 再生先（Noneの場合は利用できるものを自動選択）
+        """
+        self.sink = sink or create_default_sink()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._position = 0.0
+    
+    @property
+    def is_available(self) -> bool:
+        """実際に音を出せるか"""
+        return self.sink.is_audible
+    
+    @property
+    def is_playing(self) -> bool:
+        """再生中か"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def position(self) -> float:
+        """再生キューに送った位置（元ファイル上の秒）"""
+        return self._position
+    
+    def play(
+        self,
+        audio_path: Union[str, Path],
+        start_time: float = 0.0,
+        end_time: Optional[float] = None,
+        on_finished: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        音声ファイルの範囲を再生（再生中の音声は停止する）
+        
+        Args:
+            audio_path: 音声ファイルパス
+            start_time: 再生開始時刻（秒）
+            end_time: 再生終了時刻（秒、Noneの場合はファイルの最後まで）
+            on_finished: 再生終了・停止時に再生スレッドから呼ばれるコールバック
+        
+        Raises:
+            FileNotFoundError: ファイルが見つからない場合
+        """
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"音声ファイルが見つかりません: {audio_path}")
+        
+        with self._lock:
+            self.stop()
+            self._stop_event = threading.Event()
+            self._position = start_time
+            self._thread = threading.Thread(
+                target=self._playback_loop,
+                args=(audio_path, start_time, end_time, self._stop_event, on_finished),
+                name="audio-player",
+                daemon=True
+            )
+            self._thread.start()
+    
+    def play_segment(self, audio_path: Union[str, Path], segment, on_finished: Optional[Callable[[], None]] = None) -> None:
+        """
+        話者セグメントの範囲を再生
+        
+        Args:
+            audio_path: セグメントの時刻に対応する音声ファイル（入力・ボーカルなど）
+            segment: SpeakerSegment、または 'start', 'end' を持つ辞書
+            on_finished: 再生終了・停止時のコールバック
+        """
+        if isinstance(segment, dict):
+            start, end = segment['start'], segment['end']
+        else:
+            start, end = segment.start_time, segment.end_time
+        self.play(audio_path, start, end, on_finished)
+    
+    def stop(self) -> None:
+        """再生を停止"""
+        self._stop_event.set()
+        self.sink.stop()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._thread = None
+    
+    def _playback_loop(
+        self,
+        audio_path: Path,
+        start_time: float,
+        end_time: Optional[float],
+        stop_event: threading.Event,
+        on_finished: Optional[Callable[[], None]]
+    ) -> None:
+        """ファイルをシークしてブロックごとに読み込み、再生先に送る"""
+        import soundfile as sf
+        
+        try:
+            with sf.SoundFile(str(audio_path)) as f:
+                sample_rate = f.samplerate
+                start_frame = min(int(start_time * sample_rate), f.frames)
+                end_frame = f.frames if end_time is None else min(int(end_time * sample_rate), f.frames)
+                f.seek(start_frame)
+                
+                self.sink.open(sample_rate, f.channels)
+                frame = start_frame
+                block_frames = max(int(self.FIRST_BLOCK_SECONDS * sample_rate), 1)
+                while frame < end_frame and not stop_event.is_set():
+                    block = f.read(min(block_frames, end_frame - frame), dtype='float32', always_2d=True)
+                    if len(block) == 0:
+                        break
+                    self.sink.write(block)
+                    frame += len(block)
+                    self._position = frame / sample_rate
+                    block_frames = max(int(self.BLOCK_SECONDS * sample_rate), 1)
+                
+                if not stop_event.is_set():
+                    self.sink.drain()
+        except Exception as e:
+            logging.error(f"再生エラー: {audio_path}: {e}")
+        finally:
+            self.sink.close()
+            if on_finished:
+                try:
+                    on_finished()
+                except Exception as e:
+                    logging.debug(f"再生終了コールバックエラー: {e}")
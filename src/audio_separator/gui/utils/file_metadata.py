@@ -0,0 +1,113 @@
+"""
+出力ファイル情報のバックグラウンド取得
+
+ファイルサイズや音声長の取得（stat・ヘッダ読み込み）をワーカースレッドで行い、
+GUIスレッドは結果をまとめて取り出して表示に反映する
+"""
+
+import queue
+import logging
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from ...utils.audio_utils import AudioUtils
+
+
+class FileMetadataLoader:
+    """ファイル情報をバックグラウンドで取得するクラス"""
+    
+    def __init__(self):
+        """ローダーを初期化（ワーカースレッドは最初の要求時に開始）"""
+        self._requests: "queue.Queue[Tuple[int, Any, Path]]" = queue.Queue()
+        self._results: "queue.Queue[Tuple[int, Any, int, Optional[float]]]" = queue.Queue()
+        self._generation = 0
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def read_metadata(path: Path) -> Tuple[int, Optional[float]]:
+        """
+        ファイルサイズと音声長を取得
+        
+        Args:
+            path: ファイルパス
+        
+        Returns:
+            Tuple[int, Optional[float]]: (サイズ, 音声長)。音声長を取得できない場合はNone
+        """
+        try:
+            info = AudioUtils.get_audio_info(path)
+            return info['file_size'], info['duration']
+        except (FileNotFoundError, ValueError):
+            pass
+        
+        try:
+            return path.stat().st_size, None
+        except OSError:
+            return 0, None
+    
+    def request(self, key: Any, path: Path) -> None:
+        """
+        ファイル情報の取得を要求
+        
+        Args:
+            key: 結果と対応付けるキー（ツリーのアイテムIDなど）
+            path: ファイルパス
+        """
+        with self._lock:
+            self._requests.put((self._generation, key, Path(path)))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._worker_loop, name="file-metadata", daemon=True)
+                self._worker.start()
+    
+    def clear(self) -> None:
+        """未処理の要求と未取得の結果を破棄（表示内容を切り替えた場合に呼ぶ）"""
+        with self._lock:
+            self._generation += 1
+    
+    def has_pending(self) -> bool:
+        """未処理の要求または未取得の結果があるか"""
+        return not self._requests.empty() or not self._results.empty() or self._requests.unfinished_tasks > 0
+    
+    def drain(self, max_items: int) -> List[Tuple[Any, int, Optional[float]]]:
+        """
+        取得済みの結果をまとめて取り出す（GUIスレッドから呼ぶ）
+        
+        Args:
+            max_items: 取り出す最大件数
+        
+        Returns:
+            List[Tuple[Any, int, Optional[float]]]: (キー, サイズ, 音声長) のリスト
+        """
+        items = []
+        while len(items) < max_items:
+            try:
+                generation, key, size, duration = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                items.append((key, size, duration))
+        return items
+    
+    def _worker_loop(self) -> None:
+        """要求を順に処理（一定時間要求が無ければ終了）"""
+        while True:
+            try:
+                generation, key, path = self._requests.get(timeout=5.0)
+            except queue.Empty:
+                with self._lock:
+                    if self._requests.empty():
+                        self._worker = None
+                        return
+                continue
+            
+            try:
+                if generation != self._generation:
+                    continue
+                size, duration = self.read_metadata(path)
+                self._results.put((generation, key, size, duration))
+            except Exception as e:
+                logging.debug(f"ファイル情報取得エラー: {path}: {e}")
+            finally:
+                self._requests.task_done()
@@ -0,0 +1,130 @@
+"""
+ワーカースレッドからGUIへの進捗通知
+
+処理スレッドは進捗を publish() で登録するだけで、ウィジェットには触れない。
+GUIスレッドの after() タイマーが一定間隔で最新の値だけを取り出して反映するため、
+処理側が高頻度に通知しても画面更新の回数は表示間隔で頭打ちになる
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class ProgressBus:
+    """進捗・状態をまとめてGUIスレッドに届ける通知チャネル"""
+    
+    # 画面更新の間隔（ミリ秒）
+    DEFAULT_INTERVAL_MS = 100
+    
+    def __init__(self, widget=None, interval_ms: int = DEFAULT_INTERVAL_MS):
+        """
+        通知チャネルを初期化
+        
+        Args:
+            widget: after() を持つTkウィジェット（Noneの場合は flush() を直接呼ぶ）
+            interval_ms: 画面更新の間隔（ミリ秒）
+        """
+        self.widget = widget
+        self.interval_ms = interval_ms
+        
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Any] = {}
+        self._events: Deque[Tuple[Callable[..., None], tuple]] = deque()
+        self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._timer: Optional[str] = None
+        
+        # 通知回数と反映回数（間引きの確認用）
+        self.published_count = 0
+        self.delivered_count = 0
+    
+    def subscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        """
+        トピックの購読を登録（GUIスレッドで呼ぶ）
+        
+        Args:
+            topic: トピック名（'progress' など）
+            callback: 最新の値を受け取るコールバック（GUIスレッドで呼ばれる）
+        """
+        self._subscribers.setdefault(topic, []).append(callback)
+    
+    def publish(self, topic: str, value: Any) -> None:
+        """
+        トピックの最新の値を登録（任意のスレッドから呼べる）
+        
+        次の画面更新までに同じトピックへ複数回登録された場合は最後の値だけが届く
+        
+        Args:
+            topic: トピック名
+            value: 値
+        """
+        with self._lock:
+            self._latest[topic] = value
+            self.published_count += 1
+    
+    def post(self, callback: Callable[..., None], *args) -> None:
+        """
+        間引かずに必ず実行する処理を登録（完了通知など、任意のスレッドから呼べる）
+        
+        登録順に、その時点の最新の値を反映した後で実行される
+        
+        Args:
+            callback: GUIスレッドで実行する関数
+            *args: 関数の引数
+        """
+        with self._lock:
+            self._events.append((callback, args))
+    
+    def start(self) -> None:
+        """画面更新タイマーを開始（GUIスレッドで呼ぶ）"""
+        if self.widget is not None and self._timer is None:
+            self._timer = self.widget.after(self.interval_ms, self._on_timer)
+    
+    def stop(self) -> None:
+        """画面更新タイマーを停止"""
+        if self.widget is not None and self._timer is not None:
+            try:
+                self.widget.after_cancel(self._timer)
+            except Exception:
+                pass
+        self._timer = None
+    
+    def _on_timer(self) -> None:
+        """タイマーから呼ばれ、反映して次回を予約"""
+        self._timer = None
+        try:
+            self.flush()
+        finally:
+            self.start()
+    
+    def flush(self) -> int:
+        """
+        登録された値と処理をGUIスレッドで反映
+        
+        Returns:
+            int: 反映した値と処理の数
+        """
+        with self._lock:
+            latest, self._latest = self._latest, {}
+            events = list(self._events)
+            self._events.clear()
+        
+        delivered = 0
+        for topic, value in latest.items():
+            for callback in self._subscribers.get(topic, []):
+                try:
+                    callback(value)
+                except Exception as e:
+                    logging.error(f"進捗反映エラー ({topic}): {e}")
+            delivered += 1
+        
+        for callback, args in events:
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.error(f"通知処理エラー: {e}")
+            delivered += 1
+        
+        self.delivered_count += delivered
+        return delivered
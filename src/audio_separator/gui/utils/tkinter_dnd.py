@@ -88,18 +88,19 @@ class TkinterDragDrop:
             # ファイル数を取得
             file_count = ctypes.windll.shell32.DragQueryFileW(hdrop, 0xFFFFFFFF, None, 0)
             
-            if file_count > 0:
+            # 複数ファイルがドロップされた場合は1ファイルずつコールバックを呼ぶ
+            for index in range(file_count):
                 # バッファサイズを取得
-                buffer_size = ctypes.windll.shell32.DragQueryFileW(hdrop, 0, None, 0) + 1
+                buffer_size = ctypes.windll.shell32.DragQueryFileW(hdrop, index, None, 0) + 1
                 
                 # ファイルパスを取得
                 buffer = ctypes.create_unicode_buffer(buffer_size)
-                ctypes.windll.shell32.DragQueryFileW(hdrop, 0, buffer, buffer_size)
+                ctypes.windll.shell32.DragQueryFileW(hdrop, index, buffer, buffer_size)
                 
                 file_path = buffer.value
                 if file_path:
                     # メインスレッドでコールバックを実行
-                    self.widget.after(0, lambda: self.callback(file_path))
+                    self.widget.after(0, self.callback, file_path)
             
             # ドロップハンドルを解放
             ctypes.windll.shell32.DragFinish(hdrop)
@@ -17,17 +17,30 @@ from ..components.output_panel import OutputPanel
 from ..components.preview_panel import PreviewPanel
 from ..controllers.separation_controller import SeparationController
 from ..models.gui_model import AudioSeparationModel
+from ...utils.lazy_import import prewarm_modules
 
 
 class MainWindow(tk.Tk):
     """メインウィンドウ"""
     
+    # ウィンドウ表示後、重いモジュール・モデルの事前読み込みを始めるまでの時間（ミリ秒）
+    PREWARM_DELAY_MS = 200
+    MODEL_PREWARM_DELAY_MS = 2000
+    
+    # モデル読み込み状態の表示
+    MODEL_STATE_LABELS = {
+        AudioSeparationModel.MODEL_COLD: "⚪ モデル未読み込み",
+        AudioSeparationModel.MODEL_WARMING: "🟡 モデル読み込み中...",
+        AudioSeparationModel.MODEL_WARM: "🟢 モデル準備完了",
+    }
+    
     def __init__(self):
         super().__init__()
         
         # モデルとコントローラー初期化
         self.model = AudioSeparationModel()
         self.controller = SeparationController(self.model, self)
+        self._batch_window = None
         
         # ウィンドウ設定
         self._setup_window()
@@ -47,6 +60,12 @@ class MainWindow(tk.Tk):
         # 設定読み込み
         self._load_settings()
         
+        # ウィンドウを描画してから torch・librosa などをバックグラウンドで読み込む
+        self.after(self.PREWARM_DELAY_MS, prewarm_modules)
+        
+        # ファイルが選択されないまま待機している場合もモデルを読み込んでおく
+        self.after(self.MODEL_PREWARM_DELAY_MS, self.controller.prewarm_models)
+        
         logging.info("MainWindow初期化完了")
     
     def _setup_window(self):
@@ -170,6 +189,8 @@ class MainWindow(tk.Tk):
         file_menu.add_command(label="プロジェクトを開く", command=self.controller.open_project, accelerator="Ctrl+O")
         file_menu.add_command(label="プロジェクトを保存", command=self.controller.save_project, accelerator="Ctrl+S")
         file_menu.add_separator()
+        file_menu.add_command(label="バッチ処理", command=self._open_batch_window, accelerator="Ctrl+B")
+        file_menu.add_separator()
         file_menu.add_command(label="終了", command=self._on_closing, accelerator="Ctrl+Q")
         
         # 処理メニュー
@@ -188,10 +209,20 @@ class MainWindow(tk.Tk):
         self.bind('<Control-n>', lambda e: self.controller.new_project())
         self.bind('<Control-o>', lambda e: self.controller.open_project())
         self.bind('<Control-s>', lambda e: self.controller.save_project())
+        self.bind('<Control-b>', lambda e: self._open_batch_window())
         self.bind('<Control-q>', lambda e: self._on_closing())
         self.bind('<F5>', lambda e: self.controller.start_separation())
         self.bind('<Escape>', lambda e: self.controller.stop_separation())
     
+    def _open_batch_window(self):
+        """バッチ処理ウィンドウを開く（開いている場合は前面に表示）"""
+        from ..windows.batch_window import BatchWindow
+        
+        if self._batch_window is not None and self._batch_window.winfo_exists():
+            self._batch_window.lift()
+            return
+        self._batch_window = BatchWindow(self, self.controller)
+    
     def _create_status_bar(self):
         """ステータスバーを作成"""
         self.status_bar = ttk.Frame(self)
@@ -206,14 +237,21 @@ class MainWindow(tk.Tk):
         )
         self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2, 5))
         
-        # 右側：GPU情報
-        gpu_info = self._get_gpu_info()
+        # 右側：GPU情報（PyTorchの読み込みは起動後に行うため、モデル読み込み後に表示）
         self.gpu_label = ttk.Label(
             self.status_bar,
-            text=gpu_info,
+            text="GPU: 確認中...",
             relief=tk.SUNKEN
         )
         self.gpu_label.pack(side=tk.RIGHT, padx=(5, 2))
+        
+        # 右側：モデル読み込み状態
+        self.model_state_label = ttk.Label(
+            self.status_bar,
+            text=self.MODEL_STATE_LABELS[self.model.get_model_state()],
+            relief=tk.SUNKEN
+        )
+        self.model_state_label.pack(side=tk.RIGHT, padx=(5, 0))
     
     def _get_gpu_info(self) -> str:
         """GPU情報を取得"""
@@ -423,6 +461,7 @@ Author: toyosatomimi development team
             self._auto_save_settings()
             
             # ウィンドウを閉じる
+            self.controller.shutdown()
             self.destroy()
             
             logging.info("アプリケーション終了")
@@ -431,6 +470,15 @@ Author: toyosatomimi development team
             logging.error(f"終了処理エラー: {e}")
             self.destroy()
     
+    def update_model_state(self, state: str):
+        """モデル読み込み状態の表示を更新"""
+        try:
+            self.model_state_label.config(text=self.MODEL_STATE_LABELS.get(state, state))
+            if state == AudioSeparationModel.MODEL_WARM:
+                self.gpu_label.config(text=self._get_gpu_info())
+        except Exception as e:
+            logging.error(f"モデル状態更新エラー: {e}")
+    
     def update_status(self, message: str):
         """ステータスバーを更新"""
         try:
@@ -0,0 +1,9 @@
+"""
+GUI ウィンドウパッケージ
+
+メインウィンドウから開くサブウィンドウを提供します。
+"""
+
+from .batch_window import BatchWindow
+
+__all__ = ['BatchWindow']
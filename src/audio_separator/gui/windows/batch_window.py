@@ -0,0 +1,267 @@
+"""
+バッチ処理ウィンドウ
+
+複数の音声ファイル・フォルダをジョブとして投入し、読み込み済みのモデルを共有する
+ワーカーで並列に処理する。ジョブごとの進捗と全体の処理速度を表示し、
+待機中のジョブの優先度変更と、個別のキャンセルができる
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from pathlib import Path
+from typing import Dict, Iterable, List
+import logging
+
+from ...service.jobs import SeparationJob
+from ...utils.audio_utils import AudioUtils
+from ...utils.file_utils import FileUtils
+from ..utils.tkinter_dnd import setup_tkinter_drag_drop
+
+
+class BatchWindow(tk.Toplevel):
+    """バッチ処理ウィンドウ"""
+    
+    # 表示を更新する間隔（ミリ秒）
+    REFRESH_MS = 500
+    
+    # 同時実行数の上限（モデルはワーカー間で共有し、ステージごとに排他する）
+    MAX_WORKERS_LIMIT = 4
+    
+    # ジョブ状態の表示
+    STATUS_LABELS = {
+        SeparationJob.QUEUED: "⏳ 待機中",
+        SeparationJob.RUNNING: "▶️ 処理中",
+        SeparationJob.COMPLETED: "✅ 完了",
+        SeparationJob.FAILED: "❌ 失敗",
+        SeparationJob.CANCELLED: "⏹️ キャンセル",
+    }
+    
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.job_manager = controller.get_job_manager()
+        
+        # 一覧に表示しているジョブ（ジョブID → ツリーの行）
+        self._rows: Dict[str, str] = {}
+        self._refresh_timer = None
+        
+        self.title("バッチ処理")
+        self.geometry("900x500")
+        self.minsize(600, 300)
+        
+        self._create_widgets()
+        self._setup_drag_drop()
+        
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._refresh()
+    
+    def _create_widgets(self):
+        """ウィジェットを作成"""
+        main_frame = ttk.Frame(self, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # ツールバー
+        toolbar = ttk.Frame(main_frame)
+        toolbar.pack(fill=tk.X, pady=(0, 8))
+        
+        ttk.Button(toolbar, text="🎵 ファイル追加", command=self._add_files).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="📁 フォルダ追加", command=self._add_folder).pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(toolbar, text="同時実行数:").pack(side=tk.LEFT, padx=(20, 5))
+        self.workers_var = tk.IntVar(value=self.job_manager.max_workers)
+        ttk.Spinbox(
+            toolbar,
+            from_=1,
+            to=self.MAX_WORKERS_LIMIT,
+            textvariable=self.workers_var,
+            width=4,
+            state='readonly',
+            command=self._on_workers_changed
+        ).pack(side=tk.LEFT)
+        
+        ttk.Button(toolbar, text="❌ キャンセル", command=self._cancel_selected).pack(side=tk.RIGHT)
+        ttk.Button(toolbar, text="⬇️ 後回し", command=lambda: self._change_priority(-1)).pack(side=tk.RIGHT, padx=(0, 5))
+        ttk.Button(toolbar, text="⬆️ 優先", command=lambda: self._change_priority(1)).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        # ジョブ一覧
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ('status', 'progress', 'priority', 'speed', 'remaining')
+        self.jobs_tree = ttk.Treeview(tree_frame, columns=columns, show='tree headings', selectmode='extended')
+        self.jobs_tree.heading('#0', text='ファイル名')
+        self.jobs_tree.heading('status', text='状態')
+        self.jobs_tree.heading('progress', text='進捗')
+        self.jobs_tree.heading('priority', text='優先度')
+        self.jobs_tree.heading('speed', text='処理速度')
+        self.jobs_tree.heading('remaining', text='残り時間')
+        
+        self.jobs_tree.column('#0', width=300)
+        self.jobs_tree.column('status', width=110)
+        self.jobs_tree.column('progress', width=70, anchor=tk.E)
+        self.jobs_tree.column('priority', width=60, anchor=tk.E)
+        self.jobs_tree.column('speed', width=80, anchor=tk.E)
+        self.jobs_tree.column('remaining', width=80, anchor=tk.E)
+        
+        tree_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.jobs_tree.yview)
+        self.jobs_tree.configure(yscrollcommand=tree_scrollbar.set)
+        self.jobs_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # 全体の状況
+        self.summary_label = ttk.Label(main_frame, text="ファイルまたはフォルダを追加してください", anchor=tk.W)
+        self.summary_label.pack(fill=tk.X, pady=(8, 0))
+    
+    def _setup_drag_drop(self):
+        """ドラッグ&ドロップを設定（tkinterdnd2、Windowsネイティブの順に試す）"""
+        try:
+            from tkinterdnd2 import DND_FILES
+            
+            if hasattr(self.jobs_tree, 'drop_target_register'):
+                self.jobs_tree.drop_target_register(DND_FILES)
+                self.jobs_tree.dnd_bind('<<Drop>>', self._on_drop)
+                return
+        except ImportError:
+            pass
+        except Exception as e:
+            logging.debug(f"tkinterdnd2のドロップ設定に失敗: {e}")
+        
+        if not setup_tkinter_drag_drop(self, lambda path: self._submit_paths([Path(path)])):
+            logging.info("バッチ処理ウィンドウのドラッグ&ドロップは利用できません")
+    
+    def _on_drop(self, event):
+        """tkinterdnd2のドロップ時の処理"""
+        self._submit_paths([Path(path) for path in self.tk.splitlist(event.data)])
+    
+    def _add_files(self):
+        """ファイル選択ダイアログから追加"""
+        patterns = ' '.join(f'*{ext}' for ext in sorted(AudioUtils.SUPPORTED_FORMATS))
+        file_paths = filedialog.askopenfilenames(
+            parent=self,
+            title="音声ファイルを選択",
+            filetypes=[('Audio files', patterns), ('All files', '*.*')]
+        )
+        if file_paths:
+            self._submit_paths([Path(path) for path in file_paths])
+    
+    def _add_folder(self):
+        """フォルダ選択ダイアログから追加（サブフォルダも含む）"""
+        folder = filedialog.askdirectory(parent=self, title="フォルダを選択")
+        if folder:
+            self._submit_paths([Path(folder)])
+    
+    @staticmethod
+    def collect_audio_files(paths: Iterable[Path]) -> List[Path]:
+        """
+        ファイル・フォルダから対応形式の音声ファイルを集める
+        
+        Args:
+            paths: ファイルまたはフォルダのパス（フォルダはサブフォルダも含めて検索）
+        
+        Returns:
+            List[Path]: 音声ファイル（フォルダ内はパス順、重複は除く）
+        """
+        files: List[Path] = []
+        seen = set()
+        for path in paths:
+            path = Path(path)
+            candidates = sorted(FileUtils.list_files(path, recursive=True)) if path.is_dir() else [path]
+            for candidate in candidates:
+                if candidate.suffix.lower() in AudioUtils.SUPPORTED_FORMATS and candidate not in seen:
+                    seen.add(candidate)
+                    files.append(candidate)
+        return files
+    
+    def _submit_paths(self, paths: List[Path]):
+        """ファイル・フォルダをジョブとして投入"""
+        files = self.collect_audio_files(paths)
+        if not files:
+            messagebox.showwarning("バッチ処理", "対応形式の音声ファイルが見つかりませんでした。", parent=self)
+            return
+        
+        jobs = self.controller.submit_batch_files(files)
+        logging.info(f"バッチジョブ投入: {len(jobs)}/{len(files)}件")
+        self._refresh(reschedule=False)
+    
+    def _selected_job_ids(self) -> List[str]:
+        """選択中の行のジョブIDを取得"""
+        selected = set(self.jobs_tree.selection())
+        return [job_id for job_id, item in self._rows.items() if item in selected]
+    
+    def _change_priority(self, delta: int):
+        """選択中の待機ジョブの優先度を変更"""
+        for job_id in self._selected_job_ids():
+            job = self.job_manager.get_job(job_id)
+            if job is not None:
+                self.job_manager.set_priority(job_id, job.priority + delta)
+        self._refresh(reschedule=False)
+    
+    def _cancel_selected(self):
+        """選択中のジョブをキャンセル"""
+        for job_id in self._selected_job_ids():
+            self.job_manager.cancel(job_id)
+        self._refresh(reschedule=False)
+    
+    def _on_workers_changed(self):
+        """同時実行数の変更"""
+        self.job_manager.set_max_workers(self.workers_var.get())
+    
+    def _refresh(self, reschedule: bool = True):
+        """ジョブの状態を一覧と全体の状況に反映（ウィンドウを開き直した場合も全ジョブを表示）"""
+        jobs = self.job_manager.list_jobs()
+        for job in jobs:
+            if job.job_id not in self._rows:
+                self._rows[job.job_id] = self.jobs_tree.insert('', 'end', text=Path(job.input_path).name)
+            
+            speed = f"{job.throughput:.1f}x" if job.throughput else ""
+            remaining = self._format_time(job.time_remaining) if job.status == SeparationJob.RUNNING and job.time_remaining is not None else ""
+            self.jobs_tree.item(
+                self._rows[job.job_id],
+                values=(
+                    self.STATUS_LABELS.get(job.status, job.status),
+                    f"{job.progress * 100:.0f}%",
+                    job.priority,
+                    speed,
+                    remaining
+                )
+            )
+        
+        if jobs:
+            self.summary_label.config(text=self._format_summary(jobs))
+        
+        if reschedule:
+            self._refresh_timer = self.after(self.REFRESH_MS, self._refresh)
+    
+    def _format_summary(self, jobs: List[SeparationJob]) -> str:
+        """全体の状況の表示テキストを作成"""
+        counts = {status: 0 for status in self.STATUS_LABELS}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        
+        stats = self.job_manager.get_throughput()
+        finished = counts[SeparationJob.COMPLETED] + counts[SeparationJob.FAILED] + counts[SeparationJob.CANCELLED]
+        text = (
+            f"完了 {finished}/{len(jobs)}件 (処理中 {counts[SeparationJob.RUNNING]}, "
+            f"待機 {counts[SeparationJob.QUEUED]}, 失敗 {counts[SeparationJob.FAILED]})"
+            f"  |  処理済み音声 {stats['audio_processed'] / 3600:.2f}時間 / 実時間 {stats['wall_time'] / 3600:.2f}時間"
+        )
+        if stats['wall_time'] > 0:
+            text += f"  |  全体の処理速度 {stats['throughput']:.1f}x"
+        backlog = self.job_manager.get_estimated_backlog()
+        if backlog > 0:
+            text += f"  |  残り約 {self._format_time(backlog / self.job_manager.max_workers)}"
+        return text
+    
+    def _format_time(self, seconds: float) -> str:
+        """時間を表示形式に変換"""
+        seconds = max(0, int(seconds))
+        if seconds < 3600:
+            return f"{seconds // 60}:{seconds % 60:02d}"
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    
+    def _on_close(self):
+        """ウィンドウを閉じる（ジョブはバックグラウンドで処理を続ける）"""
+        if self._refresh_timer is not None:
+            self.after_cancel(self._refresh_timer)
+            self._refresh_timer = None
+        self.destroy()
@@ -1,15 +1,322 @@
 """メインエントリーポイント"""
 
 import sys
+import argparse
+import logging
 from pathlib import Path
 
+# 話者音声の出力形式（AudioUtils.OUTPUT_FORMATS のキー、起動を速くするため重いモジュールは読み込まない）
+OUTPUT_FORMATS = ['wav', 'flac', 'ogg', 'opus', 'mp3']
 
-def main():
+
+def _build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数パーサーを作成"""
+    parser = argparse.ArgumentParser(
+        prog='toyosatomimi',
+        description='音声分離アプリケーション - Toyosatomimi'
+    )
+    parser.add_argument('--verbose', action='store_true', help='詳細ログを表示')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    # serve: モデル常駐サービス
+    serve_parser = subparsers.add_parser('serve', help='モデルを常駐させたローカル分離サービスを起動')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='待ち受けアドレス')
+    serve_parser.add_argument('--port', type=int, default=8765, help='待ち受けポート')
+    serve_parser.add_argument('--device', default='auto', choices=['auto', 'cpu', 'cuda'], help='処理デバイス')
+    serve_parser.add_argument('--no-warmup', action='store_true', help='起動時のモデル事前読み込みを行わない')
+    serve_parser.add_argument('--allow-dir', action='append', metavar='DIR',
+                              help='入力・出力・話者登録簿に使えるディレクトリ（複数指定可、既定はホームディレクトリ）')
+    
+    # submit: サービスへのジョブ投入（薄いクライアント）
+    submit_parser = subparsers.add_parser('submit', help='起動中の分離サービスにジョブを投入して完了を待つ')
+    submit_parser.add_argument('input_file', help='入力音声ファイル')
+    submit_parser.add_argument('-o', '--output-dir', help='出力ディレクトリ')
+    submit_parser.add_argument('--server', default='http://127.0.0.1:8765', help='分離サービスのURL')
+    submit_parser.add_argument('--no-bgm', action='store_true', help='BGM分離を行わない')
+    submit_parser.add_argument('--force-bgm', action='store_true', help='BGMの自動判定をせず常にBGM分離する')
+    submit_parser.add_argument('--speakers', type=int, help='強制話者数')
+    submit_parser.add_argument('--registry', help='話者登録簿のディレクトリ（登録済みの話者名で出力する）')
+    submit_parser.add_argument('--format', default='wav', choices=OUTPUT_FORMATS, help='話者音声の出力形式')
+    submit_parser.add_argument('--bit-depth', type=int, default=16, choices=[16, 24, 32], help='WAV・FLACのビット深度')
+    submit_parser.add_argument('--profile', action='store_true', help='ステージ別の処理時間・メモリ集計を表示')
+    
+    # extract: 保存したセグメントファイルから話者音声を再書き出し（話者分離を行わない）
+    extract_parser = subparsers.add_parser('extract', help='セグメントファイル (.rttm/.json/.npz) から話者音声を書き出す')
+    extract_parser.add_argument('segment_file', help='セグメントファイル')
+    extract_parser.add_argument('-o', '--output-dir', required=True, help='出力ディレクトリ')
+    extract_parser.add_argument('--audio', help='元音声ファイル（省略時はセグメントファイルに記録されたパス）')
+    extract_parser.add_argument('--naming', default='detailed', choices=['simple', 'detailed'], help='ファイル命名スタイル')
+    extract_parser.add_argument('--fade', type=float, default=0.01, help='フェードイン・フェードアウト時間（秒）')
+    extract_parser.add_argument('--no-individual', action='store_true', help='個別セグメントファイルを作成しない')
+    extract_parser.add_argument('--no-combined', action='store_true', help='結合ファイルを作成しない')
+    extract_parser.add_argument('--container', action='store_true', help='個別セグメントを話者ごとに1ファイル（と索引）にまとめる')
+    extract_parser.add_argument('--format', default='wav', choices=OUTPUT_FORMATS, help='出力形式')
+    extract_parser.add_argument('--bit-depth', type=int, default=16, choices=[16, 24, 32], help='WAV・FLACのビット深度')
+    
+    # follow: 録音中のファイルの追記分だけを話者分離（定期的に実行する）
+    follow_parser = subparsers.add_parser('follow', help='録音中の音声ファイルに追記された部分を逐次話者分離')
+    follow_parser.add_argument('audio_file', help='録音中の音声ファイル')
+    follow_parser.add_argument('--state', required=True, help='逐次話者分離の状態ファイル (.npz、無ければ新規作成)')
+    follow_parser.add_argument('-o', '--output', required=True, help='これまでのセグメントの保存先 (.rttm/.json/.npz)')
+    follow_parser.add_argument('--max-speakers', type=int, help='最大話者数')
+    follow_parser.add_argument('--final', action='store_true', help='録音終了後の最後の実行（末尾の発話を確定する）')
+    
+    # stream: 標準入力・FIFO・TCPから受信しながらBGM分離・話者分離（ファイルに書き出してから処理しない）
+    stream_parser = subparsers.add_parser('stream', help='音声ストリーム（標準入力・FIFO・TCP）を受信しながら分離')
+    stream_parser.add_argument('input', nargs='?', default='-', help="入力（'-'は標準入力、FIFO・ファイルのパス、tcp://ホスト:ポート）")
+    stream_parser.add_argument('-o', '--output-dir', required=True, help='出力ディレクトリ')
+    stream_parser.add_argument('--input-format', default='auto', choices=['auto', 'raw', 'wav'], help='入力の形式（autoは先頭が RIFF ならWAV）')
+    stream_parser.add_argument('--sample-format', default='s16le', choices=['u8', 's16le', 's24le', 's32le', 'f32le', 'f64le'], help='生のPCMのサンプル形式')
+    stream_parser.add_argument('--rate', type=int, help='生のPCMのサンプリングレート')
+    stream_parser.add_argument('--channels', type=int, default=1, help='生のPCMのチャンネル数')
+    stream_parser.add_argument('--no-bgm-separation', action='store_true', help='BGM分離を行わず話者分離のみ')
+    stream_parser.add_argument('--max-speakers', type=int, help='最大話者数')
+    stream_parser.add_argument('--min-segment', type=float, default=0.5, help='最小セグメント長（秒）')
+    stream_parser.add_argument('--naming', default='detailed', choices=['simple', 'detailed'], help='ファイル命名スタイル')
+    stream_parser.add_argument('--format', default='wav', choices=OUTPUT_FORMATS, help='話者音声の出力形式')
+    stream_parser.add_argument('--bit-depth', type=int, default=16, choices=[16, 24, 32], help='WAV・FLACのビット深度')
+    
+    # speakers: ファイルをまたいだ話者登録簿の管理と照合
+    speakers_parser = subparsers.add_parser('speakers', help='話者登録簿の登録・照合・一覧')
+    speakers_parser.add_argument('--registry', required=True, help='話者登録簿のディレクトリ')
+    speakers_subparsers = speakers_parser.add_subparsers(dest='speakers_command', required=True)
+    enroll_parser = speakers_subparsers.add_parser('enroll', help='話者を登録（登録済みの場合は参照特徴量を更新）')
+    enroll_parser.add_argument('name', help='話者名')
+    enroll_parser.add_argument('audio_file', help='話者の音声ファイル')
+    enroll_parser.add_argument('--segments', help='セグメントファイル（指定した場合は --speaker の区間だけを使う）')
+    enroll_parser.add_argument('--speaker', help='セグメントファイル中の話者ID')
+    identify_parser = speakers_subparsers.add_parser('identify', help='セグメントファイルの話者を登録済みの話者名に置き換える')
+    identify_parser.add_argument('segment_file', help='セグメントファイル (.rttm/.json/.npz)')
+    identify_parser.add_argument('--audio', help='元音声ファイル（省略時はセグメントファイルに記録されたパス）')
+    identify_parser.add_argument('-o', '--output', help='置き換えたセグメントの保存先（省略時は上書き）')
+    speakers_subparsers.add_parser('list', help='登録済みの話者の一覧')
+    
+    return parser
+
+
+def _run_serve(args: argparse.Namespace) -> int:
+    """分離サービスを起動"""
+    from .service.server import run_server
+    
+    run_server(host=args.host, port=args.port, warmup=not args.no_warmup, allowed_roots=args.allow_dir, device=args.device)
+    return 0
+
+
+def _run_submit(args: argparse.Namespace) -> int:
+    """分離サービスにジョブを投入"""
+    from .service.client import SeparationClient, ServiceError
+    
+    client = SeparationClient(args.server)
+    if not client.is_available():
+        print(f"❌ 分離サービスに接続できません: {args.server}")
+        print("   先に 'toyosatomimi serve' でサービスを起動してください")
+        return 1
+    
+    params = {
+        'enable_bgm_separation': not args.no_bgm,
+        'force_bgm_separation': args.force_bgm,
+        'output_format': args.format,
+        'bit_depth': args.bit_depth
+    }
+    if args.speakers:
+        params['force_num_speakers'] = args.speakers
+    if args.registry:
+        params['speaker_registry'] = str(Path(args.registry).resolve())
+    
+    def on_progress(progress: float, message: str):
+        print(f"\r[{progress * 100:5.1f}%] {message:<40}", end='', flush=True)
+    
+    try:
+        job = client.submit(args.input_file, args.output_dir, params)
+        result = client.wait(job['job_id'], on_progress)
+    except ServiceError as e:
+        print(f"\n❌ 処理に失敗しました: {e}")
+        return 1
+    
+    print()
+    print(f"✅ 完了: {result['speakers_detected']}人の話者, {result['segments_detected']}セグメント")
+    print(f"   出力ディレクトリ: {result['output_directory']}")
+    print(f"   処理時間: {result['processing_time']:.1f}秒")
+    
+    if args.profile and result.get('profile'):
+        from .utils.profiler import StageProfiler
+        print()
+        print(StageProfiler.format_summary_table(result['profile']))
+        print(f"   トレース: {result['trace_file']}")
+    return 0
+
+
+def _run_extract(args: argparse.Namespace) -> int:
+    """セグメントファイルから話者音声を書き出す"""
+    from .processors.speaker_processor import SpeakerProcessor
+    
+    try:
+        result = SpeakerProcessor().extract_from_segment_file(
+            args.segment_file,
+            args.output_dir,
+            audio_path=args.audio,
+            create_individual=not args.no_individual,
+            create_combined=not args.no_combined,
+            naming_style=args.naming,
+            fade_duration=args.fade,
+            segment_container=args.container,
+            output_format=args.format,
+            bit_depth=args.bit_depth
+        )
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"❌ 書き出しに失敗しました: {e}")
+        return 1
+    
+    print(f"✅ 完了: {result['speakers_detected']}人の話者, {result['segments_detected']}セグメント")
+    print(f"   出力ディレクトリ: {args.output_dir}")
+    return 0
+
+
+def _run_follow(args: argparse.Namespace) -> int:
+    """録音中のファイルに追記された部分を話者分離し、状態とセグメントを保存"""
+    from .processors.incremental_diarizer import IncrementalDiarizer
+    from .processors.segment_io import SegmentIO
+    from .utils.audio_utils import AudioUtils
+    
+    state_path = Path(args.state)
+    try:
+        if state_path.exists():
+            diarizer = IncrementalDiarizer.load_state(state_path)
+        else:
+            sample_rate = AudioUtils.get_audio_info(args.audio_file)['sample_rate']
+            diarizer = IncrementalDiarizer(sample_rate, max_speakers=args.max_speakers)
+        
+        update = diarizer.update_from_file(args.audio_file)
+        segments = diarizer.finalize() if args.final else diarizer.segments
+        diarizer.save_state(state_path)
+        SegmentIO.save(segments, args.output, audio_file=args.audio_file)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"❌ 逐次話者分離に失敗しました: {e}")
+        return 1
+    
+    print(f"✅ {diarizer.processed_duration:.1f}秒まで処理: 確定 {len(update.segments)}セグメント追加, "
+          f"{segments.num_speakers}人の話者, 合計{len(segments)}セグメント")
+    for old, new in update.relabeled.items():
+        print(f"   {old} → {new} に統合")
+    return 0
+
+
+def _run_stream(args: argparse.Namespace) -> int:
+    """音声ストリームを受信しながら分離し、話者音声を書き出す"""
+    from .processors.demucs_processor import DemucsProcessor
+    from .processors.incremental_diarizer import IncrementalDiarizer
+    from .processors.segment_io import SegmentIO
+    from .processors.speaker_processor import SpeakerProcessor
+    from .utils.audio_stream import AudioStream
+    
+    output_dir = Path(args.output_dir)
+    speaker_processor = SpeakerProcessor()
+    try:
+        with AudioStream.open(
+            args.input, sample_rate=args.rate, channels=args.channels,
+            sample_format=args.sample_format, container=args.input_format
+        ) as stream:
+            if args.no_bgm_separation:
+                audio_path = output_dir / f"{stream.name}.wav"
+                segments = speaker_processor.diarize_stream(
+                    stream, min_duration=args.min_segment, max_speakers=args.max_speakers, audio_output_path=audio_path
+                )
+            else:
+                # 分離したボーカルを順に逐次話者分離に渡す
+                diarizer = IncrementalDiarizer(stream.sample_rate, max_speakers=args.max_speakers, min_duration=args.min_segment)
+                audio_path, _ = DemucsProcessor().separate_stream(
+                    stream, str(output_dir / 'bgm_separated'), vocals_callback=diarizer.update
+                )
+                segments = diarizer.finalize()
+            duration = stream.duration
+        
+        segments_file = SegmentIO.save(segments, output_dir / SpeakerProcessor.SEGMENTS_FILENAME, audio_file=audio_path)
+        result = speaker_processor.extract_from_segment_file(
+            segments_file, output_dir / 'speakers',
+            naming_style=args.naming, output_format=args.format, bit_depth=args.bit_depth
+        )
+    except (FileNotFoundError, ValueError, RuntimeError, OSError) as e:
+        print(f"❌ ストリームの分離に失敗しました: {e}")
+        return 1
+    
+    print(f"✅ 完了: {duration:.1f}秒, {result['speakers_detected']}人の話者, {result['segments_detected']}セグメント")
+    print(f"   出力ディレクトリ: {output_dir}")
+    return 0
+
+
+def _run_speakers(args: argparse.Namespace) -> int:
+    """話者登録簿の登録・照合・一覧"""
+    from .processors.segment_io import SegmentIO
+    from .processors.speaker_processor import SpeakerProcessor
+    from .processors.speaker_registry import SpeakerRegistry
+    
+    try:
+        registry = SpeakerRegistry(args.registry)
+        if args.speakers_command == 'list':
+            for name, count in zip(registry.names, registry.counts):
+                print(f"{name}\t{count}回登録")
+            print(f"合計 {len(registry)}人")
+            return 0
+        
+        if args.speakers_command == 'enroll':
+            segments = None
+            if args.segments:
+                segments, _ = SegmentIO.load(args.segments)
+                if args.speaker:
+                    segments = segments.select_speakers([args.speaker])
+            embeddings = registry.embed_file(args.audio_file, segments)
+            if len(embeddings) != 1:
+                print(f"❌ 話者を1人に絞れません（{len(embeddings)}人）。--speaker で話者IDを指定してください")
+                return 1
+            registry.enroll(args.name, next(iter(embeddings.values())))
+            registry.save()
+            print(f"✅ 登録しました: {args.name}（登録数 {len(registry)}人）")
+            return 0
+        
+        segments, recorded_audio = SegmentIO.load(args.segment_file)
+        audio_path = args.audio or recorded_audio
+        if not audio_path:
+            print("❌ 元音声ファイルが記録されていません。--audio で指定してください")
+            return 1
+        segments, mapping = SpeakerProcessor().identify_speakers(audio_path, segments, registry)
+        SegmentIO.save(segments, args.output or args.segment_file, audio_file=audio_path)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"❌ 話者登録簿の処理に失敗しました: {e}")
+        return 1
+    
+    for local_id, name in sorted(mapping.items()):
+        print(f"   {local_id} → {name}")
+    print(f"✅ {len(mapping)}人の話者を置き換えました")
+    return 0
+
+
+def main(argv=None):
     """アプリケーションのメインエントリーポイント"""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    
+    if args.command == 'serve':
+        return _run_serve(args)
+    if args.command == 'submit':
+        return _run_submit(args)
+    if args.command == 'extract':
+        return _run_extract(args)
+    if args.command == 'follow':
+        return _run_follow(args)
+    if args.command == 'stream':
+        return _run_stream(args)
+    if args.command == 'speakers':
+        return _run_speakers(args)
+    
     print("音声分離アプリケーション - Toyosatomimi")
-    print("現在開発中です...")
+    parser.print_help()
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
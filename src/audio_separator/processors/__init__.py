@@ -2,5 +2,19 @@
 
 from .demucs_processor import DemucsProcessor
 from .speaker_processor import SpeakerProcessor, SpeakerSegment
+from .speaker_embedding import SpeakerEmbedder
+from .speaker_registry import SpeakerRegistry
+from .separation_pipeline import SeparationPipeline
+from .segment_index import IntervalIndex, SpeakerTimelineIndex
+from .incremental_diarizer import IncrementalDiarizer, IncrementalUpdate
+from .segment_container import SegmentContainer, SegmentContainerWriter
+from .segment_io import SegmentIO
+from .segment_table import SegmentTable, SegmentView
+from .speaker_stats import SpeakerStatistics
 
-__all__ = ["DemucsProcessor", "SpeakerProcessor", "SpeakerSegment"]
\ No newline at end of file
+__all__ = [
+    "DemucsProcessor", "SpeakerProcessor", "SpeakerSegment", "SeparationPipeline",
+    "IntervalIndex", "SpeakerTimelineIndex", "SegmentTable", "SegmentView",
+    "SpeakerStatistics", "SegmentIO", "SegmentContainer", "SegmentContainerWriter",
+    "IncrementalDiarizer", "IncrementalUpdate", "SpeakerEmbedder", "SpeakerRegistry"
+]
\ No newline at end of file
@@ -7,10 +7,52 @@ Demucsモデルを使用してBGMとボーカルを分離する処理を提供
 import os
 import logging
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any, Callable
+from typing import Tuple, Optional, Dict, Any, Callable, List
 import numpy as np
 
+from ..utils.audio_stream import AudioStream
 from ..utils.audio_utils import AudioUtils
+from ..utils.cancellation import CancellationToken, CheckedCall, OperationCancelledError, release_device_memory
+from ..utils.lazy_import import lazy_import
+from ..utils.profiler import profile_stage
+from ..utils.progress import ProgressReporter
+from ..utils.music_detector import MusicAnalysis
+from ..utils.speech_activity import SpeechActivityDetector, SpeechActivityMap
+from ..utils.time_estimator import ProcessingTimeEstimator, TimeEstimate
+
+# 読み込みに時間がかかるため、最初に使う時点で読み込む
+sf = lazy_import('soundfile')
+
+
+class _CancellablePool:
+    """
+    apply_modelの分割推論に渡すプール
+    
+    demucsの既定のプール（DummyPoolExecutor）と同じく、各セグメントは結果を取り出す時点で
+    呼び出し元のスレッドで推論する。推論の直前にトークンを確認するため、
+    キャンセルは次のセグメントの境界で反映される
+    """
+    
+    def __init__(self, token: CancellationToken):
+        self.token = token
+    
+    def submit(self, func, *args, **kwargs) -> '_DeferredResult':
+        return _DeferredResult(CheckedCall(func, self.token), args, kwargs)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        pass
+
+
+class _DeferredResult:
+    """result()を呼んだ時点で関数を実行するFuture相当のオブジェクト"""
+    
+    def __init__(self, func, args, kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+    
+    def result(self, timeout=None):
+        return self._func(*self._args, **self._kwargs)
 
 
 class DemucsProcessor:
@@ -35,6 +77,12 @@ class DemucsProcessor:
         }
     }
     
+    # 推論を分割する単位（チャンクごとに進捗を通知する）
+    CHUNK_SECONDS = 30.0
+    
+    # チャンク間で重ねてクロスフェードする長さ
+    CHUNK_OVERLAP_SECONDS = 1.0
+    
     def __init__(self, model_name: str = 'htdemucs', device: str = 'auto'):
         """
         Demucsプロセッサを初期化
@@ -48,6 +96,12 @@ class DemucsProcessor:
         self.model = None
         self._is_initialized = False
         
+        # 実測記録に基づく処理時間推定（パイプラインから設定される）
+        self.time_estimator: Optional[ProcessingTimeEstimator] = None
+        
+        # 無音区間を除いて推論するための音声区間検出（Noneの場合は全体を推論）
+        self.activity_detector: Optional[SpeechActivityDetector] = SpeechActivityDetector()
+        
         # モデル名の検証
         if model_name not in self.AVAILABLE_MODELS:
             raise ValueError(f"サポートされていないモデル: {model_name}")
@@ -80,13 +134,88 @@ class DemucsProcessor:
         except Exception as e:
             raise RuntimeError(f"BGM分離モデルの初期化に失敗: {e}")
     
+    def _load_demucs_model(self) -> None:
+        """
+        Demucsモデル本体を読み込み、デバイスに配置する（読み込み済みなら何もしない）
+        """
+        import torch
+        from demucs import pretrained
+        
+        if getattr(self, '_demucs_model', None) is not None:
+            return
+        
+        logging.info(f"Demucsモデル '{self.model_name}' を読み込み中...")
+        self._demucs_model = pretrained.get_model(self.model_name)
+        
+        # デバイス設定（設定に基づく）
+        if self.device == 'cuda':
+            # GPU強制使用
+            if torch.cuda.is_available():
+                device = 'cuda'
+                logging.info("GPU使用を強制しています")
+            else:
+                logging.warning("GPU強制指定されましたが、CUDAが利用できません。CPUで実行します")
+                device = 'cpu'
+        elif self.device == 'cpu':
+            # CPU強制使用
+            device = 'cpu'
+            logging.info("CPU使用を強制しています")
+        else:
+            # auto: GPU優先、フォールバックCPU
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            logging.info(f"自動デバイス選択: {device}")
+        
+        self._demucs_model = self._demucs_model.to(device)
+        self._demucs_model.eval()
+        
+        logging.info(f"Demucsモデル読み込み完了 (デバイス: {device})")
+    
+    def warmup(self) -> bool:
+        """
+        モデルを事前に読み込み、最初の分離処理の待ち時間をなくす
+        
+        Returns:
+            bool: 実際のDemucsモデルを読み込めた場合True（シンプル分離の場合False）
+        """
+        self._initialize_model()
+        
+        if not self._demucs_available:
+            return False
+        
+        try:
+            self._load_demucs_model()
+            return True
+        except Exception as e:
+            logging.warning(f"Demucsモデルの事前読み込みに失敗: {e}")
+            return False
+    
+    @property
+    def is_warm(self) -> bool:
+        """モデルが読み込み済みで、すぐに分離処理を開始できるか"""
+        if not self._is_initialized:
+            return False
+        if not self._demucs_available:
+            return True
+        return getattr(self, '_demucs_model', None) is not None
+    
+    def release_model(self) -> None:
+        """読み込み済みのDemucsモデルを解放（次回の分離処理で再読み込みされる）"""
+        if getattr(self, '_demucs_model', None) is None:
+            return
+        
+        self._demucs_model = None
+        release_device_memory()
+        logging.info("Demucsモデルを解放しました")
+    
     def separate(
         self,
         input_path: str,
         output_dir: str,
         vocals_name: str = 'vocals.wav',
         bgm_name: str = 'bgm.wav',
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        music_analysis: Optional[MusicAnalysis] = None
     ) -> Tuple[str, str]:
         """
         BGMとボーカルを分離する
@@ -96,7 +225,9 @@ class DemucsProcessor:
             output_dir: 出力ディレクトリ
             vocals_name: ボーカル出力ファイル名
             bgm_name: BGM出力ファイル名
-            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)
+            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)、またはProgressReporter
+            cancellation_token: キャンセル・一時停止トークン（推論のセグメントごと・ファイル書き出しごとに確認）
+            music_analysis: BGMの有無の判定結果（指定した場合、音楽の無い区間は分離せず元の音声をボーカルとする）
             
         Returns:
             Tuple[str, str]: (ボーカルファイルパス, BGMファイルパス)
@@ -104,6 +235,7 @@ class DemucsProcessor:
         Raises:
             FileNotFoundError: 入力ファイルが見つからない場合
             RuntimeError: 分離処理に失敗した場合
+            OperationCancelledError: キャンセルされた場合（モデルは読み込んだまま残す）
         """
         input_path = Path(input_path)
         output_dir = Path(output_dir)
@@ -123,42 +255,56 @@ class DemucsProcessor:
         logging.info(f"モデル: {self.model_name}")
         logging.info(f"出力ディレクトリ: {output_dir}")
         
+        reporter = ProgressReporter.ensure(progress_callback, 'demucs')
+        token = cancellation_token
+        
         try:
             # 進捗報告
-            if progress_callback:
-                progress_callback(0.1, "モデル初期化中...")
+            reporter.update(0.1, "モデル初期化中...")
             
             # モデル初期化
-            self._initialize_model()
+            with profile_stage('demucs.initialize'):
+                self._initialize_model()
             
             # 進捗報告
-            if progress_callback:
-                progress_callback(0.3, "音声ファイル読み込み中...")
+            reporter.update(0.3, "音声ファイル読み込み中...")
+            
+            if token:
+                token.check()
             
             # 音声ファイル読み込み
-            audio_data, sample_rate = AudioUtils.load_audio(input_path)
+            with profile_stage('demucs.decode'):
+                audio_data, sample_rate = AudioUtils.load_audio(input_path)
+            if reporter.audio_duration is None:
+                reporter.audio_duration = audio_data.shape[-1] / sample_rate
             
             # 進捗報告
-            if progress_callback:
-                progress_callback(0.5, "BGM分離処理中...")
-            
-            # BGM分離処理
-            if hasattr(self, '_demucs_available') and self._demucs_available:
-                vocals, bgm = self._separate_audio_demucs(audio_data, sample_rate)
-            else:
-                vocals, bgm = self._separate_audio_simple(audio_data, sample_rate)
+            reporter.update(0.5, "BGM分離処理中...")
+            
+            # BGM分離処理（0.5-0.8の範囲はチャンクごとに通知）
+            separation_progress = reporter.sub(0.5, 0.8, 'demucs.separate')
+            use_demucs = hasattr(self, '_demucs_available') and self._demucs_available
+            with profile_stage('demucs.separate', backend='demucs' if use_demucs else 'simple'):
+                if use_demucs:
+                    vocals, bgm = self._separate_active_regions(audio_data, sample_rate, music_analysis, separation_progress, token)
+                else:
+                    if token:
+                        token.check()
+                    vocals, bgm = self._separate_audio_simple(audio_data, sample_rate)
+                    separation_progress.update(1.0)
             
             # 進捗報告
-            if progress_callback:
-                progress_callback(0.8, "音声ファイル保存中...")
+            reporter.update(0.8, "音声ファイル保存中...")
             
             # 結果を保存
-            AudioUtils.save_audio(vocals, vocals_path, sample_rate)
-            AudioUtils.save_audio(bgm, bgm_path, sample_rate)
+            with profile_stage('demucs.export'):
+                for audio, path in ((vocals, vocals_path), (bgm, bgm_path)):
+                    if token:
+                        token.check()
+                    AudioUtils.save_audio(audio, path, sample_rate)
             
             # 進捗報告
-            if progress_callback:
-                progress_callback(1.0, "BGM分離完了")
+            reporter.update(1.0, "BGM分離完了")
             
             logging.info(f"BGM分離完了")
             logging.info(f"ボーカル: {vocals_path}")
@@ -166,14 +312,185 @@ class DemucsProcessor:
             
             return str(vocals_path), str(bgm_path)
             
+        except OperationCancelledError:
+            logging.info("BGM分離がキャンセルされました")
+            raise
+        except Exception as e:
+            logging.error(f"BGM分離処理でエラー: {e}")
+            raise RuntimeError(f"BGM分離に失敗: {e}")
+    
+    def separate_stream(
+        self,
+        stream: AudioStream,
+        output_dir: str,
+        vocals_name: str = 'vocals.wav',
+        bgm_name: str = 'bgm.wav',
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        vocals_callback: Optional[Callable[[np.ndarray], None]] = None
+    ) -> Tuple[str, str]:
+        """
+        音声ストリームを受信しながらBGMとボーカルを分離する
+        
+        CHUNK_SECONDS 分を受信するごとに分離して書き出すため、受信と分離が並行して進む。
+        チャンク間はファイル入力のチャンク推論と同じく CHUNK_OVERLAP_SECONDS 重ねてクロスフェードする。
+        無音・音楽の無い区間の除外は全体を見て決めるため、ストリームでは行わない
+        
+        Args:
+            stream: 入力の音声ストリーム
+            output_dir: 出力ディレクトリ
+            vocals_name: ボーカル出力ファイル名
+            bgm_name: BGM出力ファイル名
+            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)、またはProgressReporter
+                （全体の長さが分かる場合は受信した割合、分からない場合は進捗率を進めず受信済みの長さを通知）
+            cancellation_token: キャンセル・一時停止トークン（ブロックごと・推論のセグメントごとに確認）
+            vocals_callback: 確定したボーカルを順に受け取る関数（逐次話者分離などに渡す）
+            
+        Returns:
+            Tuple[str, str]: (ボーカルファイルパス, BGMファイルパス)
+            
+        Raises:
+            RuntimeError: 分離処理に失敗した場合
+            OperationCancelledError: キャンセルされた場合（モデルは読み込んだまま残す）
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        vocals_path = output_dir / vocals_name
+        bgm_path = output_dir / bgm_name
+        
+        logging.info(f"ストリームのBGM分離開始: {stream.name}")
+        reporter = ProgressReporter.ensure(progress_callback, 'demucs')
+        token = cancellation_token
+        sample_rate = stream.sample_rate
+        chunk_samples = int(self.CHUNK_SECONDS * sample_rate)
+        overlap = int(self.CHUNK_OVERLAP_SECONDS * sample_rate)
+        fade_in = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+        
+        try:
+            reporter.update(0.1, "モデル初期化中...")
+            with profile_stage('demucs.initialize'):
+                self._initialize_model()
+            use_demucs = hasattr(self, '_demucs_available') and self._demucs_available
+            subtype = AudioUtils.OUTPUT_FORMATS['wav']['subtypes'][16]
+            
+            with sf.SoundFile(str(vocals_path), 'w', sample_rate, 1, subtype, format='WAV') as vocals_file, \
+                    sf.SoundFile(str(bgm_path), 'w', sample_rate, 1, subtype, format='WAV') as bgm_file:
+                tail = None
+                separated = 0
+                
+                def emit(audio: np.ndarray, final: bool) -> None:
+                    """チャンクを分離し、次のチャンクと重なる末尾以外を書き出す"""
+                    nonlocal tail, separated
+                    with profile_stage('demucs.separate', backend='demucs' if use_demucs else 'simple'):
+                        if use_demucs:
+                            vocals, bgm = self._separate_audio_demucs(audio, sample_rate, token=token)
+                        else:
+                            vocals, bgm = self._separate_audio_simple(audio, sample_rate)
+                    vocals = np.asarray(vocals, dtype=np.float32)
+                    bgm = np.asarray(bgm, dtype=np.float32)
+                    
+                    # 前のチャンクの末尾とクロスフェード
+                    if tail is not None:
+                        vocals[:overlap] = tail[0] * (1.0 - fade_in) + vocals[:overlap] * fade_in
+                        bgm[:overlap] = tail[1] * (1.0 - fade_in) + bgm[:overlap] * fade_in
+                    keep = len(vocals) if final else len(vocals) - overlap
+                    tail = None if final else (vocals[keep:], bgm[keep:])
+                    
+                    with profile_stage('demucs.export'):
+                        vocals_file.write(vocals[:keep])
+                        bgm_file.write(bgm[:keep])
+                    if vocals_callback is not None:
+                        vocals_callback(vocals[:keep])
+                    separated += keep
+                    message = f"BGM分離中: {separated / sample_rate:.0f}秒"
+                    if stream.total_samples:
+                        fraction = min(separated / stream.total_samples, 1.0)
+                        reporter.update(0.1 + 0.89 * fraction, f"{message}/{stream.total_duration:.0f}秒")
+                    else:
+                        reporter.update(0.1, message)
+                
+                buffer = np.zeros(0, dtype=np.float32)
+                for block in stream.blocks(cancellation_token=token):
+                    buffer = np.concatenate([buffer, block])
+                    while len(buffer) >= chunk_samples:
+                        if token:
+                            token.check()
+                        emit(buffer[:chunk_samples], final=False)
+                        buffer = buffer[chunk_samples - overlap:]
+                if len(buffer):
+                    emit(buffer, final=True)
+            
+            reporter.audio_duration = stream.duration
+            reporter.update(1.0, "BGM分離完了")
+            logging.info(f"ストリームのBGM分離完了: {stream.duration:.1f}秒")
+            return str(vocals_path), str(bgm_path)
+            
+        except OperationCancelledError:
+            logging.info("BGM分離がキャンセルされました")
+            raise
         except Exception as e:
             logging.error(f"BGM分離処理でエラー: {e}")
             raise RuntimeError(f"BGM分離に失敗: {e}")
     
+    def _separate_active_regions(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        music_analysis: Optional[MusicAnalysis] = None,
+        progress: Optional[ProgressReporter] = None,
+        token: Optional[CancellationToken] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        無音区間と音楽の無い区間を除いた音声だけをDemucsで分離し、元の長さに戻す
+        
+        除いた区間のBGMは0とし、ボーカルは無音区間を0、音楽の無い区間を元の音声とする
+        
+        Args:
+            audio_data: 入力音声データ
+            sample_rate: サンプリングレート
+            music_analysis: BGMの有無の判定結果（Noneの場合は音楽の有無で区間を除かない）
+            progress: チャンクごとの進捗を通知するレポーター
+            token: キャンセルトークン
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (ボーカル, BGM)
+        """
+        total_samples = audio_data.shape[-1]
+        with profile_stage('demucs.activity'):
+            if self.activity_detector is not None:
+                regions = self.activity_detector.detect(audio_data, sample_rate)
+            else:
+                regions = SpeechActivityMap.full(total_samples, sample_rate)
+            music_regions = None
+            if music_analysis is not None:
+                music_regions = music_analysis.region_map(total_samples, sample_rate)
+                regions = regions.intersect(music_regions)
+                logging.info(f"音楽の無い区間を除いてBGM分離: {regions.active_duration:.1f}秒 / {total_samples / sample_rate:.1f}秒")
+        
+        if len(regions.regions):
+            vocals, bgm = self._separate_audio_demucs(regions.compact(audio_data), sample_rate, progress, token)
+            vocals, bgm = regions.expand(vocals), regions.expand(bgm)
+        else:
+            vocals = np.zeros(total_samples, dtype=np.float32)
+            bgm = np.zeros(total_samples, dtype=np.float32)
+            if progress is not None:
+                progress.update(1.0)
+        
+        if music_regions is not None:
+            # 音楽の無い区間は元の音声をそのままボーカルとする
+            passthrough = ~music_regions.mask()
+            mono = audio_data if audio_data.ndim == 1 else audio_data.mean(axis=0)
+            vocals = vocals.astype(mono.dtype, copy=False)
+            vocals[passthrough] = mono[passthrough]
+        
+        return vocals, bgm
+    
     def _separate_audio_demucs(
         self,
         audio_data: np.ndarray,
-        sample_rate: int
+        sample_rate: int,
+        progress: Optional[ProgressReporter] = None,
+        token: Optional[CancellationToken] = None
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Demucsを使用した音声分離
@@ -181,6 +498,8 @@ class DemucsProcessor:
         Args:
             audio_data: 入力音声データ
             sample_rate: サンプリングレート
+            progress: チャンクごとの進捗を通知するレポーター
+            token: 推論のセグメントごとに確認するキャンセルトークン
             
         Returns:
             Tuple[np.ndarray, np.ndarray]: (ボーカル, BGM)
@@ -192,32 +511,8 @@ class DemucsProcessor:
             from demucs import pretrained
             
             # モデル読み込み
-            if not hasattr(self, '_demucs_model') or self._demucs_model is None:
-                logging.info(f"Demucsモデル '{self.model_name}' を読み込み中...")
-                self._demucs_model = pretrained.get_model(self.model_name)
-                
-                # デバイス設定（設定に基づく）
-                if self.device == 'cuda':
-                    # GPU強制使用
-                    if torch.cuda.is_available():
-                        device = 'cuda'
-                        logging.info("GPU使用を強制しています")
-                    else:
-                        logging.warning("GPU強制指定されましたが、CUDAが利用できません。CPUで実行します")
-                        device = 'cpu'
-                elif self.device == 'cpu':
-                    # CPU強制使用
-                    device = 'cpu'
-                    logging.info("CPU使用を強制しています")
-                else:
-                    # auto: GPU優先、フォールバックCPU
-                    device = 'cuda' if torch.cuda.is_available() else 'cpu'
-                    logging.info(f"自動デバイス選択: {device}")
-                
-                self._demucs_model = self._demucs_model.to(device)
-                self._demucs_model.eval()
-                
-                logging.info(f"Demucsモデル読み込み完了 (デバイス: {device})")
+            with profile_stage('demucs.load_model'):
+                self._load_demucs_model()
             
             # 音声データをPyTorchテンソルに変換
             # audio_dataがモノラルの場合はステレオに変換
@@ -237,9 +532,8 @@ class DemucsProcessor:
             logging.info(f"入力テンソル形状: {audio_tensor.shape}, デバイス: {device}")
             
             # Demucsで分離実行
-            with torch.no_grad():
-                from demucs.apply import apply_model
-                separated = apply_model(self._demucs_model, audio_tensor)
+            with torch.no_grad(), profile_stage('demucs.inference', device=str(device)):
+                separated = self._apply_model_chunked(audio_tensor, sample_rate, progress, token)
             
             logging.info(f"分離結果テンソル形状: {separated.shape}")
             
@@ -260,11 +554,94 @@ class DemucsProcessor:
             logging.info("実際のDemucs分離完了")
             return vocals, bgm
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.error(f"Demucs分離でエラー: {e}")
             logging.info("シンプル分離にフォールバック")
             return self._separate_audio_simple(audio_data, sample_rate)
     
+    @staticmethod
+    def _chunk_bounds(total_samples: int, chunk_samples: int, overlap_samples: int) -> List[Tuple[int, int]]:
+        """
+        推論チャンクの範囲を計算
+        
+        Args:
+            total_samples: 全体のサンプル数
+            chunk_samples: チャンクのサンプル数
+            overlap_samples: 隣接チャンクと重ねるサンプル数
+        
+        Returns:
+            List[Tuple[int, int]]: (開始, 終了) サンプル位置のリスト
+        """
+        if total_samples <= chunk_samples:
+            return [(0, total_samples)]
+        
+        stride = chunk_samples - overlap_samples
+        bounds = []
+        start = 0
+        while True:
+            end = min(start + chunk_samples, total_samples)
+            bounds.append((start, end))
+            if end >= total_samples:
+                return bounds
+            start += stride
+    
+    def _apply_model_chunked(
+        self,
+        audio_tensor,
+        sample_rate: int,
+        progress: Optional[ProgressReporter] = None,
+        token: Optional[CancellationToken] = None
+    ):
+        """
+        音声をチャンクに分けてDemucsを適用し、重なり部分を線形クロスフェードで結合
+        
+        Args:
+            audio_tensor: 入力テンソル [1, channels, samples]
+            sample_rate: サンプリングレート
+            progress: チャンクごとの進捗を通知するレポーター
+            token: キャンセルトークン（モデルのセグメントごとに確認し、推論中のセグメントは完了させる）
+        
+        Returns:
+            分離結果テンソル [1, sources, channels, samples]
+        """
+        import torch
+        from demucs.apply import apply_model
+        
+        total = audio_tensor.shape[-1]
+        overlap = int(self.CHUNK_OVERLAP_SECONDS * sample_rate)
+        bounds = self._chunk_bounds(total, int(self.CHUNK_SECONDS * sample_rate), overlap)
+        
+        model = self._demucs_model
+        
+        separated = None
+        weight = torch.zeros(total, device=audio_tensor.device)
+        for index, (start, end) in enumerate(bounds):
+            if token:
+                token.check()
+            chunk = audio_tensor[..., start:end]
+            with torch.no_grad():
+                # チャンク内もモデルのセグメント（htdemucsは約8秒）ごとにキャンセルを確認する
+                part = apply_model(model, chunk, pool=_CancellablePool(token) if token else None)
+            
+            # 前のチャンクとの重なりはフェードイン、次のチャンクとの重なりはフェードアウト
+            window = torch.ones(end - start, device=part.device)
+            if start > 0:
+                window[:overlap] = torch.linspace(0.0, 1.0, overlap, device=part.device)
+            if end < total:
+                window[-overlap:] = torch.linspace(1.0, 0.0, overlap, device=part.device)
+            
+            if separated is None:
+                separated = torch.zeros(part.shape[:-1] + (total,), device=part.device, dtype=part.dtype)
+            separated[..., start:end] += part * window
+            weight[start:end] += window
+            
+            if progress is not None:
+                progress.update((index + 1) / len(bounds))
+        
+        return separated / weight.clamp(min=1e-8)
+    
     def _separate_audio_simple(
         self,
         audio_data: np.ndarray,
@@ -360,15 +737,12 @@ class DemucsProcessor:
         """
         return cls.AVAILABLE_MODELS.copy()
     
-    def estimate_processing_time(self, audio_duration: float) -> float:
+    def _get_default_speed_factor(self) -> float:
         """
-        処理時間を推定
+        実測記録が無い場合の処理速度係数（処理時間/音声長）を取得
         
-        Args:
-            audio_duration: 音声の長さ（秒）
-            
         Returns:
-            float: 推定処理時間（秒）
+            float: 処理速度係数
         """
         # モデルごとの処理速度係数（実測値に基づいて調整が必要）
         speed_factors = {
@@ -385,6 +759,52 @@ class DemucsProcessor:
         else:
             device_factor = 1.0  # GPU使用
         
-        estimated_time = audio_duration * base_factor * device_factor
+        return base_factor * device_factor
+    
+    def get_time_estimation_key(self) -> Dict[str, Any]:
+        """
+        処理時間記録の照合キーを取得
+        
+        Returns:
+            Dict[str, Any]: ステージ名・モデル名・デバイス・処理方式
+        """
+        return {
+            'stage': 'bgm_separation',
+            'model': self.model_name,
+            'device': self.device,
+            'settings': {'backend': 'demucs' if getattr(self, '_demucs_available', False) else 'simple'}
+        }
+    
+    def estimate_processing_time_interval(self, audio_duration: float) -> TimeEstimate:
+        """
+        処理時間を信頼区間付きで推定（実測記録が無い場合は既定の係数を使用）
+        
+        Args:
+            audio_duration: 音声の長さ（秒）
+            
+        Returns:
+            TimeEstimate: 推定結果
+        """
+        default_factor = self._get_default_speed_factor()
+        if self.time_estimator is None:
+            estimated_time = audio_duration * default_factor
+            low, high = ProcessingTimeEstimator.DEFAULT_INTERVAL
+            return TimeEstimate(estimated_time, estimated_time * low, estimated_time * high)
+        
+        return self.time_estimator.estimate(
+            audio_duration=audio_duration,
+            default_factor=default_factor,
+            **self.get_time_estimation_key()
+        )
+    
+    def estimate_processing_time(self, audio_duration: float) -> float:
+        """
+        処理時間を推定
         
-        return estimated_time
\ No newline at end of file
+        Args:
+            audio_duration: 音声の長さ（秒）
+            
+        Returns:
+            float: 推定処理時間（秒）
+        """
+        return self.estimate_processing_time_interval(audio_duration).estimate
\ No newline at end of file
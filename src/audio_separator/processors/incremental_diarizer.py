@@ -0,0 +1,426 @@
+"""
+録音中の音声の逐次話者分離
+
+追記された音声だけを 0.5秒の窓に区切り、窓ごとのスペクトル包絡（SpeakerEmbedder）を
+話者の特徴量として、既存の話者の重心と比べて話者を割り当てる（近い話者がいなければ
+新しい話者とする）。話者の重心・全体の平均・確定したセグメント・未確定の末尾の発話を
+状態として保持するため、1回の更新の処理量は追記された長さだけで決まる。
+状態はファイルに保存でき、定期的に起動するスクリプトからも続きを処理できる
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from ..utils.lazy_import import lazy_import
+from ..utils.speech_activity import SpeechActivityDetector
+from .segment_table import SegmentTable
+from .speaker_embedding import SpeakerEmbedder
+
+# 読み込みに時間がかかるため、最初に使う時点で読み込む
+sf = lazy_import('soundfile')
+
+
+class IncrementalUpdate:
+    """逐次話者分離の1回の更新結果"""
+    
+    def __init__(
+        self,
+        segments: SegmentTable,
+        open_segment: SegmentTable,
+        relabeled: Dict[str, str],
+        processed_duration: float
+    ):
+        """
+        更新結果を初期化
+        
+        Args:
+            segments: この更新で確定したセグメント
+            open_segment: 末尾の発話中のセグメント（0または1行、次の更新で延びる・話者が変わる場合がある）
+            relabeled: 同じ話者と判定して統合した話者ID（統合前 → 統合後、確定済みのセグメントにも適用済み）
+            processed_duration: 処理済みの音声の長さ（秒）
+        """
+        self.segments = segments
+        self.open_segment = open_segment
+        self.relabeled = relabeled
+        self.processed_duration = processed_duration
+
+
+class IncrementalDiarizer:
+    """追記される音声の逐次話者分離"""
+    
+    # 全体の平均を引いた特徴量の類似度（コサイン）がこれ未満なら新しい話者とする
+    SIMILARITY_THRESHOLD = 0.6
+    
+    # 重心どうしの類似度がこれ以上の話者は同じ話者として統合する
+    MERGE_THRESHOLD = 0.85
+    
+    # 全体の平均が安定するまで（発話の窓数）は話者を割り当てずに保留する
+    WARMUP_WINDOWS = 20
+    
+    # 保留中に終了した場合の、平均を引かない特徴量の類似度のしきい値
+    RAW_SIMILARITY_THRESHOLD = 0.97
+    
+    # 状態ファイルの形式名とバージョン
+    STATE_FORMAT = 'toyosatomimi-incremental-diarizer'
+    STATE_VERSION = 1
+    
+    def __init__(self, sample_rate: int, max_speakers: Optional[int] = None, min_duration: float = 0.5):
+        """
+        逐次話者分離を初期化
+        
+        Args:
+            sample_rate: 音声のサンプリングレート
+            max_speakers: 最大話者数（Noneの場合は制限なし、上限に達した後は最も近い話者に割り当てる）
+            min_duration: 最終結果に残す最小セグメント長（秒）
+        """
+        self.sample_rate = int(sample_rate)
+        self.max_speakers = max_speakers
+        self.min_duration = min_duration
+        
+        self.embedder = SpeakerEmbedder(self.sample_rate)
+        self.window_samples = self.embedder.window_samples
+        
+        # 処理済みの窓数と、窓に満たない末尾の音声
+        self.num_windows = 0
+        self._leftover = np.zeros(0, dtype=np.float32)
+        self._peak_level = SpeechActivityDetector.ABSOLUTE_FLOOR_DB
+        
+        # 話者ごとの特徴量の合計と窓数、全体の特徴量の合計と窓数
+        self._centroid_sums = np.zeros((0, SpeakerEmbedder.NUM_BANDS))
+        self._centroid_counts = np.zeros(0, dtype=np.int64)
+        self._global_sum = np.zeros(SpeakerEmbedder.NUM_BANDS)
+        self._global_count = 0
+        
+        # 話者を割り当てていない発話の窓（窓番号と特徴量）
+        self._pending_windows: List[int] = []
+        self._pending_features: List[np.ndarray] = []
+        
+        # 確定したセグメント（窓番号の範囲と話者コード）と末尾の発話（開始窓, 終了窓, 話者コード）
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._codes: List[int] = []
+        self._open: Optional[List[int]] = None
+        
+        # 話者コードの統合先（統合されていない場合は自身）
+        self._merged_into: List[int] = []
+        
+        # ファイルから読み込む場合の読み込み済みフレーム数
+        self.file_position = 0
+    
+    # --- 話者・セグメント ---
+    
+    @property
+    def processed_duration(self) -> float:
+        """処理済みの音声の長さ（秒、窓に満たない末尾を含む）"""
+        return (self.num_windows * self.window_samples + len(self._leftover)) / self.sample_rate
+    
+    @property
+    def num_speakers(self) -> int:
+        """統合後の話者数"""
+        return sum(1 for code, target in enumerate(self._merged_into) if code == target)
+    
+    def _speaker_id(self, code: int) -> str:
+        return f"SPEAKER_{code:02d}"
+    
+    def _table(self, starts: List[int], ends: List[int], codes: List[int]) -> SegmentTable:
+        """窓番号のセグメントをテーブルに変換（話者は統合先のID）"""
+        if not starts:
+            return SegmentTable.empty()
+        seconds = self.window_samples / self.sample_rate
+        categories = [self._speaker_id(code) for code in range(len(self._merged_into))]
+        resolved = np.array([self._resolve(code) for code in codes])
+        return SegmentTable(
+            np.asarray(starts) * seconds, np.asarray(ends) * seconds, resolved, np.ones(len(starts)), categories
+        ).compact()
+    
+    @property
+    def segments(self) -> SegmentTable:
+        """これまでのセグメント（末尾の発話中のセグメントを含む）"""
+        starts, ends, codes = list(self._starts), list(self._ends), list(self._codes)
+        if self._open is not None:
+            starts.append(self._open[0])
+            ends.append(self._open[1])
+            codes.append(self._open[2])
+        return self._table(starts, ends, codes)
+    
+    def _resolve(self, code: int) -> int:
+        while self._merged_into[code] != code:
+            code = self._merged_into[code]
+        return code
+    
+    # --- 更新 ---
+    
+    def update(self, audio: np.ndarray) -> IncrementalUpdate:
+        """
+        追記された音声を処理
+        
+        Args:
+            audio: 前回の続きの音声（最後の軸が時間、複数チャンネルは平均する）
+        
+        Returns:
+            IncrementalUpdate: この更新で確定・変更されたセグメント
+        """
+        mono = audio if audio.ndim == 1 else audio.reshape(-1, audio.shape[-1]).mean(axis=0)
+        samples = np.concatenate([self._leftover, mono.astype(np.float32, copy=False)])
+        num_new = len(samples) // self.window_samples
+        self._leftover = samples[num_new * self.window_samples:].copy()
+        
+        first_new_segment = len(self._starts)
+        relabeled: Dict[str, str] = {}
+        if num_new:
+            windows = samples[:num_new * self.window_samples]
+            features, voiced = self._window_features(windows, num_new)
+            
+            for offset in range(num_new):
+                index = self.num_windows + offset
+                if voiced[offset]:
+                    self._global_sum += features[offset]
+                    self._global_count += 1
+                    self._pending_windows.append(index)
+                    self._pending_features.append(features[offset])
+                else:
+                    # 無音の窓：保留中の窓を割り当ててから発話を区切る
+                    self._assign_pending()
+                    self._close_open()
+            self.num_windows += num_new
+            
+            if self._global_count >= self.WARMUP_WINDOWS:
+                self._assign_pending()
+                relabeled = self._merge_similar_speakers()
+        
+        open_segment = SegmentTable.empty()
+        if self._open is not None:
+            open_segment = self._table([self._open[0]], [self._open[1]], [self._open[2]])
+        return IncrementalUpdate(
+            self._table(self._starts[first_new_segment:], self._ends[first_new_segment:], self._codes[first_new_segment:]),
+            open_segment,
+            relabeled,
+            self.processed_duration
+        )
+    
+    def update_from_file(self, file_path: Union[str, Path]) -> IncrementalUpdate:
+        """
+        録音中のファイルに追記された部分を読み込んで処理
+        
+        Args:
+            file_path: 音声ファイルパス（ヘッダーのフレーム数まで読み込む）
+        
+        Returns:
+            IncrementalUpdate: この更新で確定・変更されたセグメント
+        
+        Raises:
+            ValueError: サンプリングレートが異なる、またはファイルが短くなった場合
+        """
+        with sf.SoundFile(str(file_path)) as f:
+            if f.samplerate != self.sample_rate:
+                raise ValueError(f"サンプリングレートが異なります: {f.samplerate}Hz（{self.sample_rate}Hzで開始）")
+            if f.frames < self.file_position:
+                raise ValueError(f"ファイルが前回より短くなっています: {file_path}")
+            f.seek(self.file_position)
+            audio = f.read(dtype='float32', always_2d=True)
+        self.file_position += len(audio)
+        return self.update(audio.T)
+    
+    def finalize(self) -> SegmentTable:
+        """
+        末尾の音声と保留中の窓を処理して最終的なセグメントを確定
+        
+        Returns:
+            SegmentTable: 全体のセグメント（同じ話者の隣接するセグメントは結合し、最小長未満は除く）
+        """
+        if len(self._leftover):
+            # 窓に満たない末尾は無音で埋めて処理する
+            self.update(np.zeros(self.window_samples - len(self._leftover), dtype=np.float32))
+        self._assign_pending(final=True)
+        self._close_open()
+        self._merge_similar_speakers()
+        
+        # 同じ話者のセグメントが隣接する場合は結合
+        starts, ends, codes = [], [], []
+        for start, end, code in zip(self._starts, self._ends, self._codes):
+            code = self._resolve(code)
+            if codes and codes[-1] == code and ends[-1] >= start:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+                codes.append(code)
+        self._starts, self._ends, self._codes = starts, ends, codes
+        
+        segments = self.segments.filter_min_duration(self.min_duration)
+        logging.info(f"逐次話者分離完了: {self.processed_duration:.1f}秒, {segments.num_speakers}人, {len(segments)}セグメント")
+        return segments
+    
+    def _window_features(self, windows: np.ndarray, num_windows: int):
+        """窓ごとの特徴量と発話の判定（有音の判定は、これまでで最も大きいフレームからの差で行う）"""
+        levels = self.embedder.frame_levels(windows)
+        self._peak_level = max(self._peak_level, float(levels.max()))
+        return self.embedder.window_features(windows, levels > self.embedder.activity_threshold(self._peak_level))
+    
+    def _centered(self, vectors: np.ndarray) -> np.ndarray:
+        """全体の平均を引いて正規化"""
+        centered = vectors - self._global_sum / max(self._global_count, 1)
+        return centered / np.maximum(np.linalg.norm(centered, axis=-1, keepdims=True), 1e-9)
+    
+    def _assign_pending(self, final: bool = False) -> None:
+        """保留中の窓に話者を割り当てる（全体の平均が安定するまでは、終了時以外は保留する）"""
+        if not self._pending_windows:
+            return
+        warm = self._global_count >= self.WARMUP_WINDOWS
+        if not warm and not final:
+            return
+        
+        for index, feature in zip(self._pending_windows, self._pending_features):
+            code = self._nearest_speaker(feature, warm)
+            self._centroid_sums[code] += feature
+            self._centroid_counts[code] += 1
+            
+            # 直前の窓から続く同じ話者の発話は延ばし、それ以外は新しいセグメントにする
+            if self._open is not None and self._open[1] == index and self._resolve(self._open[2]) == code:
+                self._open[1] = index + 1
+            else:
+                self._close_open()
+                self._open = [index, index + 1, code]
+        self._pending_windows.clear()
+        self._pending_features.clear()
+    
+    def _nearest_speaker(self, feature: np.ndarray, warm: bool) -> int:
+        """最も近い話者のコード（しきい値未満で上限に達していなければ新しい話者）"""
+        active = [code for code, target in enumerate(self._merged_into) if code == target]
+        if active:
+            centroids = self._centroid_sums[active] / self._centroid_counts[active, None]
+            if warm:
+                similarities = self._centered(centroids) @ self._centered(feature)
+                threshold = self.SIMILARITY_THRESHOLD
+            else:
+                similarities = (centroids / np.linalg.norm(centroids, axis=1, keepdims=True)) @ feature
+                threshold = self.RAW_SIMILARITY_THRESHOLD
+            best = int(np.argmax(similarities))
+            if similarities[best] >= threshold or (self.max_speakers is not None and len(active) >= self.max_speakers):
+                return active[best]
+        
+        # 新しい話者
+        code = len(self._merged_into)
+        self._merged_into.append(code)
+        self._centroid_sums = np.vstack([self._centroid_sums, np.zeros(SpeakerEmbedder.NUM_BANDS)])
+        self._centroid_counts = np.append(self._centroid_counts, 0)
+        return code
+    
+    def _close_open(self) -> None:
+        """末尾の発話を確定"""
+        if self._open is not None:
+            self._starts.append(self._open[0])
+            self._ends.append(self._open[1])
+            self._codes.append(self._open[2])
+            self._open = None
+    
+    def _merge_similar_speakers(self) -> Dict[str, str]:
+        """重心が近い話者を統合（統合した話者ID → 統合先の話者ID）"""
+        relabeled: Dict[str, str] = {}
+        if self._global_count < self.WARMUP_WINDOWS:
+            return relabeled
+        while True:
+            active = [code for code, target in enumerate(self._merged_into) if code == target and self._centroid_counts[code]]
+            if len(active) < 2:
+                return relabeled
+            centered = self._centered(self._centroid_sums[active] / self._centroid_counts[active, None])
+            similarities = centered @ centered.T
+            np.fill_diagonal(similarities, -np.inf)
+            i, j = np.unravel_index(int(np.argmax(similarities)), similarities.shape)
+            if similarities[i, j] < self.MERGE_THRESHOLD:
+                return relabeled
+            
+            # 先に現れた話者（コードの小さい方）に統合する
+            keep, drop = sorted((active[i], active[j]))
+            self._merged_into[drop] = keep
+            self._centroid_sums[keep] += self._centroid_sums[drop]
+            self._centroid_counts[keep] += self._centroid_counts[drop]
+            for old, new in list(relabeled.items()):
+                if new == self._speaker_id(drop):
+                    relabeled[old] = self._speaker_id(keep)
+            relabeled[self._speaker_id(drop)] = self._speaker_id(keep)
+            logging.info(f"逐次話者分離: {self._speaker_id(drop)} を {self._speaker_id(keep)} に統合")
+    
+    # --- 状態の保存 ---
+    
+    def save_state(self, path: Union[str, Path]) -> Path:
+        """
+        状態をファイルに保存（次回の起動時に load_state で続きから処理する）
+        
+        Args:
+            path: 保存先パス（.npz）
+        
+        Returns:
+            Path: 保存したパス
+        """
+        path = Path(path)
+        header = {
+            'format': self.STATE_FORMAT,
+            'version': self.STATE_VERSION,
+            'sample_rate': self.sample_rate,
+            'max_speakers': self.max_speakers,
+            'min_duration': self.min_duration,
+            'num_windows': self.num_windows,
+            'peak_level': self._peak_level,
+            'global_count': self._global_count,
+            'pending_windows': self._pending_windows,
+            'open': self._open,
+            'merged_into': self._merged_into,
+            'file_position': self.file_position
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                header=np.array(json.dumps(header)),
+                leftover=self._leftover,
+                centroid_sums=self._centroid_sums,
+                centroid_counts=self._centroid_counts,
+                global_sum=self._global_sum,
+                pending_features=np.array(self._pending_features).reshape(-1, SpeakerEmbedder.NUM_BANDS),
+                segments=np.array([self._starts, self._ends, self._codes], dtype=np.int64).reshape(3, -1)
+            )
+        tmp_path.replace(path)
+        return path
+    
+    @classmethod
+    def load_state(cls, path: Union[str, Path]) -> "IncrementalDiarizer":
+        """
+        保存した状態から復元
+        
+        Args:
+            path: 状態ファイルパス
+        
+        Returns:
+            IncrementalDiarizer: 保存時の状態の逐次話者分離
+        
+        Raises:
+            ValueError: ファイル形式が正しくない場合
+        """
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['header'])) if 'header' in data else {}
+            if header.get('format') != cls.STATE_FORMAT or header.get('version') != cls.STATE_VERSION:
+                raise ValueError(f"逐次話者分離の状態ファイルの形式が異なります: {path}")
+            
+            diarizer = cls(header['sample_rate'], header['max_speakers'], header['min_duration'])
+            diarizer.num_windows = header['num_windows']
+            diarizer._peak_level = header['peak_level']
+            diarizer._global_count = header['global_count']
+            diarizer._pending_windows = list(header['pending_windows'])
+            diarizer._open = header['open']
+            diarizer._merged_into = list(header['merged_into'])
+            diarizer.file_position = header['file_position']
+            
+            diarizer._leftover = data['leftover'].astype(np.float32)
+            diarizer._centroid_sums = data['centroid_sums'].reshape(-1, SpeakerEmbedder.NUM_BANDS)
+            diarizer._centroid_counts = data['centroid_counts'].astype(np.int64)
+            diarizer._global_sum = data['global_sum']
+            diarizer._pending_features = list(data['pending_features'])
+            starts, ends, codes = data['segments'].tolist()
+            diarizer._starts, diarizer._ends, diarizer._codes = starts, ends, codes
+        return diarizer
@@ -0,0 +1,227 @@
+"""
+話者セグメントのコンテナ出力
+
+話者ごとのセグメント音声を1つのWAVファイルに連続して書き込み、各セグメントの
+位置（サンプル単位のオフセットと長さ）と元の時刻を索引ファイル（JSON）に記録する。
+長い会議でもセグメントごとの小さなファイルを大量に作らずに済み、
+個別のセグメントは索引からシークして読み出せる
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, List, Union
+
+import numpy as np
+
+from ..utils.audio_utils import AudioUtils
+from ..utils.lazy_import import lazy_import
+from ..utils.profiler import record_io
+from .segment_table import SegmentTable
+
+# 読み込みに時間がかかるため、最初に使う時点で読み込む
+sf = lazy_import('soundfile')
+
+
+class SegmentContainerWriter:
+    """セグメント音声を1つのWAVファイルに順に書き込み、索引を作成する"""
+    
+    # 索引ファイルの形式名とバージョン
+    FORMAT = 'toyosatomimi-segment-container'
+    VERSION = 1
+    
+    # 索引ファイルの拡張子（音声ファイルの拡張子の代わりに付ける）
+    INDEX_SUFFIX = '.index.json'
+    
+    def __init__(self, path: Union[str, Path], sample_rate: int, speaker_id: str = '', source_file: str = ''):
+        """
+        書き込み先を開く
+        
+        Args:
+            path: コンテナの音声ファイルパス（.wav）
+            sample_rate: サンプリングレート
+            speaker_id: 話者ID（索引に記録）
+            source_file: 元音声ファイル名（索引に記録）
+        """
+        self.path = Path(path)
+        self.index_path = SegmentContainer.index_path_for(self.path)
+        self.sample_rate = int(sample_rate)
+        self.speaker_id = speaker_id
+        self.source_file = source_file
+        
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._confidences: List[float] = []
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []
+        self._position = 0
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = sf.SoundFile(str(self.path), mode='w', samplerate=self.sample_rate, channels=1, format='WAV')
+    
+    def __enter__(self) -> "SegmentContainerWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def add(self, audio: np.ndarray, start_time: float, end_time: float, confidence: float = 1.0) -> int:
+        """
+        セグメント音声を追加
+        
+        Args:
+            audio: セグメントの音声（モノラル）
+            start_time: 元音声での開始時刻（秒）
+            end_time: 元音声での終了時刻（秒）
+            confidence: 信頼度
+        
+        Returns:
+            int: 追加したセグメントの番号
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        self._file.write(audio)
+        
+        self._starts.append(float(start_time))
+        self._ends.append(float(end_time))
+        self._confidences.append(float(confidence))
+        self._offsets.append(self._position)
+        self._lengths.append(len(audio))
+        self._position += len(audio)
+        return len(self._offsets) - 1
+    
+    def close(self) -> Path:
+        """
+        音声ファイルを閉じて索引を書き出す
+        
+        Returns:
+            Path: 索引ファイルパス
+        """
+        if self._file.closed:
+            return self.index_path
+        self._file.close()
+        
+        index = {
+            'format': self.FORMAT,
+            'version': self.VERSION,
+            'audio_file': self.path.name,
+            'source_file': self.source_file,
+            'speaker': self.speaker_id,
+            'sample_rate': self.sample_rate,
+            'total_samples': self._position,
+            'starts': self._starts,
+            'ends': self._ends,
+            'confidences': self._confidences,
+            'offsets': self._offsets,
+            'lengths': self._lengths
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(index, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        tmp_path.replace(self.index_path)
+        record_io(bytes_written=self.path.stat().st_size)
+        
+        logging.info(f"セグメントコンテナ保存: {self.path} ({len(self)}セグメント)")
+        return self.index_path
+
+
+class SegmentContainer:
+    """セグメントコンテナの読み出し（索引からシークして個別のセグメントを読む）"""
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        コンテナを開く
+        
+        Args:
+            path: コンテナの音声ファイルパス、または索引ファイルパス
+        
+        Raises:
+            FileNotFoundError: 音声ファイル・索引ファイルが見つからない場合
+            ValueError: 索引ファイルの形式が正しくない場合
+        """
+        path = Path(path)
+        if path.name.endswith(SegmentContainerWriter.INDEX_SUFFIX):
+            self.index_path = path
+        else:
+            self.index_path = self.index_path_for(path)
+        if not self.index_path.exists():
+            raise FileNotFoundError(f"セグメントコンテナの索引が見つかりません: {self.index_path}")
+        
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if not isinstance(index, dict) or index.get('format') != SegmentContainerWriter.FORMAT:
+            raise ValueError(f"セグメントコンテナの索引の形式が異なります: {self.index_path}")
+        if index.get('version') != SegmentContainerWriter.VERSION:
+            raise ValueError(f"対応していないセグメントコンテナのバージョンです: {index.get('version')}")
+        
+        self.audio_path = self.index_path.with_name(index['audio_file'])
+        if not self.audio_path.exists():
+            raise FileNotFoundError(f"セグメントコンテナの音声ファイルが見つかりません: {self.audio_path}")
+        
+        self.speaker_id: str = index.get('speaker', '')
+        self.source_file: str = index.get('source_file', '')
+        self.sample_rate = int(index['sample_rate'])
+        self.offsets = np.asarray(index['offsets'], dtype=np.int64)
+        self.lengths = np.asarray(index['lengths'], dtype=np.int64)
+        self.segments = SegmentTable.from_arrays(
+            index['starts'], index['ends'], [self.speaker_id] * len(self.offsets), index['confidences']
+        )
+    
+    @staticmethod
+    def index_path_for(audio_path: Union[str, Path]) -> Path:
+        """音声ファイルに対応する索引ファイルパス"""
+        audio_path = Path(audio_path)
+        return audio_path.with_name(audio_path.stem + SegmentContainerWriter.INDEX_SUFFIX)
+    
+    @staticmethod
+    def is_container(path: Union[str, Path]) -> bool:
+        """索引ファイルを持つコンテナの音声ファイルか"""
+        return SegmentContainer.index_path_for(path).exists()
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def read(self, index: int) -> np.ndarray:
+        """
+        セグメントの音声を読み出す
+        
+        Args:
+            index: セグメント番号（負の値は末尾から）
+        
+        Returns:
+            np.ndarray: セグメントの音声（float32、モノラル）
+        
+        Raises:
+            IndexError: セグメント番号が範囲外の場合
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"セグメント番号が範囲外です: {index}（{len(self)}セグメント）")
+        offset, length = int(self.offsets[index]), int(self.lengths[index])
+        with sf.SoundFile(str(self.audio_path)) as f:
+            f.seek(offset)
+            audio = f.read(length, dtype='float32')
+        record_io(bytes_read=audio.nbytes)
+        return audio
+    
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """全セグメントの音声を順に読み出す（ファイルを開いたまま順に読む）"""
+        with sf.SoundFile(str(self.audio_path)) as f:
+            for offset, length in zip(self.offsets.tolist(), self.lengths.tolist()):
+                f.seek(offset)
+                yield f.read(length, dtype='float32')
+    
+    def export(self, index: int, output_path: Union[str, Path]) -> Path:
+        """
+        セグメントを個別の音声ファイルとして書き出す
+        
+        Args:
+            index: セグメント番号
+            output_path: 出力ファイルパス
+        
+        Returns:
+            Path: 出力ファイルパス
+        """
+        output_path = Path(output_path)
+        AudioUtils.save_audio(self.read(index), output_path, self.sample_rate)
+        return output_path
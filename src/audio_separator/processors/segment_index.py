@@ -0,0 +1,196 @@
+"""
+話者セグメントの区間インデックス
+
+セグメントを話者ごとに開始時刻順の配列として保持し、表示範囲と重なる
+セグメントを二分探索で取り出す。タイムライン表示のように表示範囲を
+頻繁に変えて問い合わせる用途で、セグメント数に対して O(log n + k) で応答する
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from .speaker_processor import SpeakerSegment
+
+
+class IntervalIndex:
+    """開始時刻順に並べた区間の集合に対する範囲検索インデックス"""
+    
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        """
+        インデックスを作成
+        
+        Args:
+            starts: 区間の開始時刻（秒）
+            ends: 区間の終了時刻（秒）
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        order = np.argsort(starts, kind='stable')
+        
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.order = order
+        
+        # 重なる区間があっても二分探索できるよう、終了時刻の累積最大値を持つ
+        self._max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def query(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        範囲 [start, end) と重なる区間を取得
+        
+        Args:
+            start: 範囲の開始時刻（秒）
+            end: 範囲の終了時刻（秒）
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 重なる区間の (開始時刻, 終了時刻)（開始時刻順）
+        """
+        first, last = self._bounds(start, end)
+        starts = self.starts[first:last]
+        ends = self.ends[first:last]
+        
+        # 累積最大値で絞り込んだ範囲内に、既に終わっている短い区間が残る場合がある
+        overlapping = ends > start
+        if not overlapping.all():
+            starts, ends = starts[overlapping], ends[overlapping]
+        return starts, ends
+    
+    def query_indices(self, start: float, end: float) -> np.ndarray:
+        """
+        範囲 [start, end) と重なる区間の元の位置を取得
+        
+        Args:
+            start: 範囲の開始時刻（秒）
+            end: 範囲の終了時刻（秒）
+        
+        Returns:
+            np.ndarray: インデックス作成時の並びでの位置（開始時刻順）
+        """
+        first, last = self._bounds(start, end)
+        positions = np.arange(first, last)
+        return self.order[positions[self.ends[first:last] > start]]
+    
+    def _bounds(self, start: float, end: float) -> Tuple[int, int]:
+        """範囲と重なり得る区間の位置 [first, last) を二分探索で求める"""
+        # first より前の区間は全て start までに終わり、last 以降は end 以降に始まる
+        first = int(np.searchsorted(self._max_ends, start, side='right'))
+        last = int(np.searchsorted(self.starts, end, side='left'))
+        return first, max(first, last)
+    
+    def contains(self, times: np.ndarray) -> np.ndarray:
+        """
+        各時刻がいずれかの区間 [開始, 終了) に含まれるか
+        
+        Args:
+            times: 時刻の配列（秒）
+        
+        Returns:
+            np.ndarray: 時刻ごとの真偽値
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if len(self.starts) == 0:
+            return np.zeros(times.shape, dtype=bool)
+        
+        index = np.searchsorted(self.starts, times, side='right') - 1
+        return (index >= 0) & (times < self._max_ends[np.clip(index, 0, None)])
+    
+    def query_coalesced(self, start: float, end: float, min_gap: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        範囲と重なる区間を、間隔が min_gap 未満のものをまとめて取得
+        
+        表示上1ピクセルに満たない隙間や区間を1つの区間として描画するために使う
+        
+        Args:
+            start: 範囲の開始時刻（秒）
+            end: 範囲の終了時刻（秒）
+            min_gap: これ未満の隙間で隣り合う区間をまとめる（秒）
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: まとめた区間の (開始時刻, 終了時刻)
+        """
+        starts, ends = self.query(start, end)
+        if len(starts) <= 1:
+            return starts, ends
+        
+        # 直前までの区間の終了時刻から min_gap 以上離れた位置で新しい区間を始める
+        max_ends = np.maximum.accumulate(ends)
+        breaks = np.flatnonzero(starts[1:] - max_ends[:-1] >= min_gap) + 1
+        group_starts = np.concatenate([[0], breaks])
+        group_ends = np.concatenate([breaks - 1, [len(starts) - 1]])
+        return starts[group_starts], max_ends[group_ends]
+
+
+class SpeakerTimelineIndex:
+    """話者ごとの区間インデックス"""
+    
+    def __init__(self, indexes: Dict[str, IntervalIndex]):
+        """
+        インデックスを初期化
+        
+        Args:
+            indexes: 話者ID → 区間インデックス
+        """
+        self.indexes = indexes
+        self.duration = max((float(index.ends.max()) for index in indexes.values() if len(index)), default=0.0)
+    
+    @classmethod
+    def from_segments(cls, segments: Iterable[Union[SpeakerSegment, Dict[str, Any]]]) -> "SpeakerTimelineIndex":
+        """
+        セグメントからインデックスを作成
+        
+        Args:
+            segments: SpeakerSegment（SegmentTable の行を含む）、または 'start', 'end', 'speaker' を持つ辞書
+        
+        Returns:
+            SpeakerTimelineIndex: インデックス
+        """
+        grouped: Dict[str, List[Tuple[float, float]]] = {}
+        for segment in segments:
+            if isinstance(segment, dict):
+                speaker_id, start, end = segment['speaker'], segment['start'], segment['end']
+            else:
+                speaker_id, start, end = segment.speaker_id, segment.start_time, segment.end_time
+            grouped.setdefault(speaker_id, []).append((start, end))
+        
+        indexes = {}
+        for speaker_id in sorted(grouped):
+            bounds = np.array(grouped[speaker_id], dtype=np.float64)
+            indexes[speaker_id] = IntervalIndex(bounds[:, 0], bounds[:, 1])
+        return cls(indexes)
+    
+    @property
+    def speakers(self) -> List[str]:
+        """話者IDのリスト"""
+        return list(self.indexes)
+    
+    def query(self, start: float, end: float) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        話者ごとに範囲と重なる区間を取得
+        
+        Args:
+            start: 範囲の開始時刻（秒）
+            end: 範囲の終了時刻（秒）
+        
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray]]: 話者ID → (開始時刻, 終了時刻)
+        """
+        return {speaker_id: index.query(start, end) for speaker_id, index in self.indexes.items()}
+    
+    def speakers_at(self, time: float) -> List[str]:
+        """
+        指定時刻に発話している話者を取得
+        
+        Args:
+            time: 時刻（秒）
+        
+        Returns:
+            List[str]: 話者IDのリスト
+        """
+        return [
+            speaker_id for speaker_id, index in self.indexes.items()
+            if index.contains(np.array([time]))[0]
+        ]
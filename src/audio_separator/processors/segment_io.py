@@ -0,0 +1,308 @@
+"""
+話者セグメントの保存・読み込み
+
+話者分離の結果を RTTM（他の話者分離ツールと共通の形式）、列指向のJSON、
+NPZ（NumPy配列の圧縮形式）で保存する。JSON・NPZには元音声のパスも記録するため、
+保存したセグメントファイルだけから話者音声の抽出（命名規則やフェードを変えた
+再書き出し）ができ、話者分離をやり直す必要がない
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .segment_table import SegmentTable
+
+
+class SegmentIO:
+    """話者セグメントファイルの読み書き"""
+    
+    # JSON・NPZの形式名とバージョン
+    FORMAT = 'toyosatomimi-segments'
+    VERSION = 1
+    
+    # 拡張子ごとの形式
+    FORMATS = {'.rttm': 'rttm', '.json': 'json', '.npz': 'npz'}
+    
+    @classmethod
+    def save(
+        cls,
+        segments: Iterable[Any],
+        path: Union[str, Path],
+        audio_file: Optional[Union[str, Path]] = None
+    ) -> Path:
+        """
+        拡張子に応じた形式でセグメントを保存
+        
+        Args:
+            segments: 話者セグメント（SegmentTable、または SpeakerSegment・辞書のリスト）
+            path: 保存先パス（.rttm, .json, .npz）
+            audio_file: 元音声ファイルパス（RTTMではファイルIDとして名前だけを記録）
+        
+        Returns:
+            Path: 保存したパス
+        
+        Raises:
+            ValueError: 対応していない拡張子の場合
+        """
+        path = Path(path)
+        segment_format = cls._format_of(path)
+        table = SegmentTable.from_segments(segments)
+        if segment_format == 'rttm':
+            file_id = Path(audio_file).stem if audio_file else path.stem
+            return cls.write_rttm(table, path, file_id)
+        if segment_format == 'json':
+            return cls.write_json(table, path, audio_file)
+        return cls.write_npz(table, path, audio_file)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Tuple[SegmentTable, Optional[str]]:
+        """
+        拡張子に応じた形式でセグメントを読み込む
+        
+        Args:
+            path: セグメントファイルパス（.rttm, .json, .npz）
+        
+        Returns:
+            Tuple[SegmentTable, Optional[str]]: (セグメント, 記録された元音声ファイルパス（RTTMはNone）)
+        
+        Raises:
+            FileNotFoundError: ファイルが見つからない場合
+            ValueError: 対応していない拡張子、またはファイル形式が正しくない場合
+        """
+        path = Path(path)
+        segment_format = cls._format_of(path)
+        if not path.exists():
+            raise FileNotFoundError(f"セグメントファイルが見つかりません: {path}")
+        if segment_format == 'rttm':
+            return cls.read_rttm(path), None
+        if segment_format == 'json':
+            return cls.read_json(path)
+        return cls.read_npz(path)
+    
+    @classmethod
+    def _format_of(cls, path: Path) -> str:
+        """拡張子からファイル形式を判定"""
+        segment_format = cls.FORMATS.get(path.suffix.lower())
+        if segment_format is None:
+            raise ValueError(f"対応していないセグメントファイル形式です: {path.suffix}（.rttm, .json, .npz のいずれか）")
+        return segment_format
+    
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> Path:
+        """一時ファイルに書いてから置き換える（書き込み途中のファイルを残さない）"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return path
+    
+    # --- RTTM ---
+    
+    @classmethod
+    def write_rttm(cls, segments: Iterable[Any], path: Union[str, Path], file_id: str = 'audio') -> Path:
+        """
+        RTTM形式で保存（信頼度は9列目に記録）
+        
+        Args:
+            segments: 話者セグメント
+            path: 保存先パス
+            file_id: RTTMのファイルID（空白は'_'に置き換える）
+        
+        Returns:
+            Path: 保存したパス
+        """
+        table = SegmentTable.from_segments(segments)
+        file_id = '_'.join(str(file_id).split()) or 'audio'
+        lines = [
+            f"SPEAKER {file_id} 1 {start:.3f} {duration:.3f} <NA> <NA> {speaker_id} {confidence:.3f} <NA>\n"
+            for start, duration, speaker_id, confidence in zip(
+                table.starts.tolist(), table.durations.tolist(), table.speaker_ids.tolist(), table.confidences.tolist()
+            )
+        ]
+        logging.info(f"RTTM保存: {path} ({len(table)}セグメント)")
+        return cls._write_atomic(Path(path), ''.join(lines).encode('utf-8'))
+    
+    @staticmethod
+    def read_rttm(path: Union[str, Path], file_id: Optional[str] = None) -> SegmentTable:
+        """
+        RTTM形式を読み込む（SPEAKER行のみ、信頼度が無い場合は1.0）
+        
+        Args:
+            path: RTTMファイルパス
+            file_id: 読み込むファイルID（Noneの場合はすべて）
+        
+        Returns:
+            SegmentTable: セグメント
+        
+        Raises:
+            ValueError: ファイル形式が正しくない場合
+        """
+        rows = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                fields = line.split()
+                if not fields or fields[0] != 'SPEAKER':
+                    continue
+                if len(fields) < 8:
+                    raise ValueError(f"RTTMの{line_number}行目の列が足りません: {path}")
+                if file_id is None or fields[1] == file_id:
+                    rows.append(fields)
+        
+        if not rows:
+            return SegmentTable.empty()
+        try:
+            starts = np.array([fields[3] for fields in rows], dtype=np.float64)
+            durations = np.array([fields[4] for fields in rows], dtype=np.float64)
+            confidences = np.array([
+                fields[8] if len(fields) > 8 and fields[8] != '<NA>' else 1.0 for fields in rows
+            ], dtype=np.float64)
+        except ValueError as e:
+            raise ValueError(f"RTTMの数値を解析できません: {path} ({e})")
+        return SegmentTable.from_arrays(starts, starts + durations, [fields[7] for fields in rows], confidences)
+    
+    # --- JSON ---
+    
+    @classmethod
+    def write_json(
+        cls,
+        segments: Iterable[Any],
+        path: Union[str, Path],
+        audio_file: Optional[Union[str, Path]] = None
+    ) -> Path:
+        """
+        列指向のJSON形式で保存（話者IDはカテゴリ表、各セグメントは話者コードで記録）
+        
+        Args:
+            segments: 話者セグメント
+            path: 保存先パス
+            audio_file: 元音声ファイルパス
+        
+        Returns:
+            Path: 保存したパス
+        """
+        table = SegmentTable.from_segments(segments).compact()
+        data = {
+            'format': cls.FORMAT,
+            'version': cls.VERSION,
+            'audio_file': str(Path(audio_file).resolve()) if audio_file else None,
+            'speakers': table.categories,
+            'starts': table.starts.tolist(),
+            'ends': table.ends.tolist(),
+            'codes': table.codes.tolist(),
+            'confidences': table.confidences.tolist()
+        }
+        logging.info(f"セグメントJSON保存: {path} ({len(table)}セグメント)")
+        return cls._write_atomic(Path(path), json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    
+    @classmethod
+    def read_json(cls, path: Union[str, Path]) -> Tuple[SegmentTable, Optional[str]]:
+        """
+        JSON形式を読み込む
+        
+        Args:
+            path: JSONファイルパス
+        
+        Returns:
+            Tuple[SegmentTable, Optional[str]]: (セグメント, 元音声ファイルパス)
+        
+        Raises:
+            ValueError: ファイル形式が正しくない場合
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        cls._check_header(data, path)
+        table = cls._table_from_columns(data, path)
+        return table, data.get('audio_file')
+    
+    # --- NPZ ---
+    
+    @classmethod
+    def write_npz(
+        cls,
+        segments: Iterable[Any],
+        path: Union[str, Path],
+        audio_file: Optional[Union[str, Path]] = None
+    ) -> Path:
+        """
+        NPZ形式（圧縮したNumPy配列）で保存
+        
+        Args:
+            segments: 話者セグメント
+            path: 保存先パス
+            audio_file: 元音声ファイルパス
+        
+        Returns:
+            Path: 保存したパス
+        """
+        path = Path(path)
+        table = SegmentTable.from_segments(segments).compact()
+        header = {
+            'format': cls.FORMAT,
+            'version': cls.VERSION,
+            'audio_file': str(Path(audio_file).resolve()) if audio_file else None
+        }
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                header=np.array(json.dumps(header, ensure_ascii=False)),
+                speakers=np.array(table.categories, dtype=str),
+                starts=table.starts,
+                ends=table.ends,
+                codes=table.codes,
+                confidences=table.confidences
+            )
+        tmp_path.replace(path)
+        logging.info(f"セグメントNPZ保存: {path} ({len(table)}セグメント)")
+        return path
+    
+    @classmethod
+    def read_npz(cls, path: Union[str, Path]) -> Tuple[SegmentTable, Optional[str]]:
+        """
+        NPZ形式を読み込む
+        
+        Args:
+            path: NPZファイルパス
+        
+        Returns:
+            Tuple[SegmentTable, Optional[str]]: (セグメント, 元音声ファイルパス)
+        
+        Raises:
+            ValueError: ファイル形式が正しくない場合
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if 'header' not in data:
+                raise ValueError(f"セグメントファイルの形式が異なります: {path}")
+            header = json.loads(str(data['header']))
+            cls._check_header(header, path)
+            columns = {name: data[name] for name in ('starts', 'ends', 'codes', 'confidences')}
+            columns['speakers'] = data['speakers'].tolist()
+        return cls._table_from_columns(columns, path), header.get('audio_file')
+    
+    # --- 共通 ---
+    
+    @classmethod
+    def _check_header(cls, header: Dict[str, Any], path: Union[str, Path]) -> None:
+        """形式名とバージョンを確認"""
+        if not isinstance(header, dict) or header.get('format') != cls.FORMAT:
+            raise ValueError(f"セグメントファイルの形式が異なります: {path}")
+        if header.get('version') != cls.VERSION:
+            raise ValueError(f"対応していないセグメントファイルのバージョンです: {header.get('version')} ({path})")
+    
+    @staticmethod
+    def _table_from_columns(columns: Dict[str, Any], path: Union[str, Path]) -> SegmentTable:
+        """列の値からテーブルを作成（話者コードの範囲を確認）"""
+        try:
+            speakers = [str(speaker_id) for speaker_id in columns['speakers']]
+            codes = np.asarray(columns['codes'], dtype=np.int64)
+            if len(codes) and (codes.min() < 0 or codes.max() >= len(speakers)):
+                raise ValueError("話者コードが範囲外です")
+            return SegmentTable(columns['starts'], columns['ends'], codes, columns['confidences'], speakers)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"セグメントファイルが不正です: {path} ({e})")
@@ -0,0 +1,401 @@
+"""
+音声分離パイプライン
+
+BGM分離（Demucs）→ 話者分離（pyannote-audio）→ 音声抽出の一連の処理を、
+読み込み済みのプロセッサを使い回して実行する
+"""
+
+import time
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Iterator
+
+from .demucs_processor import DemucsProcessor
+from .speaker_processor import SpeakerProcessor
+from ..utils.audio_utils import AudioUtils
+from ..utils.cancellation import CancellationToken
+from ..utils.file_utils import FileUtils
+from ..utils.music_detector import MusicDetector
+from ..utils.profiler import profile_stage
+from ..utils.progress import ProgressReporter, ProgressUpdate
+from ..utils.time_estimator import ProcessingTimeEstimator, TimeEstimate
+from ..utils.waveform_peaks import PeakPyramid
+
+
+class SeparationPipeline:
+    """BGM分離と話者分離をまとめて実行するパイプラインクラス"""
+    
+    # パイプラインのデフォルトパラメータ
+    DEFAULT_PARAMS = {
+        'enable_bgm_separation': True,
+        'force_bgm_separation': False,
+        'create_individual': True,
+        'create_combined': True,
+        'naming_style': 'detailed',
+        'segment_container': False,
+        'output_format': 'wav',
+        'bit_depth': 16,
+        'speaker_registry': None,
+        'min_segment_length': 1.0,
+        'clustering_threshold': 0.5,
+        'segmentation_onset': 0.3,
+        'segmentation_offset': 0.3,
+        'force_num_speakers': None,
+        'generate_peaks': True
+    }
+    
+    # 全体進捗に占めるBGM分離・波形データ作成の割合
+    BGM_PROGRESS_WEIGHT = 0.4
+    PEAKS_PROGRESS_WEIGHT = 0.02
+    
+    def __init__(
+        self,
+        demucs_processor: Optional[DemucsProcessor] = None,
+        speaker_processor: Optional[SpeakerProcessor] = None,
+        demucs_model: str = 'htdemucs',
+        speaker_model: str = 'pyannote/speaker-diarization-3.1',
+        device: str = 'auto',
+        time_estimator: Optional[ProcessingTimeEstimator] = None
+    ):
+        """
+        パイプラインを初期化
+        
+        Args:
+            demucs_processor: 使用するDemucsプロセッサ（Noneの場合は新規作成）
+            speaker_processor: 使用する話者分離プロセッサ（Noneの場合は新規作成）
+            demucs_model: Demucsモデル名（プロセッサを新規作成する場合）
+            speaker_model: pyannoteモデル名（プロセッサを新規作成する場合）
+            device: 処理デバイス ('auto', 'cpu', 'cuda')
+            time_estimator: 処理時間の記録・推定器（Noneの場合は設定ディレクトリの記録を使用）
+        """
+        self.demucs_processor = demucs_processor or DemucsProcessor(model_name=demucs_model, device=device)
+        self.speaker_processor = speaker_processor or SpeakerProcessor(model_name=speaker_model, device=device)
+        
+        # 実測した処理時間を記録し、次回以降の推定に使う
+        self.time_estimator = time_estimator or ProcessingTimeEstimator()
+        self.demucs_processor.time_estimator = self.time_estimator
+        self.speaker_processor.time_estimator = self.time_estimator
+        
+        # BGMの無い音声はBGM分離を省略する（Noneの場合は常にBGM分離する）
+        self.music_detector: Optional[MusicDetector] = MusicDetector()
+        
+        # プロセッサはスレッドセーフではないため、ステージごとに同時実行を1ジョブに制限
+        # （あるジョブの話者分離中に、別のジョブのBGM分離を進められる）
+        self._demucs_lock = threading.Lock()
+        self._speaker_lock = threading.Lock()
+    
+    def warmup(self) -> Dict[str, bool]:
+        """
+        両方のモデルを事前に読み込む
+        
+        Returns:
+            Dict[str, bool]: モデルごとの読み込み結果（True: 実モデル, False: 簡易フォールバック）
+        """
+        with self._demucs_lock:
+            demucs_ready = self.demucs_processor.warmup()
+        with self._speaker_lock:
+            speaker_ready = self.speaker_processor.warmup()
+        
+        logging.info(f"モデル事前読み込み完了: demucs={demucs_ready}, speaker={speaker_ready}")
+        return {'demucs': demucs_ready, 'speaker': speaker_ready}
+    
+    def release_models(self) -> None:
+        """
+        両方のモデルを解放する（次回の処理で再読み込みされる）
+        
+        キャンセルしてもモデルは解放しないため、パイプラインを他の処理と共有していない
+        呼び出し側が、メモリを返したい時点で呼ぶ。使用中のモデルは処理の完了を待って解放する
+        """
+        with self._demucs_lock:
+            self.demucs_processor.release_model()
+        with self._speaker_lock:
+            self.speaker_processor.release_model()
+    
+    @property
+    def is_warm(self) -> bool:
+        """両方のモデルが読み込み済みかどうか"""
+        return self.demucs_processor.is_warm and self.speaker_processor.is_warm
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        パイプラインの状態を取得
+        
+        Returns:
+            Dict[str, Any]: モデル情報と読み込み状態
+        """
+        return {
+            'demucs': {
+                'model_name': self.demucs_processor.model_name,
+                'is_warm': self.demucs_processor.is_warm
+            },
+            'speaker': {
+                'model_name': self.speaker_processor.model_name,
+                'is_warm': self.speaker_processor.is_warm
+            }
+        }
+    
+    def estimate_time(self, audio_duration: float, params: Optional[Dict[str, Any]] = None) -> Dict[str, TimeEstimate]:
+        """
+        処理時間を推定（処理方式を確定するためモデルを初期化する）
+        
+        Args:
+            audio_duration: 音声の長さ（秒）
+            params: 処理パラメータ（DEFAULT_PARAMSを上書き）
+        
+        Returns:
+            Dict[str, TimeEstimate]: ステージごとの推定と合計（'total'）
+        """
+        run_params = self.DEFAULT_PARAMS.copy()
+        if params:
+            run_params.update(params)
+        
+        # 初期化済みの場合は、他のジョブが処理中でもステージのロックを待たない
+        if not self.demucs_processor.is_warm:
+            with self._demucs_lock:
+                self.demucs_processor._initialize_model()
+        if not self.speaker_processor.is_warm:
+            with self._speaker_lock:
+                self.speaker_processor._initialize_pipeline()
+        
+        estimates = {}
+        if run_params['enable_bgm_separation']:
+            estimates['bgm_separation'] = self.demucs_processor.estimate_processing_time_interval(audio_duration)
+        estimates['speaker_separation'] = self.speaker_processor.estimate_processing_time_interval(audio_duration)
+        
+        total = None
+        for estimate in estimates.values():
+            total = estimate if total is None else total + estimate
+        estimates['total'] = total
+        return estimates
+    
+    def run(
+        self,
+        input_path: str,
+        output_dir: str,
+        params: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        update_callback: Optional[Callable[[ProgressUpdate], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> Dict[str, Any]:
+        """
+        音声分離処理を実行
+        
+        Args:
+            input_path: 入力音声ファイルパス
+            output_dir: 出力ディレクトリ
+            params: 処理パラメータ（DEFAULT_PARAMSを上書き）
+            progress_callback: 進捗コールバック関数 (進捗率0.0-1.0, メッセージ)
+            update_callback: 実時間比・スループット付きの進捗を受け取るコールバック関数
+            cancellation_token: キャンセル・一時停止トークン
+        
+        Returns:
+            Dict[str, Any]: 処理結果情報
+        
+        Raises:
+            FileNotFoundError: 入力ファイルが見つからない場合
+            RuntimeError: 分離処理に失敗した場合
+            OperationCancelledError: キャンセルされた場合
+        """
+        input_path = Path(input_path)
+        output_dir = FileUtils.ensure_directory(output_dir)
+        
+        run_params = self.DEFAULT_PARAMS.copy()
+        if params:
+            run_params.update(params)
+        
+        with profile_stage('pipeline', input=input_path.name):
+            start_time = time.time()
+            audio_info = AudioUtils.get_audio_info(input_path)
+            reporter = ProgressReporter(
+                'pipeline',
+                progress_callback,
+                [update_callback] if update_callback else None,
+                audio_duration=audio_info['duration']
+            )
+            
+            # フェーズ1: BGM分離
+            bgm_files = []
+            speaker_input = input_path
+            music_analysis = None
+            bgm_skipped = False
+            if run_params['enable_bgm_separation'] and not run_params['force_bgm_separation'] and self.music_detector:
+                reporter.update(0.0, "BGMの有無を判定中...")
+                with profile_stage('pipeline.music_detection'):
+                    music_analysis = self.music_detector.detect_file(input_path)
+                if not music_analysis.has_music:
+                    bgm_skipped = True
+                    logging.info("BGMが検出されなかったためBGM分離をスキップします")
+                    reporter.update(0.0, "BGMが検出されなかったためBGM分離をスキップします")
+            
+            if run_params['enable_bgm_separation'] and not bgm_skipped:
+                bgm_weight = self.BGM_PROGRESS_WEIGHT
+                with self._stage_slot(self._demucs_lock, reporter, 0.0, "BGM分離の順番待ち...", cancellation_token):
+                    stage_start = time.time()
+                    with profile_stage('pipeline.bgm_separation'):
+                        vocals_path, bgm_path = self.demucs_processor.separate(
+                            str(input_path),
+                            str(output_dir / 'bgm_separated'),
+                            progress_callback=reporter.sub(0.0, bgm_weight, 'bgm_separation'),
+                            cancellation_token=cancellation_token,
+                            music_analysis=music_analysis
+                        )
+                    self.time_estimator.record(
+                        audio_duration=audio_info['duration'],
+                        processing_time=time.time() - stage_start,
+                        **self.demucs_processor.get_time_estimation_key()
+                    )
+                bgm_files = [vocals_path, bgm_path]
+                speaker_input = Path(vocals_path)
+            else:
+                bgm_weight = 0.0
+            
+            # フェーズ2: 話者分離・音声抽出
+            speaker_end = 1.0 - self.PEAKS_PROGRESS_WEIGHT if run_params['generate_peaks'] else 1.0
+            with self._stage_slot(self._speaker_lock, reporter, bgm_weight, "話者分離の順番待ち...", cancellation_token):
+                reporter.update(bgm_weight, "話者分離処理中...")
+                stage_start = time.time()
+                with profile_stage('pipeline.speaker_separation'):
+                    speaker_result = self.speaker_processor.separate_speakers(
+                        input_file=speaker_input,
+                        output_dir=output_dir / 'speakers',
+                        min_segment_length=run_params['min_segment_length'],
+                        create_combined=run_params['create_combined'],
+                        create_individual=run_params['create_individual'],
+                        naming_style=run_params['naming_style'],
+                        progress_callback=reporter.sub(bgm_weight, speaker_end, 'speaker_separation'),
+                        cancellation_token=cancellation_token,
+                        clustering_threshold=run_params['clustering_threshold'],
+                        segmentation_onset=run_params['segmentation_onset'],
+                        segmentation_offset=run_params['segmentation_offset'],
+                        force_num_speakers=run_params['force_num_speakers'],
+                        segment_container=run_params['segment_container'],
+                        output_format=run_params['output_format'],
+                        bit_depth=run_params['bit_depth'],
+                        speaker_registry=run_params['speaker_registry']
+                    )
+                self.time_estimator.record(
+                    audio_duration=audio_info['duration'],
+                    processing_time=time.time() - stage_start,
+                    **self.speaker_processor.get_time_estimation_key()
+                )
+            
+            # フェーズ3: プレビュー用の波形データ作成
+            peak_files = {}
+            if run_params['generate_peaks']:
+                with profile_stage('pipeline.peaks'):
+                    peak_files = self._generate_peak_files(
+                        input_path, bgm_files, speaker_result['output_files'],
+                        reporter.sub(speaker_end, 1.0, 'peaks'), cancellation_token
+                    )
+            
+            processing_time = time.time() - start_time
+        
+        output_files = speaker_result['output_files']
+        all_files = bgm_files + [f for files in output_files.values() for f in files]
+        
+        result = {
+            'input_file': str(input_path),
+            'output_directory': str(output_dir),
+            'duration': audio_info['duration'],
+            'file_size': audio_info['file_size'],
+            'bgm_files': bgm_files,
+            'bgm_separation_skipped': bgm_skipped,
+            'music_detection': music_analysis.to_dict() if music_analysis else None,
+            'output_files': output_files,
+            'segments_detected': speaker_result['segments_detected'],
+            'speakers_detected': speaker_result['speakers_detected'],
+            'total_duration': speaker_result['total_duration'],
+            'segments': speaker_result.get('segments', []),
+            'segments_file': speaker_result.get('segments_file'),
+            'speaker_identities': speaker_result.get('speaker_identities', {}),
+            'peak_files': peak_files,
+            'total_output_size': sum(FileUtils.get_file_size(f) for f in all_files),
+            'processing_time': processing_time,
+            'parameters': run_params
+        }
+        
+        reporter.update(1.0, "処理完了")
+        logging.info(f"音声分離パイプライン完了: {processing_time:.1f}秒")
+        return result
+    
+    @contextmanager
+    def _stage_slot(
+        self,
+        lock: threading.Lock,
+        reporter: ProgressReporter,
+        progress: float,
+        waiting_message: str,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> Iterator[None]:
+        """
+        ステージのプロセッサを使う権利を確保（他のジョブが使用中の場合は待機する）
+        
+        Args:
+            lock: ステージのロック
+            reporter: 進捗レポーター（待機中の表示に使う）
+            progress: 待機中に表示する進捗率（0.0-1.0）
+            waiting_message: 待機中のメッセージ
+            cancellation_token: 待機中もキャンセルを確認するトークン
+        
+        Raises:
+            OperationCancelledError: 待機中にキャンセルされた場合
+        """
+        if not lock.acquire(blocking=False):
+            reporter.update(progress, waiting_message)
+            while not lock.acquire(timeout=CancellationToken.POLL_INTERVAL):
+                if cancellation_token:
+                    cancellation_token.check()
+        try:
+            yield
+        finally:
+            lock.release()
+    
+    def _generate_peak_files(
+        self,
+        input_path: Path,
+        bgm_files: list,
+        output_files: Dict[str, list],
+        progress: ProgressReporter,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> Dict[str, Any]:
+        """
+        入力・ボーカル・BGM・話者ごとの統合音声の波形ピークファイルを作成
+        
+        Args:
+            input_path: 入力音声ファイルパス
+            bgm_files: [ボーカル, BGM] のファイルパス（BGM分離しない場合は空）
+            output_files: 話者IDごとの出力ファイルパスリスト
+            progress: 進捗レポーター
+            cancellation_token: キャンセルトークン
+        
+        Returns:
+            Dict[str, Any]: 'input', 'vocals', 'bgm' のピークファイルパスと、'speakers'（話者ID → パス）
+        """
+        targets = [('input', None, input_path)]
+        if len(bgm_files) == 2:
+            targets += [('vocals', None, bgm_files[0]), ('bgm', None, bgm_files[1])]
+        for speaker_id, files in output_files.items():
+            combined = [f for f in files if Path(f).stem.endswith('_combined')]
+            if combined:
+                targets.append(('speakers', speaker_id, combined[0]))
+        
+        peak_files: Dict[str, Any] = {'speakers': {}}
+        progress.update(0.0, "波形データ作成中...")
+        for index, (kind, speaker_id, audio_path) in enumerate(targets):
+            if cancellation_token:
+                cancellation_token.check()
+            try:
+                sidecar = str(PeakPyramid.ensure_for_file(audio_path))
+            except Exception as e:
+                logging.warning(f"波形データ作成に失敗: {audio_path}: {e}")
+                continue
+            
+            if speaker_id is None:
+                peak_files[kind] = sidecar
+            else:
+                peak_files['speakers'][speaker_id] = sidecar
+            progress.update((index + 1) / len(targets))
+        
+        return peak_files
@@ -0,0 +1,126 @@
+"""
+スペクトル包絡による話者の特徴量
+
+0.5秒の窓ごとに、有音のフレームの対数帯域エネルギー（70-4000Hz、対数間隔）を平均し、
+窓内の平均を引いて正規化したベクトルを話者の特徴量とする。
+逐次話者分離の窓の割り当てと、話者登録簿の照合で同じ特徴量を使う
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from ..utils.speech_activity import SpeechActivityDetector
+from .segment_table import SegmentTable
+
+
+class SpeakerEmbedder:
+    """窓ごとの話者特徴量の計算"""
+    
+    # 話者を判定する窓の長さ（秒）
+    WINDOW_SECONDS = 0.5
+    
+    # スペクトルのフレーム長の目安（秒、2のべき乗のサンプル数に切り上げる）
+    FRAME_SECONDS = 0.032
+    
+    # 特徴量の帯域数（次元数）と周波数範囲（Hz、対数間隔）
+    NUM_BANDS = 40
+    MIN_FREQUENCY = 70.0
+    MAX_FREQUENCY = 4000.0
+    
+    # 窓の半分以上のフレームが有音なら発話の窓とする
+    MIN_VOICED_RATIO = 0.5
+    
+    def __init__(self, sample_rate: int):
+        """
+        特徴量の計算を初期化
+        
+        Args:
+            sample_rate: 音声のサンプリングレート
+        """
+        self.sample_rate = int(sample_rate)
+        self.frame = 1 << int(np.ceil(np.log2(self.sample_rate * self.FRAME_SECONDS)))
+        self.frames_per_window = max(int(round(self.WINDOW_SECONDS * self.sample_rate / self.frame)), 1)
+        self.window_samples = self.frame * self.frames_per_window
+        self._band_matrix = self._build_band_matrix()
+    
+    def _build_band_matrix(self) -> np.ndarray:
+        """振幅スペクトル → 対数間隔の帯域の平均パワー の変換行列"""
+        freqs = np.fft.rfftfreq(self.frame, 1.0 / self.sample_rate)
+        edges = np.geomspace(self.MIN_FREQUENCY, min(self.MAX_FREQUENCY, self.sample_rate / 2), self.NUM_BANDS + 1)
+        band_of = np.digitize(freqs, edges) - 1
+        matrix = np.zeros((self.NUM_BANDS, len(freqs)))
+        for band in range(self.NUM_BANDS):
+            matrix[band, band_of == band] = 1.0
+        return matrix / np.maximum(matrix.sum(axis=1, keepdims=True), 1.0)
+    
+    def frame_levels(self, windows: np.ndarray) -> np.ndarray:
+        """
+        フレームごとのレベル
+        
+        Args:
+            windows: 窓の長さの倍数の音声（モノラル）
+        
+        Returns:
+            np.ndarray: [窓, フレーム] のレベル（dB）
+        """
+        frames = windows.reshape(-1, self.frame)
+        levels = 10.0 * np.log10(np.maximum(np.square(frames, dtype=np.float64).mean(axis=1), 1e-12))
+        return levels.reshape(-1, self.frames_per_window)
+    
+    @staticmethod
+    def activity_threshold(peak_level: float) -> float:
+        """最大レベルから有音とみなすレベルの下限（dB）"""
+        return max(SpeechActivityDetector.ABSOLUTE_FLOOR_DB, peak_level - SpeechActivityDetector.DYNAMIC_RANGE_DB)
+    
+    def window_features(self, windows: np.ndarray, active: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        窓ごとの特徴量
+        
+        Args:
+            windows: 窓の長さの倍数の音声（モノラル）
+            active: [窓, フレーム] の有音フレーム
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (正規化した特徴量 [窓, NUM_BANDS], 発話の窓)
+        """
+        num_windows = len(active)
+        frames = windows.reshape(-1, self.frame)
+        power = np.square(np.abs(np.fft.rfft(frames * np.hanning(self.frame), axis=1)))
+        log_bands = np.log(power @ self._band_matrix.T + 1e-10).reshape(num_windows, self.frames_per_window, -1)
+        
+        # 有音のフレームだけを平均する
+        weights = active[:, :, None].astype(np.float64)
+        features = (log_bands * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1.0)
+        features -= features.mean(axis=1, keepdims=True)
+        features /= np.maximum(np.linalg.norm(features, axis=1, keepdims=True), 1e-9)
+        return features, active.mean(axis=1) >= self.MIN_VOICED_RATIO
+    
+    def embed_speakers(self, audio: np.ndarray, segments: SegmentTable) -> Dict[str, np.ndarray]:
+        """
+        話者ごとの特徴量（各話者のセグメント内の発話の窓の平均）
+        
+        Args:
+            audio: 音声データ（モノラル）
+            segments: 話者セグメント
+        
+        Returns:
+            Dict[str, np.ndarray]: 話者ID → 正規化した特徴量（発話の窓が無い話者は含まない）
+        """
+        peak = float(self.frame_levels(audio[:len(audio) - len(audio) % self.window_samples]).max(initial=-120.0))
+        threshold = self.activity_threshold(peak)
+        
+        embeddings = {}
+        for speaker_id, table in segments.group_by_speaker().items():
+            total = np.zeros(self.NUM_BANDS)
+            for start, end in zip(table.starts.tolist(), table.ends.tolist()):
+                part = audio[int(start * self.sample_rate):int(end * self.sample_rate)]
+                part = part[:len(part) - len(part) % self.window_samples]
+                if not len(part):
+                    continue
+                features, voiced = self.window_features(part, self.frame_levels(part) > threshold)
+                total += features[voiced].sum(axis=0)
+            norm = np.linalg.norm(total)
+            if norm > 0:
+                embeddings[speaker_id] = total / norm
+        return embeddings
@@ -7,11 +7,30 @@ pyannote-audioモデルを使用して話者の識別・分離を行う処理を
 import os
 import logging
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Any, Callable
+from typing import List, Dict, Tuple, Optional, Any, Callable, Union
+from concurrent.futures import Future
+from contextlib import contextmanager
 import numpy as np
 
+from ..utils.audio_encoder import AudioEncoderPool
+from ..utils.audio_stream import AudioStream
 from ..utils.audio_utils import AudioUtils
+from ..utils.cancellation import CancellationToken, CheckedCall, OperationCancelledError, release_device_memory
 from ..utils.file_utils import FileUtils
+from ..utils.lazy_import import lazy_import
+from ..utils.profiler import profile_stage
+from ..utils.progress import ProgressReporter
+from ..utils.speech_activity import SpeechActivityDetector, SpeechActivityMap
+from ..utils.time_estimator import ProcessingTimeEstimator, TimeEstimate
+from .incremental_diarizer import IncrementalDiarizer
+from .segment_container import SegmentContainerWriter
+from .segment_io import SegmentIO
+from .segment_table import SegmentTable
+from .speaker_registry import SpeakerRegistry
+from .speaker_stats import SpeakerStatistics
+
+# 読み込みに時間がかかるため、最初に使う時点で読み込む
+sf = lazy_import('soundfile')
 
 
 class SpeakerSegment:
@@ -37,6 +56,15 @@ class SpeakerSegment:
         """セグメントの長さ（秒）"""
         return self.end_time - self.start_time
     
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書に変換"""
+        return {
+            'start': self.start_time,
+            'end': self.end_time,
+            'speaker': self.speaker_id,
+            'confidence': self.confidence
+        }
+    
     def __repr__(self) -> str:
         return f"SpeakerSegment(speaker={self.speaker_id}, {self.start_time:.2f}-{self.end_time:.2f}s, conf={self.confidence:.2f})"
 
@@ -60,6 +88,18 @@ class SpeakerProcessor:
         }
     }
     
+    # pyannoteパイプラインのフック段階ごとの進捗範囲とメッセージ
+    # （クラスタリングはembeddings完了後、discrete_diarizationの前に行われる）
+    PYANNOTE_PROGRESS_STEPS = {
+        'segmentation': (0.0, 0.4, "セグメンテーション中..."),
+        'speaker_counting': (0.4, 0.45, "話者数推定中..."),
+        'embeddings': (0.45, 0.9, "話者埋め込み抽出中..."),
+        'discrete_diarization': (0.9, 1.0, "クラスタリング中...")
+    }
+    
+    # 話者分離結果のセグメントファイル名（出力ディレクトリに保存）
+    SEGMENTS_FILENAME = 'segments.json'
+    
     def __init__(
         self,
         model_name: str = 'pyannote/speaker-diarization-3.1',
@@ -80,6 +120,12 @@ class SpeakerProcessor:
         self.pipeline = None
         self._is_initialized = False
         
+        # 実測記録に基づく処理時間推定（パイプラインから設定される）
+        self.time_estimator: Optional[ProcessingTimeEstimator] = None
+        
+        # 無音区間を除いて話者分離するための音声区間検出（Noneの場合は全体を処理）
+        self.activity_detector: Optional[SpeechActivityDetector] = SpeechActivityDetector()
+        
         # モデル名の検証
         if model_name not in self.AVAILABLE_MODELS:
             raise ValueError(f"サポートされていないモデル: {model_name}")
@@ -199,6 +245,31 @@ class SpeakerProcessor:
         except Exception as e:
             raise RuntimeError(f"話者分離パイプラインの初期化に失敗: {e}")
     
+    def warmup(self) -> bool:
+        """
+        パイプラインを事前に読み込み、最初の話者分離の待ち時間をなくす
+        
+        Returns:
+            bool: pyannote-audioパイプラインを読み込めた場合True（簡易分離の場合False）
+        """
+        self._initialize_pipeline()
+        return bool(getattr(self, '_pyannote_available', False))
+    
+    @property
+    def is_warm(self) -> bool:
+        """パイプラインが読み込み済みで、すぐに話者分離を開始できるか"""
+        return self._is_initialized
+    
+    def release_model(self) -> None:
+        """読み込み済みのpyannoteパイプラインを解放（次回の話者分離で再読み込みされる）"""
+        if self.pipeline is None:
+            return
+        
+        self.pipeline = None
+        self._is_initialized = False
+        release_device_memory()
+        logging.info("pyannoteパイプラインを解放しました")
+    
     def _initialize_pipeline_with_params(
         self, 
         clustering_threshold: float,
@@ -237,8 +308,10 @@ class SpeakerProcessor:
         clustering_threshold: float = 0.5,  # より細かく分離
         segmentation_onset: float = 0.3,  # セグメンテーション開始感度
         segmentation_offset: float = 0.3,  # セグメンテーション終了感度
-        force_num_speakers: Optional[int] = None  # 強制的に指定した話者数に分離
-    ) -> List[SpeakerSegment]:
+        force_num_speakers: Optional[int] = None,  # 強制的に指定した話者数に分離
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> SegmentTable:
         """
         音声ファイルの話者分離を実行
         
@@ -250,13 +323,16 @@ class SpeakerProcessor:
             segmentation_onset: セグメンテーション開始感度（0.1-0.9、低いほど細かく検出）
             segmentation_offset: セグメンテーション終了感度（0.1-0.9、低いほど細かく検出）
             force_num_speakers: 強制的に指定した話者数に分離（Noneの場合は自動検出）
+            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)、またはProgressReporter
+            cancellation_token: キャンセル・一時停止トークン（推論バッチごとに確認）
             
         Returns:
-            List[SpeakerSegment]: 話者セグメントのリスト
+            SegmentTable: 話者セグメント（反復すると SpeakerSegment と同じ属性の行を返す）
             
         Raises:
             FileNotFoundError: 音声ファイルが見つからない場合
             RuntimeError: 話者分離処理に失敗した場合
+            OperationCancelledError: キャンセルされた場合（パイプラインは読み込んだまま残す）
         """
         audio_path = Path(audio_path)
         
@@ -268,6 +344,7 @@ class SpeakerProcessor:
         logging.info(f"モデル: {self.model_name}")
         logging.info(f"最小セグメント長: {min_duration}秒")
         
+        token = cancellation_token
         try:
             # パイプライン初期化（パラメータ更新）
             self._initialize_pipeline_with_params(clustering_threshold, segmentation_onset, segmentation_offset)
@@ -275,6 +352,7 @@ class SpeakerProcessor:
             # 音声情報取得
             audio_info = AudioUtils.get_audio_info(audio_path)
             duration = audio_info['duration']
+            reporter = ProgressReporter.ensure(progress_callback, 'diarize', duration)
             
             logging.info(f"音声長: {duration:.2f}秒")
             logging.info(f"クラスタリング閾値: {clustering_threshold}")
@@ -286,19 +364,30 @@ class SpeakerProcessor:
             audio_info = AudioUtils.get_audio_info(audio_path)
             logging.info(f"話者分離入力音声品質: {audio_info}")
             
+            if token:
+                token.check()
+            
             # BGM分離後の音声に最適化された前処理を適用
             if hasattr(self, '_pyannote_available') and self._pyannote_available:
                 logging.info("BGM分離済み音声用の軽微な前処理実行中...")
+                reporter.update(0.0, "前処理中...")
                 
-                # 元音声を読み込み
-                audio_data, sample_rate = AudioUtils.load_audio(audio_path)
-                
-                # BGM分離後音声用の軽微な処理（ノイズ除去のみ）
-                enhanced_audio = AudioUtils.light_enhance_for_diarization(audio_data, sample_rate)
-                
-                # 一時ファイルに保存
-                temp_enhanced_path = audio_path.parent / f"temp_light_enhanced_{audio_path.name}"
-                AudioUtils.save_audio(enhanced_audio, temp_enhanced_path, sample_rate)
+                with profile_stage('diarize.preprocess'):
+                    # 元音声を読み込み
+                    audio_data, sample_rate = AudioUtils.load_audio(audio_path)
+                    
+                    # BGM分離後音声用の軽微な処理（ノイズ除去のみ）
+                    enhanced_audio = AudioUtils.light_enhance_for_diarization(audio_data, sample_rate)
+                    
+                    # 無音区間を除いた音声だけを話者分離する（結果は元の時刻に戻す）
+                    if self.activity_detector is not None:
+                        activity = self.activity_detector.detect(audio_data, sample_rate)
+                    else:
+                        activity = SpeechActivityMap.full(len(audio_data), sample_rate)
+                    
+                    # 一時ファイルに保存（入力の形式に関係なく劣化しないWAVで書き出す）
+                    temp_enhanced_path = audio_path.with_name(f"temp_light_enhanced_{audio_path.stem}.wav")
+                    AudioUtils.save_audio(activity.compact(enhanced_audio), temp_enhanced_path, sample_rate, format='wav')
                 
                 # 処理後の音声パスを更新
                 audio_path_for_processing = temp_enhanced_path
@@ -308,39 +397,106 @@ class SpeakerProcessor:
             
             # 話者分離実行
             if hasattr(self, '_pyannote_available') and self._pyannote_available:
-                segments = self._diarize_pyannote(audio_path_for_processing, duration, min_duration, max_speakers, clustering_threshold, force_num_speakers)
-                
-                # 一時ファイル削除
-                if audio_path_for_processing != audio_path:
-                    try:
-                        audio_path_for_processing.unlink()
-                        logging.info("一時ファイル削除完了")
-                    except Exception:
-                        pass
+                try:
+                    with profile_stage('diarize.pyannote'):
+                        segments = self._diarize_pyannote(
+                            audio_path_for_processing, activity.active_duration, min_duration, max_speakers, clustering_threshold, force_num_speakers,
+                            progress=reporter.sub(0.1, 1.0, 'pyannote.inference'),
+                            token=token
+                        )
+                        segments = activity.map_segments(segments)
+                finally:
+                    # 一時ファイル削除（キャンセル・エラーの場合も残さない）
+                    if audio_path_for_processing != audio_path:
+                        try:
+                            audio_path_for_processing.unlink()
+                            logging.info("一時ファイル削除完了")
+                        except Exception:
+                            pass
             else:
-                segments = self._diarize_simple(audio_path, duration, min_duration, max_speakers, force_num_speakers)
+                with profile_stage('diarize.simple'):
+                    segments = self._diarize_simple(
+                        audio_path, duration, min_duration, max_speakers, force_num_speakers,
+                        progress=reporter.sub(0.0, 1.0, 'diarize.simple'),
+                        token=token
+                    )
             
             # 結果のフィルタリング
-            filtered_segments = [
-                seg for seg in segments 
-                if seg.duration >= min_duration
-            ]
+            filtered_segments = SegmentTable.from_segments(segments).filter_min_duration(min_duration)
             
             logging.info(f"話者分離完了: {len(filtered_segments)}個のセグメント検出")
+            reporter.update(1.0, "話者分離完了")
             
             # 話者統計
-            speakers = list(set(seg.speaker_id for seg in filtered_segments))
-            for speaker in speakers:
-                speaker_segments = [seg for seg in filtered_segments if seg.speaker_id == speaker]
-                total_duration = sum(seg.duration for seg in speaker_segments)
-                logging.info(f"話者{speaker}: {len(speaker_segments)}セグメント, 合計{total_duration:.2f}秒")
+            stats = SpeakerStatistics(filtered_segments)
+            for speaker, count, total_duration in zip(stats.speakers, stats.segment_counts, stats.durations):
+                logging.info(f"話者{speaker}: {count}セグメント, 合計{total_duration:.2f}秒")
             
             return filtered_segments
             
+        except OperationCancelledError:
+            logging.info("話者分離がキャンセルされました")
+            raise
         except Exception as e:
             logging.error(f"話者分離処理でエラー: {e}")
             raise RuntimeError(f"話者分離に失敗: {e}")
     
+    def diarize_stream(
+        self,
+        stream: AudioStream,
+        min_duration: float = 0.5,
+        max_speakers: Optional[int] = None,
+        audio_output_path: Optional[Union[str, Path]] = None,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> SegmentTable:
+        """
+        音声ストリームを受信しながら話者分離を実行
+        
+        pyannoteは全体を見てクラスタリングするため、ストリームでは IncrementalDiarizer で
+        受信したブロックごとに話者を割り当てる
+        
+        Args:
+            stream: 入力の音声ストリーム
+            min_duration: 最小セグメント長（秒）
+            max_speakers: 最大話者数（Noneの場合は自動検出）
+            audio_output_path: 受信した音声を書き出すWAVファイルパス（話者音声の抽出に使う、Noneの場合は書き出さない）
+            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)、またはProgressReporter
+                （全体の長さが分かる場合は受信した割合、分からない場合は進捗率を進めず受信済みの長さを通知）
+            cancellation_token: キャンセル・一時停止トークン（ブロックごとに確認）
+            
+        Returns:
+            SegmentTable: 話者セグメント
+        """
+        logging.info(f"ストリームの話者分離開始: {stream.name}")
+        reporter = ProgressReporter.ensure(progress_callback, 'diarization')
+        diarizer = IncrementalDiarizer(stream.sample_rate, max_speakers=max_speakers, min_duration=min_duration)
+        
+        audio_file = None
+        if audio_output_path is not None:
+            Path(audio_output_path).parent.mkdir(parents=True, exist_ok=True)
+            audio_file = sf.SoundFile(str(audio_output_path), 'w', stream.sample_rate, 1,
+                                      AudioUtils.OUTPUT_FORMATS['wav']['subtypes'][16], format='WAV')
+        received = 0
+        try:
+            with profile_stage('speaker.diarize_stream'):
+                for block in stream.blocks(cancellation_token=cancellation_token):
+                    if audio_file is not None:
+                        audio_file.write(block)
+                    update = diarizer.update(block)
+                    received += block.shape[-1]
+                    message = f"話者分離中: {update.processed_duration:.0f}秒受信, {diarizer.num_speakers}人"
+                    fraction = min(received / stream.total_samples, 1.0) if stream.total_samples else 0.0
+                    reporter.update(0.99 * fraction, message)
+                segments = diarizer.finalize()
+        finally:
+            if audio_file is not None:
+                audio_file.close()
+        
+        reporter.audio_duration = stream.duration
+        reporter.update(1.0, "話者分離完了")
+        return segments
+    
     def _diarize_pyannote(
         self,
         audio_path: Path,
@@ -348,8 +504,10 @@ class SpeakerProcessor:
         min_duration: float,
         max_speakers: Optional[int],
         clustering_threshold: float = 0.7,
-        force_num_speakers: Optional[int] = None
-    ) -> List[SpeakerSegment]:
+        force_num_speakers: Optional[int] = None,
+        progress: Optional[ProgressReporter] = None,
+        token: Optional[CancellationToken] = None
+    ) -> SegmentTable:
         """
         pyannote-audioを使用した実際の話者分離
         
@@ -358,9 +516,11 @@ class SpeakerProcessor:
             duration: 音声の長さ
             min_duration: 最小セグメント長
             max_speakers: 最大話者数
+            progress: セグメンテーション・埋め込み抽出・クラスタリングの進捗を通知するレポーター
+            token: キャンセルトークン（推論バッチごとに確認）
             
         Returns:
-            List[SpeakerSegment]: 話者セグメント
+            SegmentTable: 話者セグメント
         """
         logging.info("実際のpyannote-audioによる話者分離実行中...")
         
@@ -370,27 +530,35 @@ class SpeakerProcessor:
             warnings.filterwarnings("ignore", message="std(): degrees of freedom is <= 0")
             # pyannote-audioパイプライン実行
             # v3.1では直接パラメータを渡すことができないため、標準実行
-            diarization = self.pipeline(str(audio_path))
+            pipeline = self.pipeline
+            with profile_stage('pyannote.inference'):
+                if (progress is not None or token is not None) and self._pipeline_accepts_hook():
+                    # キャンセルはフック（推論バッチごと）で確認する
+                    diarization = pipeline(str(audio_path), hook=self._make_pyannote_hook(progress, token))
+                elif token is not None:
+                    # フックに対応していない版は、推論バッチを処理する関数を差し替えて確認する
+                    with self._checked_inference(pipeline, token):
+                        diarization = pipeline(str(audio_path))
+                    token.check()
+                else:
+                    diarization = pipeline(str(audio_path))
             
-            # 結果をSpeakerSegmentに変換
-            segments = []
+            # 結果をセグメントテーブルに変換
+            starts, ends, labels = [], [], []
             for turn, track, speaker in diarization.itertracks(yield_label=True):
-                # セグメント長チェック
-                segment_duration = turn.end - turn.start
-                if segment_duration >= min_duration:
-                    segment = SpeakerSegment(
-                        start_time=turn.start,
-                        end_time=turn.end,
-                        speaker_id=speaker,
-                        confidence=1.0  # pyannoteは信頼度を直接提供しないため1.0とする
-                    )
-                    segments.append(segment)
+                starts.append(turn.start)
+                ends.append(turn.end)
+                labels.append(speaker)
+            
+            # セグメント長チェック（pyannoteは信頼度を直接提供しないため1.0とする）
+            segments = SegmentTable.from_arrays(starts, ends, labels, confidences=1.0).filter_min_duration(min_duration)
             
             # 話者数制限処理（強制話者数を優先）
             target_speakers = force_num_speakers if force_num_speakers is not None else max_speakers
             
             if target_speakers is not None:
-                unique_speakers = len(set(seg.speaker_id for seg in segments))
+                stats = SpeakerStatistics(segments)
+                unique_speakers = stats.num_speakers
                 if force_num_speakers is not None:
                     logging.info(f"検出された話者数: {unique_speakers}人, 強制話者数: {force_num_speakers}人")
                 else:
@@ -403,24 +571,9 @@ class SpeakerProcessor:
                     else:
                         logging.info(f"話者数を{unique_speakers}人から{max_speakers}人に制限します")
                     
-                    # 話者ごとの総発話時間を計算
-                    speaker_durations = {}
-                    for segment in segments:
-                        if segment.speaker_id not in speaker_durations:
-                            speaker_durations[segment.speaker_id] = 0.0
-                        speaker_durations[segment.speaker_id] += segment.duration
-                    
-                    # 発話時間の長い順にソート
-                    top_speakers = sorted(
-                        speaker_durations.items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:target_speakers]
-                    
-                    top_speaker_ids = [speaker_id for speaker_id, _ in top_speakers]
-                    
-                    # 上位話者のセグメントのみを保持
-                    segments = [seg for seg in segments if seg.speaker_id in top_speaker_ids]
+                    # 発話時間の長い上位話者のセグメントのみを保持
+                    top_speaker_ids = stats.top_speakers(target_speakers)
+                    segments = segments.select_speakers(top_speaker_ids)
                     
                     if force_num_speakers is not None:
                         logging.info(f"強制話者数制限適用完了: {len(top_speaker_ids)}人の話者を保持")
@@ -439,10 +592,89 @@ class SpeakerProcessor:
             logging.info(f"実際のpyannote-audio分離完了: {len(segments)}セグメント")
             return segments
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.error(f"pyannote-audio分離でエラー: {e}")
             logging.info("簡易分離にフォールバック")
-            return self._diarize_simple(audio_path, duration, min_duration, max_speakers, force_num_speakers)
+            return self._diarize_simple(audio_path, duration, min_duration, max_speakers, force_num_speakers, progress, token)
+    
+    def _pipeline_accepts_hook(self) -> bool:
+        """pyannoteパイプラインが進捗フック（hook引数）に対応しているか"""
+        import inspect
+        
+        apply = getattr(self.pipeline, 'apply', None)
+        if apply is None:
+            return False
+        try:
+            return 'hook' in inspect.signature(apply).parameters
+        except (TypeError, ValueError):
+            return False
+    
+    @staticmethod
+    @contextmanager
+    def _checked_inference(pipeline, token: CancellationToken):
+        """
+        pyannoteのセグメンテーション・埋め込み抽出の推論バッチごとにキャンセルを確認する
+        
+        進捗フックに対応していない版のため、バッチを処理する関数（_segmentation.infer・_embedding）を
+        一時的にトークンを確認するラッパーに差し替え、終了時に元に戻す
+        
+        Args:
+            pipeline: pyannoteパイプライン
+            token: キャンセルトークン
+        """
+        replaced = []
+        for owner, name in ((getattr(pipeline, '_segmentation', None), 'infer'), (pipeline, '_embedding')):
+            func = getattr(owner, name, None) if owner is not None else None
+            if not callable(func):
+                continue
+            replaced.append((owner, name, func, name in vars(owner)))
+            setattr(owner, name, CheckedCall(func, token))
+        try:
+            yield
+        finally:
+            for owner, name, func, own_attribute in reversed(replaced):
+                if own_attribute:
+                    setattr(owner, name, func)
+                else:
+                    delattr(owner, name)
+    
+    def _make_pyannote_hook(
+        self,
+        progress: Optional[ProgressReporter],
+        token: Optional[CancellationToken] = None
+    ) -> Callable[..., None]:
+        """
+        pyannoteパイプラインの進捗フックを作成
+        
+        段階名（segmentation, embeddings等）とバッチの完了数を
+        PYANNOTE_PROGRESS_STEPSの範囲に割り当てて通知する。
+        フックはバッチごとに呼ばれるため、キャンセル・一時停止もここで確認する
+        
+        Args:
+            progress: 進捗を通知するレポーター
+            token: キャンセルトークン
+        
+        Returns:
+            Callable[..., None]: pipeline(..., hook=...) に渡すフック関数
+        """
+        steps = self.PYANNOTE_PROGRESS_STEPS
+        
+        def hook(step_name, step_artifact, file=None, total=None, completed=None):
+            if token:
+                token.check()
+            if progress is None or step_name not in steps:
+                return
+            start, end, message = steps[step_name]
+            fraction = completed / total if total and completed is not None else 1.0
+            progress.update(start + (end - start) * fraction, message)
+            
+            # 埋め込み抽出の完了後はクラスタリングが始まる
+            if step_name == 'embeddings' and fraction >= 1.0:
+                progress.update(steps['discrete_diarization'][0], steps['discrete_diarization'][2])
+        
+        return hook
     
     def _diarize_simple(
         self,
@@ -450,8 +682,10 @@ class SpeakerProcessor:
         duration: float,
         min_duration: float,
         max_speakers: Optional[int],
-        force_num_speakers: Optional[int] = None
-    ) -> List[SpeakerSegment]:
+        force_num_speakers: Optional[int] = None,
+        progress: Optional[ProgressReporter] = None,
+        token: Optional[CancellationToken] = None
+    ) -> SegmentTable:
         """
         簡易話者分離実装
         
@@ -460,60 +694,56 @@ class SpeakerProcessor:
             duration: 音声の長さ
             min_duration: 最小セグメント長
             max_speakers: 最大話者数
+            progress: 進捗を通知するレポーター
+            token: キャンセルトークン
             
         Returns:
-            List[SpeakerSegment]: 簡易話者セグメント
+            SegmentTable: 簡易話者セグメント
         """
         logging.info("簡易話者分離実行中...")
         
         # 音声を読み込んで振幅ベースで話者変化点を推定
         try:
+            if progress is not None:
+                progress.update(0.0, "音声読み込み中...")
             audio_data, sample_rate = AudioUtils.load_audio(audio_path)
             
             # 振幅ベースのセグメンテーション
+            if token:
+                token.check()
+            if progress is not None:
+                progress.update(0.5, "振幅解析中...")
             segments = self._segment_by_amplitude(audio_data, sample_rate, duration, min_duration)
             
             # 話者ID割り当て（簡易的）
             target_speakers = force_num_speakers if force_num_speakers is not None else max_speakers
-            segments = self._assign_speaker_ids(segments, target_speakers)
+            segments = SegmentTable.from_segments(self._assign_speaker_ids(segments, target_speakers))
             
             # 強制話者数処理（簡易分離版）
             if force_num_speakers is not None:
-                unique_speakers = len(set(seg.speaker_id for seg in segments))
+                stats = SpeakerStatistics(segments)
+                unique_speakers = stats.num_speakers
                 logging.info(f"簡易分離: 検出された話者数: {unique_speakers}人, 強制話者数: {force_num_speakers}人")
                 
                 if unique_speakers > force_num_speakers:
                     # 発話時間の長い上位N人に制限
                     logging.info(f"簡易分離: 話者数を{unique_speakers}人から{force_num_speakers}人に制限します")
                     
-                    # 話者ごとの総発話時間を計算
-                    speaker_durations = {}
-                    for segment in segments:
-                        if segment.speaker_id not in speaker_durations:
-                            speaker_durations[segment.speaker_id] = 0.0
-                        speaker_durations[segment.speaker_id] += segment.duration
-                    
-                    # 発話時間の長い順にソート
-                    top_speakers = sorted(
-                        speaker_durations.items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:force_num_speakers]
-                    
-                    top_speaker_ids = [speaker_id for speaker_id, _ in top_speakers]
-                    
-                    # 上位話者のセグメントのみを保持
-                    segments = [seg for seg in segments if seg.speaker_id in top_speaker_ids]
+                    # 発話時間の長い上位話者のセグメントのみを保持
+                    top_speaker_ids = stats.top_speakers(force_num_speakers)
+                    segments = segments.select_speakers(top_speaker_ids)
                     
                     logging.info(f"簡易分離: 強制話者数制限適用完了: {len(top_speaker_ids)}人の話者を保持")
             
             logging.info(f"簡易話者分離完了: {len(segments)}セグメント")
             return segments
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.warning(f"簡易分離でもエラー: {e}")
             # 最後の手段：時間ベース分割
-            return self._diarize_time_based(duration, min_duration, max_speakers)
+            return SegmentTable.from_segments(self._diarize_time_based(duration, min_duration, max_speakers))
     
     def _segment_by_amplitude(
         self,
@@ -645,22 +875,34 @@ class SpeakerProcessor:
     def extract_speaker_audio(
         self,
         audio_path: str,
-        segments: List[SpeakerSegment],
+        segments: SegmentTable,
         output_dir: str,
         create_individual: bool = True,
         create_combined: bool = True,
-        naming_style: str = "detailed"  # "simple" or "detailed"
+        naming_style: str = "detailed",  # "simple" or "detailed"
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        fade_duration: float = 0.01,
+        segment_container: bool = False,
+        output_format: str = 'wav',
+        bit_depth: int = 16
     ) -> Dict[str, List[str]]:
         """
         話者セグメントから音声ファイルを抽出
         
         Args:
             audio_path: 元音声ファイルパス
-            segments: 話者セグメントリスト
+            segments: 話者セグメント（SegmentTable、または SpeakerSegment のリスト）
             output_dir: 出力ディレクトリ
             create_individual: 個別セグメントファイルを作成するか
             create_combined: 結合ファイルを作成するか
             naming_style: ファイル命名スタイル ("simple": segment_001.wav, "detailed": filename_speaker01_seg001_0m15s-0m23s.wav)
+            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)、またはProgressReporter
+            cancellation_token: キャンセル・一時停止トークン（ファイル書き出しごとに確認）
+            fade_duration: 個別セグメントのフェードイン・フェードアウト時間（秒）
+            segment_container: 個別セグメントを話者ごとに1つの音声ファイル（と索引ファイル）にまとめるか
+            output_format: 出力形式 ('wav', 'flac', 'ogg', 'opus', 'mp3'、コンテナはシークのため常にWAV)
+            bit_depth: ビット深度（WAV: 16/24/32、FLAC: 16/24）
             
         Returns:
             Dict[str, List[str]]: 話者IDごとの出力ファイルパスリスト
@@ -668,6 +910,7 @@ class SpeakerProcessor:
         Raises:
             FileNotFoundError: 音声ファイルが見つからない場合
             RuntimeError: 音声抽出処理に失敗した場合
+            OperationCancelledError: キャンセルされた場合
         """
         audio_path = Path(audio_path)
         output_dir = Path(output_dir)
@@ -681,90 +924,135 @@ class SpeakerProcessor:
         
         try:
             # 音声データ読み込み
-            audio_data, sample_rate = AudioUtils.load_audio(audio_path)
+            with profile_stage('extract.decode'):
+                audio_data, sample_rate = AudioUtils.load_audio(audio_path)
+            reporter = ProgressReporter.ensure(progress_callback, 'extract', len(audio_data) / sample_rate)
             
             # 元ファイル名のベース名を取得
             base_name = audio_path.stem  # 拡張子なしのファイル名
             
             # 話者ごとにグループ化
-            speaker_segments = {}
-            for segment in segments:
-                if segment.speaker_id not in speaker_segments:
-                    speaker_segments[segment.speaker_id] = []
-                speaker_segments[segment.speaker_id].append(segment)
+            segments = SegmentTable.from_segments(segments)
+            speaker_segments = segments.group_by_speaker()
+            speaker_labels = self._speaker_labels(speaker_segments, naming_style)
+            
+            # 話者IDごとの出力（エンコード中のファイルは Future）
+            output_files: Dict[str, list] = {}
             
-            output_files = {}
+            # 書き出すファイル数（ファイルごとに進捗を通知）
+            total_files = (len(segments) if create_individual else 0) + (len(speaker_segments) if create_combined else 0)
+            written_files = 0
+            reporter.update(0.0, "話者音声書き出し中...")
             
-            for speaker_id, speaker_segs in speaker_segments.items():
-                logging.info(f"話者{speaker_id}の音声抽出: {len(speaker_segs)}セグメント")
+            # 圧縮形式のエンコードはワーカーで行い、次のセグメントの切り出しと並行させる
+            with AudioEncoderPool(output_format, bit_depth) as encoder:
+                for speaker_id, speaker_segs in speaker_segments.items():
+                    logging.info(f"話者{speaker_id}の音声抽出: {len(speaker_segs)}セグメント")
                 
-                # 話者ディレクトリ作成（naming_styleに応じて）
-                if naming_style == "detailed":
-                    speaker_num = speaker_id.replace("SPEAKER_", "")
-                    try:
-                        speaker_num = f"{int(speaker_num)+1:02d}"
-                    except ValueError:
-                        speaker_num = "01"
-                    speaker_dir = output_dir / f"speaker_{speaker_num}_{base_name}"
-                else:
-                    speaker_dir = output_dir / f"speaker_{speaker_id}"
+                    # 話者ディレクトリ作成（naming_styleに応じて）
+                    speaker_label = speaker_labels[speaker_id]
+                    if naming_style == "detailed":
+                        speaker_dir = output_dir / f"speaker_{speaker_label}_{base_name}"
+                    else:
+                        speaker_dir = output_dir / f"speaker_{speaker_label}"
                 
-                FileUtils.ensure_directory(speaker_dir)
+                    FileUtils.ensure_directory(speaker_dir)
                 
-                output_files[speaker_id] = []
-                extracted_segments = []
+                    output_files[speaker_id] = []
+                    extracted_segments = []
                 
-                # 個別セグメントファイル作成
-                if create_individual:
-                    for i, segment in enumerate(speaker_segs):
-                        # 音声データを時間で切り出し
-                        segment_audio = AudioUtils.split_audio_by_time(
-                            audio_data, sample_rate,
-                            segment.start_time, segment.end_time
+                    # 個別セグメントをまとめるコンテナ（話者ごとに1ファイル）
+                    container = None
+                    if create_individual and segment_container:
+                        combined_name = self._generate_filename(base_name, speaker_id, naming_style, speaker_label=speaker_label)
+                        container = SegmentContainerWriter(
+                            speaker_dir / combined_name.replace('_combined.wav', '_segments.wav'),
+                            sample_rate, speaker_id=speaker_id, source_file=audio_path.name
                         )
+                
+                    # 個別セグメントファイル作成
+                    if create_individual:
+                        for i, segment in enumerate(speaker_segs):
+                            if cancellation_token:
+                                cancellation_token.check()
                         
-                        if len(segment_audio) > 0:
-                            # フェード処理適用
-                            segment_audio = AudioUtils.apply_fade(segment_audio, sample_rate)
-                            
-                            # ファイル名生成
-                            filename = self._generate_filename(
-                                base_name=base_name,
-                                speaker_id=speaker_id,
-                                naming_style=naming_style,
-                                segment_idx=i+1,
-                                start_time=segment.start_time,
-                                end_time=segment.end_time
+                            # 音声データを時間で切り出し
+                            segment_audio = AudioUtils.split_audio_by_time(
+                                audio_data, sample_rate,
+                                segment.start_time, segment.end_time
                             )
+                        
+                            if len(segment_audio) > 0:
+                                # フェード処理適用
+                                segment_audio = AudioUtils.apply_fade(segment_audio, sample_rate, fade_duration, fade_duration)
+                                extracted_segments.append(segment_audio)
+                            
+                                if container is not None:
+                                    container.add(segment_audio, segment.start_time, segment.end_time, segment.confidence)
+                                    written_files += 1
+                                    reporter.update(written_files / total_files)
+                                    continue
                             
-                            # ファイル保存
-                            segment_file = speaker_dir / filename
-                            AudioUtils.save_audio(segment_audio, segment_file, sample_rate)
-                            output_files[speaker_id].append(str(segment_file))
-                            extracted_segments.append(segment_audio)
+                                # ファイル名生成
+                                filename = self._generate_filename(
+                                    base_name=base_name,
+                                    speaker_id=speaker_id,
+                                    naming_style=naming_style,
+                                    segment_idx=i+1,
+                                    start_time=segment.start_time,
+                                    end_time=segment.end_time,
+                                    speaker_label=speaker_label
+                                )
+                            
+                                # ファイル保存
+                                segment_file = speaker_dir / filename
+                                output_files[speaker_id].append(encoder.submit(segment_audio, segment_file, sample_rate))
+                        
+                            written_files += 1
+                            reporter.update(written_files / total_files)
+                
+                    if container is not None:
+                        container.close()
+                        output_files[speaker_id].append(str(container.path))
                 
-                # 結合ファイル作成
-                if create_combined and extracted_segments:
-                    combined_audio = AudioUtils.concatenate_audio(extracted_segments)
-                    combined_audio = AudioUtils.normalize_audio(combined_audio)
+                    # 結合ファイル作成
+                    if create_combined and extracted_segments:
+                        if cancellation_token:
+                            cancellation_token.check()
+                        combined_audio = AudioUtils.concatenate_audio(extracted_segments)
+                        combined_audio = AudioUtils.normalize_audio(combined_audio)
                     
-                    # 結合ファイル名生成
-                    combined_filename = self._generate_filename(
-                        base_name=base_name,
-                        speaker_id=speaker_id,
-                        naming_style=naming_style
-                    )
+                        # 結合ファイル名生成
+                        combined_filename = self._generate_filename(
+                            base_name=base_name,
+                            speaker_id=speaker_id,
+                            naming_style=naming_style,
+                            speaker_label=speaker_label
+                        )
                     
-                    combined_file = speaker_dir / combined_filename
-                    AudioUtils.save_audio(combined_audio, combined_file, sample_rate)
-                    output_files[speaker_id].append(str(combined_file))
+                        combined_file = speaker_dir / combined_filename
+                        output_files[speaker_id].append(encoder.submit(combined_audio, combined_file, sample_rate))
+                
+                    if create_combined:
+                        written_files += 1
+                        reporter.update(written_files / total_files)
+                
+                    logging.info(f"話者{speaker_id}抽出完了: 合計{speaker_segs.total_duration:.2f}秒")
                 
-                total_duration = sum(seg.duration for seg in speaker_segs)
-                logging.info(f"話者{speaker_id}抽出完了: 合計{total_duration:.2f}秒")
+                reporter.update(written_files / total_files if total_files else 1.0, "エンコード完了待ち...")
             
+            output_files = {
+                speaker_id: [str(item.result()) if isinstance(item, Future) else item for item in files]
+                for speaker_id, files in output_files.items()
+            }
+            
+            reporter.update(1.0, "話者音声書き出し完了")
             logging.info(f"全話者音声抽出完了: {len(speaker_segments)}人")
             return output_files
             
+        except OperationCancelledError:
+            logging.info("話者音声抽出がキャンセルされました")
+            raise
         except Exception as e:
             logging.error(f"話者音声抽出でエラー: {e}")
             raise RuntimeError(f"話者音声抽出に失敗: {e}")
@@ -799,15 +1087,12 @@ class SpeakerProcessor:
         """
         return cls.AVAILABLE_MODELS.copy()
     
-    def estimate_processing_time(self, audio_duration: float) -> float:
+    def _get_default_speed_factor(self) -> float:
         """
-        処理時間を推定
+        実測記録が無い場合の処理速度係数（処理時間/音声長）を取得
         
-        Args:
-            audio_duration: 音声の長さ（秒）
-            
         Returns:
-            float: 推定処理時間（秒）
+            float: 処理速度係数
         """
         # モデルごとの処理速度係数
         speed_factors = {
@@ -823,166 +1108,161 @@ class SpeakerProcessor:
         else:
             device_factor = 1.0  # GPU使用
         
-        estimated_time = audio_duration * base_factor * device_factor
+        return base_factor * device_factor
+    
+    def get_time_estimation_key(self) -> Dict[str, Any]:
+        """
+        処理時間記録の照合キーを取得
         
-        return estimated_time
+        Returns:
+            Dict[str, Any]: ステージ名・モデル名・デバイス・処理方式
+        """
+        return {
+            'stage': 'speaker_separation',
+            'model': self.model_name,
+            'device': self.device,
+            'settings': {'backend': 'pyannote' if getattr(self, '_pyannote_available', False) else 'simple'}
+        }
     
-    def analyze_speakers(self, segments: List[SpeakerSegment]) -> Dict[str, Any]:
+    def estimate_processing_time_interval(self, audio_duration: float) -> TimeEstimate:
         """
-        話者分析結果を取得
+        処理時間を信頼区間付きで推定（実測記録が無い場合は既定の係数を使用）
         
         Args:
-            segments: 話者セグメントリスト
+            audio_duration: 音声の長さ（秒）
             
         Returns:
-            Dict[str, Any]: 分析結果
+            TimeEstimate: 推定結果
         """
-        if not segments:
-            return {
-                'num_speakers': 0,
-                'total_duration': 0.0,
-                'speakers': {}
-            }
+        default_factor = self._get_default_speed_factor()
+        if self.time_estimator is None:
+            estimated_time = audio_duration * default_factor
+            low, high = ProcessingTimeEstimator.DEFAULT_INTERVAL
+            return TimeEstimate(estimated_time, estimated_time * low, estimated_time * high)
+        
+        return self.time_estimator.estimate(
+            audio_duration=audio_duration,
+            default_factor=default_factor,
+            **self.get_time_estimation_key()
+        )
+    
+    def estimate_processing_time(self, audio_duration: float) -> float:
+        """
+        処理時間を推定
         
-        # 話者ごとの統計
-        speaker_stats = {}
-        for segment in segments:
-            if segment.speaker_id not in speaker_stats:
-                speaker_stats[segment.speaker_id] = {
-                    'segments': 0,
-                    'total_duration': 0.0,
-                    'avg_confidence': 0.0,
-                    'min_confidence': 1.0,
-                    'max_confidence': 0.0
-                }
-            
-            stats = speaker_stats[segment.speaker_id]
-            stats['segments'] += 1
-            stats['total_duration'] += segment.duration
-            stats['avg_confidence'] += segment.confidence
-            stats['min_confidence'] = min(stats['min_confidence'], segment.confidence)
-            stats['max_confidence'] = max(stats['max_confidence'], segment.confidence)
-        
-        # 平均信頼度計算
-        for speaker_id, stats in speaker_stats.items():
-            stats['avg_confidence'] /= stats['segments']
-        
-        total_duration = sum(seg.duration for seg in segments)
+        Args:
+            audio_duration: 音声の長さ（秒）
+            
+        Returns:
+            float: 推定処理時間（秒）
+        """
+        return self.estimate_processing_time_interval(audio_duration).estimate
+    
+    def analyze_speakers(self, segments: SegmentTable) -> Dict[str, Any]:
+        """
+        話者分析結果を取得
         
-        return {
-            'num_speakers': len(speaker_stats),
-            'total_duration': total_duration,
-            'num_segments': len(segments),
-            'speakers': speaker_stats
-        }
+        Args:
+            segments: 話者セグメント（SegmentTable、または SpeakerSegment のリスト）
+            
+        Returns:
+            Dict[str, Any]: 分析結果（話者ごとのセグメント数・発話時間・信頼度・発話時間の割合・発話ターン数）
+        """
+        return SpeakerStatistics(segments).to_dict()
     
-    def _remove_overlapping_speech(self, segments: List[SpeakerSegment]) -> List[SpeakerSegment]:
+    def _remove_overlapping_speech(self, segments: SegmentTable) -> SegmentTable:
         """
         重複する話者セグメントを除去または調整する
         
+        開始時刻順に走査し、既に残したセグメントと閾値を超えて重なる場合は
+        長い方を残す（同じ長さなら既存を優先）。以降のセグメントと重なり得ない
+        セグメントは比較対象から外すため、比較は同時に話している区間の数に比例する
+        
         Args:
-            segments: 話者セグメントのリスト
+            segments: 話者セグメント（SegmentTable、または SpeakerSegment のリスト）
             
         Returns:
-            List[SpeakerSegment]: 重複を除去したセグメントリスト
+            SegmentTable: 重複を除去したセグメント（開始時刻順）
         """
-        if not segments:
-            return segments
+        table = SegmentTable.from_segments(segments)
+        if not len(table):
+            return table
         
         # 時間順にソート
-        sorted_segments = sorted(segments, key=lambda x: x.start_time)
-        filtered_segments = []
+        table = table.sort_by_start()
+        starts = table.starts.tolist()
+        ends = table.ends.tolist()
+        durations = table.durations.tolist()
         
         overlap_threshold = 0.1  # 0.1秒以上の重複は除去対象
         removed_overlaps = 0
         
-        for current_seg in sorted_segments:
-            # 既存セグメントとの重複チェック
-            overlapping = False
+        keep = np.zeros(len(table), dtype=bool)
+        active: List[int] = []  # 残したセグメントのうち、以降と重なり得るもの（追加順）
+        
+        for current in range(len(table)):
+            current_start = starts[current]
+            
+            # 以降のセグメントとの重複が閾値を超え得ないものを比較対象から外す
+            if active:
+                active = [existing for existing in active if ends[existing] - current_start > overlap_threshold]
             
-            for existing_seg in filtered_segments:
-                # 重複判定
-                overlap_start = max(current_seg.start_time, existing_seg.start_time)
-                overlap_end = min(current_seg.end_time, existing_seg.end_time)
-                overlap_duration = max(0, overlap_end - overlap_start)
+            overlapping = False
+            for existing in active:
+                # 既存セグメントは開始時刻が早いため、重複は現在の開始時刻から始まる
+                overlap_duration = min(ends[current], ends[existing]) - current_start
                 
-                # 重複時間が閾値を超える場合
                 if overlap_duration > overlap_threshold:
                     # より長いセグメントを優先、同じ長さなら既存を優先
-                    current_duration = current_seg.duration
-                    existing_duration = existing_seg.duration
-                    
-                    if current_duration > existing_duration:
+                    if durations[current] > durations[existing]:
                         # 現在のセグメントの方が長い場合、既存を削除
-                        filtered_segments.remove(existing_seg)
-                        logging.debug(f"重複セグメント除去: {existing_seg.speaker_id} {existing_seg.start_time:.2f}-{existing_seg.end_time:.2f}s（より短い）")
-                        removed_overlaps += 1
-                        break
+                        keep[existing] = False
+                        active.remove(existing)
+                        logging.debug(f"重複セグメント除去: {table[existing].speaker_id} {starts[existing]:.2f}-{ends[existing]:.2f}s（より短い）")
                     else:
                         # 既存のセグメントを優先、現在のセグメントを除外
                         overlapping = True
-                        logging.debug(f"重複セグメント除去: {current_seg.speaker_id} {current_seg.start_time:.2f}-{current_seg.end_time:.2f}s（重複）")
-                        removed_overlaps += 1
-                        break
+                        logging.debug(f"重複セグメント除去: {table[current].speaker_id} {current_start:.2f}-{ends[current]:.2f}s（重複）")
+                    removed_overlaps += 1
+                    break
             
             # 重複していない場合のみ追加
             if not overlapping:
-                filtered_segments.append(current_seg)
+                keep[current] = True
+                active.append(current)
         
         if removed_overlaps > 0:
             logging.info(f"重複セグメント除去完了: {removed_overlaps}個のセグメントを除去")
         
-        # 再度時間順にソート
-        return sorted(filtered_segments, key=lambda x: x.start_time)
+        return table.take(keep)
     
-    def _force_split_speakers(self, segments: List[SpeakerSegment], target_num_speakers: int) -> List[SpeakerSegment]:
+    def _force_split_speakers(self, segments: SegmentTable, target_num_speakers: int) -> SegmentTable:
         """
         1つの話者として検出されたセグメントを強制的に複数話者に分割
         
         Args:
-            segments: 話者セグメントのリスト
+            segments: 話者セグメント（SegmentTable、または SpeakerSegment のリスト）
             target_num_speakers: 目標話者数
             
         Returns:
-            List[SpeakerSegment]: 分割されたセグメントリスト
+            SegmentTable: 分割されたセグメント（開始時刻順）
         """
-        if not segments or target_num_speakers <= 1:
-            return segments
+        table = SegmentTable.from_segments(segments)
+        if not len(table) or target_num_speakers <= 1:
+            return table
         
         # セグメントを時間順にソート
-        sorted_segments = sorted(segments, key=lambda x: x.start_time)
-        
-        # セグメントを均等に分割してそれぞれに異なる話者IDを割り当て
-        total_segments = len(sorted_segments)
-        segments_per_speaker = total_segments // target_num_speakers
-        remainder = total_segments % target_num_speakers
-        
-        result_segments = []
-        current_index = 0
-        
-        for speaker_idx in range(target_num_speakers):
-            # この話者が担当するセグメント数
-            current_count = segments_per_speaker + (1 if speaker_idx < remainder else 0)
-            
-            # 新しい話者IDを生成
-            new_speaker_id = f"SPEAKER_{speaker_idx:02d}"
-            
-            # セグメントに新しい話者IDを割り当て
-            for i in range(current_count):
-                if current_index < total_segments:
-                    original_seg = sorted_segments[current_index]
-                    new_segment = SpeakerSegment(
-                        start_time=original_seg.start_time,
-                        end_time=original_seg.end_time,
-                        speaker_id=new_speaker_id,
-                        confidence=original_seg.confidence
-                    )
-                    result_segments.append(new_segment)
-                    current_index += 1
-            
-            logging.info(f"強制分割: {new_speaker_id} に {current_count}セグメントを割り当て")
+        table = table.sort_by_start()
+        
+        # セグメントを均等に分割し、連続する区間ごとに異なる話者IDを割り当て
+        segments_per_speaker, remainder = divmod(len(table), target_num_speakers)
+        counts = [segments_per_speaker + (1 if speaker_idx < remainder else 0) for speaker_idx in range(target_num_speakers)]
+        speaker_ids = [f"SPEAKER_{speaker_idx:02d}" for speaker_idx in range(target_num_speakers)]
+        
+        for speaker_id, count in zip(speaker_ids, counts):
+            logging.info(f"強制分割: {speaker_id} に {count}セグメントを割り当て")
         
-        return result_segments
+        return table.with_speakers(np.repeat(np.arange(target_num_speakers), counts), speaker_ids)
     
     def _format_time_for_filename(self, seconds: float) -> str:
         """
@@ -998,6 +1278,104 @@ class SpeakerProcessor:
         secs = int(seconds % 60)
         return f"{minutes}m{secs:02d}s"
     
+    def extract_from_segment_file(
+        self,
+        segment_file: Union[str, Path],
+        output_dir: Union[str, Path],
+        audio_path: Optional[Union[str, Path]] = None,
+        create_individual: bool = True,
+        create_combined: bool = True,
+        naming_style: str = "detailed",
+        fade_duration: float = 0.01,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        segment_container: bool = False,
+        output_format: str = 'wav',
+        bit_depth: int = 16
+    ) -> Dict[str, Any]:
+        """
+        保存したセグメントファイルから話者音声を抽出（話者分離は行わない）
+        
+        Args:
+            segment_file: セグメントファイルパス（.rttm, .json, .npz）
+            output_dir: 出力ディレクトリ
+            audio_path: 元音声ファイルパス（Noneの場合はセグメントファイルに記録されたパス）
+            create_individual: 個別セグメントファイルを作成するか
+            create_combined: 結合ファイルを作成するか
+            naming_style: ファイル命名スタイル
+            fade_duration: 個別セグメントのフェードイン・フェードアウト時間（秒）
+            progress_callback: 進捗コールバック関数 (進捗率, メッセージ)、またはProgressReporter
+            cancellation_token: キャンセル・一時停止トークン
+            segment_container: 個別セグメントを話者ごとに1つの音声ファイル（と索引ファイル）にまとめるか
+            output_format: 出力形式 ('wav', 'flac', 'ogg', 'opus', 'mp3')
+            bit_depth: ビット深度（WAV: 16/24/32、FLAC: 16/24）
+            
+        Returns:
+            Dict[str, Any]: 処理結果情報（separate_speakers と同じ形式）
+            
+        Raises:
+            FileNotFoundError: セグメントファイル・音声ファイルが見つからない場合
+            ValueError: セグメントファイルの形式が正しくない場合
+        """
+        segments, recorded_audio = SegmentIO.load(segment_file)
+        audio_path = audio_path or recorded_audio
+        if not audio_path:
+            raise FileNotFoundError(f"元音声ファイルが記録されていません。音声ファイルを指定してください: {segment_file}")
+        
+        logging.info(f"セグメントファイルから抽出: {segment_file} ({len(segments)}セグメント)")
+        with profile_stage('speaker.extract'):
+            output_files = self.extract_speaker_audio(
+                audio_path=str(audio_path),
+                segments=segments,
+                output_dir=str(output_dir),
+                create_individual=create_individual,
+                create_combined=create_combined,
+                naming_style=naming_style,
+                progress_callback=progress_callback,
+                cancellation_token=cancellation_token,
+                fade_duration=fade_duration,
+                segment_container=segment_container,
+                output_format=output_format,
+                bit_depth=bit_depth
+            )
+        
+        return {
+            'output_files': output_files,
+            'segments_detected': len(segments),
+            'speakers_detected': len(output_files),
+            'total_duration': segments.total_duration,
+            'segments': segments.to_dicts(),
+            'segments_file': str(segment_file)
+        }
+    
+    def identify_speakers(
+        self,
+        audio_path: Union[str, Path],
+        segments: SegmentTable,
+        registry: Union[str, Path, SpeakerRegistry]
+    ) -> Tuple[SegmentTable, Dict[str, str]]:
+        """
+        話者登録簿と照合し、話者ID（SPEAKER_00 など）を登録済みの話者名に置き換える
+        
+        照合した回の話者は背景の平均に加え、登録簿を保存する（新しい話者は登録しない）
+        
+        Args:
+            audio_path: 元音声ファイルパス
+            segments: 話者セグメント
+            registry: 話者登録簿、またはそのディレクトリ
+            
+        Returns:
+            Tuple[SegmentTable, Dict[str, str]]: (話者を置き換えたセグメント, 話者ID → 話者名)
+        """
+        if not isinstance(registry, SpeakerRegistry):
+            registry = SpeakerRegistry(registry)
+        embeddings = registry.embed_file(audio_path, segments)
+        registry.observe(embeddings.values())
+        mapping = registry.identify(embeddings)
+        registry.save()
+        logging.info(f"話者照合: {len(mapping)}/{len(embeddings)}人が登録済みの話者に一致")
+        return registry.relabel(segments, mapping), mapping
+    
     def separate_speakers(
         self,
         input_file: Path,
@@ -1009,6 +1387,7 @@ class SpeakerProcessor:
         create_individual: bool = True,
         naming_style: str = "detailed",
         progress_callback: Optional[Callable[[float], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
         **kwargs  # 追加パラメータを受け取る
     ) -> Dict[str, Any]:
         """
@@ -1023,15 +1402,20 @@ class SpeakerProcessor:
             create_combined: 結合ファイルを作成するか
             create_individual: 個別セグメントファイルを作成するか
             naming_style: ファイル命名スタイル
-            progress_callback: 進捗コールバック関数
+            progress_callback: 進捗コールバック関数 (進捗率0-100)、またはProgressReporter (進捗率0.0-1.0)
+            cancellation_token: キャンセル・一時停止トークン
             
         Returns:
             Dict[str, Any]: 処理結果情報
         """
+        if isinstance(progress_callback, ProgressReporter):
+            reporter = progress_callback
+        else:
+            reporter = ProgressReporter('speaker', (lambda p, m: progress_callback(p * 100.0)) if progress_callback else None)
+        
         try:
             # 進捗通知
-            if progress_callback:
-                progress_callback(0.0)
+            reporter.update(0.0, "話者分離処理中...")
             
             # GUIパラメータを抽出（存在する場合のみ使用）
             clustering_threshold = kwargs.get('clustering_threshold', 0.5)
@@ -1045,49 +1429,99 @@ class SpeakerProcessor:
             logging.info(f"  kwargs全体: {kwargs}")
             
             # 話者分離実行
-            segments = self.diarize(
-                audio_path=str(input_file),
-                min_duration=min_segment_length,
-                max_speakers=None,  # デフォルトは自動検出
-                clustering_threshold=clustering_threshold,
-                segmentation_onset=segmentation_onset,
-                segmentation_offset=segmentation_offset,
-                force_num_speakers=force_num_speakers
-            )
+            with profile_stage('speaker.diarize'):
+                segments = self.diarize(
+                    audio_path=str(input_file),
+                    min_duration=min_segment_length,
+                    max_speakers=None,  # デフォルトは自動検出
+                    clustering_threshold=clustering_threshold,
+                    segmentation_onset=segmentation_onset,
+                    segmentation_offset=segmentation_offset,
+                    force_num_speakers=force_num_speakers,
+                    progress_callback=reporter.sub(0.0, 0.5, 'speaker.diarize'),
+                    cancellation_token=cancellation_token
+                )
             
-            # 進捗通知
-            if progress_callback:
-                progress_callback(50.0)
+            # 登録済みの話者と照合して話者名に置き換える
+            speaker_identities = {}
+            if kwargs.get('speaker_registry'):
+                with profile_stage('speaker.identify'):
+                    segments, speaker_identities = self.identify_speakers(input_file, segments, kwargs['speaker_registry'])
             
             # 音声抽出
-            output_files = self.extract_speaker_audio(
-                audio_path=str(input_file),
-                segments=segments,
-                output_dir=str(output_dir),
-                create_individual=create_individual,
-                create_combined=create_combined,
-                naming_style=naming_style
-            )
+            with profile_stage('speaker.extract'):
+                output_files = self.extract_speaker_audio(
+                    audio_path=str(input_file),
+                    segments=segments,
+                    output_dir=str(output_dir),
+                    create_individual=create_individual,
+                    create_combined=create_combined,
+                    naming_style=naming_style,
+                    progress_callback=reporter.sub(0.5, 1.0, 'speaker.extract'),
+                    cancellation_token=cancellation_token,
+                    fade_duration=kwargs.get('fade_duration', 0.01),
+                    segment_container=kwargs.get('segment_container', False),
+                    output_format=kwargs.get('output_format', 'wav'),
+                    bit_depth=kwargs.get('bit_depth', 16)
+                )
             
-            # 進捗通知
-            if progress_callback:
-                progress_callback(100.0)
+            # セグメントを保存（話者分離をやり直さずに再書き出しできる）
+            segments_file = SegmentIO.save(segments, Path(output_dir) / self.SEGMENTS_FILENAME, audio_file=input_file)
             
             # 処理結果を作成
             result = {
                 'output_files': output_files,
                 'segments_detected': len(segments),
                 'speakers_detected': len(output_files),
-                'total_duration': sum(seg.duration for seg in segments)
+                'total_duration': segments.total_duration,
+                'segments': segments.to_dicts(),
+                'segments_file': str(segments_file),
+                'speaker_identities': speaker_identities
             }
             
             logging.info(f"話者分離処理完了: {len(output_files)}人の話者、{len(segments)}セグメント")
             return result
             
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.error(f"話者分離処理エラー: {e}")
             raise
 
+    @staticmethod
+    def _speaker_labels(speaker_ids, naming_style: str) -> Dict[str, str]:
+        """
+        話者IDごとのディレクトリ・ファイル名に使う表記
+        
+        detailed では SPEAKER_00 -> 01 のように番号にする。登録簿で置き換えた話者名などは
+        ファイル名に使えない文字を置き換え、表記が重なる場合は _2, _3 を付けて区別する
+        
+        Args:
+            speaker_ids: 話者ID
+            naming_style: 命名スタイル ("simple" or "detailed")
+            
+        Returns:
+            Dict[str, str]: 話者ID → 表記
+        """
+        labels: Dict[str, str] = {}
+        used = set()
+        for speaker_id in speaker_ids:
+            label = None
+            if naming_style == "detailed" and speaker_id.startswith("SPEAKER_"):
+                try:
+                    label = f"{int(speaker_id[len('SPEAKER_'):])+1:02d}"
+                except ValueError:
+                    pass
+            if label is None:
+                label = FileUtils.sanitize_filename(speaker_id)
+            unique, counter = label, 2
+            while unique in used:
+                unique = f"{label}_{counter}"
+                counter += 1
+            used.add(unique)
+            labels[speaker_id] = unique
+        return labels
+    
     def _generate_filename(
         self, 
         base_name: str, 
@@ -1095,7 +1529,8 @@ class SpeakerProcessor:
         naming_style: str,
         segment_idx: Optional[int] = None,
         start_time: Optional[float] = None,
-        end_time: Optional[float] = None
+        end_time: Optional[float] = None,
+        speaker_label: Optional[str] = None
     ) -> str:
         """
         ファイル名を生成
@@ -1107,33 +1542,29 @@ class SpeakerProcessor:
             segment_idx: セグメント番号
             start_time: 開始時間（秒）
             end_time: 終了時間（秒）
+            speaker_label: 話者の表記（Noneの場合は話者IDから求める）
             
         Returns:
             str: 生成されたファイル名
         """
+        if naming_style not in ("simple", "detailed"):
+            # デフォルトはsimple
+            naming_style = "simple"
+        if speaker_label is None:
+            speaker_label = self._speaker_labels([speaker_id], naming_style)[speaker_id]
+        
         if naming_style == "simple":
             if segment_idx is not None:
                 return f"segment_{segment_idx:03d}.wav"
             else:
-                return f"speaker_{speaker_id}_combined.wav"
-        
-        elif naming_style == "detailed":
-            # 話者IDを数値に変換（SPEAKER_00 -> 01）
-            speaker_num = speaker_id.replace("SPEAKER_", "")
-            try:
-                speaker_num = f"{int(speaker_num)+1:02d}"
-            except ValueError:
-                speaker_num = "01"
-            
-            if segment_idx is not None:
-                # セグメント個別ファイル
-                start_str = self._format_time_for_filename(start_time)
-                end_str = self._format_time_for_filename(end_time)
-                return f"{base_name}_speaker{speaker_num}_seg{segment_idx:03d}_{start_str}-{end_str}.wav"
-            else:
-                # 統合ファイル
-                return f"{base_name}_speaker{speaker_num}_combined.wav"
-        
+                return f"speaker_{speaker_label}_combined.wav"
+        
+        # detailed: 話者IDは番号（SPEAKER_00 -> 01）、話者名はそのまま使う
+        if segment_idx is not None:
+            # セグメント個別ファイル
+            start_str = self._format_time_for_filename(start_time)
+            end_str = self._format_time_for_filename(end_time)
+            return f"{base_name}_speaker{speaker_label}_seg{segment_idx:03d}_{start_str}-{end_str}.wav"
         else:
-            # デフォルトはsimple
-            return self._generate_filename(base_name, speaker_id, "simple", segment_idx, start_time, end_time)
\ No newline at end of file
+            # 統合ファイル
+            return f"{base_name}_speaker{speaker_label}_combined.wav"
\ No newline at end of file
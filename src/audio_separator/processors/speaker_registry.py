@@ -0,0 +1,410 @@
+"""
+ファイルをまたいだ話者の登録簿
+
+話者名と参照特徴量（SpeakerEmbedder の話者ごとの特徴量）を、話者数 × 次元数の
+float16 行列（embeddings.npy）と索引（speakers.json）としてディレクトリに保存する。
+話者分離の結果の話者（SPEAKER_00 など）を、登録済みの話者と特徴量の類似度で照合して
+話者名に置き換える。照合は行列演算でまとめて行い、登録数が多い場合は
+粗いクラスタの一部だけを調べる近似検索も選べる
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.audio_utils import AudioUtils
+from .segment_table import SegmentTable
+from .speaker_embedding import SpeakerEmbedder
+
+
+class SpeakerRegistry:
+    """話者名と参照特徴量の登録簿"""
+    
+    # 索引ファイルの形式名とバージョン
+    FORMAT = 'toyosatomimi-speaker-registry'
+    VERSION = 1
+    
+    # 保存するファイル名
+    INDEX_FILENAME = 'speakers.json'
+    EMBEDDINGS_FILENAME = 'embeddings.npy'
+    
+    # 特徴量を計算するサンプリングレート（ファイルごとの違いで特徴量が変わらないよう揃える）
+    EMBEDDING_SAMPLE_RATE = 16000
+    
+    # 背景の平均を引いた特徴量の類似度（コサイン）がこれ以上なら同じ話者とする
+    MATCH_THRESHOLD = 0.8
+    
+    # 背景の平均が使えない間（観測した特徴量が少ない間）の、平均を引かない類似度のしきい値
+    RAW_MATCH_THRESHOLD = 0.97
+    
+    # 背景の平均を使うのに必要な観測数
+    MIN_BACKGROUND_COUNT = 4
+    
+    # 近似検索を既定で使う登録数
+    APPROXIMATE_MIN_SPEAKERS = 10000
+    
+    # 近似検索で調べるクラスタ数
+    DEFAULT_PROBES = 8
+    
+    def __init__(self, directory: Union[str, Path]):
+        """
+        登録簿を開く（ディレクトリが無い場合は空の登録簿、save で作成する）
+        
+        Args:
+            directory: 登録簿のディレクトリ
+        
+        Raises:
+            ValueError: 索引ファイルの形式が正しくない場合
+        """
+        self.directory = Path(directory)
+        self.dimension = SpeakerEmbedder.NUM_BANDS
+        self.names: List[str] = []
+        self.counts: List[int] = []
+        self._embeddings = np.zeros((0, self.dimension), dtype=np.float32)
+        
+        # 背景の平均（登録・照合で観測した話者の特徴量の平均）
+        self._background_sum = np.zeros(self.dimension)
+        self._background_count = 0
+        
+        # 検索用のキャッシュ（登録・観測で無効にする）
+        self._row_norms_cache: Optional[np.ndarray] = None
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        
+        if (self.directory / self.INDEX_FILENAME).exists():
+            self._load()
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+    
+    # --- 保存・読み込み ---
+    
+    def _load(self) -> None:
+        index_path = self.directory / self.INDEX_FILENAME
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if not isinstance(index, dict) or index.get('format') != self.FORMAT:
+            raise ValueError(f"話者登録簿の形式が異なります: {index_path}")
+        if index.get('version') != self.VERSION or index.get('dimension') != self.dimension:
+            raise ValueError(f"対応していない話者登録簿です: バージョン {index.get('version')}, 次元数 {index.get('dimension')}")
+        
+        # 保存は float16（ファイルサイズを半分にする）、検索・更新用に float32 で読み込む
+        embeddings = np.load(self.directory / self.EMBEDDINGS_FILENAME)
+        if embeddings.shape != (len(index['names']), self.dimension):
+            raise ValueError(f"話者登録簿の特徴量の数が索引と一致しません: {self.directory}")
+        self._embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.names = list(index['names'])
+        self.counts = list(index['counts'])
+        self._background_sum = np.asarray(index['background_sum'], dtype=np.float64)
+        self._background_count = int(index['background_count'])
+    
+    def save(self) -> Path:
+        """
+        登録簿を保存（一時ファイルに書いてから置き換える）
+        
+        Returns:
+            Path: 登録簿のディレクトリ
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        embeddings_path = self.directory / self.EMBEDDINGS_FILENAME
+        tmp_path = embeddings_path.with_name(embeddings_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, self._embeddings.astype(np.float16))
+        tmp_path.replace(embeddings_path)
+        
+        index = {
+            'format': self.FORMAT,
+            'version': self.VERSION,
+            'dimension': self.dimension,
+            'names': self.names,
+            'counts': self.counts,
+            'background_sum': self._background_sum.tolist(),
+            'background_count': self._background_count
+        }
+        index_path = self.directory / self.INDEX_FILENAME
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(index, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        tmp_path.replace(index_path)
+        logging.info(f"話者登録簿保存: {self.directory} ({len(self)}人)")
+        return self.directory
+    
+    # --- 登録 ---
+    
+    @classmethod
+    def embed_file(
+        cls,
+        audio_path: Union[str, Path],
+        segments: Optional[SegmentTable] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        音声ファイルから話者ごとの特徴量を計算
+        
+        Args:
+            audio_path: 音声ファイルパス
+            segments: 話者セグメント（Noneの場合は全体を1人の話者 'SPEAKER' とする）
+        
+        Returns:
+            Dict[str, np.ndarray]: 話者ID → 特徴量
+        """
+        audio, sample_rate = AudioUtils.load_audio(audio_path, sample_rate=cls.EMBEDDING_SAMPLE_RATE)
+        if segments is None:
+            segments = SegmentTable.from_arrays([0.0], [len(audio) / sample_rate], ['SPEAKER'])
+        return SpeakerEmbedder(sample_rate).embed_speakers(audio, segments)
+    
+    def enroll(self, name: str, embedding: np.ndarray) -> int:
+        """
+        話者を登録（登録済みの場合は参照特徴量を登録回数で平均する）
+        
+        Args:
+            name: 話者名
+            embedding: 特徴量
+        
+        Returns:
+            int: 話者の行番号
+        """
+        embedding = self._check_embedding(embedding)
+        if name in self.names:
+            row = self.names.index(name)
+            count = self.counts[row]
+            merged = self._embeddings[row] * count + embedding
+            self._embeddings[row] = merged / max(np.linalg.norm(merged), 1e-9)
+            self.counts[row] = count + 1
+        else:
+            row = len(self.names)
+            self.names.append(name)
+            self.counts.append(1)
+            self._embeddings = np.vstack([self._embeddings, embedding[None, :].astype(np.float32)])
+        self.observe([embedding])
+        self._ivf = None
+        logging.info(f"話者登録: {name} ({self.counts[row]}回目)")
+        return row
+    
+    def remove(self, name: str) -> None:
+        """
+        話者を削除
+        
+        Raises:
+            KeyError: 登録されていない場合
+        """
+        if name not in self.names:
+            raise KeyError(f"登録されていない話者です: {name}")
+        row = self.names.index(name)
+        del self.names[row]
+        del self.counts[row]
+        self._embeddings = np.delete(self._embeddings, row, axis=0)
+        self._row_norms_cache = None
+        self._ivf = None
+    
+    def observe(self, embeddings: Iterable[np.ndarray]) -> None:
+        """
+        話者の特徴量を背景の平均に加える（照合の前に、その回の話者も加える）
+        
+        Args:
+            embeddings: 話者ごとの特徴量
+        """
+        for embedding in embeddings:
+            self._background_sum += self._check_embedding(embedding)
+            self._background_count += 1
+        self._row_norms_cache = None
+    
+    def _check_embedding(self, embedding: np.ndarray) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float64).reshape(-1)
+        if len(embedding) != self.dimension:
+            raise ValueError(f"特徴量の次元数が異なります: {len(embedding)}（{self.dimension}）")
+        return embedding / max(np.linalg.norm(embedding), 1e-9)
+    
+    # --- 検索 ---
+    
+    @property
+    def centered(self) -> bool:
+        """背景の平均を引いて比較するか（観測数が足りない間は引かない）"""
+        return self._background_count >= self.MIN_BACKGROUND_COUNT
+    
+    @property
+    def match_threshold(self) -> float:
+        """同じ話者とみなす類似度の既定値"""
+        return self.MATCH_THRESHOLD if self.centered else self.RAW_MATCH_THRESHOLD
+    
+    def _background(self) -> np.ndarray:
+        if not self.centered:
+            return np.zeros(self.dimension)
+        return self._background_sum / self._background_count
+    
+    def _row_norms(self) -> np.ndarray:
+        """登録済みの特徴量から背景の平均を引いたノルム（|y|^2 - 2y・m + |m|^2 から計算してキャッシュ）"""
+        if self._row_norms_cache is None:
+            background = self._background().astype(np.float32)
+            squared = (np.einsum('ij,ij->i', self._embeddings, self._embeddings)
+                       - 2.0 * (self._embeddings @ background) + background @ background)
+            self._row_norms_cache = np.sqrt(np.maximum(squared, 1e-12))
+        return self._row_norms_cache
+    
+    def similarities(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        照合する特徴量と登録済みの話者の類似度（背景の平均を引いたコサイン）
+        
+        平均を引いた行列は作らず、(q - m)・(y - m) = (q - m)・y - (q - m)・m として計算する
+        
+        Args:
+            queries: 照合する特徴量 [M, 次元数]
+            rows: 比較する行番号（Noneの場合はすべて）
+        
+        Returns:
+            np.ndarray: 類似度 [M, 行数]
+        """
+        background = self._background()
+        centered = np.atleast_2d(queries).astype(np.float64) - background
+        centered /= np.maximum(np.linalg.norm(centered, axis=1, keepdims=True), 1e-9)
+        centered = centered.astype(np.float32)
+        
+        norms = self._row_norms()
+        embeddings = self._embeddings
+        if rows is not None:
+            embeddings, norms = embeddings[rows], norms[rows]
+        offsets = centered @ background.astype(np.float32)
+        return (centered @ embeddings.T - offsets[:, None]) / norms[None, :]
+    
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 1,
+        approximate: Optional[bool] = None,
+        probes: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        類似度の高い登録済みの話者を検索
+        
+        Args:
+            queries: 照合する特徴量 [M, 次元数]
+            k: 話者ごとに返す候補数
+            approximate: 近似検索を使うか（Noneの場合は登録数が APPROXIMATE_MIN_SPEAKERS 以上なら使う）
+            probes: 近似検索で調べるクラスタ数（Noneの場合は DEFAULT_PROBES）
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (行番号 [M, k], 類似度 [M, k])（候補が足りない場合は -1, -inf）
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float64))
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf)
+        if not len(self):
+            return indices, scores
+        if approximate is None:
+            approximate = len(self) >= self.APPROXIMATE_MIN_SPEAKERS
+        
+        if not approximate:
+            # すべての話者との類似度を1回の行列積で計算
+            similarity = self.similarities(queries)
+            count = min(k, len(self))
+            top = np.argpartition(-similarity, count - 1, axis=1)[:, :count]
+            top = np.take_along_axis(top, np.argsort(-np.take_along_axis(similarity, top, axis=1), axis=1), axis=1)
+            indices[:, :count] = top
+            scores[:, :count] = np.take_along_axis(similarity, top, axis=1)
+            return indices, scores
+        
+        for i, rows in enumerate(self._probe(queries, probes or self.DEFAULT_PROBES)):
+            similarity = self.similarities(queries[i], rows)[0]
+            count = min(k, len(similarity))
+            top = np.argpartition(-similarity, count - 1)[:count]
+            top = top[np.argsort(-similarity[top])]
+            indices[i, :count] = rows[top]
+            scores[i, :count] = similarity[top]
+        return indices, scores
+    
+    def build_index(self, num_lists: Optional[int] = None, iterations: int = 8) -> None:
+        """
+        近似検索の索引を作成（正規化した特徴量の k-means で登録済みの話者をクラスタに分ける）
+        
+        背景の平均に依存しないため、登録・削除するまで作り直さない
+        
+        Args:
+            num_lists: クラスタ数（Noneの場合は登録数の平方根）
+            iterations: k-means の反復回数
+        """
+        embeddings = self._embeddings
+        num_lists = max(1, min(num_lists or int(np.sqrt(len(self))), len(self)))
+        rng = np.random.default_rng(0)
+        centroids = embeddings[rng.choice(len(self), num_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(embeddings @ centroids.T, axis=1)
+            for cluster in range(num_lists):
+                members = embeddings[assignments == cluster]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    centroids[cluster] = mean / max(np.linalg.norm(mean), 1e-9)
+        assignments = np.argmax(embeddings @ centroids.T, axis=1)
+        
+        # クラスタ順に並べた行番号と、クラスタごとの開始位置
+        order = np.argsort(assignments, kind='stable')
+        offsets = np.searchsorted(assignments[order], np.arange(num_lists + 1))
+        self._ivf = (centroids, order, offsets)
+        logging.debug(f"話者登録簿の近似検索索引: {len(self)}人, {num_lists}クラスタ")
+    
+    def _probe(self, queries: np.ndarray, probes: int) -> List[np.ndarray]:
+        """照合する特徴量ごとに、近いクラスタに属する行番号"""
+        if self._ivf is None:
+            self.build_index()
+        centroids, order, offsets = self._ivf
+        normalized = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-9)
+        nearest = np.argsort(-(normalized.astype(np.float32) @ centroids.T), axis=1)[:, :probes]
+        return [np.concatenate([order[offsets[c]:offsets[c + 1]] for c in clusters]) for clusters in nearest]
+    
+    # --- 照合 ---
+    
+    def identify(
+        self,
+        embeddings: Dict[str, np.ndarray],
+        threshold: Optional[float] = None,
+        approximate: Optional[bool] = None
+    ) -> Dict[str, str]:
+        """
+        話者分離の話者を登録済みの話者に対応付ける（1人の登録話者には1人だけを対応付ける）
+        
+        Args:
+            embeddings: 話者ID → 特徴量
+            threshold: 同じ話者とみなす類似度（Noneの場合は match_threshold）
+            approximate: 近似検索を使うか（Noneの場合は登録数で決める）
+        
+        Returns:
+            Dict[str, str]: 対応付いた話者ID → 登録済みの話者名（対応付かない話者は含まない）
+        """
+        if not embeddings or not len(self):
+            return {}
+        threshold = self.match_threshold if threshold is None else threshold
+        local_ids = list(embeddings)
+        queries = np.stack([self._check_embedding(embeddings[local_id]) for local_id in local_ids])
+        indices, scores = self.search(queries, k=min(len(local_ids), len(self)), approximate=approximate)
+        
+        # 類似度の高い組から順に対応付ける
+        pairs = sorted(
+            ((score, i, row) for i in range(len(local_ids)) for row, score in zip(indices[i], scores[i])
+             if row >= 0 and score >= threshold),
+            reverse=True
+        )
+        mapping: Dict[str, str] = {}
+        used_rows = set()
+        for score, i, row in pairs:
+            if local_ids[i] in mapping or row in used_rows:
+                continue
+            mapping[local_ids[i]] = self.names[row]
+            used_rows.add(row)
+            logging.info(f"話者照合: {local_ids[i]} → {self.names[row]} (類似度 {score:.2f})")
+        return mapping
+    
+    @staticmethod
+    def relabel(segments: SegmentTable, mapping: Dict[str, str]) -> SegmentTable:
+        """
+        セグメントの話者IDを対応付けた話者名に置き換える
+        
+        Args:
+            segments: 話者セグメント
+            mapping: 話者ID → 話者名
+        
+        Returns:
+            SegmentTable: 話者を置き換えたテーブル
+        """
+        return segments.with_speakers(segments.codes, [mapping.get(c, c) for c in segments.categories])
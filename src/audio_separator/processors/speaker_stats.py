@@ -0,0 +1,132 @@
+"""
+話者統計
+
+セグメントテーブルの話者コードを使い、話者ごとのセグメント数・発話時間・
+信頼度（最小・平均・最大）・発話時間の割合・発話ターン数を配列演算でまとめて集計する。
+話者数の制限、ログ出力、analyze_speakers の結果はすべてこの集計を使う
+"""
+
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from .segment_table import SegmentTable
+
+
+class SpeakerStatistics:
+    """話者ごとの統計"""
+    
+    def __init__(self, segments: Iterable[Any]):
+        """
+        セグメントから統計を集計
+        
+        Args:
+            segments: 話者セグメント（SegmentTable、または SpeakerSegment・辞書のリスト）
+        """
+        table = SegmentTable.from_segments(segments)
+        num_categories = len(table.categories)
+        durations = table.durations
+        
+        self.num_segments = len(table)
+        self.total_duration = float(durations.sum())
+        
+        # 話者は最初に現れた順に並べる
+        self.speakers: List[str] = table.speakers
+        self._rows: Dict[str, int] = {speaker_id: row for row, speaker_id in enumerate(self.speakers)}
+        order = table.codes_for(self.speakers)
+        
+        # 話者コードごとの集計
+        counts = np.bincount(table.codes, minlength=num_categories)
+        totals = np.bincount(table.codes, weights=durations, minlength=num_categories)
+        confidence_sums = np.bincount(table.codes, weights=table.confidences, minlength=num_categories)
+        
+        # 最小・最大は話者コード順に並べた区間ごとに求める（話者コードの昇順）
+        confidence_min = np.zeros(num_categories)
+        confidence_max = np.zeros(num_categories)
+        present = np.flatnonzero(counts)
+        if len(present):
+            grouped = table.confidences[np.argsort(table.codes, kind='stable')]
+            boundaries = np.concatenate(([0], np.cumsum(counts[present])[:-1]))
+            confidence_min[present] = np.minimum.reduceat(grouped, boundaries)
+            confidence_max[present] = np.maximum.reduceat(grouped, boundaries)
+        
+        # 発話ターン（開始時刻順に並べたときの同じ話者の連続）
+        timeline = table.codes[np.argsort(table.starts, kind='stable')]
+        if len(timeline):
+            turn_starts = np.flatnonzero(np.concatenate(([True], timeline[1:] != timeline[:-1])))
+        else:
+            turn_starts = np.empty(0, dtype=np.int64)
+        turns = np.bincount(timeline[turn_starts], minlength=num_categories)
+        self.num_turns = len(turn_starts)
+        self.speaker_changes = max(self.num_turns - 1, 0)
+        
+        # 話者の並びに合わせる
+        self.segment_counts = counts[order]
+        self.durations = totals[order]
+        self.confidence_mean = confidence_sums[order] / np.maximum(self.segment_counts, 1)
+        self.confidence_min = confidence_min[order]
+        self.confidence_max = confidence_max[order]
+        self.turns = turns[order]
+        self.shares = self.durations / self.total_duration if self.total_duration > 0 else np.zeros(len(order))
+    
+    @property
+    def num_speakers(self) -> int:
+        """話者数"""
+        return len(self.speakers)
+    
+    def top_speakers(self, num_speakers: int) -> List[str]:
+        """
+        発話時間の長い上位の話者を取得
+        
+        Args:
+            num_speakers: 取得する話者数（同じ発話時間の場合は先に現れた話者を優先）
+        
+        Returns:
+            List[str]: 話者ID（発話時間の長い順）
+        """
+        ranking = np.argsort(-self.durations, kind='stable')[:max(num_speakers, 0)]
+        return [self.speakers[i] for i in ranking]
+    
+    def speaker_summary(self, speaker_id: str) -> Dict[str, Any]:
+        """
+        話者1人の統計を取得
+        
+        Args:
+            speaker_id: 話者ID
+        
+        Returns:
+            Dict[str, Any]: セグメント数、発話時間、信頼度、発話時間の割合、発話ターン数
+        
+        Raises:
+            ValueError: 話者が含まれていない場合
+        """
+        i = self._rows.get(speaker_id)
+        if i is None:
+            raise ValueError(f"話者が見つかりません: {speaker_id}")
+        turns = int(self.turns[i])
+        return {
+            'segments': int(self.segment_counts[i]),
+            'total_duration': float(self.durations[i]),
+            'avg_confidence': float(self.confidence_mean[i]),
+            'min_confidence': float(self.confidence_min[i]),
+            'max_confidence': float(self.confidence_max[i]),
+            'share': float(self.shares[i]),
+            'turns': turns,
+            'avg_turn_duration': float(self.durations[i]) / turns if turns else 0.0
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        統計を辞書に変換（analyze_speakers の結果）
+        
+        Returns:
+            Dict[str, Any]: 話者数、合計時間、セグメント数、ターン数、話者交代数、話者ごとの統計
+        """
+        return {
+            'num_speakers': self.num_speakers,
+            'total_duration': self.total_duration,
+            'num_segments': self.num_segments,
+            'num_turns': self.num_turns,
+            'speaker_changes': self.speaker_changes,
+            'speakers': {speaker_id: self.speaker_summary(speaker_id) for speaker_id in self.speakers}
+        }
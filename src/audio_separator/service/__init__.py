@@ -0,0 +1,7 @@
+"""ローカル分離サービス"""
+
+from .jobs import JobManager, SeparationJob
+from .server import SeparationServer, run_server
+from .client import SeparationClient, ServiceError
+
+__all__ = ["JobManager", "SeparationJob", "SeparationServer", "run_server", "SeparationClient", "ServiceError"]
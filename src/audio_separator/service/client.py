@@ -0,0 +1,181 @@
+"""
+分離サービスクライアント
+
+ローカル分離サービスにジョブを投入し、進捗を受信して結果を取得する薄いクライアント
+"""
+
+import json
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Iterator, List
+from urllib import request, error
+from urllib.parse import quote
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class ServiceError(RuntimeError):
+    """分離サービスがエラーを返した場合の例外"""
+
+
+class SeparationClient:
+    """分離サービスクライアントクラス"""
+    
+    def __init__(self, base_url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: float = 30.0):
+        """
+        クライアントを初期化
+        
+        Args:
+            base_url: サービスのベースURL
+            timeout: 通常リクエストのタイムアウト（秒）
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+    
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """JSONリクエストを送信してレスポンスを返す"""
+        data = None
+        headers = {'Accept': 'application/json'}
+        if payload is not None:
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            headers['Content-Type'] = 'application/json; charset=utf-8'
+        
+        req = request.Request(f"{self.base_url}{path}", data=data, headers=headers, method=method)
+        try:
+            with request.urlopen(req, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get('error', str(e))
+            except Exception:
+                message = str(e)
+            raise ServiceError(message) from e
+    
+    def is_available(self) -> bool:
+        """サービスが起動しているかどうか"""
+        try:
+            self.health()
+            return True
+        except (error.URLError, OSError, ServiceError):
+            return False
+    
+    def health(self) -> Dict[str, Any]:
+        """サービス・モデル状態を取得"""
+        return self._request('GET', '/health')
+    
+    def submit(self, input_path: str, output_dir: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        ジョブを投入
+        
+        Args:
+            input_path: 入力音声ファイルパス（サーバーから参照可能なパス）
+            output_dir: 出力ディレクトリ（Noneの場合はサーバー側で決定）
+            params: パイプラインパラメータ
+        
+        Returns:
+            Dict[str, Any]: 投入されたジョブ情報
+        """
+        payload = {'input_path': str(Path(input_path).resolve())}
+        if output_dir:
+            payload['output_dir'] = str(Path(output_dir).resolve())
+        if params:
+            payload['params'] = params
+        return self._request('POST', '/jobs', payload)
+    
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """ジョブ状態を取得"""
+        return self._request('GET', f'/jobs/{job_id}')
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """ジョブ一覧を取得"""
+        return self._request('GET', '/jobs')
+    
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """ジョブをキャンセル"""
+        return self._request('DELETE', f'/jobs/{job_id}')
+    
+    def get_result(self, job_id: str) -> Dict[str, Any]:
+        """処理結果を取得"""
+        return self._request('GET', f'/jobs/{job_id}/result')
+    
+    def stream_events(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        進捗イベントを受信する（ジョブ終了まで）
+        
+        Args:
+            job_id: ジョブID
+        
+        Yields:
+            Dict[str, Any]: {'event': イベント名, 'data': データ}
+        """
+        req = request.Request(f"{self.base_url}/jobs/{job_id}/events", headers={'Accept': 'text/event-stream'})
+        with request.urlopen(req) as response:
+            event_name = 'message'
+            data_lines = []
+            for raw_line in response:
+                line = raw_line.decode('utf-8').rstrip('\r\n')
+                
+                if not line:
+                    # 空行でイベント確定
+                    if data_lines:
+                        if event_name == 'end':
+                            return
+                        yield {'event': event_name, 'data': json.loads('\n'.join(data_lines))}
+                    event_name = 'message'
+                    data_lines = []
+                elif line.startswith(':'):
+                    continue  # キープアライブ
+                elif line.startswith('event:'):
+                    event_name = line[len('event:'):].strip()
+                elif line.startswith('data:'):
+                    data_lines.append(line[len('data:'):].strip())
+    
+    def wait(self, job_id: str, progress_callback: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+        """
+        ジョブの終了を待って結果を返す
+        
+        Args:
+            job_id: ジョブID
+            progress_callback: 進捗コールバック関数 (進捗率0.0-1.0, メッセージ)
+        
+        Returns:
+            Dict[str, Any]: 処理結果
+        
+        Raises:
+            ServiceError: ジョブが失敗またはキャンセルされた場合
+        """
+        for event in self.stream_events(job_id):
+            if event['event'] == 'progress' and progress_callback:
+                progress_callback(event['data']['progress'], event['data']['message'])
+        
+        job = self.get_job(job_id)
+        if job['status'] != 'completed':
+            raise ServiceError(job.get('error') or f"ジョブが完了しませんでした: {job['status']}")
+        
+        return self.get_result(job_id)
+    
+    def download(self, job_id: str, relative_path: str, destination: str) -> Path:
+        """
+        出力ファイルをダウンロード
+        
+        Args:
+            job_id: ジョブID
+            relative_path: 出力ディレクトリからの相対パス
+            destination: 保存先ファイルパス
+        
+        Returns:
+            Path: 保存先ファイルパス
+        """
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        
+        url = f"{self.base_url}/jobs/{job_id}/files?path={quote(relative_path)}"
+        try:
+            with request.urlopen(url, timeout=self.timeout) as response, open(destination, 'wb') as f:
+                shutil.copyfileobj(response, f)
+        except error.HTTPError as e:
+            raise ServiceError(f"ファイル取得に失敗: {relative_path} ({e})") from e
+        
+        logging.info(f"ファイル取得完了: {destination}")
+        return destination
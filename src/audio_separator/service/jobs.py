@@ -0,0 +1,565 @@
+"""
+分離ジョブ管理
+
+常駐モデルを使い回して音声分離ジョブを優先度順に実行し、進捗イベントを配信する
+"""
+
+import time
+import uuid
+import queue
+import logging
+import itertools
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+
+from ..processors.separation_pipeline import SeparationPipeline
+from ..utils.audio_utils import AudioUtils
+from ..utils.cancellation import CancellationToken, OperationCancelledError
+from ..utils.profiler import StageProfiler
+from ..utils.progress import ProgressUpdate
+from ..utils.time_estimator import ProcessingTimeEstimator, TimeEstimate
+
+
+class SeparationJob:
+    """音声分離ジョブを表すクラス"""
+    
+    # ジョブ状態
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    
+    TERMINAL_STATES = {COMPLETED, FAILED, CANCELLED}
+    
+    def __init__(
+        self,
+        input_path: str,
+        output_dir: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = 0
+    ):
+        """
+        ジョブを初期化
+        
+        Args:
+            input_path: 入力音声ファイルパス
+            output_dir: 出力ディレクトリ
+            params: パイプラインパラメータ
+            priority: 優先度（大きいほど先に実行）
+        """
+        self.job_id = uuid.uuid4().hex[:12]
+        self.input_path = str(input_path)
+        self.output_dir = str(output_dir)
+        self.params = dict(params or {})
+        self.priority = priority
+        
+        self.status = self.QUEUED
+        self.progress = 0.0
+        self.message = "待機中"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        
+        # 処理時間の推定（実測記録に基づく）
+        self.audio_duration: Optional[float] = None
+        self.estimated_time: Optional[TimeEstimate] = None
+        self.time_remaining: Optional[float] = None
+        
+        # 処理速度（進捗通知から算出）
+        self.real_time_factor: Optional[float] = None
+        self.throughput: Optional[float] = None
+        
+        # 実行中のキャンセル要求
+        self.cancellation_token = CancellationToken()
+        
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        
+        # 進捗イベント履歴（SSE購読者は途中からでも全履歴を受け取れる）
+        self._events: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+    
+    @property
+    def is_finished(self) -> bool:
+        """ジョブが終了状態かどうか"""
+        return self.status in self.TERMINAL_STATES
+    
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        """イベントを記録して購読者に通知"""
+        with self._condition:
+            self._events.append({'event': event, 'data': data})
+            self._condition.notify_all()
+    
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        """
+        ジョブ状態を更新
+        
+        Args:
+            status: 新しい状態
+            message: 状態メッセージ
+        """
+        self.status = status
+        if message is not None:
+            self.message = message
+        
+        now = time.time()
+        if status == self.RUNNING:
+            self.started_at = now
+        elif status in self.TERMINAL_STATES:
+            self.finished_at = now
+        
+        self._emit('status', {'status': status, 'message': self.message})
+    
+    def update_progress(self, progress: float, message: str) -> None:
+        """
+        進捗を更新
+        
+        Args:
+            progress: 進捗率（0.0-1.0）
+            message: 進捗メッセージ
+        """
+        self.progress = progress
+        self.message = message
+        if self.estimated_time is not None and self.started_at is not None:
+            self.time_remaining = ProcessingTimeEstimator.estimate_remaining(
+                self.estimated_time.estimate, time.time() - self.started_at, progress
+            )
+        self._emit('progress', {
+            'progress': progress,
+            'message': message,
+            'time_remaining': self.time_remaining,
+            'real_time_factor': self.real_time_factor,
+            'throughput': self.throughput
+        })
+    
+    def handle_progress_update(self, update: ProgressUpdate) -> None:
+        """
+        パイプラインからの進捗通知（実時間比・スループット付き）を反映
+        
+        Args:
+            update: 進捗通知
+        """
+        self.real_time_factor = update.real_time_factor
+        self.throughput = update.throughput
+        self.update_progress(update.progress, update.message)
+    
+    def iter_events(self, timeout: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        イベントを先頭から順に取得する（ジョブ終了まで待機）
+        
+        Args:
+            timeout: 新規イベント待機のタイムアウト（秒）。タイムアウト時はNoneを返す
+        
+        Yields:
+            Optional[Dict[str, Any]]: イベント（タイムアウト時はNone）
+        """
+        index = 0
+        while True:
+            with self._condition:
+                if index >= len(self._events) and not self.is_finished:
+                    self._condition.wait(timeout)
+                pending = self._events[index:]
+                finished = self.is_finished
+            
+            if not pending:
+                if finished:
+                    return
+                yield None
+                continue
+            
+            for event in pending:
+                yield event
+            index += len(pending)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        ジョブ情報を辞書に変換
+        
+        Returns:
+            Dict[str, Any]: JSONシリアライズ可能なジョブ情報
+        """
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'input_path': self.input_path,
+            'output_dir': self.output_dir,
+            'params': self.params,
+            'priority': self.priority,
+            'error': self.error,
+            'audio_duration': self.audio_duration,
+            'estimated_time': self.estimated_time.to_dict() if self.estimated_time else None,
+            'time_remaining': self.time_remaining,
+            'real_time_factor': self.real_time_factor,
+            'throughput': self.throughput,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobManager:
+    """常駐パイプラインでジョブを優先度順に実行するジョブ管理クラス"""
+    
+    # ジョブごとに出力ディレクトリへ保存するトレースファイル名
+    TRACE_FILENAME = 'profile_trace.json'
+    
+    # 同時に実行するジョブ数の既定値
+    DEFAULT_MAX_WORKERS = 1
+    
+    def __init__(
+        self,
+        pipeline: Optional[SeparationPipeline] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **pipeline_kwargs
+    ):
+        """
+        ジョブ管理を初期化
+        
+        Args:
+            pipeline: 使用するパイプライン（Noneの場合は新規作成）
+            max_workers: 同時に実行するジョブ数（モデルは全ワーカーで共有する）
+            **pipeline_kwargs: パイプラインを新規作成する場合の引数
+        """
+        self.pipeline = pipeline or SeparationPipeline(**pipeline_kwargs)
+        self.max_workers = max(1, int(max_workers))
+        
+        # キューの要素は (-優先度, 投入順, ジョブ)。優先度を変更した場合は新しい要素を追加し、
+        # 古い要素は取り出した時点で読み捨てる（ジョブがNoneの要素はワーカーを起こすためのもの）
+        self._jobs: Dict[str, SeparationJob] = {}
+        self._queue: "queue.PriorityQueue[Tuple[float, int, Optional[SeparationJob]]]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._worker_ids = itertools.count(1)
+        self._running = False
+    
+    def start(self, warmup: bool = True) -> None:
+        """
+        ワーカースレッドを開始
+        
+        Args:
+            warmup: 開始前にモデルを事前読み込みするか
+        """
+        if self._running:
+            return
+        
+        if warmup:
+            self.pipeline.warmup()
+        
+        with self._lock:
+            self._running = True
+            self._spawn_workers()
+        logging.info(f"ジョブ管理ワーカー開始: {self.max_workers}並列")
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        ワーカースレッドを停止（待機中のジョブは実行しない）
+        
+        Args:
+            wait: 実行中のジョブの終了を待つか
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            workers, self._workers = self._workers, []
+        
+        for _ in workers:
+            self._wake_worker()
+        if wait:
+            for worker in workers:
+                worker.join()
+        logging.info("ジョブ管理ワーカー停止")
+    
+    def set_max_workers(self, max_workers: int) -> None:
+        """
+        同時に実行するジョブ数を変更
+        
+        減らした場合、余分なワーカーは実行中のジョブを終えてから停止する
+        
+        Args:
+            max_workers: 同時に実行するジョブ数
+        """
+        with self._lock:
+            self.max_workers = max(1, int(max_workers))
+            if not self._running:
+                return
+            excess = len(self._workers) - self.max_workers
+            self._spawn_workers()
+        
+        for _ in range(excess):
+            self._wake_worker()
+        logging.info(f"同時実行数を変更: {self.max_workers}")
+    
+    def submit(
+        self,
+        input_path: str,
+        output_dir: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = 0
+    ) -> SeparationJob:
+        """
+        ジョブを投入
+        
+        Args:
+            input_path: 入力音声ファイルパス
+            output_dir: 出力ディレクトリ
+            params: パイプラインパラメータ
+            priority: 優先度（大きいほど先に実行、同じ優先度は投入順）
+        
+        Returns:
+            SeparationJob: 投入されたジョブ
+        
+        Raises:
+            FileNotFoundError: 入力ファイルが見つからない場合
+        """
+        if not Path(input_path).exists():
+            raise FileNotFoundError(f"入力ファイルが見つかりません: {input_path}")
+        
+        job = SeparationJob(input_path, output_dir, params, priority)
+        self._estimate_job(job, initialize=False)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        job.set_status(SeparationJob.QUEUED, "待機中")
+        self._enqueue(job)
+        
+        logging.info(f"ジョブ投入: {job.job_id} ({input_path})")
+        return job
+    
+    def set_priority(self, job_id: str, priority: int) -> bool:
+        """
+        待機中のジョブの優先度を変更
+        
+        Args:
+            job_id: ジョブID
+            priority: 新しい優先度（大きいほど先に実行）
+        
+        Returns:
+            bool: 変更できたかどうか（実行中・終了済みのジョブは変更できない）
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != SeparationJob.QUEUED:
+                return False
+            job.priority = priority
+        
+        self._enqueue(job)
+        logging.info(f"ジョブ優先度変更: {job_id} → {priority}")
+        return True
+    
+    def get_job(self, job_id: str) -> Optional[SeparationJob]:
+        """ジョブを取得"""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def list_jobs(self) -> List[SeparationJob]:
+        """全ジョブを投入順に取得"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at)
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        ジョブをキャンセル
+        
+        待機中のジョブはすぐにキャンセルし、実行中のジョブは処理側で
+        キャンセル要求を確認した時点（推論中は次のDemucsのセグメント・pyannoteのバッチの境界）で中断する。
+        読み込んだモデルは次のジョブのために解放しない
+        
+        Args:
+            job_id: ジョブID
+        
+        Returns:
+            bool: キャンセルできたかどうか
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return False
+            
+            job.cancellation_token.cancel()
+            if job.status == SeparationJob.QUEUED:
+                job.set_status(SeparationJob.CANCELLED, "キャンセルされました")
+            else:
+                job.message = "キャンセル中..."
+        logging.info(f"ジョブキャンセル: {job_id}")
+        return True
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        サービス状態を取得
+        
+        Returns:
+            Dict[str, Any]: モデル状態とジョブ数
+        """
+        jobs = self.list_jobs()
+        return {
+            'running': self._running,
+            'max_workers': self.max_workers,
+            'models': self.pipeline.get_status(),
+            'jobs': {
+                'total': len(jobs),
+                'queued': sum(1 for job in jobs if job.status == SeparationJob.QUEUED),
+                'running': sum(1 for job in jobs if job.status == SeparationJob.RUNNING)
+            },
+            'estimated_backlog': self.get_estimated_backlog()
+        }
+    
+    def get_estimated_backlog(self) -> float:
+        """
+        実行中・待機中のジョブがすべて終わるまでの推定時間を取得
+        
+        Returns:
+            float: 推定残り時間（秒、推定できないジョブは除く）
+        """
+        backlog = 0.0
+        for job in self.list_jobs():
+            if job.status == SeparationJob.RUNNING and job.time_remaining is not None:
+                backlog += job.time_remaining
+            elif job.status == SeparationJob.QUEUED and job.estimated_time is not None:
+                backlog += job.estimated_time.estimate
+        return backlog
+    
+    def get_throughput(self) -> Dict[str, float]:
+        """
+        全ジョブを通した処理量と処理速度を取得
+        
+        処理速度は、いずれかのジョブが実行中だった実時間あたりに処理した音声の長さ
+        （音声時間/実時間）。並列実行で重なった時間は1回だけ数える
+        
+        Returns:
+            Dict[str, float]: 'audio_processed'（処理済み音声の秒数、実行中のジョブは進捗分）,
+                'wall_time'（実行中だった実時間の秒数）, 'throughput'（音声時間/実時間）
+        """
+        now = time.time()
+        audio_processed = 0.0
+        intervals = []
+        for job in self.list_jobs():
+            if job.started_at is None:
+                continue
+            intervals.append((job.started_at, job.finished_at or now))
+            if job.audio_duration:
+                if job.status == SeparationJob.COMPLETED:
+                    audio_processed += job.audio_duration
+                elif job.status == SeparationJob.RUNNING:
+                    audio_processed += job.audio_duration * job.progress
+        
+        # 実行区間を結合して、ジョブが1つでも動いていた時間を求める
+        wall_time = 0.0
+        current_start, current_end = None, None
+        for start, end in sorted(intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    wall_time += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            wall_time += current_end - current_start
+        
+        return {
+            'audio_processed': audio_processed,
+            'wall_time': wall_time,
+            'throughput': audio_processed / wall_time if wall_time > 0 else 0.0
+        }
+    
+    def _enqueue(self, job: SeparationJob) -> None:
+        """ジョブを現在の優先度でキューに追加"""
+        self._queue.put((-job.priority, next(self._sequence), job))
+    
+    def _wake_worker(self) -> None:
+        """待機中のワーカーを1つ起こす（停止・ワーカー数変更の確認用）"""
+        self._queue.put((float('-inf'), next(self._sequence), None))
+    
+    def _spawn_workers(self) -> None:
+        """不足しているワーカースレッドを起動（self._lock を保持して呼ぶ）"""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"separation-worker-{next(self._worker_ids)}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+    
+    def _retire_if_excess(self) -> bool:
+        """ワーカー数が上限を超えている場合、呼び出し元のワーカーを停止対象にする"""
+        with self._lock:
+            current = threading.current_thread()
+            if len(self._workers) <= self.max_workers or current not in self._workers:
+                return False
+            self._workers.remove(current)
+            return True
+    
+    def _claim(self, job: SeparationJob) -> bool:
+        """待機中のジョブを実行中にする（他のワーカーやキャンセルと競合しないよう排他で行う）"""
+        with self._lock:
+            if job.status != SeparationJob.QUEUED:
+                return False
+            job.set_status(SeparationJob.RUNNING, "処理開始")
+            return True
+    
+    def _estimate_job(self, job: SeparationJob, initialize: bool) -> None:
+        """
+        ジョブの処理時間を推定
+        
+        Args:
+            job: 対象ジョブ
+            initialize: モデル未初期化の場合に初期化してでも推定するか（ワーカースレッドのみTrue）
+        """
+        if not initialize and not self.pipeline.is_warm:
+            return
+        
+        try:
+            if job.audio_duration is None:
+                job.audio_duration = AudioUtils.get_audio_info(job.input_path)['duration']
+            job.estimated_time = self.pipeline.estimate_time(job.audio_duration, job.params)['total']
+        except Exception as e:
+            logging.warning(f"処理時間の推定に失敗: {job.job_id}: {e}")
+    
+    def _worker_loop(self) -> None:
+        """キューから優先度の高いジョブを取り出して実行"""
+        while self._running and not self._retire_if_excess():
+            key, _, job = self._queue.get()
+            if job is None:
+                continue
+            # 優先度変更前の古い要素、キャンセル済み・実行済みのジョブは読み捨てる
+            if key != -job.priority or not self._claim(job):
+                continue
+            self._run_job(job)
+    
+    def _run_job(self, job: SeparationJob) -> None:
+        """ジョブを実行（_claim() で実行中にしてから呼ぶ）"""
+        self._estimate_job(job, initialize=True)
+        logging.info(f"ジョブ実行開始: {job.job_id} (推定 {job.estimated_time})")
+        
+        profiler = StageProfiler(name=f"job {job.job_id}")
+        try:
+            with profiler.activate():
+                job.result = self.pipeline.run(
+                    job.input_path,
+                    job.output_dir,
+                    params=job.params,
+                    update_callback=job.handle_progress_update,
+                    cancellation_token=job.cancellation_token
+                )
+            
+            # ステージごとの計測結果を保存
+            trace_path = profiler.save_trace(Path(job.output_dir) / self.TRACE_FILENAME)
+            job.result['profile'] = profiler.summary()
+            job.result['trace_file'] = str(trace_path)
+            logging.info(f"ステージ別処理時間 ({job.job_id}):\n{profiler.format_summary()}")
+            
+            job.set_status(SeparationJob.COMPLETED, "処理完了")
+            logging.info(f"ジョブ完了: {job.job_id}")
+        
+        except OperationCancelledError:
+            job.set_status(SeparationJob.CANCELLED, "キャンセルされました")
+            logging.info(f"ジョブ中断: {job.job_id}")
+        except Exception as e:
+            job.error = str(e)
+            job.set_status(SeparationJob.FAILED, f"エラー: {e}")
+            logging.error(f"ジョブ失敗: {job.job_id}: {e}")
@@ -0,0 +1,349 @@
+"""
+ローカルHTTP分離サービス
+
+DemucsとpyannoteのモデルをメモリにロードしたままHTTP/JSONでジョブを受け付け、
+進捗をServer-Sent Eventsで配信し、結果ファイルを提供する
+
+エンドポイント:
+    GET    /health                  サービス・モデル状態
+    GET    /jobs                    ジョブ一覧
+    POST   /jobs                    ジョブ投入 {"input_path", "output_dir", "params"}
+    GET    /jobs/<id>               ジョブ状態
+    DELETE /jobs/<id>               ジョブキャンセル
+    GET    /jobs/<id>/events        進捗イベント (text/event-stream)
+    GET    /jobs/<id>/result        処理結果
+    GET    /jobs/<id>/files?path=   出力ファイル取得（出力ディレクトリ内のみ）
+
+ブラウザから他のサイト経由で呼ばれないよう、Origin（送られた場合）と Host が
+サービス自身のものであること、POSTの本文が application/json であることを確認する。
+入力・出力・話者登録簿のパスは許可したディレクトリ（既定はホームディレクトリ）の下に限る
+"""
+
+import json
+import logging
+import shutil
+import threading
+from pathlib import Path
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Iterable, List, Optional, Set
+from urllib.parse import urlparse, parse_qs
+
+from .jobs import JobManager, SeparationJob
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class SeparationRequestHandler(BaseHTTPRequestHandler):
+    """分離サービスのHTTPリクエストハンドラー"""
+    
+    server_version = "toyosatomimi/0.1"
+    protocol_version = "HTTP/1.1"
+    
+    @property
+    def job_manager(self) -> JobManager:
+        return self.server.job_manager
+    
+    def log_message(self, format: str, *args) -> None:
+        logging.debug(f"HTTP {self.address_string()} - {format % args}")
+    
+    # --- レスポンスヘルパー ---
+    
+    def _send_json(self, data: Any, status: HTTPStatus = HTTPStatus.OK) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_error_json(self, status: HTTPStatus, message: str) -> None:
+        self._send_json({'error': message}, status)
+    
+    def _read_json_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length', 0))
+        if length <= 0:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+    
+    def _check_origin(self) -> bool:
+        """Host・Origin がサービス自身のものか確認（他のサイトからのリクエスト・DNSリバインディング対策）"""
+        host = self.headers.get('Host', '')
+        if not self.server.is_allowed_host(host):
+            self._send_error_json(HTTPStatus.FORBIDDEN, f"許可されていないHostです: {host}")
+            return False
+        
+        origin = self.headers.get('Origin')
+        if origin is not None and origin != f"http://{host}":
+            self._send_error_json(HTTPStatus.FORBIDDEN, f"許可されていないOriginです: {origin}")
+            return False
+        return True
+    
+    def _get_job_or_404(self, job_id: str) -> Optional[SeparationJob]:
+        job = self.job_manager.get_job(job_id)
+        if job is None:
+            self._send_error_json(HTTPStatus.NOT_FOUND, f"ジョブが見つかりません: {job_id}")
+        return job
+    
+    # --- ルーティング ---
+    
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split('/') if p]
+        if not self._check_origin():
+            return
+        
+        try:
+            if parts == ['health']:
+                self._send_json(self.job_manager.get_status())
+            elif parts == ['jobs']:
+                self._send_json([job.to_dict() for job in self.job_manager.list_jobs()])
+            elif len(parts) == 2 and parts[0] == 'jobs':
+                job = self._get_job_or_404(parts[1])
+                if job:
+                    self._send_json(job.to_dict())
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+                job = self._get_job_or_404(parts[1])
+                if job:
+                    self._stream_events(job)
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+                job = self._get_job_or_404(parts[1])
+                if job:
+                    self._send_result(job)
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'files':
+                job = self._get_job_or_404(parts[1])
+                if job:
+                    self._send_file(job, parse_qs(url.query).get('path', [''])[0])
+            else:
+                self._send_error_json(HTTPStatus.NOT_FOUND, f"不明なパス: {url.path}")
+        
+        except (BrokenPipeError, ConnectionResetError):
+            logging.debug("クライアント切断")
+        except Exception as e:
+            logging.error(f"リクエスト処理エラー: {e}")
+            self._send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+    
+    def do_POST(self) -> None:
+        parts = [p for p in urlparse(self.path).path.split('/') if p]
+        if parts != ['jobs']:
+            self._send_error_json(HTTPStatus.NOT_FOUND, f"不明なパス: {self.path}")
+            return
+        if not self._check_origin():
+            return
+        
+        # フォーム送信など、ブラウザが事前確認なしで送れる形式は受け付けない
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_error_json(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type は application/json にしてください")
+            return
+        
+        try:
+            payload = self._read_json_body()
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_error_json(HTTPStatus.BAD_REQUEST, f"JSONの解析に失敗: {e}")
+            return
+        
+        input_path = payload.get('input_path')
+        if not input_path:
+            self._send_error_json(HTTPStatus.BAD_REQUEST, "input_path は必須です")
+            return
+        
+        output_dir = payload.get('output_dir') or str(Path(input_path).parent / f"{Path(input_path).stem}_separated")
+        params = payload.get('params') or {}
+        if not isinstance(params, dict):
+            self._send_error_json(HTTPStatus.BAD_REQUEST, "params はオブジェクトで指定してください")
+            return
+        
+        # 入力・出力・話者登録簿は許可したディレクトリの下に限る
+        for label, path in [('input_path', input_path), ('output_dir', output_dir), ('speaker_registry', params.get('speaker_registry'))]:
+            if path and not self.server.is_allowed_path(path):
+                self._send_error_json(HTTPStatus.FORBIDDEN, f"{label} が許可されたディレクトリの外です: {path}")
+                return
+        
+        try:
+            job = self.job_manager.submit(input_path, output_dir, params)
+        except FileNotFoundError as e:
+            self._send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        
+        self._send_json(job.to_dict(), HTTPStatus.ACCEPTED)
+    
+    def do_DELETE(self) -> None:
+        parts = [p for p in urlparse(self.path).path.split('/') if p]
+        if len(parts) != 2 or parts[0] != 'jobs':
+            self._send_error_json(HTTPStatus.NOT_FOUND, f"不明なパス: {self.path}")
+            return
+        if not self._check_origin():
+            return
+        
+        job = self._get_job_or_404(parts[1])
+        if job is None:
+            return
+        
+        if self.job_manager.cancel(job.job_id):
+            self._send_json(job.to_dict())
+        else:
+            self._send_error_json(HTTPStatus.CONFLICT, f"キャンセルできない状態です: {job.status}")
+    
+    # --- 個別処理 ---
+    
+    def _stream_events(self, job: SeparationJob) -> None:
+        """進捗イベントをServer-Sent Eventsで配信"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        for event in job.iter_events():
+            if event is None:
+                # キープアライブ（プロキシ・クライアントのタイムアウト防止）
+                chunk = ": keepalive\n\n"
+            else:
+                data = json.dumps(event['data'], ensure_ascii=False)
+                chunk = f"event: {event['event']}\ndata: {data}\n\n"
+            self.wfile.write(chunk.encode('utf-8'))
+            self.wfile.flush()
+        
+        self.wfile.write(b"event: end\ndata: {}\n\n")
+        self.wfile.flush()
+    
+    def _send_result(self, job: SeparationJob) -> None:
+        """処理結果を返す"""
+        if job.status == SeparationJob.COMPLETED:
+            self._send_json(job.result)
+        elif job.status == SeparationJob.FAILED:
+            self._send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, job.error or "処理に失敗しました")
+        else:
+            self._send_error_json(HTTPStatus.CONFLICT, f"処理が完了していません: {job.status}")
+    
+    def _send_file(self, job: SeparationJob, relative_path: str) -> None:
+        """出力ディレクトリ内のファイルを返す"""
+        output_dir = Path(job.output_dir).resolve()
+        file_path = (output_dir / relative_path).resolve()
+        
+        # 出力ディレクトリ外へのアクセスを禁止
+        if output_dir not in file_path.parents or not file_path.is_file():
+            self._send_error_json(HTTPStatus.NOT_FOUND, f"ファイルが見つかりません: {relative_path}")
+            return
+        
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(file_path.stat().st_size))
+        self.send_header('Content-Disposition', f'attachment; filename="{file_path.name}"')
+        self.end_headers()
+        with open(file_path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile)
+
+
+class SeparationServer(ThreadingHTTPServer):
+    """常駐モデルを保持するローカル分離サービス"""
+    
+    daemon_threads = True
+    
+    # ローカルホストとして扱う名前
+    LOOPBACK_NAMES = ('127.0.0.1', 'localhost', '[::1]')
+    
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        job_manager: Optional[JobManager] = None,
+        allowed_roots: Optional[Iterable[str]] = None
+    ):
+        """
+        サーバーを初期化
+        
+        Args:
+            host: 待ち受けアドレス（既定はローカルホストのみ）
+            port: 待ち受けポート
+            job_manager: 使用するジョブ管理（Noneの場合は新規作成）
+            allowed_roots: 入力・出力・話者登録簿に使えるディレクトリ（Noneの場合はホームディレクトリ）
+        """
+        super().__init__((host, port), SeparationRequestHandler)
+        self.job_manager = job_manager or JobManager()
+        roots = allowed_roots if allowed_roots is not None else [Path.home()]
+        self.allowed_roots: List[Path] = [Path(root).expanduser().resolve() for root in roots]
+    
+    @property
+    def allowed_hosts(self) -> Set[str]:
+        """受け付ける Host ヘッダー（空の場合は確認しない = 全アドレスで待ち受けている場合）"""
+        host, port = self.server_address[:2]
+        if host in ('0.0.0.0', '::', ''):
+            return set()
+        names = set(self.LOOPBACK_NAMES) if host in ('127.0.0.1', '::1') else set()
+        names.add(f"[{host}]" if ':' in host else host)
+        return {f"{name}:{port}" for name in names}
+    
+    def is_allowed_host(self, host: str) -> bool:
+        """Host ヘッダーがサービス自身を指しているか"""
+        allowed = self.allowed_hosts
+        return not allowed or host.lower() in allowed
+    
+    def is_allowed_path(self, path: str) -> bool:
+        """パスが許可したディレクトリの下にあるか（シンボリックリンクは解決して判定）"""
+        resolved = Path(path).expanduser().resolve()
+        return any(resolved == root or root in resolved.parents for root in self.allowed_roots)
+    
+    @property
+    def url(self) -> str:
+        """サーバーのベースURL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start_background(self, warmup: bool = True) -> threading.Thread:
+        """
+        バックグラウンドスレッドでサーバーを起動
+        
+        Args:
+            warmup: 起動前にモデルを事前読み込みするか
+        
+        Returns:
+            threading.Thread: サーバースレッド
+        """
+        self.job_manager.start(warmup=warmup)
+        thread = threading.Thread(target=self.serve_forever, name="separation-server", daemon=True)
+        thread.start()
+        logging.info(f"分離サービス起動: {self.url}")
+        return thread
+    
+    def stop(self) -> None:
+        """サーバーとワーカーを停止"""
+        self.shutdown()
+        self.server_close()
+        self.job_manager.shutdown(wait=False)
+        logging.info("分離サービス停止")
+
+
+def run_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    warmup: bool = True,
+    allowed_roots: Optional[Iterable[str]] = None,
+    **pipeline_kwargs
+) -> None:
+    """
+    分離サービスを起動してCtrl+Cまで待ち受ける
+    
+    Args:
+        host: 待ち受けアドレス
+        port: 待ち受けポート
+        warmup: 起動時にモデルを事前読み込みするか
+        allowed_roots: 入力・出力・話者登録簿に使えるディレクトリ（Noneの場合はホームディレクトリ）
+        **pipeline_kwargs: パイプライン作成時の引数（device, demucs_model等）
+    """
+    server = SeparationServer(host, port, JobManager(**pipeline_kwargs), allowed_roots)
+    logging.info(f"許可ディレクトリ: {', '.join(map(str, server.allowed_roots))}")
+    server.job_manager.start(warmup=warmup)
+    logging.info(f"分離サービス待ち受け開始: {server.url}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("停止要求を受信しました")
+    finally:
+        server.server_close()
+        server.job_manager.shutdown(wait=False)
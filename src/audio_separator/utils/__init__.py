@@ -3,5 +3,6 @@
 from .config_manager import ConfigManager
 from .audio_utils import AudioUtils
 from .file_utils import FileUtils
+from .profiler import StageProfiler, profile_stage
 
-__all__ = ["ConfigManager", "AudioUtils", "FileUtils"]
\ No newline at end of file
+__all__ = ["ConfigManager", "AudioUtils", "FileUtils", "StageProfiler", "profile_stage"]
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+音声ファイルの並列書き出し
+
+FLAC・Ogg/Opus・MP3の圧縮は書き出しより時間がかかるため、ワーカースレッドで
+エンコードし、呼び出し側は次のセグメントの切り出しを続ける。
+エンコード（libsndfile）はGILを解放するため、スレッドでも並列に動く。
+未完了の書き出し数に上限を設け、音声データをメモリに溜め込みすぎないようにする
+"""
+
+import os
+import logging
+import contextvars
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, List, Optional, Union
+
+import numpy as np
+
+from .audio_utils import AudioUtils
+
+
+class AudioEncoderPool:
+    """出力形式を固定した音声ファイルの並列書き出し"""
+    
+    # ワーカー数の上限（Noneを指定した場合）
+    MAX_WORKERS = 4
+    
+    # ワーカーあたりの未完了の書き出し数の上限
+    PENDING_PER_WORKER = 4
+    
+    def __init__(
+        self,
+        format: str = 'wav',
+        bit_depth: int = 16,
+        compression_level: Optional[float] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        書き出しプールを初期化
+        
+        Args:
+            format: 出力形式（AudioUtils.OUTPUT_FORMATS のキー）
+            bit_depth: ビット深度（WAV・FLAC）
+            compression_level: 圧縮レベル（0.0-1.0、Noneの場合は形式の既定値）
+            max_workers: ワーカー数（Noneの場合はCPU数と MAX_WORKERS の小さい方、0の場合は呼び出し元で書き出す）
+        
+        Raises:
+            ValueError: 出力形式・ビット深度が正しくない場合
+        """
+        spec = AudioUtils.OUTPUT_FORMATS.get(format)
+        if spec is None:
+            raise ValueError(f"サポートされていない出力形式: {format}（{', '.join(AudioUtils.OUTPUT_FORMATS)}）")
+        if 'subtypes' in spec and bit_depth not in spec['subtypes']:
+            raise ValueError(f"{format}で使えないビット深度: {bit_depth}（{', '.join(map(str, spec['subtypes']))}）")
+        
+        self.format = format
+        self.bit_depth = bit_depth
+        self.compression_level = compression_level
+        
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, self.MAX_WORKERS)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='audio-encoder') if max_workers > 0 else None
+        self._pending: Deque[Future] = deque()
+    
+    def __enter__(self) -> "AudioEncoderPool":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.cancel()
+    
+    def submit(self, audio_data: np.ndarray, path: Union[str, Path], sample_rate: int) -> Future:
+        """
+        書き出しを依頼（未完了の書き出しが上限に達している場合は古いものの完了を待つ）
+        
+        Args:
+            audio_data: 音声データ（書き出しが終わるまで変更しないこと）
+            path: 出力ファイルパス（拡張子は出力形式に合わせる）
+            sample_rate: サンプリングレート
+        
+        Returns:
+            Future: 保存したファイルパス（Path）を返す Future（失敗した場合は result() で例外）
+        """
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(self._encode(audio_data, path, sample_rate))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        while len(self._pending) >= self.max_workers * self.PENDING_PER_WORKER:
+            self._pending.popleft().result()
+        
+        # プロファイラーなどのコンテキストをワーカーに引き継ぐ
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._encode, audio_data, path, sample_rate)
+        self._pending.append(future)
+        return future
+    
+    def _encode(self, audio_data: np.ndarray, path: Union[str, Path], sample_rate: int) -> Path:
+        return AudioUtils.save_audio(
+            audio_data, path, sample_rate,
+            format=self.format, bit_depth=self.bit_depth, compression_level=self.compression_level
+        )
+    
+    def wait(self) -> List[Path]:
+        """
+        未完了の書き出しをすべて待つ
+        
+        Returns:
+            List[Path]: 待った書き出しのファイルパス（依頼順）
+        
+        Raises:
+            ValueError: 書き出しに失敗した場合（最初の失敗）
+        """
+        paths = []
+        while self._pending:
+            paths.append(self._pending.popleft().result())
+        return paths
+    
+    def close(self) -> None:
+        """未完了の書き出しを待ってワーカーを終了"""
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+    
+    def cancel(self) -> None:
+        """開始前の書き出しを取り消してワーカーを終了（実行中の書き出しは完了を待つ）"""
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        logging.debug("音声書き出しを取り消しました")
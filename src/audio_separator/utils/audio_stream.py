@@ -0,0 +1,346 @@
+"""
+パイプ・ソケットからの音声ストリーム入力
+
+標準入力・名前付きパイプ（FIFO）・TCPソケットから、生のPCMまたはWAVのバイト列を
+順に読み込み、一定の長さのブロック（float32）に変換して渡す。
+シークできない入力でも扱えるよう、WAVのヘッダーは自前で解析する
+（録音中に書き出されたWAVはデータ長が未確定のため、終端まで読む）。
+読み込みは別スレッドで先行して行い、分離処理の間も送信側を待たせない
+"""
+
+import os
+import sys
+import stat
+import queue
+import socket
+import struct
+import logging
+import threading
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+
+from .cancellation import CancellationToken
+
+
+class AudioStream:
+    """生のPCM・WAVのバイトストリームをブロックごとに読み込む"""
+    
+    # 生のPCMのサンプル形式 → (NumPyの型, 1サンプルのバイト数, 正規化の係数)
+    SAMPLE_FORMATS = {
+        'u8': ('u1', 1, 128.0),
+        's16le': ('<i2', 2, 32768.0),
+        's24le': (None, 3, 8388608.0),
+        's32le': ('<i4', 4, 2147483648.0),
+        'f32le': ('<f4', 4, 1.0),
+        'f64le': ('<f8', 8, 1.0)
+    }
+    
+    # 入力の形式（autoは先頭が RIFF ならWAV、それ以外は生のPCM）
+    CONTAINERS = ('auto', 'raw', 'wav')
+    
+    # 1ブロックの長さ（秒）
+    BLOCK_SECONDS = 1.0
+    
+    # 先読みしておくブロック数の上限
+    PREFETCH_BLOCKS = 32
+    
+    # WAVのデータ長が未確定であることを表す値（録音中のファイル・パイプ出力）
+    _UNKNOWN_DATA_SIZES = (0, 0xFFFFFFFF)
+    
+    def __init__(
+        self,
+        source: BinaryIO,
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+        sample_format: str = 's16le',
+        container: str = 'auto',
+        name: str = 'stream'
+    ):
+        """
+        ストリームを開く（WAVの場合はヘッダーを読み込む）
+        
+        Args:
+            source: バイナリの読み込みストリーム（シークできなくてよい）
+            sample_rate: 生のPCMのサンプリングレート（WAVの場合はヘッダーの値を使う）
+            channels: 生のPCMのチャンネル数（WAVの場合はヘッダーの値を使う）
+            sample_format: 生のPCMのサンプル形式（SAMPLE_FORMATS のキー）
+            container: 入力の形式（'auto', 'raw', 'wav'）
+            name: ログ・出力ファイル名に使うストリーム名
+        
+        Raises:
+            ValueError: 形式の指定が正しくない、またはWAVのヘッダーを解析できない場合
+        """
+        if container not in self.CONTAINERS:
+            raise ValueError(f"サポートされていない入力形式: {container}（{', '.join(self.CONTAINERS)}）")
+        
+        self._source = source
+        self._prefix = b''
+        self._remaining: Optional[int] = None
+        self.name = name
+        self.samples_read = 0
+        
+        head = self._read(4)
+        self._prefix = head
+        if container == 'wav' or (container == 'auto' and head == b'RIFF'):
+            self.container = 'wav'
+            self._read_wav_header()
+        else:
+            if sample_rate is None or channels is None:
+                raise ValueError("生のPCMにはサンプリングレートとチャンネル数の指定が必要です")
+            self.container = 'raw'
+            self.sample_rate = int(sample_rate)
+            self.channels = int(channels)
+            self.sample_format = sample_format
+        
+        if self.sample_format not in self.SAMPLE_FORMATS:
+            raise ValueError(f"サポートされていないサンプル形式: {self.sample_format}（{', '.join(self.SAMPLE_FORMATS)}）")
+        if self.sample_rate <= 0 or self.channels <= 0:
+            raise ValueError(f"サンプリングレート・チャンネル数が正しくありません: {self.sample_rate}Hz, {self.channels}ch")
+        
+        self.frame_bytes = self.SAMPLE_FORMATS[self.sample_format][1] * self.channels
+        
+        # 全体の長さ（WAVのデータ長、または通常ファイルのサイズから分かる場合のみ）
+        total_bytes = self._remaining if self.container == 'wav' else self._regular_file_size()
+        self.total_samples: Optional[int] = total_bytes // self.frame_bytes if total_bytes is not None else None
+        logging.info(f"音声ストリーム開始: {self.name} ({self.container}, {self.sample_format}, {self.sample_rate}Hz, {self.channels}ch)")
+    
+    @classmethod
+    def open(cls, spec: str, **kwargs) -> "AudioStream":
+        """
+        入力の指定からストリームを開く
+        
+        Args:
+            spec: '-'（標準入力）、'tcp://ホスト:ポート'（接続して受信）、またはファイル・FIFOのパス
+            **kwargs: AudioStream の引数（sample_rate, channels, sample_format, container）
+        
+        Returns:
+            AudioStream: 開いたストリーム（close で入力も閉じる）
+        
+        Raises:
+            FileNotFoundError: ファイル・FIFOが見つからない場合
+            ValueError: 接続先の指定が正しくない場合
+        """
+        if spec == '-':
+            return cls(sys.stdin.buffer, name='stdin', **kwargs)
+        if spec.startswith('tcp://'):
+            host, _, port = spec[len('tcp://'):].rpartition(':')
+            if not host or not port.isdigit():
+                raise ValueError(f"接続先は tcp://ホスト:ポート の形式で指定してください: {spec}")
+            connection = socket.create_connection((host, int(port)))
+            stream = cls(connection.makefile('rb'), name=f"{host}_{port}", **kwargs)
+            stream._socket = connection
+            return stream
+        
+        path = Path(spec)
+        if not path.exists():
+            raise FileNotFoundError(f"入力ストリームが見つかりません: {path}")
+        return cls(open(path, 'rb'), name=path.stem, **kwargs)
+    
+    def __enter__(self) -> "AudioStream":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """入力を閉じる（標準入力は閉じない）"""
+        if self._source is not sys.stdin.buffer:
+            self._source.close()
+        connection = getattr(self, '_socket', None)
+        if connection is not None:
+            connection.close()
+    
+    @property
+    def duration(self) -> float:
+        """読み込んだ音声の長さ（秒）"""
+        return self.samples_read / self.sample_rate
+    
+    @property
+    def total_duration(self) -> Optional[float]:
+        """全体の長さ（秒、パイプ・ソケット・録音中のWAVなど分からない場合はNone）"""
+        if self.total_samples is None:
+            return None
+        return self.total_samples / self.sample_rate
+    
+    def _regular_file_size(self) -> Optional[int]:
+        """入力が通常ファイルの場合はそのサイズ（パイプ・ソケットはNone）"""
+        try:
+            info = os.fstat(self._source.fileno())
+        except (AttributeError, OSError, ValueError):
+            return None
+        return info.st_size if stat.S_ISREG(info.st_mode) else None
+    
+    # --- 読み込み ---
+    
+    def _read(self, size: int) -> bytes:
+        """最大 size バイトを読み込む（パイプの短い読み込みは終端まで繰り返す）"""
+        data = self._prefix[:size]
+        self._prefix = self._prefix[size:]
+        while len(data) < size:
+            part = self._source.read(size - len(data))
+            if not part:
+                break
+            data += part
+        return data
+    
+    def _read_wav_header(self) -> None:
+        """RIFF/WAVEのヘッダーを data チャンクの先頭まで読み込む"""
+        riff = self._read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            raise ValueError(f"WAVのヘッダーではありません: {self.name}")
+        
+        fmt = None
+        while True:
+            chunk_header = self._read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"WAVに data チャンクがありません: {self.name}")
+            chunk_id, chunk_size = chunk_header[:4], struct.unpack('<I', chunk_header[4:])[0]
+            if chunk_id == b'data':
+                break
+            body = self._read(chunk_size + (chunk_size & 1))
+            if chunk_id == b'fmt ':
+                fmt = body[:chunk_size]
+        if fmt is None or len(fmt) < 16:
+            raise ValueError(f"WAVに fmt チャンクがありません: {self.name}")
+        
+        format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+        if format_tag == 0xFFFE and len(fmt) >= 26:
+            # WAVE_FORMAT_EXTENSIBLE はサブフォーマットの先頭2バイトが形式
+            format_tag = struct.unpack('<H', fmt[24:26])[0]
+        if format_tag == 1 and bits in (8, 16, 24, 32):
+            self.sample_format = 'u8' if bits == 8 else f"s{bits}le"
+        elif format_tag == 3 and bits in (32, 64):
+            self.sample_format = f"f{bits}le"
+        else:
+            raise ValueError(f"サポートされていないWAVの形式です: 形式 {format_tag}, {bits}ビット")
+        
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._remaining = None if chunk_size in self._UNKNOWN_DATA_SIZES else chunk_size
+    
+    def _decode(self, data: bytes) -> np.ndarray:
+        """バイト列を float32 の [チャンネル, サンプル] に変換"""
+        dtype, _, scale = self.SAMPLE_FORMATS[self.sample_format]
+        if dtype is None:
+            # 24ビットは下位にゼロを詰めて32ビット整数として読む
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            padded = np.zeros((len(raw), 4), dtype=np.uint8)
+            padded[:, 1:] = raw
+            samples = padded.view('<i4').reshape(-1).astype(np.float32) / (scale * 256.0)
+        else:
+            samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+            if self.sample_format == 'u8':
+                samples -= scale
+            if scale != 1.0:
+                samples /= scale
+        return samples.reshape(-1, self.channels).T
+    
+    def read_block(self, num_samples: int) -> Optional[np.ndarray]:
+        """
+        次のブロックを読み込む
+        
+        Args:
+            num_samples: 読み込むサンプル数（終端では短くなる）
+        
+        Returns:
+            Optional[np.ndarray]: float32 の [チャンネル, サンプル]（終端の場合は None）
+        """
+        size = num_samples * self.frame_bytes
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        data = self._read(size)
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        
+        # 途中で切れたサンプルは捨てる
+        data = data[:len(data) - len(data) % self.frame_bytes]
+        if not data:
+            return None
+        block = self._decode(data)
+        self.samples_read += block.shape[1]
+        return block
+    
+    def blocks(
+        self,
+        block_seconds: Optional[float] = None,
+        mono: bool = True,
+        prefetch: bool = True,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        終端までブロックを順に返す
+        
+        Args:
+            block_seconds: 1ブロックの長さ（秒、Noneの場合は BLOCK_SECONDS）
+            mono: モノラルに変換するか（Falseの場合は [チャンネル, サンプル]）
+            prefetch: 別スレッドで先読みするか（処理中も送信側を待たせない）
+            cancellation_token: ブロックごとに確認するキャンセルトークン
+        
+        Yields:
+            np.ndarray: 音声ブロック（float32）
+        """
+        num_samples = max(int((block_seconds or self.BLOCK_SECONDS) * self.sample_rate), 1)
+        source = self._prefetch(num_samples) if prefetch else self._read_blocks(num_samples)
+        for block in source:
+            if cancellation_token:
+                cancellation_token.check()
+            yield block.mean(axis=0) if mono else block
+    
+    def _read_blocks(self, num_samples: int) -> Iterator[np.ndarray]:
+        """終端までブロックを読み込む"""
+        while True:
+            block = self.read_block(num_samples)
+            if block is None:
+                return
+            yield block
+    
+    def _prefetch(self, num_samples: int) -> Iterator[np.ndarray]:
+        """読み込みスレッドで先読みしたブロックを返す（読み込みの例外は呼び出し側で送出）"""
+        blocks: "queue.Queue" = queue.Queue(self.PREFETCH_BLOCKS)
+        finished = object()
+        stopped = threading.Event()
+        
+        def reader():
+            try:
+                for block in self._read_blocks(num_samples):
+                    if stopped.is_set():
+                        break
+                    blocks.put(block)
+            except (OSError, ValueError) as e:
+                blocks.put(e)
+            blocks.put(finished)
+        
+        thread = threading.Thread(target=reader, name='audio-stream-reader', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = blocks.get()
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise ValueError(f"音声ストリームの読み込みに失敗: {item}")
+                yield item
+        finally:
+            # 途中で止めた場合は読み込みスレッドに止めるよう伝え、待機中の put を空ける
+            # （入力の読み込み中のスレッドは待たない）
+            stopped.set()
+            while True:
+                try:
+                    blocks.get_nowait()
+                except queue.Empty:
+                    break
+    
+    def read_all(self) -> np.ndarray:
+        """
+        終端まで読み込む
+        
+        Returns:
+            np.ndarray: float32 の [チャンネル, サンプル]
+        """
+        parts = list(self.blocks(mono=False, prefetch=False))
+        if not parts:
+            return np.zeros((self.channels, 0), dtype=np.float32)
+        return np.concatenate(parts, axis=1)
+
@@ -6,22 +6,43 @@
 
 import os
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Tuple, Optional, Union, List
 import numpy as np
-import librosa
-import soundfile as sf
+
+from .lazy_import import lazy_import
+from .profiler import profile_stage, record_io
+
+# 読み込みに時間がかかるため、最初に使う時点で読み込む
+librosa = lazy_import('librosa')
+sf = lazy_import('soundfile')
 
 
 class AudioUtils:
     """音声処理ユーティリティクラス"""
     
     # サポートされている音声形式
-    SUPPORTED_FORMATS = {'.wav', '.mp3', '.flac', '.m4a', '.aac', '.ogg'}
+    SUPPORTED_FORMATS = {'.wav', '.mp3', '.flac', '.m4a', '.aac', '.ogg', '.opus'}
+    
+    # 出力形式ごとの拡張子、soundfileの形式、ビット深度 → サブタイプ（非可逆圧縮は固定）
+    OUTPUT_FORMATS = {
+        'wav': {'extension': '.wav', 'format': 'WAV', 'subtypes': {16: 'PCM_16', 24: 'PCM_24', 32: 'FLOAT'}},
+        'flac': {'extension': '.flac', 'format': 'FLAC', 'subtypes': {16: 'PCM_16', 24: 'PCM_24'}},
+        'ogg': {'extension': '.ogg', 'format': 'OGG', 'subtype': 'VORBIS'},
+        'opus': {'extension': '.opus', 'format': 'OGG', 'subtype': 'OPUS', 'sample_rates': (8000, 12000, 16000, 24000, 48000)},
+        'mp3': {'extension': '.mp3', 'format': 'MP3', 'subtype': 'MPEG_LAYER_III', 'sample_rates': (32000, 44100, 48000)}
+    }
     
     # デフォルトのサンプリングレート
     DEFAULT_SAMPLE_RATE = 44100
     
+    # ファイル情報のキャッシュ（(パス, 更新時刻, サイズ) → 情報）
+    PROBE_CACHE_SIZE = 256
+    _probe_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+    _probe_lock = threading.Lock()
+    
     @staticmethod
     def load_audio(
         file_path: Union[str, Path], 
@@ -53,11 +74,13 @@ class AudioUtils:
         
         try:
             # librosaで音声を読み込み
-            audio_data, sr = librosa.load(
-                str(file_path),
-                sr=sample_rate,
-                mono=mono
-            )
+            with profile_stage('audio.load', file=file_path.name):
+                audio_data, sr = librosa.load(
+                    str(file_path),
+                    sr=sample_rate,
+                    mono=mono
+                )
+                record_io(bytes_read=file_path.stat().st_size)
             
             logging.info(f"音声ファイル読み込み完了: {file_path}")
             logging.info(f"サンプリングレート: {sr}Hz, 長さ: {len(audio_data)/sr:.2f}秒")
@@ -72,21 +95,36 @@ class AudioUtils:
         audio_data: np.ndarray,
         output_path: Union[str, Path],
         sample_rate: int = DEFAULT_SAMPLE_RATE,
-        format: str = 'wav'
-    ) -> None:
+        format: Optional[str] = None,
+        bit_depth: int = 16,
+        compression_level: Optional[float] = None
+    ) -> Path:
         """
         音声データをファイルに保存する
         
         Args:
             audio_data: 音声データ
-            output_path: 出力ファイルパス
+            output_path: 出力ファイルパス（形式を指定した場合は拡張子を形式に合わせる）
             sample_rate: サンプリングレート
-            format: 出力形式
+            format: 出力形式（OUTPUT_FORMATS のキー、Noneの場合は拡張子から判定）
+            bit_depth: ビット深度（WAV: 16/24/32(float)、FLAC: 16/24、非可逆圧縮では無視）
+            compression_level: 圧縮レベル（0.0-1.0、FLACは圧縮率、Ogg/Opus/MP3は品質の逆、Noneの場合は既定値）
+            
+        Returns:
+            Path: 保存したファイルパス
             
         Raises:
             ValueError: 無効なデータまたは形式の場合
         """
         output_path = Path(output_path)
+        if format is None:
+            format = output_path.suffix.lower().lstrip('.') or 'wav'
+        spec = AudioUtils.OUTPUT_FORMATS.get(format)
+        if spec is None:
+            raise ValueError(f"サポートされていない出力形式: {format}（{', '.join(AudioUtils.OUTPUT_FORMATS)}）")
+        if 'subtypes' in spec and bit_depth not in spec['subtypes']:
+            raise ValueError(f"{format}で使えないビット深度: {bit_depth}（{', '.join(map(str, spec['subtypes']))}）")
+        output_path = output_path.with_suffix(spec['extension'])
         
         # 出力ディレクトリを作成
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -96,15 +134,29 @@ class AudioUtils:
             if audio_data.dtype != np.float32:
                 audio_data = audio_data.astype(np.float32)
             
+            # 形式が対応していないサンプリングレートは、対応する最も近い上のレートに変換
+            allowed_rates = spec.get('sample_rates')
+            if allowed_rates and sample_rate not in allowed_rates:
+                target_rate = min((rate for rate in allowed_rates if rate >= sample_rate), default=allowed_rates[-1])
+                audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=target_rate)
+                sample_rate = target_rate
+            
             # 形状チェック：ステレオの場合は転置
             if len(audio_data.shape) == 2 and audio_data.shape[0] == 2:
                 # [2, samples] -> [samples, 2] for soundfile
                 audio_data = audio_data.T
             
-            # soundfileで保存（拡張子から自動形式判定）
-            sf.write(str(output_path), audio_data, sample_rate)
+            with profile_stage('audio.save', file=output_path.name, format=format):
+                sf.write(
+                    str(output_path), audio_data, sample_rate,
+                    subtype=spec['subtypes'][bit_depth] if 'subtypes' in spec else spec['subtype'],
+                    format=spec['format'],
+                    compression_level=compression_level if format != 'wav' else None
+                )
+                record_io(bytes_written=output_path.stat().st_size)
             
             logging.info(f"音声ファイル保存完了: {output_path}")
+            return output_path
             
         except Exception as e:
             raise ValueError(f"音声ファイルの保存に失敗: {e}")
@@ -120,27 +172,61 @@ class AudioUtils:
         Returns:
             dict: 音声ファイルの情報
         """
+        return AudioUtils.probe_audio_file(file_path)
+    
+    @staticmethod
+    def probe_audio_file(file_path: Union[str, Path]) -> dict:
+        """
+        音声ファイルのヘッダを読んで情報を取得する
+        
+        結果は (パス, 更新時刻, サイズ) をキーにキャッシュし、同じファイルの
+        検証・情報取得でファイルを開き直さない
+        
+        Args:
+            file_path: 音声ファイルのパス
+            
+        Returns:
+            dict: 音声ファイルの情報
+            
+        Raises:
+            FileNotFoundError: ファイルが見つからない場合
+            ValueError: 音声ファイルとして読めない場合
+        """
         file_path = Path(file_path)
         
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except OSError:
             raise FileNotFoundError(f"音声ファイルが見つかりません: {file_path}")
         
+        key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        with AudioUtils._probe_lock:
+            cached = AudioUtils._probe_cache.get(key)
+            if cached is not None:
+                AudioUtils._probe_cache.move_to_end(key)
+                return dict(cached, file_path=str(file_path))
+        
         try:
             # ファイル情報を取得（メタデータのみ）
             info = sf.info(str(file_path))
-            
-            return {
-                'duration': info.duration,
-                'sample_rate': info.samplerate,
-                'channels': info.channels,
-                'format': info.format,
-                'subtype': info.subtype,
-                'file_size': file_path.stat().st_size,
-                'file_path': str(file_path)
-            }
-            
         except Exception as e:
             raise ValueError(f"音声ファイル情報の取得に失敗: {e}")
+        
+        result = {
+            'duration': info.duration,
+            'sample_rate': info.samplerate,
+            'channels': info.channels,
+            'format': info.format,
+            'subtype': info.subtype,
+            'file_size': stat.st_size,
+            'file_path': str(file_path)
+        }
+        
+        with AudioUtils._probe_lock:
+            AudioUtils._probe_cache[key] = result
+            while len(AudioUtils._probe_cache) > AudioUtils.PROBE_CACHE_SIZE:
+                AudioUtils._probe_cache.popitem(last=False)
+        return dict(result)
     
     @staticmethod
     def normalize_audio(audio_data: np.ndarray, target_peak: float = 0.95) -> np.ndarray:
@@ -316,19 +402,15 @@ class AudioUtils:
         try:
             file_path = Path(file_path)
             
-            # ファイル存在チェック
-            if not file_path.exists():
-                return False
-            
             # 拡張子チェック
             if file_path.suffix.lower() not in AudioUtils.SUPPORTED_FORMATS:
                 return False
             
-            # ファイル読み込みテスト
-            info = sf.info(str(file_path))
+            # ファイル読み込みテスト（存在しない・読めない場合は例外）
+            info = AudioUtils.probe_audio_file(file_path)
             
             # 基本的な妥当性チェック
-            if info.duration <= 0 or info.samplerate <= 0:
+            if info['duration'] <= 0 or info['sample_rate'] <= 0:
                 return False
             
             return True
@@ -0,0 +1,116 @@
+"""
+処理のキャンセル・一時停止
+
+処理側はチャンク・バッチ・ファイル書き出しの合間にトークンを確認し、
+キャンセルされていれば OperationCancelledError で処理を中断する。
+推論は推論ライブラリ内部の区間（Demucsのセグメント・pyannoteのバッチ）ごとに確認し、
+推論中の区間は完了まで待ってから中断する
+（別スレッドに残すと、キャンセル後もモデルを使い続けて解放や次のジョブと競合するため）
+"""
+
+import gc
+import sys
+import logging
+import threading
+
+
+class OperationCancelledError(Exception):
+    """処理がキャンセルされた場合の例外"""
+    
+    def __init__(self, message: str = "処理がキャンセルされました"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """処理のキャンセル・一時停止を要求するトークン"""
+    
+    # 一時停止中・待機中にキャンセルを確認する間隔（秒）
+    POLL_INTERVAL = 0.1
+    
+    def __init__(self):
+        """トークンを初期化"""
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+    
+    @property
+    def is_cancelled(self) -> bool:
+        """キャンセルが要求されているか"""
+        return self._cancelled.is_set()
+    
+    @property
+    def is_paused(self) -> bool:
+        """一時停止が要求されているか"""
+        return not self._running.is_set()
+    
+    def cancel(self) -> None:
+        """キャンセルを要求（一時停止中の処理も再開させて中断する）"""
+        self._cancelled.set()
+        self._running.set()
+    
+    def pause(self) -> None:
+        """一時停止を要求（次の確認箇所で処理が停止する）"""
+        if not self.is_cancelled:
+            self._running.clear()
+    
+    def resume(self) -> None:
+        """一時停止を解除"""
+        self._running.set()
+    
+    def check(self) -> None:
+        """
+        キャンセル・一時停止を確認
+        
+        一時停止中は再開またはキャンセルされるまで待機する
+        
+        Raises:
+            OperationCancelledError: キャンセルされている場合
+        """
+        if self.is_paused:
+            logging.info("処理を一時停止しました")
+            while not self._running.wait(self.POLL_INTERVAL):
+                pass
+            if not self.is_cancelled:
+                logging.info("処理を再開しました")
+        
+        if self.is_cancelled:
+            raise OperationCancelledError()
+
+
+class CheckedCall:
+    """
+    呼び出しの直前にトークンを確認する関数ラッパー
+    
+    推論ライブラリ内部の関数と差し替え、推論を区間ごとに中断できるようにする。
+    属性の参照は元の関数・オブジェクトに委譲する
+    """
+    
+    def __init__(self, func, token: CancellationToken):
+        """
+        ラッパーを初期化
+        
+        Args:
+            func: 元の関数・呼び出し可能オブジェクト
+            token: 呼び出しごとに確認するトークン
+        """
+        self._func = func
+        self._token = token
+    
+    def __call__(self, *args, **kwargs):
+        self._token.check()
+        return self._func(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._func, name)
+
+
+def release_device_memory() -> None:
+    """解放したモデルのメモリを回収（PyTorch読み込み済みの場合はGPUキャッシュも解放）"""
+    gc.collect()
+    
+    torch = sys.modules.get('torch')
+    try:
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception as e:
+        logging.debug(f"GPUメモリ解放エラー: {e}")
@@ -86,6 +86,19 @@ class ConfigManager:
         self._config = {}
         self._load_config()
     
+    @staticmethod
+    def get_config_dir() -> Path:
+        """
+        ユーザー設定ディレクトリを取得
+        
+        Returns:
+            Path: 設定ディレクトリ
+        """
+        if os.name == 'nt':  # Windows
+            return Path.home() / 'AppData' / 'Local' / 'toyosatomimi'
+        else:  # Linux/Mac
+            return Path.home() / '.config' / 'toyosatomimi'
+    
     def _get_default_config_path(self) -> Path:
         """
         デフォルトの設定ファイルパスを取得
@@ -94,12 +107,7 @@ class ConfigManager:
             Path: 設定ファイルパス
         """
         # ユーザーディレクトリの設定フォルダ
-        if os.name == 'nt':  # Windows
-            config_dir = Path.home() / 'AppData' / 'Local' / 'toyosatomimi'
-        else:  # Linux/Mac
-            config_dir = Path.home() / '.config' / 'toyosatomimi'
-        
-        return config_dir / 'config.json'
+        return self.get_config_dir() / 'config.json'
     
     def _load_config(self) -> None:
         """設定ファイルを読み込み"""
@@ -5,6 +5,7 @@
 """
 
 import os
+import re
 import shutil
 import logging
 from pathlib import Path
@@ -61,6 +62,22 @@ class FileUtils:
             
             counter += 1
     
+    @staticmethod
+    def sanitize_filename(name: str, replacement: str = "_") -> str:
+        """
+        ファイル名・ディレクトリ名に使えない文字を置き換える
+        
+        Args:
+            name: 元の名前（話者名など）
+            replacement: 置き換える文字
+            
+        Returns:
+            str: ファイル名に使える名前（空になる場合は "unknown"）
+        """
+        sanitized = re.sub(r'[\x00-\x1f<>:"/\\|?*]', replacement, str(name))
+        sanitized = sanitized.strip(' .')
+        return sanitized or "unknown"
+    
     @staticmethod
     def copy_file(source: Union[str, Path], destination: Union[str, Path]) -> Path:
         """
@@ -0,0 +1,170 @@
+"""
+重いモジュールの遅延読み込み
+
+librosa・soundfile・torch などは読み込みに時間がかかるため、モジュールの
+読み込み時には代理オブジェクトだけを作り、最初に属性を参照した時点で実際に
+読み込む。GUIはウィンドウ表示後にバックグラウンドで事前読み込みを行う
+"""
+
+import re
+import sys
+import time
+import logging
+import importlib
+import threading
+import subprocess
+from types import ModuleType
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# 起動時に読み込みたくない重いモジュール（事前読み込みの順序）
+HEAVY_MODULES = (
+    'soundfile',
+    'scipy.signal',
+    'librosa',
+    'torch',
+    'torchaudio',
+    'demucs.pretrained',
+    'demucs.apply',
+    'pyannote.audio',
+)
+
+
+class LazyModule(ModuleType):
+    """最初の属性参照時に読み込まれるモジュールの代理オブジェクト"""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+    
+    def _load(self) -> ModuleType:
+        """モジュールを読み込む（複数スレッドから呼ばれても1回だけ）"""
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+    
+    @property
+    def is_loaded(self) -> bool:
+        """実際に読み込まれているか（他の箇所で読み込まれた場合も含む）"""
+        return self.__dict__['_lazy_module'] is not None or self.__name__ in sys.modules
+    
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+    
+    def __dir__(self):
+        return dir(self._load())
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    モジュールを遅延読み込みする代理オブジェクトを作成
+    
+    Args:
+        name: モジュール名
+    
+    Returns:
+        LazyModule: 最初の属性参照時に読み込まれる代理オブジェクト
+    """
+    return LazyModule(name)
+
+
+# 事前読み込みの状態（モジュール名 → (読み込めたか, 所要秒数)）
+_prewarm_status: Dict[str, Tuple[bool, float]] = {}
+_prewarm_lock = threading.Lock()
+
+
+def prewarm_modules(
+    names: Iterable[str] = HEAVY_MODULES,
+    on_complete: Optional[Callable[[Dict[str, Tuple[bool, float]]], None]] = None
+) -> threading.Thread:
+    """
+    重いモジュールをバックグラウンドで読み込む
+    
+    インストールされていないモジュールは読み込めなかったものとして記録する
+    
+    Args:
+        names: 読み込むモジュール名
+        on_complete: 完了時にワーカースレッドから呼ばれるコールバック（状態の辞書を受け取る）
+    
+    Returns:
+        threading.Thread: 読み込みスレッド
+    """
+    names = list(names)
+    
+    def worker():
+        for name in names:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+                loaded = True
+            except Exception as e:
+                logging.debug(f"事前読み込みをスキップ: {name}: {e}")
+                loaded = False
+            with _prewarm_lock:
+                _prewarm_status[name] = (loaded, time.perf_counter() - start)
+        
+        status = get_prewarm_status()
+        logging.info(
+            "モジュール事前読み込み完了: " +
+            ", ".join(f"{name}={seconds:.2f}s" for name, (ok, seconds) in status.items() if ok)
+        )
+        if on_complete:
+            on_complete(status)
+    
+    thread = threading.Thread(target=worker, name="module-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_prewarm_status() -> Dict[str, Tuple[bool, float]]:
+    """事前読み込みの状態を取得（モジュール名 → (読み込めたか, 所要秒数)）"""
+    with _prewarm_lock:
+        return dict(_prewarm_status)
+
+
+def measure_import_times(
+    module: str,
+    python: str = sys.executable,
+    cwd: Optional[str] = None
+) -> Dict[str, Tuple[int, int]]:
+    """
+    新しいプロセスで `python -X importtime` を実行し、モジュールごとの読み込み時間を計測
+    
+    Args:
+        module: 読み込むモジュール名
+        python: 使用するPythonインタープリタ
+        cwd: 実行ディレクトリ
+    
+    Returns:
+        Dict[str, Tuple[int, int]]: モジュール名 → (自身の時間, 累積時間)（マイクロ秒）
+    
+    Raises:
+        RuntimeError: 読み込みに失敗した場合
+    """
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        cwd=cwd
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"モジュールの読み込みに失敗: {module}\n{completed.stderr[-2000:]}")
+    
+    times = {}
+    pattern = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.+)$')
+    for line in completed.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            name = match.group(3).strip()
+            times[name] = (int(match.group(1)), int(match.group(2)))
+    return times
@@ -0,0 +1,221 @@
+"""
+BGM（音楽）の有無の判定
+
+短時間スペクトルのピーク（倍音・和音の成分）が同じ周波数に持続するかを
+1秒ごとに調べる。音楽は音程が一定の音が続くためピークが持続し、話し声は
+抑揚と音節で音程・振幅が変わり続けるため持続しない。
+音楽の無いファイルはBGM分離を省略し、音楽の無い区間はDemucsに渡さない
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from .audio_utils import AudioUtils
+from .speech_activity import SpeechActivityMap
+
+
+class MusicAnalysis:
+    """BGMの有無の判定結果（1秒ごとの窓単位）"""
+    
+    def __init__(self, window_seconds: float, scores: np.ndarray, is_music: np.ndarray, is_silent: np.ndarray, duration: float):
+        """
+        判定結果を初期化
+        
+        Args:
+            window_seconds: 判定の窓の長さ（秒）
+            scores: 窓ごとの音楽らしさ（0.0-1.0、ピークの持続率）
+            is_music: 窓ごとの判定
+            is_silent: 窓ごとの無音判定（無音の窓は音楽の割合に含めない）
+            duration: 音声の長さ（秒）
+        """
+        self.window_seconds = window_seconds
+        self.scores = scores
+        self.is_music = is_music
+        self.is_silent = is_silent
+        self.duration = duration
+    
+    @property
+    def music_duration(self) -> float:
+        """音楽のある区間の合計時間（秒）"""
+        return min(float(self.is_music.sum()) * self.window_seconds, self.duration)
+    
+    @property
+    def music_ratio(self) -> float:
+        """無音以外の区間に占める音楽のある区間の割合（0.0-1.0）"""
+        sounding = int((~self.is_silent).sum())
+        return float(self.is_music.sum()) / sounding if sounding else 0.0
+    
+    @property
+    def has_music(self) -> bool:
+        """BGM分離が必要な量の音楽があるか"""
+        return self.music_ratio >= MusicDetector.MIN_MUSIC_RATIO
+    
+    def regions(self, padding: float = 1.0, min_gap: float = 3.0) -> List[Tuple[float, float]]:
+        """
+        音楽のある区間を取得
+        
+        Args:
+            padding: 区間の前後に付ける余白（秒）
+            min_gap: これより短い音楽の無い区間は前後の区間とつなげる（秒）
+        
+        Returns:
+            List[Tuple[float, float]]: (開始, 終了) 時刻（秒）のリスト
+        """
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], self.is_music.astype(np.int8), [0]))))
+        regions: List[Tuple[float, float]] = []
+        for start, end in edges.reshape(-1, 2):
+            start = max(start * self.window_seconds - padding, 0.0)
+            end = min(end * self.window_seconds + padding, self.duration)
+            if regions and start - regions[-1][1] < min_gap:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+        return regions
+    
+    def region_map(self, total_samples: int, sample_rate: int) -> SpeechActivityMap:
+        """
+        音楽のある区間をサンプル位置の対応表に変換
+        
+        Args:
+            total_samples: 音声の総サンプル数
+            sample_rate: サンプリングレート
+        
+        Returns:
+            SpeechActivityMap: 音楽のある区間
+        """
+        bounds = np.round(np.array(self.regions(), dtype=np.float64).reshape(-1, 2) * sample_rate).astype(np.int64)
+        return SpeechActivityMap(np.clip(bounds, 0, total_samples), total_samples, sample_rate)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書に変換（処理結果の報告用）"""
+        return {
+            'has_music': self.has_music,
+            'music_ratio': self.music_ratio,
+            'music_duration': self.music_duration,
+            'regions': [[start, end] for start, end in self.regions()]
+        }
+
+
+class MusicDetector:
+    """スペクトルのピークの持続による音楽検出"""
+    
+    # 判定の窓の長さ（秒）
+    WINDOW_SECONDS = 1.0
+    
+    # スペクトルのフレーム長の目安（秒、2のべき乗のサンプル数に切り上げる）
+    FRAME_SECONDS = 0.064
+    
+    # ピークを探す周波数範囲（Hz）
+    MIN_FREQUENCY = 60.0
+    MAX_FREQUENCY = 5000.0
+    
+    # フレームの中央値のこの倍率を超える極大をピークとする
+    PEAK_RATIO = 4.0
+    
+    # 持続率の高い上位のピーク数と、音楽とみなす持続率
+    TOP_PEAKS = 3
+    MUSIC_THRESHOLD = 0.8
+    
+    # これより小さい窓は無音とする（dBFS）
+    SILENCE_DB = -50.0
+    
+    # BGM分離を行う音楽の割合の下限
+    MIN_MUSIC_RATIO = 0.05
+    
+    # ファイルから判定する場合のサンプリングレート
+    ANALYSIS_SAMPLE_RATE = 16000
+    
+    # まとめて計算する窓の数
+    BLOCK_WINDOWS = 128
+    
+    def detect(self, audio: np.ndarray, sample_rate: int) -> MusicAnalysis:
+        """
+        音楽のある区間を判定
+        
+        Args:
+            audio: 音声（最後の軸が時間、複数チャンネルは平均する）
+            sample_rate: サンプリングレート
+        
+        Returns:
+            MusicAnalysis: 判定結果
+        """
+        mono = audio if audio.ndim == 1 else audio.reshape(-1, audio.shape[-1]).mean(axis=0)
+        duration = len(mono) / sample_rate
+        frame = 1 << int(np.ceil(np.log2(sample_rate * self.FRAME_SECONDS)))
+        frames_per_window = max(int(round(self.WINDOW_SECONDS * sample_rate / frame)), 1)
+        window_seconds = frames_per_window * frame / sample_rate
+        
+        window_samples = frame * frames_per_window
+        num_windows = -(-len(mono) // window_samples)
+        scores = np.zeros(num_windows)
+        is_silent = np.zeros(num_windows, dtype=bool)
+        
+        # 長い音声でもメモリを抑えるため、窓をまとめたブロックごとに計算する
+        freqs = np.fft.rfftfreq(frame, 1.0 / sample_rate)
+        band = (freqs >= self.MIN_FREQUENCY) & (freqs <= self.MAX_FREQUENCY)
+        hann = np.hanning(frame).astype(np.float32)
+        for first in range(0, num_windows, self.BLOCK_WINDOWS):
+            count = min(self.BLOCK_WINDOWS, num_windows - first)
+            block = np.zeros(count * window_samples, dtype=np.float32)
+            chunk = mono[first * window_samples:(first + count) * window_samples]
+            block[:len(chunk)] = chunk
+            frames = block.reshape(count * frames_per_window, frame)
+            
+            # 無音の窓
+            power = np.square(frames, dtype=np.float64).reshape(count, -1).mean(axis=1)
+            is_silent[first:first + count] = 10.0 * np.log10(np.maximum(power, 1e-12)) < self.SILENCE_DB
+            
+            magnitude = np.abs(np.fft.rfft(frames * hann, axis=1))[:, band]
+            scores[first:first + count] = self._window_scores(magnitude, count, frames_per_window)
+        
+        is_music = (scores >= self.MUSIC_THRESHOLD) & ~is_silent
+        
+        analysis = MusicAnalysis(window_seconds, scores, is_music, is_silent, duration)
+        logging.info(
+            f"BGM判定: 音楽 {analysis.music_duration:.1f}秒 / {duration:.1f}秒 "
+            f"(無音以外の{analysis.music_ratio * 100:.0f}%), BGM分離{'必要' if analysis.has_music else '不要'}"
+        )
+        return analysis
+    
+    def _window_scores(self, magnitude: np.ndarray, num_windows: int, frames_per_window: int) -> np.ndarray:
+        """
+        窓ごとの音楽らしさ（持続率の高い上位のピークの平均）を計算
+        
+        Args:
+            magnitude: フレームごとの振幅スペクトル [窓数×フレーム数, 周波数]
+            num_windows: 窓数
+            frames_per_window: 窓あたりのフレーム数
+        
+        Returns:
+            np.ndarray: 窓ごとの音楽らしさ（0.0-1.0）
+        """
+        if magnitude.shape[1] < 3:
+            return np.zeros(num_windows)
+        
+        # 雑音より十分大きい極大をピークとし、隣の周波数への揺れは同じピークとみなす
+        floor = np.median(magnitude, axis=1, keepdims=True) * self.PEAK_RATIO
+        center = magnitude[:, 1:-1]
+        peaks = np.zeros(magnitude.shape, dtype=bool)
+        peaks[:, 1:-1] = (center > magnitude[:, :-2]) & (center >= magnitude[:, 2:]) & (center > floor)
+        pooled = peaks.copy()
+        pooled[:, 1:] |= peaks[:, :-1]
+        pooled[:, :-1] |= peaks[:, 1:]
+        
+        persistence = pooled.reshape(num_windows, frames_per_window, -1).mean(axis=1)
+        return np.sort(persistence, axis=1)[:, -self.TOP_PEAKS:].mean(axis=1)
+    
+    def detect_file(self, file_path: Union[str, Path]) -> MusicAnalysis:
+        """
+        音声ファイルのBGMの有無を判定（判定用のサンプリングレートで読み込む）
+        
+        Args:
+            file_path: 音声ファイルパス
+        
+        Returns:
+            MusicAnalysis: 判定結果
+        """
+        audio_data, sample_rate = AudioUtils.load_audio(file_path, sample_rate=self.ANALYSIS_SAMPLE_RATE)
+        return self.detect(audio_data, sample_rate)
@@ -0,0 +1,439 @@
+"""
+処理ステージのプロファイラー
+
+パイプラインの各ステージ（デコード、Demucs、pyannote、書き出し等）について
+経過時間・CPU時間・ピークRSS・読み書きバイト数を記録し、
+Chrome trace形式のJSONと集計表を出力する。
+
+CPU時間はステージを実行したスレッドの値で、コンテキストを引き継いだワーカー
+（AudioEncoderPool等）で実行した子ステージの分を加算する（PyTorchの演算スレッドなど、
+プロファイラーを経由しないスレッドの分は含まない）。RSSはプロセス全体の値のため、
+他のジョブと並行して実行した場合は集計表・トレースにその旨を記録する
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Tuple, Union, Iterator
+
+
+# 現在有効なプロファイラー（無効時はNoneで、計測は何もしない）
+_active_profiler: contextvars.ContextVar[Optional["StageProfiler"]] = contextvars.ContextVar(
+    'active_profiler', default=None
+)
+
+# 実行中のステージ（外側から順、ワーカーにはコンテキストごと引き継がれる）
+_stage_stack: contextvars.ContextVar[Tuple["StageRecord", ...]] = contextvars.ContextVar(
+    'stage_stack', default=()
+)
+
+
+def _get_current_rss() -> Optional[int]:
+    """
+    現在の常駐メモリ量（バイト）を取得
+    
+    Returns:
+        Optional[int]: RSS（取得できない場合はNone）
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    
+    # psutilが無い場合はLinuxの/procから取得
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    # 最終手段: プロセス開始以降の最大RSS
+    try:
+        import resource
+        import sys
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOSはバイト、Linuxはキロバイト単位
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class StageRecord:
+    """1つのステージの計測結果を表すクラス"""
+    
+    def __init__(self, name: str, depth: int, thread_id: int, args: Optional[Dict[str, Any]] = None):
+        """
+        ステージ記録を初期化
+        
+        Args:
+            name: ステージ名（例: "demucs.inference"）
+            depth: ネストの深さ（0がトップレベル）
+            thread_id: 実行スレッドID
+            args: 付加情報
+        """
+        self.name = name
+        self.depth = depth
+        self.thread_id = thread_id
+        self.args = dict(args or {})
+        
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+        self._cpu_start = time.thread_time()
+        self.thread_cpu_time = 0.0
+        self.worker_cpu_time = 0.0
+        
+        self.start_rss = _get_current_rss()
+        self.peak_rss = self.start_rss
+        self.bytes_read = 0
+        self.bytes_written = 0
+    
+    @property
+    def wall_time(self) -> float:
+        """経過時間（秒）"""
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return end_time - self.start_time
+    
+    @property
+    def cpu_time(self) -> float:
+        """CPU時間（秒、実行スレッドの分と別スレッドで実行した子ステージの分の合計）"""
+        return self.thread_cpu_time + self.worker_cpu_time
+    
+    def update_peak_rss(self, rss: Optional[int]) -> None:
+        """ピークRSSを更新"""
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+    
+    def finish(self) -> None:
+        """ステージを終了"""
+        self.end_time = time.perf_counter()
+        self.thread_cpu_time = time.thread_time() - self._cpu_start
+        self.update_peak_rss(_get_current_rss())
+
+
+class StageProfiler:
+    """ステージ単位で時間・メモリ・I/Oを計測するプロファイラー"""
+    
+    # RSSサンプリング間隔（秒）
+    DEFAULT_SAMPLE_INTERVAL = 0.05
+    
+    # 有効化中のプロファイラー（並行実行の検出に使う）
+    _running: Set["StageProfiler"] = set()
+    _running_lock = threading.Lock()
+    
+    def __init__(self, name: str = "job", sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        プロファイラーを初期化
+        
+        Args:
+            name: プロファイル名（トレースのプロセス名に使用）
+            sample_interval: ステージ実行中のRSSサンプリング間隔（秒、0以下で無効）
+        """
+        self.name = name
+        self.sample_interval = sample_interval
+        
+        self.records: List[StageRecord] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._open_records: List[StageRecord] = []
+        
+        # 他のプロファイラーと同時に有効だった場合True（RSSは他のジョブの分を含む）
+        self.concurrent = False
+        
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
+    
+    # --- ステージ計測 ---
+    
+    @contextmanager
+    def stage(self, name: str, **args) -> Iterator[StageRecord]:
+        """
+        ステージを計測するコンテキストマネージャー
+        
+        Args:
+            name: ステージ名
+            **args: トレースに含める付加情報
+        
+        Yields:
+            StageRecord: 計測中のステージ記録
+        """
+        stack = _stage_stack.get()
+        record = StageRecord(name, len(stack), threading.get_ident(), args)
+        
+        with self._lock:
+            self.records.append(record)
+            self._open_records.append(record)
+        token = _stage_stack.set(stack + (record,))
+        
+        try:
+            yield record
+        finally:
+            record.finish()
+            _stage_stack.reset(token)
+            with self._lock:
+                self._open_records.remove(record)
+                # 子ステージのピークは親ステージのピークでもある
+                for parent in stack:
+                    parent.update_peak_rss(record.peak_rss)
+                # ワーカースレッドで実行した分は親ステージのスレッドのCPU時間に含まれないため加算する
+                if stack and stack[-1].thread_id != record.thread_id:
+                    for parent in stack:
+                        parent.worker_cpu_time += record.thread_cpu_time
+    
+    def add_io(self, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        """
+        実行中のステージ（と親ステージ）に読み書きバイト数を加算
+        
+        Args:
+            bytes_read: 読み込みバイト数
+            bytes_written: 書き込みバイト数
+        """
+        with self._lock:
+            for record in _stage_stack.get():
+                record.bytes_read += bytes_read
+                record.bytes_written += bytes_written
+    
+    # --- RSSサンプリング ---
+    
+    def start(self) -> None:
+        """RSSサンプリングスレッドを開始"""
+        if self.sample_interval <= 0 or self._sampler is not None:
+            return
+        
+        self._sampler_stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-rss-sampler", daemon=True)
+        self._sampler.start()
+    
+    def stop(self) -> None:
+        """RSSサンプリングスレッドを停止"""
+        if self._sampler is None:
+            return
+        
+        self._sampler_stop.set()
+        self._sampler.join()
+        self._sampler = None
+    
+    def _sample_loop(self) -> None:
+        """実行中ステージのピークRSSを定期的に更新"""
+        while not self._sampler_stop.wait(self.sample_interval):
+            rss = _get_current_rss()
+            if rss is None:
+                return
+            with self._lock:
+                for record in self._open_records:
+                    record.update_peak_rss(rss)
+    
+    @contextmanager
+    def activate(self) -> Iterator["StageProfiler"]:
+        """
+        このプロファイラーを有効化する（profile_stage / record_io の記録先になる）
+        
+        Yields:
+            StageProfiler: 自身
+        """
+        with StageProfiler._running_lock:
+            if StageProfiler._running:
+                self.concurrent = True
+                for profiler in StageProfiler._running:
+                    profiler.concurrent = True
+            StageProfiler._running.add(self)
+        
+        token = _active_profiler.set(self)
+        stack_token = _stage_stack.set(())
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+            _stage_stack.reset(stack_token)
+            _active_profiler.reset(token)
+            with StageProfiler._running_lock:
+                StageProfiler._running.discard(self)
+    
+    @property
+    def peak_rss_scope(self) -> str:
+        """ピークRSSの範囲（並行実行した場合は'process'、それ以外は'job'）"""
+        return 'process' if self.concurrent else 'job'
+    
+    # --- 出力 ---
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Chrome trace形式（chrome://tracing, Perfetto）に変換
+        
+        Returns:
+            Dict[str, Any]: traceEventsを含むトレースデータ
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': self.name}}
+        ]
+        
+        with self._lock:
+            records = list(self.records)
+        
+        for record in records:
+            args = dict(record.args)
+            args.update({
+                'cpu_ms': round(record.cpu_time * 1000.0, 3),
+                'peak_rss_mb': round(record.peak_rss / (1024 * 1024), 2) if record.peak_rss is not None else None,
+                'bytes_read': record.bytes_read,
+                'bytes_written': record.bytes_written
+            })
+            events.append({
+                'name': record.name,
+                'cat': record.name.split('.')[0],
+                'ph': 'X',
+                'ts': round((record.start_time - self._origin) * 1e6, 1),
+                'dur': round(record.wall_time * 1e6, 1),
+                'pid': pid,
+                'tid': record.thread_id,
+                'args': args
+            })
+        
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'peak_rss_scope': self.peak_rss_scope}}
+    
+    def save_trace(self, output_path: Union[str, Path]) -> Path:
+        """
+        Chrome trace形式のJSONを保存
+        
+        Args:
+            output_path: 出力ファイルパス
+        
+        Returns:
+            Path: 保存したファイルパス
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        
+        logging.info(f"プロファイルトレース保存: {output_path}")
+        return output_path
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        ステージ名ごとの集計を取得（初出順）
+        
+        Returns:
+            List[Dict[str, Any]]: ステージごとの集計結果
+        """
+        with self._lock:
+            records = list(self.records)
+        
+        rows: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            row = rows.get(record.name)
+            if row is None:
+                row = rows[record.name] = {
+                    'stage': record.name,
+                    'depth': record.depth,
+                    'calls': 0,
+                    'wall_time': 0.0,
+                    'cpu_time': 0.0,
+                    'peak_rss': None,
+                    'peak_rss_scope': self.peak_rss_scope,
+                    'bytes_read': 0,
+                    'bytes_written': 0
+                }
+            row['calls'] += 1
+            row['wall_time'] += record.wall_time
+            row['cpu_time'] += record.cpu_time
+            row['bytes_read'] += record.bytes_read
+            row['bytes_written'] += record.bytes_written
+            if record.peak_rss is not None:
+                row['peak_rss'] = max(row['peak_rss'] or 0, record.peak_rss)
+        
+        total_wall = sum(record.wall_time for record in records if record.depth == 0) or 1e-9
+        for row in rows.values():
+            row['wall_ratio'] = row['wall_time'] / total_wall
+        
+        return list(rows.values())
+    
+    def format_summary(self) -> str:
+        """集計表を文字列で取得"""
+        return self.format_summary_table(self.summary())
+    
+    @staticmethod
+    def format_summary_table(rows: List[Dict[str, Any]]) -> str:
+        """
+        集計結果を表形式の文字列に整形
+        
+        Args:
+            rows: summary()の結果（JSON経由で受け取ったものも可）
+        
+        Returns:
+            str: 整形済みの集計表
+        """
+        def format_bytes(value: int) -> str:
+            if not value:
+                return "-"
+            for unit in ['B', 'KB', 'MB', 'GB']:
+                if value < 1024 or unit == 'GB':
+                    return f"{value:.0f}{unit}" if unit == 'B' else f"{value:.1f}{unit}"
+                value /= 1024.0
+        
+        header = f"{'ステージ':<34} {'回数':>4} {'経過(s)':>9} {'CPU(s)':>9} {'割合':>6} {'ピークRSS':>10} {'読込':>9} {'書込':>9}"
+        lines = [header, '-' * len(header)]
+        process_wide = False
+        for row in rows:
+            name = '  ' * row['depth'] + row['stage']
+            peak = f"{row['peak_rss'] / (1024 * 1024):.0f}MB" if row.get('peak_rss') else "-"
+            if row.get('peak_rss') and row.get('peak_rss_scope') == 'process':
+                peak += '*'
+                process_wide = True
+            lines.append(
+                f"{name:<34} {row['calls']:>4} {row['wall_time']:>9.3f} {row['cpu_time']:>9.3f} "
+                f"{row['wall_ratio'] * 100:>5.1f}% {peak:>10} "
+                f"{format_bytes(row['bytes_read']):>9} {format_bytes(row['bytes_written']):>9}"
+            )
+        if process_wide:
+            lines.append("* 他のジョブと並行して実行したため、プロセス全体のピークRSS")
+        return '\n'.join(lines)
+
+
+def get_active_profiler() -> Optional[StageProfiler]:
+    """現在有効なプロファイラーを取得（無効時はNone）"""
+    return _active_profiler.get()
+
+
+@contextmanager
+def profile_stage(name: str, **args) -> Iterator[Optional[StageRecord]]:
+    """
+    有効なプロファイラーがあればステージを計測する（無ければ何もしない）
+    
+    Args:
+        name: ステージ名
+        **args: トレースに含める付加情報
+    
+    Yields:
+        Optional[StageRecord]: 計測中のステージ記録（プロファイラー無効時はNone）
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield None
+        return
+    
+    with profiler.stage(name, **args) as record:
+        yield record
+
+
+def record_io(bytes_read: int = 0, bytes_written: int = 0) -> None:
+    """
+    有効なプロファイラーがあれば現在ステージに読み書きバイト数を加算
+    
+    Args:
+        bytes_read: 読み込みバイト数
+        bytes_written: 書き込みバイト数
+    """
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.add_io(bytes_read, bytes_written)
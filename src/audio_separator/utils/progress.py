@@ -0,0 +1,223 @@
+"""
+処理進捗の通知
+
+推論ループの内側から細かく進捗を通知するための仕組み。
+各通知は実時間比（処理時間/処理済み音声長）とスループットを持ち、
+通知間隔を制限することでコールバックが推論を遅くしないようにする
+"""
+
+import time
+import logging
+from typing import Dict, Any, Optional, Callable, List
+
+
+class ProgressUpdate:
+    """進捗通知の内容を表すクラス"""
+    
+    def __init__(
+        self,
+        stage: str,
+        progress: float,
+        message: str,
+        elapsed: float,
+        audio_duration: Optional[float] = None
+    ):
+        """
+        進捗通知を初期化
+        
+        Args:
+            stage: ステージ名（例: 'demucs.inference'）
+            progress: 処理全体に対する進捗率（0.0-1.0）
+            message: 進捗メッセージ
+            elapsed: 処理開始からの経過時間（秒）
+            audio_duration: 処理対象の音声長（秒）
+        """
+        self.stage = stage
+        self.progress = progress
+        self.message = message
+        self.elapsed = elapsed
+        self.audio_duration = audio_duration
+    
+    @property
+    def audio_processed(self) -> Optional[float]:
+        """処理済みとみなせる音声長（秒）"""
+        if self.audio_duration is None:
+            return None
+        return self.audio_duration * self.progress
+    
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """実時間比（経過時間/処理済み音声長、1.0未満なら実時間より速い）"""
+        processed = self.audio_processed
+        if not processed or self.elapsed <= 0:
+            return None
+        return self.elapsed / processed
+    
+    @property
+    def throughput(self) -> Optional[float]:
+        """スループット（1秒あたりに処理した音声の秒数）"""
+        processed = self.audio_processed
+        if not processed or self.elapsed <= 0:
+            return None
+        return processed / self.elapsed
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書に変換"""
+        return {
+            'stage': self.stage,
+            'progress': self.progress,
+            'message': self.message,
+            'elapsed': self.elapsed,
+            'audio_duration': self.audio_duration,
+            'real_time_factor': self.real_time_factor,
+            'throughput': self.throughput
+        }
+
+
+class _ReporterState:
+    """親子のレポーターで共有する通知状態"""
+    
+    def __init__(
+        self,
+        callback: Optional[Callable[[float, str], None]],
+        listeners: List[Callable[[ProgressUpdate], None]],
+        audio_duration: Optional[float],
+        min_interval: float
+    ):
+        self.callback = callback
+        self.listeners = listeners
+        self.audio_duration = audio_duration
+        self.min_interval = min_interval
+        self.start_time = time.monotonic()
+        self.last_delivery = float('-inf')
+        self.last_progress = 0.0
+        self.last_message = ""
+
+
+class ProgressReporter:
+    """間隔を制限して進捗を通知するクラス"""
+    
+    # 既定の最小通知間隔（秒）
+    DEFAULT_MIN_INTERVAL = 0.1
+    
+    def __init__(
+        self,
+        stage: str,
+        callback: Optional[Callable[[float, str], None]] = None,
+        listeners: Optional[List[Callable[[ProgressUpdate], None]]] = None,
+        audio_duration: Optional[float] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL
+    ):
+        """
+        レポーターを初期化
+        
+        Args:
+            stage: ステージ名
+            callback: 進捗コールバック関数 (進捗率0.0-1.0, メッセージ)
+            listeners: ProgressUpdateを受け取るリスナーのリスト
+            audio_duration: 処理対象の音声長（秒、実時間比の計算に使用）
+            min_interval: 最小通知間隔（秒）
+        """
+        self.stage = stage
+        self._state = _ReporterState(callback, list(listeners or []), audio_duration, min_interval)
+        self._start = 0.0
+        self._end = 1.0
+    
+    @property
+    def audio_duration(self) -> Optional[float]:
+        """処理対象の音声長"""
+        return self._state.audio_duration
+    
+    @audio_duration.setter
+    def audio_duration(self, value: Optional[float]) -> None:
+        self._state.audio_duration = value
+    
+    @staticmethod
+    def ensure(
+        callback: Optional[Callable[[float, str], None]],
+        stage: str,
+        audio_duration: Optional[float] = None
+    ) -> "ProgressReporter":
+        """
+        進捗コールバックをレポーターに変換
+        
+        上位の処理から渡されたレポーター（またはその子）はそのまま使い、
+        通知間隔の制限とリスナーを共有する
+        
+        Args:
+            callback: 進捗コールバック関数、またはProgressReporter
+            stage: 新しく作成する場合のステージ名
+            audio_duration: 処理対象の音声長（未設定の場合のみ反映）
+        
+        Returns:
+            ProgressReporter: レポーター
+        """
+        if isinstance(callback, ProgressReporter):
+            if callback.audio_duration is None:
+                callback.audio_duration = audio_duration
+            return callback
+        return ProgressReporter(stage, callback, audio_duration=audio_duration)
+    
+    def sub(self, start: float, end: float, stage: Optional[str] = None) -> "ProgressReporter":
+        """
+        進捗範囲の一部を受け持つ子レポーターを作成
+        
+        Args:
+            start: このレポーターの範囲内での開始位置（0.0-1.0）
+            end: このレポーターの範囲内での終了位置（0.0-1.0）
+            stage: 子のステージ名（Noneの場合は親と同じ）
+        
+        Returns:
+            ProgressReporter: 子レポーター（通知間隔の制限は親と共有）
+        """
+        child = ProgressReporter.__new__(ProgressReporter)
+        child.stage = stage or self.stage
+        child._state = self._state
+        span = self._end - self._start
+        child._start = self._start + span * start
+        child._end = self._start + span * end
+        return child
+    
+    def update(self, fraction: float, message: Optional[str] = None, force: bool = False) -> None:
+        """
+        進捗を通知（最小通知間隔より短い場合は間引く）
+        
+        メッセージが変わった場合・完了時・force指定時は必ず通知する
+        
+        Args:
+            fraction: このレポーターの範囲内での進捗率（0.0-1.0）
+            message: 進捗メッセージ（Noneの場合は前回のメッセージ）
+            force: 間隔制限を無視して通知するか
+        """
+        state = self._state
+        fraction = min(max(fraction, 0.0), 1.0)
+        progress = max(self._start + (self._end - self._start) * fraction, state.last_progress)
+        if message is None:
+            message = state.last_message
+        
+        now = time.monotonic()
+        if not (force or message != state.last_message or fraction >= 1.0
+                or now - state.last_delivery >= state.min_interval):
+            return
+        
+        state.last_delivery = now
+        state.last_progress = progress
+        state.last_message = message
+        
+        if state.callback:
+            try:
+                state.callback(progress, message)
+            except Exception as e:
+                logging.warning(f"進捗コールバックエラー: {e}")
+        
+        if state.listeners:
+            update = ProgressUpdate(self.stage, progress, message, now - state.start_time, state.audio_duration)
+            for listener in state.listeners:
+                try:
+                    listener(update)
+                except Exception as e:
+                    logging.warning(f"進捗リスナーエラー: {e}")
+    
+    def __call__(self, fraction: float, message: Optional[str] = None) -> None:
+        """進捗コールバックとして呼び出された場合はupdateと同じ"""
+        self.update(fraction, message)
@@ -0,0 +1,272 @@
+"""
+音声区間検出（無音の事前除去）
+
+短いフレームごとのエネルギーから音のある区間を求め、前後に余白を付けた区間だけを
+詰めて重いモデル（Demucs・pyannote）に渡す。モデルの出力は区間の対応表を使って
+元の時刻に戻す（波形は無音部分を0で埋め、話者セグメントは元の時刻に写す）
+"""
+
+import logging
+
+import numpy as np
+
+
+class SpeechActivityMap:
+    """音のある区間と、詰めた音声上の時刻との対応表"""
+    
+    def __init__(self, regions: np.ndarray, total_samples: int, sample_rate: int):
+        """
+        対応表を初期化
+        
+        Args:
+            regions: 音のある区間の (開始, 終了) サンプル位置 [N, 2]（昇順・重なりなし）
+            total_samples: 元音声の総サンプル数
+            sample_rate: サンプリングレート
+        """
+        self.regions = np.asarray(regions, dtype=np.int64).reshape(-1, 2)
+        self.total_samples = int(total_samples)
+        self.sample_rate = int(sample_rate)
+        
+        # 詰めた音声上での各区間の開始位置
+        lengths = self.regions[:, 1] - self.regions[:, 0]
+        self.compact_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    
+    @classmethod
+    def full(cls, total_samples: int, sample_rate: int) -> "SpeechActivityMap":
+        """全体を音のある区間とする対応表"""
+        regions = np.array([[0, total_samples]]) if total_samples > 0 else np.empty((0, 2))
+        return cls(regions, total_samples, sample_rate)
+    
+    @property
+    def active_samples(self) -> int:
+        """音のある区間の合計サンプル数"""
+        return int((self.regions[:, 1] - self.regions[:, 0]).sum())
+    
+    @property
+    def active_duration(self) -> float:
+        """音のある区間の合計時間（秒）"""
+        return self.active_samples / self.sample_rate
+    
+    @property
+    def active_ratio(self) -> float:
+        """音のある区間の割合（0.0-1.0）"""
+        return self.active_samples / self.total_samples if self.total_samples else 1.0
+    
+    @property
+    def is_full(self) -> bool:
+        """除去する区間が無いか"""
+        return self.active_samples >= self.total_samples
+    
+    def mask(self) -> np.ndarray:
+        """区間に含まれるサンプルを True とする配列"""
+        mask = np.zeros(self.total_samples, dtype=bool)
+        for start, end in self.regions:
+            mask[start:end] = True
+        return mask
+    
+    def intersect(self, other: "SpeechActivityMap") -> "SpeechActivityMap":
+        """
+        両方の区間に含まれる部分だけの対応表を作成
+        
+        Args:
+            other: 同じ音声の対応表
+        
+        Returns:
+            SpeechActivityMap: 共通部分の対応表
+        """
+        regions = []
+        i = j = 0
+        while i < len(self.regions) and j < len(other.regions):
+            start = max(self.regions[i, 0], other.regions[j, 0])
+            end = min(self.regions[i, 1], other.regions[j, 1])
+            if start < end:
+                regions.append((start, end))
+            if self.regions[i, 1] < other.regions[j, 1]:
+                i += 1
+            else:
+                j += 1
+        return SpeechActivityMap(np.array(regions, dtype=np.int64).reshape(-1, 2), self.total_samples, self.sample_rate)
+    
+    def compact(self, audio: np.ndarray) -> np.ndarray:
+        """
+        音のある区間だけを詰めた音声を作成
+        
+        Args:
+            audio: 元音声（最後の軸が時間）
+        
+        Returns:
+            np.ndarray: 詰めた音声
+        """
+        if self.is_full:
+            return audio
+        return np.concatenate([audio[..., start:end] for start, end in self.regions], axis=-1)
+    
+    def expand(self, compact_audio: np.ndarray) -> np.ndarray:
+        """
+        詰めた音声を元の長さに戻す（除去した区間は0で埋める）
+        
+        Args:
+            compact_audio: compact() と同じ長さの音声（最後の軸が時間）
+        
+        Returns:
+            np.ndarray: 元の長さの音声
+        """
+        if self.is_full:
+            return compact_audio
+        audio = np.zeros(compact_audio.shape[:-1] + (self.total_samples,), dtype=compact_audio.dtype)
+        for (start, end), offset in zip(self.regions, self.compact_starts):
+            audio[..., start:end] = compact_audio[..., offset:offset + end - start]
+        return audio
+    
+    def to_original_time(self, compact_times: np.ndarray) -> np.ndarray:
+        """
+        詰めた音声上の時刻を元の時刻に変換
+        
+        Args:
+            compact_times: 詰めた音声上の時刻（秒）
+        
+        Returns:
+            np.ndarray: 元の時刻（秒）
+        """
+        compact_times = np.asarray(compact_times, dtype=np.float64)
+        if not len(self.regions):
+            return compact_times
+        compact_starts = self.compact_starts / self.sample_rate
+        index = np.clip(np.searchsorted(compact_starts, compact_times, side='right') - 1, 0, len(self.regions) - 1)
+        return compact_times - compact_starts[index] + self.regions[index, 0] / self.sample_rate
+    
+    def map_segments(self, segments):
+        """
+        詰めた音声上の話者セグメントを元の時刻に写す
+        
+        除去した区間をまたぐセグメントは区間の境目で分割するため、
+        写したセグメントが無音部分を含むことはない
+        
+        Args:
+            segments: 詰めた音声上の話者セグメント（SegmentTable）
+        
+        Returns:
+            SegmentTable: 元の時刻の話者セグメント
+        """
+        from ..processors.segment_table import SegmentTable
+        
+        if self.is_full or not len(segments) or not len(self.regions):
+            return segments
+        
+        rate = float(self.sample_rate)
+        compact_starts = self.compact_starts / rate
+        compact_ends = compact_starts + (self.regions[:, 1] - self.regions[:, 0]) / rate
+        original_starts = self.regions[:, 0] / rate
+        last = len(self.regions) - 1
+        
+        # セグメントの開始・終了が含まれる区間（区間の境目で終わる場合は前の区間）
+        first_region = np.clip(np.searchsorted(compact_starts, segments.starts, side='right') - 1, 0, last)
+        last_region = np.clip(np.searchsorted(compact_starts, segments.ends, side='left') - 1, first_region, last)
+        
+        # 区間ごとの断片に展開
+        pieces = last_region - first_region + 1
+        rows = np.repeat(np.arange(len(segments)), pieces)
+        piece_offsets = np.arange(len(rows)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        region = first_region[rows] + piece_offsets
+        
+        starts = np.maximum(segments.starts[rows], compact_starts[region])
+        ends = np.minimum(segments.ends[rows], compact_ends[region])
+        shift = original_starts[region] - compact_starts[region]
+        
+        keep = ends > starts
+        return SegmentTable(
+            (starts + shift)[keep],
+            (ends + shift)[keep],
+            segments.codes[rows][keep],
+            segments.confidences[rows][keep],
+            segments.categories
+        )
+
+
+class SpeechActivityDetector:
+    """フレームのエネルギーによる音声区間検出"""
+    
+    # フレーム長（秒）
+    FRAME_SECONDS = 0.05
+    
+    # これより小さいフレームは常に無音とする（dBFS）
+    ABSOLUTE_FLOOR_DB = -50.0
+    
+    # 大きな音（上位5%のフレーム）からこれ以上小さいフレームを無音とする（dB）
+    DYNAMIC_RANGE_DB = 40.0
+    
+    def __init__(self, padding: float = 0.5, min_silence: float = 2.0):
+        """
+        検出器を初期化
+        
+        Args:
+            padding: 音のある区間の前後に付ける余白（秒）
+            min_silence: 除去する無音の最小の長さ（秒、余白を付けた後の長さ）
+        """
+        self.padding = padding
+        self.min_silence = min_silence
+    
+    def frame_levels(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        フレームごとのRMSレベル（dBFS）を計算
+        
+        Args:
+            audio: 音声（最後の軸が時間、複数チャンネルは平均する）
+            sample_rate: サンプリングレート
+        
+        Returns:
+            np.ndarray: フレームごとのレベル
+        """
+        mono = audio if audio.ndim == 1 else audio.reshape(-1, audio.shape[-1]).mean(axis=0)
+        frame = max(int(self.FRAME_SECONDS * sample_rate), 1)
+        num_frames = -(-len(mono) // frame)
+        padded = np.zeros(num_frames * frame, dtype=np.float64)
+        padded[:len(mono)] = mono
+        power = np.square(padded).reshape(num_frames, frame).mean(axis=1)
+        return 10.0 * np.log10(np.maximum(power, 1e-12))
+    
+    def detect(self, audio: np.ndarray, sample_rate: int) -> SpeechActivityMap:
+        """
+        音のある区間を検出
+        
+        Args:
+            audio: 音声（最後の軸が時間）
+            sample_rate: サンプリングレート
+        
+        Returns:
+            SpeechActivityMap: 音のある区間の対応表
+        """
+        total_samples = audio.shape[-1]
+        frame = max(int(self.FRAME_SECONDS * sample_rate), 1)
+        levels = self.frame_levels(audio, sample_rate)
+        if not len(levels):
+            return SpeechActivityMap.full(total_samples, sample_rate)
+        
+        threshold = max(self.ABSOLUTE_FLOOR_DB, float(np.percentile(levels, 95)) - self.DYNAMIC_RANGE_DB)
+        active = levels > threshold
+        
+        # 音のある区間の前後に余白を付ける（余白分だけ広げる）
+        pad_frames = int(np.ceil(self.padding / self.FRAME_SECONDS))
+        if pad_frames > 0 and active.any():
+            active = np.convolve(active.astype(np.int32), np.ones(2 * pad_frames + 1, dtype=np.int32), mode='same') > 0
+        
+        # 無音の連続を求め、短い無音は残す
+        edges = np.flatnonzero(np.diff(np.concatenate(([1], active.astype(np.int8), [1]))))
+        silences = edges.reshape(-1, 2)
+        min_frames = int(np.ceil(self.min_silence / self.FRAME_SECONDS))
+        silences = silences[silences[:, 1] - silences[:, 0] >= min_frames]
+        
+        # 無音以外を音のある区間とする（サンプル位置）
+        bounds = np.concatenate(([0], silences.ravel() * frame, [len(levels) * frame]))
+        regions = np.minimum(bounds.reshape(-1, 2), total_samples)
+        regions = regions[regions[:, 1] > regions[:, 0]]
+        if not len(regions):
+            # 全体が無音の場合はそのまま処理する
+            return SpeechActivityMap.full(total_samples, sample_rate)
+        
+        activity = SpeechActivityMap(regions, total_samples, sample_rate)
+        logging.info(
+            f"音声区間検出: {len(regions)}区間, 音のある区間 {activity.active_duration:.1f}秒 / "
+            f"{total_samples / sample_rate:.1f}秒 ({activity.active_ratio * 100:.0f}%)"
+        )
+        return activity
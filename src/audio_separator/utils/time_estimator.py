@@ -0,0 +1,274 @@
+"""
+処理時間推定
+
+過去の実行で計測したステージごとの処理速度（処理時間/音声長）を
+マシン・モデル・設定ごとに記録し、そこから処理時間を信頼区間付きで推定する
+"""
+
+import os
+import json
+import math
+import time
+import hashlib
+import logging
+import platform
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Union
+
+from .config_manager import ConfigManager
+
+
+def get_machine_fingerprint() -> Dict[str, Any]:
+    """
+    処理速度に影響するマシン情報と、その識別子を取得
+    
+    Returns:
+        Dict[str, Any]: マシン情報（'id'キーに識別子）
+    """
+    # GPUの有無は記録キーのデバイスで区別する（推定のためだけにtorchを読み込まない）
+    info = {
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()
+    }
+    info['id'] = hashlib.sha1(json.dumps(info, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return info
+
+
+class TimeEstimate:
+    """処理時間の推定結果を表すクラス"""
+    
+    def __init__(self, estimate: float, lower: float, upper: float, samples: int = 0, source: str = 'default'):
+        """
+        推定結果を初期化
+        
+        Args:
+            estimate: 推定処理時間（秒）
+            lower: 信頼区間の下限（秒）
+            upper: 信頼区間の上限（秒）
+            samples: 推定に使った記録数
+            source: 推定の根拠（'history': 実測記録, 'default': 既定の係数）
+        """
+        self.estimate = estimate
+        self.lower = lower
+        self.upper = upper
+        self.samples = samples
+        self.source = source
+    
+    def __add__(self, other: "TimeEstimate") -> "TimeEstimate":
+        """ステージごとの推定を合算（区間は保守的に端点を加算）"""
+        return TimeEstimate(
+            self.estimate + other.estimate,
+            self.lower + other.lower,
+            self.upper + other.upper,
+            min(self.samples, other.samples),
+            self.source if self.source == other.source else 'mixed'
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書に変換"""
+        return {
+            'estimate': self.estimate,
+            'lower': self.lower,
+            'upper': self.upper,
+            'samples': self.samples,
+            'source': self.source
+        }
+    
+    def __repr__(self) -> str:
+        return f"TimeEstimate({self.estimate:.1f}s [{self.lower:.1f}-{self.upper:.1f}], n={self.samples}, {self.source})"
+
+
+class ProcessingTimeEstimator:
+    """実測記録から処理時間を推定するクラス"""
+    
+    # 記録ファイル名（設定ディレクトリに保存）
+    RECORDS_FILENAME = 'throughput_records.jsonl'
+    
+    # 推定に使う直近の記録数
+    MAX_SAMPLES = 50
+    
+    # 信頼区間のz値（約90%）
+    Z_SCORE = 1.645
+    
+    # 記録が1件しかない場合に仮定する log(処理速度) の標準偏差
+    PRIOR_LOG_STD = 0.5
+    
+    # 記録が無い場合の推定区間（既定係数に対する倍率）
+    DEFAULT_INTERVAL = (0.5, 2.0)
+    
+    def __init__(self, records_file: Optional[Union[str, Path]] = None):
+        """
+        推定器を初期化
+        
+        Args:
+            records_file: 記録ファイルパス（Noneの場合は設定ディレクトリ）
+        """
+        self.records_file = Path(records_file) if records_file else ConfigManager.get_config_dir() / self.RECORDS_FILENAME
+        self.machine = get_machine_fingerprint()
+        
+        self._lock = threading.Lock()
+        self._records: Optional[List[Dict[str, Any]]] = None
+    
+    @staticmethod
+    def make_key(stage: str, model: str, device: str, settings: Optional[Dict[str, Any]] = None) -> str:
+        """
+        記録の照合キーを作成
+        
+        Args:
+            stage: ステージ名（例: 'bgm_separation'）
+            model: モデル名
+            device: 処理デバイス
+            settings: 処理速度に影響する設定
+        
+        Returns:
+            str: 照合キー
+        """
+        return json.dumps([stage, model, device, settings or {}], sort_keys=True, ensure_ascii=False)
+    
+    def _load_records(self) -> List[Dict[str, Any]]:
+        """このマシンの記録を読み込む（初回のみファイルから）"""
+        if self._records is not None:
+            return self._records
+        
+        records = []
+        if self.records_file.exists():
+            try:
+                with open(self.records_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if record.get('machine') == self.machine['id']:
+                            records.append(record)
+            except OSError as e:
+                logging.warning(f"処理時間記録の読み込みに失敗: {e}")
+        
+        self._records = records
+        return records
+    
+    def record(
+        self,
+        stage: str,
+        model: str,
+        device: str,
+        audio_duration: float,
+        processing_time: float,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        実測した処理時間を記録
+        
+        Args:
+            stage: ステージ名
+            model: モデル名
+            device: 処理デバイス
+            audio_duration: 音声の長さ（秒）
+            processing_time: 実測処理時間（秒）
+            settings: 処理速度に影響する設定
+        """
+        if audio_duration <= 0 or processing_time <= 0:
+            return
+        
+        record = {
+            'timestamp': time.time(),
+            'machine': self.machine['id'],
+            'key': self.make_key(stage, model, device, settings),
+            'audio_duration': audio_duration,
+            'processing_time': processing_time
+        }
+        
+        with self._lock:
+            self._load_records().append(record)
+            try:
+                self.records_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.records_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            except OSError as e:
+                logging.warning(f"処理時間記録の保存に失敗: {e}")
+        
+        logging.debug(f"処理時間記録: {stage} {audio_duration:.1f}秒 → {processing_time:.2f}秒")
+    
+    def estimate(
+        self,
+        stage: str,
+        model: str,
+        device: str,
+        audio_duration: float,
+        settings: Optional[Dict[str, Any]] = None,
+        default_factor: Optional[float] = None
+    ) -> TimeEstimate:
+        """
+        処理時間を推定
+        
+        処理速度（処理時間/音声長）は対数正規分布に従うとみなし、
+        直近の記録から log(処理速度) の平均と標準偏差を求めて予測区間を計算する
+        
+        Args:
+            stage: ステージ名
+            model: モデル名
+            device: 処理デバイス
+            audio_duration: 音声の長さ（秒）
+            settings: 処理速度に影響する設定
+            default_factor: 記録が無い場合に使う処理速度係数
+        
+        Returns:
+            TimeEstimate: 推定結果
+        """
+        key = self.make_key(stage, model, device, settings)
+        with self._lock:
+            samples = [r for r in self._load_records() if r['key'] == key][-self.MAX_SAMPLES:]
+        
+        if not samples:
+            factor = default_factor if default_factor is not None else 1.0
+            estimate = audio_duration * factor
+            low, high = self.DEFAULT_INTERVAL
+            return TimeEstimate(estimate, estimate * low, estimate * high, 0, 'default')
+        
+        log_rates = [math.log(r['processing_time'] / r['audio_duration']) for r in samples]
+        n = len(log_rates)
+        mean = sum(log_rates) / n
+        if n > 1:
+            std = math.sqrt(sum((x - mean) ** 2 for x in log_rates) / (n - 1))
+        else:
+            std = self.PRIOR_LOG_STD
+        
+        # 新しい1件の予測区間（平均の不確かさを含む）
+        spread = self.Z_SCORE * std * math.sqrt(1.0 + 1.0 / n)
+        return TimeEstimate(
+            audio_duration * math.exp(mean),
+            audio_duration * math.exp(mean - spread),
+            audio_duration * math.exp(mean + spread),
+            n,
+            'history'
+        )
+    
+    @staticmethod
+    def estimate_remaining(total_estimate: float, elapsed: float, progress: float) -> float:
+        """
+        経過時間と進捗率から残り時間を推定
+        
+        開始直後は事前推定を、進捗が進むほど実際の進み具合からの外挿を重視する
+        
+        Args:
+            total_estimate: 事前推定の総処理時間（秒）
+            elapsed: 経過時間（秒）
+            progress: 進捗率（0.0-1.0）
+        
+        Returns:
+            float: 推定残り時間（秒）
+        """
+        prior_remaining = max(total_estimate - elapsed, 0.0)
+        if progress <= 0.0:
+            return prior_remaining
+        if progress >= 1.0:
+            return 0.0
+        
+        observed_remaining = elapsed / progress - elapsed
+        return (1.0 - progress) * prior_remaining + progress * observed_remaining
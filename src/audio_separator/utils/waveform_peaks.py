@@ -0,0 +1,311 @@
+"""
+波形ピークピラミッド
+
+音声を一定サンプル数ごとの最小値・最大値に縮約したピーク列を、解像度を
+1/2ずつ下げながら多段に保持する（audiowaveformの.datファイルと同様の考え方）。
+バイナリのサイドカーファイル（<音声ファイル名>.peaks）に保存し、表示側は
+メモリマップで読み込んで、表示範囲・表示幅に合った段だけを参照する
+"""
+
+import struct
+import logging
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+
+class PeakPyramid:
+    """多段の波形ピーク（最小値・最大値）を保持するクラス"""
+    
+    # サイドカーファイルの拡張子と識別子
+    SIDECAR_SUFFIX = '.peaks'
+    MAGIC = b'TPKS'
+    VERSION = 1
+    
+    # ヘッダ: 識別子, バージョン, 段数, サンプリングレート, 最細段のサンプル数/ピーク, 総サンプル数
+    HEADER_FORMAT = '<4sHHIIQ'
+    # 段ごとの情報: サンプル数/ピーク, ピーク数, データ開始位置
+    LEVEL_FORMAT = '<IQQ'
+    
+    # 既定の最細段の解像度（サンプル数/ピーク）
+    DEFAULT_SAMPLES_PER_PEAK = 256
+    
+    # 最も粗い段のピーク数の目安（これ以下になるまで段を重ねる）
+    MIN_LEVEL_LENGTH = 1024
+    
+    # ファイルから生成する場合の読み込み単位（ピーク数）
+    READ_BLOCK_PEAKS = 4096
+    
+    def __init__(self, sample_rate: int, total_samples: int, levels: List[Tuple[int, np.ndarray]]):
+        """
+        ピラミッドを初期化
+        
+        Args:
+            sample_rate: サンプリングレート
+            total_samples: 元音声の総サンプル数
+            levels: (サンプル数/ピーク, ピーク配列[N, 2] int16) のリスト（細かい順）
+        """
+        self.sample_rate = sample_rate
+        self.total_samples = total_samples
+        self.levels = levels
+    
+    @property
+    def duration(self) -> float:
+        """元音声の長さ（秒）"""
+        return self.total_samples / self.sample_rate if self.sample_rate else 0.0
+    
+    # --- 生成 ---
+    
+    @staticmethod
+    def _to_int16(values: np.ndarray) -> np.ndarray:
+        """-1.0〜1.0の値をint16に変換"""
+        return np.round(np.clip(values, -1.0, 1.0) * 32767).astype(np.int16)
+    
+    @staticmethod
+    def _reduce_block(mono: np.ndarray, samples_per_peak: int) -> np.ndarray:
+        """モノラル音声をピーク列[N, 2]に縮約（端数は最後のピークにまとめる）"""
+        count = -(-len(mono) // samples_per_peak)
+        peaks = np.empty((count, 2), dtype=np.float32)
+        full = len(mono) // samples_per_peak
+        if full:
+            frames = mono[:full * samples_per_peak].reshape(full, samples_per_peak)
+            peaks[:full, 0] = frames.min(axis=1)
+            peaks[:full, 1] = frames.max(axis=1)
+        if count > full:
+            rest = mono[full * samples_per_peak:]
+            peaks[full] = (rest.min(), rest.max())
+        return peaks
+    
+    @classmethod
+    def _build_levels(cls, base: np.ndarray, samples_per_peak: int) -> List[Tuple[int, np.ndarray]]:
+        """最細段から1/2ずつ粗い段を作成"""
+        levels = [(samples_per_peak, base)]
+        current, spp = base, samples_per_peak
+        while len(current) > cls.MIN_LEVEL_LENGTH:
+            if len(current) % 2:
+                current = np.concatenate([current, current[-1:]])
+            pairs = current.reshape(-1, 2, 2)
+            current = np.stack([pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)], axis=1)
+            spp *= 2
+            levels.append((spp, current))
+        return levels
+    
+    @classmethod
+    def from_audio(
+        cls,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        samples_per_peak: int = DEFAULT_SAMPLES_PER_PEAK
+    ) -> "PeakPyramid":
+        """
+        音声データからピラミッドを作成
+        
+        Args:
+            audio_data: 音声データ（モノラル、または[channels, samples]）
+            sample_rate: サンプリングレート
+            samples_per_peak: 最細段のサンプル数/ピーク
+        
+        Returns:
+            PeakPyramid: ピラミッド
+        """
+        mono = audio_data if audio_data.ndim == 1 else audio_data.mean(axis=0)
+        if len(mono) == 0:
+            return cls(sample_rate, 0, [(samples_per_peak, np.zeros((0, 2), dtype=np.int16))])
+        
+        base = cls._to_int16(cls._reduce_block(mono.astype(np.float32), samples_per_peak))
+        return cls(sample_rate, len(mono), cls._build_levels(base, samples_per_peak))
+    
+    @classmethod
+    def from_file(
+        cls,
+        audio_path: Union[str, Path],
+        samples_per_peak: int = DEFAULT_SAMPLES_PER_PEAK
+    ) -> "PeakPyramid":
+        """
+        音声ファイルからピラミッドを作成（全体を読み込まずブロック単位で処理）
+        
+        Args:
+            audio_path: 音声ファイルパス
+            samples_per_peak: 最細段のサンプル数/ピーク
+        
+        Returns:
+            PeakPyramid: ピラミッド
+        """
+        import soundfile as sf
+        
+        try:
+            with sf.SoundFile(str(audio_path)) as f:
+                sample_rate = f.samplerate
+                total = 0
+                blocks = []
+                for block in f.blocks(blocksize=samples_per_peak * cls.READ_BLOCK_PEAKS, dtype='float32', always_2d=True):
+                    blocks.append(cls._reduce_block(block.mean(axis=1), samples_per_peak))
+                    total += len(block)
+        except RuntimeError:
+            # libsndfileで読めない形式は通常の読み込みで処理
+            from .audio_utils import AudioUtils
+            audio_data, sample_rate = AudioUtils.load_audio(audio_path)
+            return cls.from_audio(audio_data, sample_rate, samples_per_peak)
+        
+        if not blocks:
+            return cls(sample_rate, 0, [(samples_per_peak, np.zeros((0, 2), dtype=np.int16))])
+        
+        base = cls._to_int16(np.concatenate(blocks))
+        return cls(sample_rate, total, cls._build_levels(base, samples_per_peak))
+    
+    # --- 保存・読み込み ---
+    
+    @classmethod
+    def sidecar_path(cls, audio_path: Union[str, Path]) -> Path:
+        """音声ファイルに対応するサイドカーファイルのパス"""
+        audio_path = Path(audio_path)
+        return audio_path.with_name(audio_path.name + cls.SIDECAR_SUFFIX)
+    
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        サイドカーファイルに保存
+        
+        Args:
+            path: 保存先パス
+        
+        Returns:
+            Path: 保存したパス
+        """
+        path = Path(path)
+        header_size = struct.calcsize(self.HEADER_FORMAT) + struct.calcsize(self.LEVEL_FORMAT) * len(self.levels)
+        
+        offset = header_size
+        level_headers = []
+        for spp, peaks in self.levels:
+            level_headers.append(struct.pack(self.LEVEL_FORMAT, spp, len(peaks), offset))
+            offset += peaks.size * 2
+        
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(struct.pack(
+                self.HEADER_FORMAT, self.MAGIC, self.VERSION, len(self.levels),
+                self.sample_rate, self.levels[0][0], self.total_samples
+            ))
+            for level_header in level_headers:
+                f.write(level_header)
+            for _, peaks in self.levels:
+                f.write(np.ascontiguousarray(peaks, dtype='<i2').tobytes())
+        tmp_path.replace(path)
+        return path
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PeakPyramid":
+        """
+        サイドカーファイルをメモリマップで読み込む
+        
+        Args:
+            path: サイドカーファイルパス
+        
+        Returns:
+            PeakPyramid: ピラミッド（ピーク配列はファイルを直接参照する）
+        
+        Raises:
+            ValueError: ファイル形式が正しくない場合
+        """
+        path = Path(path)
+        header_size = struct.calcsize(cls.HEADER_FORMAT)
+        level_size = struct.calcsize(cls.LEVEL_FORMAT)
+        
+        with open(path, 'rb') as f:
+            header = f.read(header_size)
+            if len(header) < header_size:
+                raise ValueError(f"ピークファイルが不正です: {path}")
+            magic, version, num_levels, sample_rate, _, total_samples = struct.unpack(cls.HEADER_FORMAT, header)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise ValueError(f"ピークファイルの形式が異なります: {path}")
+            level_info = [struct.unpack(cls.LEVEL_FORMAT, f.read(level_size)) for _ in range(num_levels)]
+        
+        levels = []
+        for spp, length, offset in level_info:
+            if length:
+                peaks = np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(length, 2))
+            else:
+                peaks = np.zeros((0, 2), dtype=np.int16)
+            levels.append((spp, peaks))
+        return cls(sample_rate, total_samples, levels)
+    
+    @classmethod
+    def ensure_for_file(cls, audio_path: Union[str, Path]) -> Path:
+        """
+        音声ファイルのサイドカーを作成（既に新しいものがあれば再利用）
+        
+        Args:
+            audio_path: 音声ファイルパス
+        
+        Returns:
+            Path: サイドカーファイルのパス
+        """
+        audio_path = Path(audio_path)
+        sidecar = cls.sidecar_path(audio_path)
+        if sidecar.exists() and sidecar.stat().st_mtime >= audio_path.stat().st_mtime:
+            return sidecar
+        
+        cls.from_file(audio_path).save(sidecar)
+        logging.debug(f"波形ピーク作成: {sidecar}")
+        return sidecar
+    
+    # --- 表示用の取得 ---
+    
+    def select_level(self, samples_per_pixel: float) -> Tuple[int, np.ndarray]:
+        """
+        表示解像度に合う段を選択（1ピクセルに1ピーク以上が対応する最も粗い段）
+        
+        Args:
+            samples_per_pixel: 1ピクセルあたりのサンプル数
+        
+        Returns:
+            Tuple[int, np.ndarray]: (サンプル数/ピーク, ピーク配列)
+        """
+        selected = self.levels[0]
+        for level in self.levels:
+            if level[0] <= samples_per_pixel:
+                selected = level
+            else:
+                break
+        return selected
+    
+    def get_peaks(self, start_time: float, end_time: float, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        表示範囲の波形をピクセル幅に合わせて取得
+        
+        Args:
+            start_time: 表示開始時刻（秒）
+            end_time: 表示終了時刻（秒）
+            width: 表示幅（ピクセル）
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: ピクセルごとの (最小値, 最大値)（-1.0〜1.0、範囲外は0）
+        """
+        mins = np.zeros(width, dtype=np.float32)
+        maxs = np.zeros(width, dtype=np.float32)
+        if width <= 0 or end_time <= start_time or self.total_samples == 0:
+            return mins, maxs
+        
+        samples_per_pixel = (end_time - start_time) * self.sample_rate / width
+        spp, peaks = self.select_level(samples_per_pixel)
+        if len(peaks) == 0:
+            return mins, maxs
+        
+        # ピクセルの境界に対応するピーク位置（ズームイン時は同じピークを複数ピクセルで使う）
+        edges = (start_time + (end_time - start_time) * np.arange(width + 1) / width) * self.sample_rate / spp
+        first = np.floor(edges[:-1]).astype(np.int64)
+        valid = (first >= 0) & (first < len(peaks))
+        if not valid.any():
+            return mins, maxs
+        
+        # 表示範囲のピークだけを読み込む
+        starts = first[valid]
+        lo = int(starts[0])
+        hi = int(min(max(np.ceil(edges[-1]), starts[-1] + 1), len(peaks)))
+        window = np.asarray(peaks[lo:hi], dtype=np.float32) / 32767.0
+        
+        # 各ピクセルは次のピクセルの開始位置までのピークを集計する
+        mins[valid] = np.minimum.reduceat(window[:, 0], starts - lo)
+        maxs[valid] = np.maximum.reduceat(window[:, 1], starts - lo)
+        return mins, maxs
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+出力形式の選択と音声ファイルの並列書き出しのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import SpeakerProcessor
+from src.audio_separator.utils.audio_encoder import AudioEncoderPool
+from src.audio_separator.utils.audio_utils import AudioUtils
+from benchmarks.fixtures import generate_mixture, write_fixture
+
+SAMPLE_RATE = 44100
+
+
+@pytest.mark.parametrize('format, bit_depth, subtype', [
+    ('wav', 16, 'PCM_16'), ('wav', 24, 'PCM_24'), ('wav', 32, 'FLOAT'),
+    ('flac', 16, 'PCM_16'), ('flac', 24, 'PCM_24'), ('ogg', 16, 'VORBIS'), ('opus', 16, 'OPUS')
+])
+def test_save_audio_formats(tmp_path, format, bit_depth, subtype):
+    """指定した形式・ビット深度で保存し、拡張子を形式に合わせる"""
+    audio, _ = generate_mixture(3.0, 2, SAMPLE_RATE)
+    
+    path = AudioUtils.save_audio(audio, tmp_path / "out.wav", SAMPLE_RATE, format=format, bit_depth=bit_depth)
+    
+    info = sf.info(str(path))
+    assert path.suffix == AudioUtils.OUTPUT_FORMATS[format]['extension']
+    assert info.subtype == subtype
+    # Opusは対応するサンプリングレートに変換する
+    assert info.samplerate == (48000 if format == 'opus' else SAMPLE_RATE)
+    if format != 'wav':
+        assert path.stat().st_size < 3.0 * SAMPLE_RATE * 2
+
+
+def test_save_audio_rejects_unknown_options(tmp_path):
+    """対応していない形式・ビット深度はエラーにする"""
+    audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    with pytest.raises(ValueError):
+        AudioUtils.save_audio(audio, tmp_path / "out.aac", SAMPLE_RATE)
+    with pytest.raises(ValueError):
+        AudioUtils.save_audio(audio, tmp_path / "out.flac", SAMPLE_RATE, bit_depth=32)
+    with pytest.raises(ValueError):
+        AudioEncoderPool('ogg2')
+
+
+@pytest.mark.parametrize('max_workers', [0, 2])
+def test_encoder_pool_keeps_order_and_reports_errors(tmp_path, max_workers):
+    """並列に書き出しても依頼順の結果を返し、失敗は呼び出し元に伝える"""
+    rng = np.random.default_rng(0)
+    with AudioEncoderPool('flac', max_workers=max_workers) as encoder:
+        futures = [
+            encoder.submit(rng.uniform(-0.5, 0.5, SAMPLE_RATE).astype(np.float32), tmp_path / f"clip_{i}.wav", SAMPLE_RATE)
+            for i in range(20)
+        ]
+    assert [future.result().name for future in futures] == [f"clip_{i}.flac" for i in range(20)]
+    
+    with pytest.raises(ValueError):
+        with AudioEncoderPool('wav', bit_depth=24, max_workers=max_workers) as encoder:
+            encoder.submit(np.zeros((3, 3, 3), dtype=np.float32), tmp_path / "broken.wav", SAMPLE_RATE).result()
+
+
+def test_extract_speaker_audio_in_flac(tmp_path):
+    """話者音声をFLACで書き出し、出力ファイルパスは実際の拡張子になる"""
+    fixture = write_fixture(tmp_path / "fixtures", 6.0, 2)
+    processor = SpeakerProcessor(device='cpu')
+    processor.pipeline = None
+    processor._pyannote_available = False
+    processor._is_initialized = True
+    
+    result = processor.separate_speakers(fixture['path'], tmp_path / "out", min_segment_length=0.5, output_format='flac')
+    
+    files = [Path(f) for files in result['output_files'].values() for f in files]
+    assert files and all(f.suffix == '.flac' and f.exists() for f in files)
+    assert not list((tmp_path / "out").rglob("*.wav"))
+
+
+class _RecordingPipeline:
+    """受け取った音声ファイルの形式を記録し、話者なしの結果を返すパイプライン"""
+    
+    def __init__(self):
+        self.received = []
+    
+    def __call__(self, path):
+        self.received.append((Path(path).suffix, sf.info(path).format))
+        return self
+    
+    def itertracks(self, yield_label=False):
+        return iter(())
+
+
+@pytest.mark.parametrize('suffix', ['.ogg', '.flac'])
+def test_diarization_temp_file_is_wav(tmp_path, suffix):
+    """話者分離の前処理の一時ファイルは、入力の形式に関係なくWAVで書き出して削除する"""
+    audio, _ = generate_mixture(4.0, 2, SAMPLE_RATE)
+    input_path = AudioUtils.save_audio(audio, tmp_path / f"input{suffix}", SAMPLE_RATE)
+    processor = SpeakerProcessor(device='cpu')
+    processor.pipeline = _RecordingPipeline()
+    processor._pyannote_available = True
+    processor._is_initialized = True
+    
+    processor.diarize(str(input_path))
+    
+    assert processor.pipeline.received == [('.wav', 'WAV')]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [input_path.name]
+
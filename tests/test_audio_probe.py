@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+音声ファイル情報取得（キャッシュ付き）のテスト
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.utils import audio_utils
+from src.audio_separator.utils.audio_utils import AudioUtils
+
+
+def test_probe_is_cached_by_path_mtime_and_size(tmp_path, monkeypatch):
+    """検証と情報取得でヘッダは1回だけ読み込まれ、ファイル更新時は読み直す"""
+    path = tmp_path / "a.wav"
+    sf.write(str(path), np.zeros(16000, dtype=np.float32), 16000)
+    
+    calls = []
+    original_info = audio_utils.sf.info
+    monkeypatch.setattr(audio_utils.sf, 'info', lambda p: calls.append(p) or original_info(p))
+    
+    assert AudioUtils.validate_audio_file(path)
+    info = AudioUtils.get_audio_info(path)
+    assert info['duration'] == 1.0 and info['file_size'] == path.stat().st_size
+    assert len(calls) == 1
+    
+    # 返された辞書を変更してもキャッシュには影響しない
+    info['duration'] = -1
+    assert AudioUtils.get_audio_info(path)['duration'] == 1.0
+    
+    sf.write(str(path), np.zeros(32000, dtype=np.float32), 16000)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert AudioUtils.get_audio_info(path)['duration'] == 2.0
+    assert len(calls) == 2
+
+
+def test_probe_errors(tmp_path):
+    """存在しないファイル・音声でないファイルの扱い"""
+    with pytest.raises(FileNotFoundError):
+        AudioUtils.probe_audio_file(tmp_path / "missing.wav")
+    assert not AudioUtils.validate_audio_file(tmp_path / "missing.wav")
+    
+    broken = tmp_path / "broken.wav"
+    broken.write_bytes(b"not audio")
+    with pytest.raises(ValueError):
+        AudioUtils.probe_audio_file(broken)
+    assert not AudioUtils.validate_audio_file(broken)
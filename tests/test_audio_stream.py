@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+パイプ・ソケットからの音声ストリーム入力のテスト
+"""
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import DemucsProcessor, SegmentIO, SpeakerProcessor
+from src.audio_separator.utils.audio_stream import AudioStream
+from benchmarks.fixtures import _speaker_voice, SPEAKER_F0
+
+SAMPLE_RATE = 16000
+
+
+class _Pipe(io.RawIOBase):
+    """パイプのように短い読み込みを返すシークできない入力"""
+    
+    def __init__(self, data: bytes, max_read: int = 1000):
+        self._data = io.BytesIO(data)
+        self._max_read = max_read
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> bytes:
+        return self._data.read(min(size, self._max_read) if size >= 0 else self._max_read)
+
+
+def _voices(seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    gap = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+    parts = []
+    for speaker in [0, 1, 0, 1, 0, 1]:
+        parts += [_speaker_voice(rng, SPEAKER_F0[speaker], 2.5, SAMPLE_RATE), gap]
+    return np.concatenate(parts)
+
+
+def _wav_bytes(audio: np.ndarray, subtype: str = 'PCM_16') -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, audio.T, SAMPLE_RATE, subtype=subtype, format='WAV')
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('subtype', ['PCM_U8', 'PCM_16', 'PCM_24', 'PCM_32', 'FLOAT', 'DOUBLE'])
+def test_wav_stream_matches_file(subtype):
+    """WAVのバイト列をシークせずに読み、soundfileで読み込んだ値と一致する"""
+    audio = np.random.default_rng(0).uniform(-0.9, 0.9, (2, 5000)).astype(np.float32)
+    data = _wav_bytes(audio, subtype)
+    expected = sf.read(io.BytesIO(data), dtype='float32', always_2d=True)[0].T
+    
+    stream = AudioStream(_Pipe(data))
+    blocks = list(stream.blocks(block_seconds=0.1, mono=False))
+    
+    assert (stream.container, stream.channels, stream.sample_rate) == ('wav', 2, SAMPLE_RATE)
+    assert [block.shape[1] for block in blocks[:-1]] == [1600] * (len(blocks) - 1)
+    np.testing.assert_allclose(np.concatenate(blocks, axis=1), expected, atol=1e-6)
+
+
+def test_raw_pcm_and_unknown_wav_length():
+    """生のPCMは形式の指定で読み、データ長が未確定のWAVは終端まで読む"""
+    audio = np.linspace(-1.0, 1.0, 3001, dtype=np.float32)
+    pcm = (audio * 32767).astype('<i2').tobytes()
+    
+    stream = AudioStream(_Pipe(pcm + b'\x01'), sample_rate=SAMPLE_RATE, channels=1, container='raw')
+    np.testing.assert_allclose(stream.read_all()[0], audio, atol=1e-4)
+    assert stream.duration == pytest.approx(3001 / SAMPLE_RATE)
+    
+    data = bytearray(_wav_bytes(audio))
+    data[40:44] = b'\xff\xff\xff\xff'
+    np.testing.assert_allclose(AudioStream(_Pipe(bytes(data))).read_all()[0], audio, atol=1e-4)
+    
+    with pytest.raises(ValueError):
+        AudioStream(_Pipe(pcm))
+    with pytest.raises(ValueError):
+        AudioStream(_Pipe(pcm), sample_rate=SAMPLE_RATE, channels=1, sample_format='s12le')
+
+
+def test_progress_follows_known_length(tmp_path):
+    """全体の長さが分かる入力は受信した割合で進捗を通知し、分からない入力は進捗率を進めない"""
+    audio = _voices()
+    data = _wav_bytes(audio)
+    
+    raw_path = tmp_path / "input.pcm"
+    raw_path.write_bytes(data[44:])
+    with AudioStream.open(str(raw_path), sample_rate=SAMPLE_RATE, channels=1, container='raw') as stream:
+        assert stream.total_duration == pytest.approx(len(audio) / SAMPLE_RATE)
+    
+    stream = AudioStream(_Pipe(data))
+    assert stream.total_duration == pytest.approx(len(audio) / SAMPLE_RATE)
+    progress = []
+    SpeakerProcessor(device='cpu').diarize_stream(stream, progress_callback=lambda p, m: progress.append(p))
+    assert progress == sorted(progress) and progress[-1] == 1.0
+    assert len(set(progress[:-1])) > 5 and progress[-2] >= 0.9
+    
+    unknown = bytearray(data)
+    unknown[40:44] = b'\xff\xff\xff\xff'
+    stream = AudioStream(_Pipe(bytes(unknown)))
+    assert stream.total_duration is None
+    progress = []
+    SpeakerProcessor(device='cpu').diarize_stream(stream, progress_callback=lambda p, m: progress.append(p))
+    assert set(progress[:-1]) == {0.0} and progress[-1] == 1.0
+
+
+def test_demucs_stream_crossfades_chunks(tmp_path, monkeypatch):
+    """チャンクごとに分離して書き出し、ボーカルを順に渡す（全長は入力と同じ）"""
+    monkeypatch.setattr(DemucsProcessor, 'CHUNK_SECONDS', 4.0)
+    audio = _voices()
+    received, progress = [], []
+    
+    processor = DemucsProcessor(device='cpu')
+    vocals_path, bgm_path = processor.separate_stream(
+        AudioStream(_Pipe(_wav_bytes(audio), 4096)), tmp_path, vocals_callback=received.append,
+        progress_callback=lambda p, m: progress.append(p)
+    )
+    
+    vocals, sample_rate = sf.read(vocals_path, dtype='float32')
+    assert sample_rate == SAMPLE_RATE
+    assert len(vocals) == len(audio) == sf.info(bgm_path).frames
+    assert len(received) > 3
+    np.testing.assert_allclose(np.concatenate(received), vocals, atol=1e-4)
+    assert progress == sorted(progress) and len(set(progress)) > 3
+
+
+def test_stream_command_from_stdin(tmp_path):
+    """streamコマンドが標準入力の生のPCMを受信して話者音声を書き出す"""
+    pcm = (_voices() * 32767).astype('<i2').tobytes()
+    command = [
+        sys.executable, '-c', 'import sys; from src.audio_separator.main import main; sys.exit(main(sys.argv[1:]))',
+        'stream', '-', '-o', str(tmp_path), '--rate', str(SAMPLE_RATE), '--no-bgm-separation', '--naming', 'simple'
+    ]
+    result = subprocess.run(command, input=pcm, capture_output=True, cwd=Path(__file__).parent.parent, timeout=300)
+    assert result.returncode == 0, result.stderr.decode(errors='replace')
+    
+    segments, audio_file = SegmentIO.load(tmp_path / SpeakerProcessor.SEGMENTS_FILENAME)
+    assert Path(audio_file).name == 'stdin.wav'
+    assert sf.info(audio_file).frames == len(pcm) // 2
+    assert segments.num_speakers == 2
+    assert len(list((tmp_path / 'speakers').rglob('segment_*.wav'))) == len(segments)
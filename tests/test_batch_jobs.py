@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+バッチ処理（ジョブの優先度・並列実行・全体の処理速度）のテスト
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.service import JobManager
+from src.audio_separator.gui.windows.batch_window import BatchWindow
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+from benchmarks.fixtures import write_fixture
+from benchmarks.run_benchmarks import force_offline
+
+
+def _create_manager(tmp_path, max_workers: int) -> JobManager:
+    """簡易分離で動作するジョブ管理を作成"""
+    manager = JobManager(
+        device='cpu',
+        max_workers=max_workers,
+        time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl")
+    )
+    force_offline(manager.pipeline.demucs_processor, manager.pipeline.speaker_processor)
+    return manager
+
+
+def _wait_until(condition, timeout: float = 30.0):
+    """条件を満たすまで待機"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert condition()
+
+
+def test_jobs_run_in_priority_order(tmp_path):
+    """待機中のジョブは優先度順に実行され、優先度の変更も反映される"""
+    fixture = write_fixture(tmp_path / "fixtures", 3.0, 2)
+    manager = _create_manager(tmp_path, max_workers=1)
+    manager.start(warmup=False)
+    try:
+        # 実行中のジョブを一時停止して、後続のジョブを待機させる
+        blocker = manager.submit(str(fixture['path']), str(tmp_path / "blocker"))
+        blocker.cancellation_token.pause()
+        _wait_until(lambda: blocker.status == blocker.RUNNING)
+        
+        low = manager.submit(str(fixture['path']), str(tmp_path / "low"))
+        mid = manager.submit(str(fixture['path']), str(tmp_path / "mid"), priority=1)
+        high = manager.submit(str(fixture['path']), str(tmp_path / "high"), priority=5)
+        assert manager.set_priority(low.job_id, 10)
+        assert not manager.set_priority(blocker.job_id, 10)
+        
+        blocker.cancellation_token.resume()
+        jobs = [blocker, low, mid, high]
+        _wait_until(lambda: all(job.is_finished for job in jobs), timeout=120.0)
+        
+        assert all(job.status == job.COMPLETED for job in jobs)
+        order = sorted(jobs, key=lambda job: job.started_at)
+        assert order == [blocker, low, high, mid]
+        
+        # 全体の処理速度は完了したジョブの音声長の合計から求める
+        stats = manager.get_throughput()
+        assert abs(stats['audio_processed'] - 4 * fixture['duration']) < 0.1
+        assert 0 < stats['wall_time'] <= time.time() - blocker.started_at
+        assert stats['throughput'] > 0
+    finally:
+        manager.shutdown()
+
+
+def test_parallel_workers_share_stages_and_cancel_waiting_job(tmp_path):
+    """並列実行ではステージごとに順番待ちし、待機中のジョブもキャンセルできる"""
+    fixture = write_fixture(tmp_path / "fixtures", 3.0, 2)
+    manager = _create_manager(tmp_path, max_workers=2)
+    manager.start(warmup=False)
+    try:
+        first = manager.submit(str(fixture['path']), str(tmp_path / "first"))
+        second = manager.submit(str(fixture['path']), str(tmp_path / "second"))
+        first.cancellation_token.pause()
+        second.cancellation_token.pause()
+        
+        # 一方がBGM分離中に一時停止し、もう一方はBGM分離の順番待ちになる
+        _wait_until(lambda: first.status == first.RUNNING and second.status == second.RUNNING)
+        _wait_until(lambda: "順番待ち" in first.message or "順番待ち" in second.message)
+        waiting, holder = (first, second) if "順番待ち" in first.message else (second, first)
+        
+        assert manager.cancel(waiting.job_id)
+        _wait_until(lambda: waiting.is_finished, timeout=2.0)
+        assert waiting.status == waiting.CANCELLED
+        
+        holder.cancellation_token.resume()
+        _wait_until(lambda: holder.is_finished, timeout=60.0)
+        assert holder.status == holder.COMPLETED
+        
+        # ワーカー数を減らしても残りのワーカーで処理を続ける
+        manager.set_max_workers(1)
+        assert manager.get_status()['max_workers'] == 1
+        extra = manager.submit(str(fixture['path']), str(tmp_path / "extra"))
+        _wait_until(lambda: extra.is_finished, timeout=60.0)
+        assert extra.status == extra.COMPLETED
+    finally:
+        manager.shutdown()
+
+
+def test_collect_audio_files_expands_folders(tmp_path):
+    """フォルダはサブフォルダも含めて対応形式のファイルだけを集める"""
+    (tmp_path / "album" / "disc2").mkdir(parents=True)
+    for name in ["album/b.wav", "album/a.flac", "album/disc2/c.mp3", "album/notes.txt", "single.ogg"]:
+        (tmp_path / name).write_bytes(b"")
+    
+    files = BatchWindow.collect_audio_files([tmp_path / "album", tmp_path / "single.ogg", tmp_path / "album" / "b.wav"])
+    
+    assert [path.relative_to(tmp_path).as_posix() for path in files] == [
+        "album/a.flac", "album/b.wav", "album/disc2/c.mp3", "single.ogg"
+    ]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+ベンチマークスイートのテスト
+
+合成フィクスチャの決定性と、ベースライン比較による劣化検出を確認する
+"""
+
+import sys
+import copy
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixtures import generate_mixture
+from benchmarks.run_benchmarks import run_suite, compare_results
+
+
+def test_fixture_is_deterministic():
+    """同じ引数からは同じ合成音声と正解セグメントが生成される"""
+    audio_a, segments_a = generate_mixture(8.0, num_speakers=3)
+    audio_b, segments_b = generate_mixture(8.0, num_speakers=3)
+    
+    assert np.array_equal(audio_a, audio_b)
+    assert [(s.start_time, s.speaker_id) for s in segments_a] == [(s.start_time, s.speaker_id) for s in segments_b]
+    assert len({s.speaker_id for s in segments_a}) == 3
+
+
+def test_suite_runs_offline_and_detects_regression(tmp_path):
+    """フォールバック処理で全ケースが計測でき、遅くなったケースが劣化と判定される"""
+    current = run_suite([4.0], repeat=1, fixture_dir=tmp_path)
+    
+    assert current['config']['speaker_backend'] == 'simple'
+    assert {key.split('/')[0] for key in current['results']} == {
+        'load_audio', 'separate', 'diarize', 'extract_speaker_audio', '_remove_overlapping_speech'
+    }
+    assert not any(row['regression'] for row in compare_results(current, current))
+    
+    # ベースラインを大幅に速くして、今回の結果が劣化として検出されることを確認
+    baseline = copy.deepcopy(current)
+    baseline['results']['separate/4s']['median'] = current['results']['separate/4s']['median'] / 10.0
+    regressions = [row['case'] for row in compare_results(current, baseline) if row['regression']]
+    assert regressions == ['separate/4s']
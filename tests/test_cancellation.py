@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+処理のキャンセル・一時停止のテスト
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixtures import write_fixture
+from benchmarks.run_benchmarks import force_offline
+from src.audio_separator.processors.demucs_processor import DemucsProcessor, _CancellablePool
+from src.audio_separator.processors.separation_pipeline import SeparationPipeline
+from src.audio_separator.service import JobManager
+from src.audio_separator.processors.speaker_processor import SpeakerProcessor
+from src.audio_separator.utils.cancellation import CancellationToken, OperationCancelledError
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+
+
+def test_token_pause_resume_and_cancel():
+    """一時停止中は確認箇所で待機し、キャンセルで中断する"""
+    token = CancellationToken()
+    token.check()
+    
+    token.pause()
+    assert token.is_paused
+    threading.Timer(0.3, token.resume).start()
+    start = time.monotonic()
+    token.check()
+    assert time.monotonic() - start >= 0.25
+    
+    # 一時停止中のキャンセルは待機を解除して中断する
+    token.pause()
+    threading.Timer(0.2, token.cancel).start()
+    with pytest.raises(OperationCancelledError):
+        token.check()
+
+
+class _BatchedPipeline:
+    """推論バッチごとにフックを呼ぶパイプライン（pyannoteのPipeline.applyと同じ呼び出し方）"""
+    
+    def __init__(self, batches: int = 10):
+        self.batches = batches
+        self.completed = 0
+        self.running = False
+    
+    def apply(self, file, hook=None):
+        self.running = True
+        try:
+            for index in range(self.batches):
+                time.sleep(0.05)
+                self.completed = index + 1
+                hook('embeddings', None, total=self.batches, completed=index + 1)
+        finally:
+            self.running = False
+    
+    def __call__(self, file, hook=None):
+        return self.apply(file, hook=hook)
+
+
+def test_pyannote_cancel_stops_at_batch_boundary(tmp_path):
+    """推論中のキャンセルは次のバッチの境界で中断し、推論を別スレッドに残さない"""
+    processor = SpeakerProcessor(device='cpu')
+    pipeline = _BatchedPipeline()
+    processor.pipeline = pipeline
+    token = CancellationToken()
+    threads_before = threading.active_count()
+    
+    threading.Timer(0.12, token.cancel).start()
+    with pytest.raises(OperationCancelledError):
+        processor._diarize_pyannote(tmp_path / "input.wav", 10.0, 0.5, None, token=token)
+    
+    assert 1 <= pipeline.completed < pipeline.batches
+    assert not pipeline.running
+    time.sleep(0.1)
+    assert threading.active_count() <= threads_before
+
+
+class _SegmentationModel:
+    """推論バッチごとにinferを呼ばれるセグメンテーションモデル"""
+    
+    def infer(self, batch):
+        time.sleep(0.05)
+        return batch
+
+
+class _PipelineWithoutHook:
+    """進捗フックに対応していない版のpyannoteパイプライン（内部でバッチごとに推論する）"""
+    
+    def __init__(self, batches: int = 10):
+        self.batches = batches
+        self.completed = 0
+        self._segmentation = _SegmentationModel()
+        self._embedding = self._embed
+    
+    def _embed(self, batch):
+        time.sleep(0.05)
+        return batch
+    
+    def apply(self, file):
+        for index in range(self.batches):
+            self._segmentation.infer(index)
+            self._embedding(index)
+            self.completed = index + 1
+    
+    def __call__(self, file):
+        return self.apply(file)
+
+
+def test_pyannote_without_hook_cancels_between_batches(tmp_path):
+    """フックに対応していない版でも推論バッチの境界で中断し、差し替えた関数を元に戻す"""
+    processor = SpeakerProcessor(device='cpu')
+    pipeline = _PipelineWithoutHook()
+    embedding = pipeline._embedding
+    processor.pipeline = pipeline
+    token = CancellationToken()
+    
+    threading.Timer(0.25, token.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(OperationCancelledError):
+        processor._diarize_pyannote(tmp_path / "input.wav", 10.0, 0.5, None, token=token)
+    
+    assert 1 <= pipeline.completed < pipeline.batches
+    assert time.monotonic() - started < 0.25 + 0.1
+    assert 'infer' not in vars(pipeline._segmentation)
+    assert pipeline._embedding is embedding
+
+
+def test_demucs_pool_checks_token_per_segment():
+    """apply_modelに渡すプールは、各セグメントを取り出す時点で推論し、その前にキャンセルを確認する"""
+    token = CancellationToken()
+    calls = []
+    
+    def segment(index):
+        calls.append(index)
+        if index == 2:
+            token.cancel()
+        return index
+    
+    pool = _CancellablePool(token)
+    futures = [pool.submit(segment, index) for index in range(5)]
+    assert calls == []
+    
+    assert [futures[index].result() for index in range(3)] == [0, 1, 2]
+    with pytest.raises(OperationCancelledError):
+        futures[3].result()
+    assert calls == [0, 1, 2]
+
+
+def test_demucs_cancel_latency():
+    """Demucsの推論中のキャンセルは、1セグメント分の推論時間程度で反映される"""
+    torch = pytest.importorskip('torch')
+    pytest.importorskip('demucs')
+    from demucs.apply import apply_model
+    
+    processor = DemucsProcessor(device='cpu')
+    processor.activity_detector = None
+    if not processor.warmup():
+        pytest.skip("Demucsモデルを読み込めません")
+    model = processor._demucs_model
+    segment_samples = int(float(model.segment) * model.samplerate)
+    
+    started = time.monotonic()
+    with torch.no_grad():
+        apply_model(model, torch.zeros(1, model.audio_channels, segment_samples))
+    segment_seconds = time.monotonic() - started
+    
+    audio = 0.1 * torch.randn(1, model.audio_channels, int(processor.CHUNK_SECONDS * model.samplerate))
+    token = CancellationToken()
+    cancelled_at = []
+    
+    def cancel():
+        cancelled_at.append(time.monotonic())
+        token.cancel()
+    
+    threading.Timer(1.5 * segment_seconds, cancel).start()
+    with pytest.raises(OperationCancelledError):
+        processor._apply_model_chunked(audio, model.samplerate, token=token)
+    
+    assert time.monotonic() - cancelled_at[0] <= max(1.0, 1.5 * segment_seconds)
+
+
+def test_cancelled_diarization_removes_temp_file(tmp_path):
+    """話者分離をキャンセルしても前処理の一時ファイルを残さず、パイプラインは読み込んだまま残す"""
+    fixture = write_fixture(tmp_path / "fixtures", 6.0, 2)
+    processor = SpeakerProcessor(device='cpu')
+    pipeline = _BatchedPipeline()
+    processor.pipeline = pipeline
+    processor._pyannote_available = True
+    processor._is_initialized = True
+    token = CancellationToken()
+    
+    threading.Timer(0.12, token.cancel).start()
+    with pytest.raises(OperationCancelledError):
+        processor.diarize(str(fixture['path']), cancellation_token=token)
+    
+    assert not list(Path(fixture['path']).parent.glob("temp_light_enhanced_*"))
+    assert processor.pipeline is pipeline
+
+
+def test_pipeline_cancel_during_extraction(tmp_path):
+    """話者音声の書き出し中にキャンセルすると以降のファイルは書き出されない"""
+    fixture = write_fixture(tmp_path / "fixtures", 12.0, 2)
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    force_offline(pipeline.demucs_processor, pipeline.speaker_processor)
+    
+    token = CancellationToken()
+    
+    def on_update(update):
+        if update.stage == 'speaker.extract':
+            token.cancel()
+    
+    with pytest.raises(OperationCancelledError):
+        pipeline.run(str(fixture['path']), str(tmp_path / "out"), update_callback=on_update, cancellation_token=token)
+    
+    assert not list((tmp_path / "out" / "speakers").rglob("*.wav"))
+
+
+def test_pipeline_release_models(tmp_path):
+    """呼び出し側がrelease_modelsを呼ぶと両方のモデルを解放する"""
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    force_offline(pipeline.demucs_processor, pipeline.speaker_processor)
+    pipeline.demucs_processor._demucs_model = object()
+    pipeline.speaker_processor.pipeline = _BatchedPipeline()
+    
+    pipeline.release_models()
+    
+    assert pipeline.demucs_processor._demucs_model is None
+    assert pipeline.speaker_processor.pipeline is None
+
+
+def test_job_manager_cancels_running_job(tmp_path):
+    """実行中のジョブもキャンセルできる"""
+    fixture = write_fixture(tmp_path / "fixtures", 12.0, 2)
+    manager = JobManager(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    force_offline(manager.pipeline.demucs_processor, manager.pipeline.speaker_processor)
+    manager.start(warmup=False)
+    try:
+        job = manager.submit(str(fixture['path']), str(tmp_path / "out"))
+        job.cancellation_token.pause()
+        
+        deadline = time.monotonic() + 10.0
+        while job.status != job.RUNNING and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert manager.cancel(job.job_id)
+        
+        deadline = time.monotonic() + 1.0
+        while not job.is_finished and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert job.status == job.CANCELLED
+    finally:
+        manager.shutdown()
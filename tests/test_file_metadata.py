@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+出力ファイル情報のバックグラウンド取得のテスト
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.gui.utils.file_metadata import FileMetadataLoader
+
+
+def _drain_all(loader: FileMetadataLoader, timeout: float = 5.0):
+    """未処理の要求が無くなるまで結果を取り出す"""
+    results = []
+    deadline = time.monotonic() + timeout
+    while loader.has_pending() and time.monotonic() < deadline:
+        results.extend(loader.drain(10))
+        time.sleep(0.01)
+    return results
+
+
+def test_loader_reads_size_and_duration_in_background(tmp_path):
+    """サイズと音声長をまとめて取り出せる（音声でないファイルはサイズのみ）"""
+    paths = []
+    for i in range(25):
+        path = tmp_path / f"seg_{i:03d}.wav"
+        sf.write(str(path), np.zeros(1600 * (i + 1), dtype=np.float32), 16000)
+        paths.append(path)
+    text_file = tmp_path / "notes.txt"
+    text_file.write_text("abc")
+    
+    loader = FileMetadataLoader()
+    for i, path in enumerate(paths + [text_file]):
+        loader.request(i, path)
+    
+    results = {key: (size, duration) for key, size, duration in _drain_all(loader)}
+    assert len(results) == 26
+    assert abs(results[9][1] - 1.0) < 1e-6
+    assert results[9][0] == paths[9].stat().st_size
+    assert results[25] == (3, None)
+
+
+def test_loader_discards_stale_results(tmp_path):
+    """表示を切り替えた後は以前の要求の結果を返さない"""
+    path = tmp_path / "a.wav"
+    sf.write(str(path), np.zeros(1600, dtype=np.float32), 16000)
+    
+    loader = FileMetadataLoader()
+    loader.request('old', path)
+    loader.clear()
+    loader.request('new', path)
+    
+    keys = [key for key, _, _ in _drain_all(loader)]
+    assert keys == ['new']
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+録音中の音声の逐次話者分離のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import IncrementalDiarizer, SegmentIO
+from src.audio_separator.main import main
+from benchmarks.fixtures import _speaker_voice, SPEAKER_F0
+
+SAMPLE_RATE = 16000
+
+
+def _conversation(order, seed: int = 1):
+    """話者が交代する会話（発話の間に無音）と正解の話者番号"""
+    rng = np.random.default_rng(seed)
+    parts, turns, current = [], [], 0.0
+    for speaker in order:
+        voice = _speaker_voice(rng, SPEAKER_F0[speaker], rng.uniform(2.0, 4.0), SAMPLE_RATE)
+        turns.append((current, current + len(voice) / SAMPLE_RATE, speaker))
+        gap = np.zeros(int(rng.uniform(0.5, 1.0) * SAMPLE_RATE), dtype=np.float32)
+        parts += [voice, gap]
+        current += (len(voice) + len(gap)) / SAMPLE_RATE
+    return np.concatenate(parts), turns
+
+
+def _run(audio: np.ndarray, chunk: int):
+    diarizer = IncrementalDiarizer(SAMPLE_RATE)
+    for start in range(0, len(audio), chunk):
+        diarizer.update(audio[start:start + chunk])
+    return diarizer.finalize()
+
+
+def test_recovers_speakers():
+    """交代する話者を区別し、同じ話者には同じIDを付ける"""
+    audio, turns = _conversation([0, 1, 2, 0, 1, 2, 1, 0, 2, 0, 1])
+    
+    segments = _run(audio, len(audio))
+    
+    assert segments.num_speakers == 3
+    assert len(segments) == len(turns)
+    labels = {}
+    for segment, (start, end, speaker) in zip(segments, turns):
+        assert segment.start_time == pytest.approx(start, abs=0.6)
+        assert segment.end_time == pytest.approx(end, abs=0.6)
+        assert labels.setdefault(speaker, segment.speaker_id) == segment.speaker_id
+    assert len(set(labels.values())) == 3
+
+
+def test_chunked_updates_match_single_update(tmp_path):
+    """分割して渡しても、途中で状態を保存・復元しても、一度に処理した結果と同じになる"""
+    audio, _ = _conversation([0, 1, 2, 0, 2, 1, 0])
+    expected = _run(audio, len(audio)).to_dicts()
+    
+    assert _run(audio, SAMPLE_RATE).to_dicts() == expected
+    
+    diarizer = IncrementalDiarizer(SAMPLE_RATE)
+    half = len(audio) // 2 + 123
+    diarizer.update(audio[:half])
+    state = diarizer.save_state(tmp_path / "state.npz")
+    restored = IncrementalDiarizer.load_state(state)
+    restored.update(audio[half:])
+    assert restored.finalize().to_dicts() == expected
+
+
+def test_update_cost_depends_on_appended_audio(monkeypatch):
+    """更新ごとに特徴量を計算するのは追記された窓だけ"""
+    audio, _ = _conversation([0, 1, 0, 1, 0, 1])
+    diarizer = IncrementalDiarizer(SAMPLE_RATE)
+    diarizer.update(audio[:-SAMPLE_RATE])
+    
+    computed = []
+    original = diarizer._window_features
+    monkeypatch.setattr(diarizer, '_window_features', lambda windows, count: computed.append(count) or original(windows, count))
+    update = diarizer.update(audio[-SAMPLE_RATE:])
+    
+    assert sum(computed) <= SAMPLE_RATE // diarizer.window_samples + 1
+    assert update.processed_duration == pytest.approx(len(audio) / SAMPLE_RATE)
+    
+    # 確定したセグメントは以降の更新で再出力しない
+    final = diarizer.finalize()
+    assert len(update.segments) < len(final)
+
+
+def test_follow_growing_file(tmp_path, capsys):
+    """followコマンドを繰り返し実行すると、追記された部分だけを処理して最後に確定する"""
+    audio, turns = _conversation([0, 1, 0, 1, 2, 0])
+    recording = tmp_path / "recording.wav"
+    state = tmp_path / "state.npz"
+    output = tmp_path / "segments.json"
+    
+    for end in (len(audio) // 3, 2 * len(audio) // 3, len(audio)):
+        sf.write(recording, audio[:end], SAMPLE_RATE)
+        args = [str(recording), '--state', str(state), '-o', str(output)]
+        assert main(['follow'] + args + (['--final'] if end == len(audio) else [])) == 0
+    
+    assert IncrementalDiarizer.load_state(state).file_position == len(audio)
+    segments, audio_file = SegmentIO.load(output)
+    assert audio_file == str(recording.resolve())
+    assert segments.num_speakers == 3
+    assert len(segments) == len(turns)
+    
+    # ファイルが短くなった場合（別の録音）はエラー
+    sf.write(recording, audio[:SAMPLE_RATE], SAMPLE_RATE)
+    assert main(['follow', str(recording), '--state', str(state), '-o', str(output)]) == 1
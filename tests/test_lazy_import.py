@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+重いモジュールの遅延読み込みのテスト
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.utils.lazy_import import lazy_import, prewarm_modules, get_prewarm_status
+from benchmarks.import_audit import audit, DEFAULT_BUDGET
+
+
+def test_gui_import_stays_within_budget():
+    """GUIの読み込みで重いモジュールが読み込まれず、読み込み時間が予算内に収まる"""
+    total, forbidden, times = audit()
+    assert forbidden == []
+    assert 'src.audio_separator.utils.audio_utils' in times
+    assert total < DEFAULT_BUDGET
+
+
+def test_lazy_module_loads_once_on_first_use():
+    """最初の属性参照で1回だけ読み込まれる"""
+    module = lazy_import('colorsys')
+    assert 'not loaded' in repr(module) or 'colorsys' in sys.modules
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(module.rgb_to_hsv(1.0, 0.0, 0.0))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == [(0.0, 1.0, 1.0)] * 8
+    assert module.is_loaded
+
+
+def test_prewarm_records_missing_modules():
+    """事前読み込みはインストールされていないモジュールを読み込めなかったものとして記録する"""
+    completed = []
+    thread = prewarm_modules(['json', 'no_such_module_for_prewarm'], on_complete=completed.append)
+    thread.join(timeout=10)
+    
+    status = get_prewarm_status()
+    assert status['json'][0] is True
+    assert status['no_such_module_for_prewarm'][0] is False
+    assert completed and completed[0]['json'][0] is True
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+GUIモデルのモデル事前読み込みのテスト
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.gui.models.gui_model import AudioSeparationModel
+from src.audio_separator.processors.separation_pipeline import SeparationPipeline
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+from benchmarks.fixtures import write_fixture
+
+
+def _wait_until(condition, timeout: float = 30.0):
+    """条件を満たすまで待機"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_start_waits_for_prewarm_and_reports_state(tmp_path):
+    """事前読み込み中に開始した処理は読み込み完了を待ってから実行される"""
+    fixture = write_fixture(tmp_path / "fixtures", 4.0, 2)
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    
+    # 事前読み込みを止めておけるようにする
+    release = threading.Event()
+    original_warmup = pipeline.warmup
+    pipeline.warmup = lambda: release.wait(10) and original_warmup()
+    
+    model = AudioSeparationModel(pipeline=pipeline)
+    states, messages, completions = [], [], []
+    model.add_model_state_callback(states.append)
+    model.add_progress_callback(lambda p: messages.append(p.message))
+    model.add_completion_callback(lambda ok, err: completions.append((ok, err)))
+    assert model.get_model_state() == AudioSeparationModel.MODEL_COLD
+    
+    model.set_input_file(fixture['path'])
+    model.set_output_settings({'output_dir': str(tmp_path / "out")})
+    assert model.prewarm_models()
+    assert not model.prewarm_models()
+    assert model.get_model_state() == AudioSeparationModel.MODEL_WARMING
+    
+    assert model.start_separation()
+    _wait_until(lambda: "モデル読み込み完了を待機中..." in messages)
+    assert model.is_processing() and not completions
+    
+    release.set()
+    _wait_until(lambda: completions)
+    assert completions == [(True, None)]
+    assert states == [AudioSeparationModel.MODEL_WARMING, AudioSeparationModel.MODEL_WARM]
+    assert not model.prewarm_models()
+
+
+def test_stop_while_waiting_for_prewarm(tmp_path):
+    """読み込み待ちの間も停止できる"""
+    fixture = write_fixture(tmp_path / "fixtures", 4.0, 2)
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    release = threading.Event()
+    original_warmup = pipeline.warmup
+    pipeline.warmup = lambda: release.wait(10) and original_warmup()
+    
+    model = AudioSeparationModel(pipeline=pipeline)
+    completions = []
+    model.add_completion_callback(lambda ok, err: completions.append((ok, err)))
+    model.set_input_file(fixture['path'])
+    model.set_output_settings({'output_dir': str(tmp_path / "out")})
+    
+    model.prewarm_models()
+    model.start_separation()
+    time.sleep(0.2)
+    model.stop_separation()
+    _wait_until(lambda: completions, timeout=2.0)
+    assert completions == [(False, AudioSeparationModel.CANCELLED_MESSAGE)]
+    release.set()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+BGM（音楽）の有無の判定とBGM分離の省略のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import DemucsProcessor, SeparationPipeline
+from src.audio_separator.utils.music_detector import MusicDetector
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+from benchmarks.fixtures import generate_mixture
+from benchmarks.run_benchmarks import force_offline
+
+SAMPLE_RATE = 16000
+
+
+def _speech(duration: float, seed: int = 1) -> np.ndarray:
+    """抑揚（音程の変化）と音節（振幅の変化）のある話し声に近い音声"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    knots = rng.uniform(0.7, 1.5, int(duration * 3) + 2)
+    contour = np.interp(t, np.linspace(0, duration, len(knots)), knots)
+    phase = 2 * np.pi * np.cumsum(120.0 * contour) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t + rng.uniform(0, 6)), 0, None)
+    return (0.3 * voice * syllables).astype(np.float32)
+
+
+def _music(duration: float) -> np.ndarray:
+    """一定の音程が続く和音"""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    chord = sum(np.sin(2 * np.pi * f * t) for f in (220.0, 277.2, 329.6))
+    return (0.1 * chord).astype(np.float32)
+
+
+def test_speech_only_has_no_music():
+    """話し声だけの音声はBGM分離不要と判定する"""
+    analysis = MusicDetector().detect(_speech(30.0), SAMPLE_RATE)
+    
+    assert not analysis.has_music
+    assert analysis.regions() == []
+
+
+def test_mixture_and_music_regions():
+    """BGMを含む音声は分離が必要と判定し、音楽のある区間を求める"""
+    detector = MusicDetector()
+    mixture, _ = generate_mixture(20.0, 2, SAMPLE_RATE)
+    assert detector.detect(mixture, SAMPLE_RATE).has_music
+    
+    # 話し声(0-20秒) → 音楽(20-30秒) → 話し声(30-50秒)
+    audio = np.concatenate([_speech(20.0, seed=2), _music(10.0), _speech(20.0, seed=3)])
+    analysis = detector.detect(audio, SAMPLE_RATE)
+    
+    assert analysis.has_music
+    assert len(analysis.regions()) == 1
+    start, end = analysis.regions()[0]
+    assert 18.0 <= start <= 20.5 and 29.5 <= end <= 32.0
+    
+    # 音楽のある区間だけがサンプル位置の対応表に含まれる
+    music_map = analysis.region_map(len(audio), SAMPLE_RATE)
+    mask = music_map.mask()
+    assert mask[25 * SAMPLE_RATE] and not mask[5 * SAMPLE_RATE] and not mask[45 * SAMPLE_RATE]
+    
+    # 無音は音楽の割合に含めない
+    silence = MusicDetector().detect(np.zeros(5 * SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    assert silence.is_silent.all() and not silence.has_music
+
+
+def test_pipeline_skips_bgm_separation_without_music(tmp_path):
+    """BGMの無い音声はBGM分離を省略し、強制した場合は分離する"""
+    input_file = tmp_path / "speech.wav"
+    sf.write(str(input_file), _speech(8.0), SAMPLE_RATE)
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    force_offline(pipeline.demucs_processor, pipeline.speaker_processor)
+    params = {'generate_peaks': False, 'create_individual': False}
+    
+    skipped = pipeline.run(input_file, tmp_path / "auto", params)
+    
+    assert skipped['bgm_separation_skipped']
+    assert skipped['bgm_files'] == []
+    assert skipped['music_detection']['has_music'] is False
+    
+    forced = pipeline.run(input_file, tmp_path / "forced", dict(params, force_bgm_separation=True))
+    
+    assert not forced['bgm_separation_skipped']
+    assert len(forced['bgm_files']) == 2
+    assert forced['music_detection'] is None
+
+
+def test_demucs_only_processes_music_regions():
+    """音楽の無い区間はDemucsに渡さず、元の音声をボーカルとする"""
+    audio = np.concatenate([_speech(20.0, seed=2), _music(10.0), _speech(20.0, seed=3)])
+    analysis = MusicDetector().detect(audio, SAMPLE_RATE)
+    processed = []
+    
+    class RecordingProcessor(DemucsProcessor):
+        def _separate_audio_demucs(self, audio_data, sample_rate, progress=None, token=None):
+            processed.append(audio_data.shape[-1])
+            return np.full(audio_data.shape[-1], 0.5, dtype=np.float32), np.full(audio_data.shape[-1], 0.25, dtype=np.float32)
+    
+    vocals, bgm = RecordingProcessor(device='cpu')._separate_active_regions(audio, SAMPLE_RATE, analysis)
+    
+    assert processed[0] < 15 * SAMPLE_RATE
+    assert np.array_equal(vocals[:10 * SAMPLE_RATE], audio[:10 * SAMPLE_RATE])
+    assert vocals[25 * SAMPLE_RATE] == 0.5 and bgm[25 * SAMPLE_RATE] == 0.25
+    assert not bgm[:10 * SAMPLE_RATE].any()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+ステージプロファイラーのテスト
+"""
+
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.utils.audio_encoder import AudioEncoderPool
+from src.audio_separator.utils.audio_utils import AudioUtils
+from src.audio_separator.utils.profiler import StageProfiler, profile_stage
+
+
+def test_stages_are_recorded_with_io_and_chrome_trace(tmp_path):
+    """ネストしたステージとI/Oバイト数がトレースに記録される"""
+    audio_path = tmp_path / "tone.wav"
+    audio = 0.3 * np.sin(2 * np.pi * 220 * np.arange(16000) / 16000)
+    
+    profiler = StageProfiler(name="test")
+    with profiler.activate():
+        with profile_stage('outer'):
+            AudioUtils.save_audio(audio, audio_path, 16000)
+            AudioUtils.load_audio(audio_path)
+    
+    rows = {row['stage']: row for row in profiler.summary()}
+    assert set(rows) == {'outer', 'audio.save', 'audio.load'}
+    assert rows['outer']['depth'] == 0 and rows['audio.load']['depth'] == 1
+    assert rows['audio.save']['bytes_written'] == audio_path.stat().st_size
+    assert rows['outer']['bytes_read'] == audio_path.stat().st_size
+    assert rows['outer']['wall_time'] >= rows['audio.load']['wall_time']
+    
+    trace = json.loads(profiler.save_trace(tmp_path / "trace.json").read_text(encoding='utf-8'))
+    complete_events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert [e['name'] for e in complete_events] == ['outer', 'audio.save', 'audio.load']
+    assert all(e['dur'] >= 0 and 'cpu_ms' in e['args'] for e in complete_events)
+    assert 'audio.load' in profiler.format_summary()
+
+
+def test_profile_stage_is_noop_without_active_profiler():
+    """プロファイラー無効時は何も記録しない"""
+    with profile_stage('ignored') as record:
+        assert record is None
+
+
+def _burn_cpu(seconds: float) -> None:
+    """実行スレッドのCPU時間を指定秒数だけ消費する"""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def test_concurrent_runs_record_their_own_cpu_time():
+    """並行実行したジョブのCPU時間はそれぞれのスレッドの分だけで、RSSはプロセス全体として記録する"""
+    profilers = [StageProfiler(name=f"job{i}") for i in range(2)]
+    barrier = threading.Barrier(2)
+    
+    def run(profiler):
+        with profiler.activate():
+            barrier.wait()
+            with profile_stage('work'):
+                _burn_cpu(0.2)
+            barrier.wait()
+    
+    threads = [threading.Thread(target=run, args=(profiler,)) for profiler in profilers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    for profiler in profilers:
+        row, = profiler.summary()
+        assert 0.2 <= row['cpu_time'] < 0.3
+        assert row['peak_rss_scope'] == 'process'
+        assert profiler.to_chrome_trace()['otherData']['peak_rss_scope'] == 'process'
+        assert '*' in profiler.format_summary()
+    
+    single = StageProfiler(name="single")
+    with single.activate():
+        with profile_stage('work'):
+            pass
+    assert single.summary()[0]['peak_rss_scope'] == 'job'
+
+
+def test_encoder_worker_stages_are_attributed_to_parent(tmp_path):
+    """書き出しワーカーで実行したステージは呼び出し元の子ステージになり、CPU時間とI/Oを親に加算する"""
+    audio = 0.3 * np.sin(2 * np.pi * 220 * np.arange(48000) / 16000)
+    
+    profiler = StageProfiler(name="test", sample_interval=0)
+    with profiler.activate():
+        with profile_stage('outer'):
+            with AudioEncoderPool(format='flac', max_workers=2) as pool:
+                for i in range(4):
+                    pool.submit(audio, tmp_path / f"{i}.flac", 16000)
+    
+    outer = next(record for record in profiler.records if record.name == 'outer')
+    saves = [record for record in profiler.records if record.name == 'audio.save']
+    assert len(saves) == 4
+    assert all(record.depth == 1 and record.thread_id != outer.thread_id for record in saves)
+    assert outer.worker_cpu_time == pytest.approx(sum(record.thread_cpu_time for record in saves))
+    assert outer.bytes_written == sum(path.stat().st_size for path in tmp_path.glob("*.flac"))
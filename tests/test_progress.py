@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+進捗通知のテスト
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixtures import write_fixture
+from benchmarks.run_benchmarks import force_offline
+from src.audio_separator.processors.demucs_processor import DemucsProcessor
+from src.audio_separator.processors.speaker_processor import SpeakerProcessor
+from src.audio_separator.processors.separation_pipeline import SeparationPipeline
+from src.audio_separator.utils.progress import ProgressReporter
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+
+
+def test_reporter_rate_limits_and_maps_ranges():
+    """通知は間引かれ、子レポーターは親の範囲に割り当てられる"""
+    received = []
+    updates = []
+    reporter = ProgressReporter('test', lambda p, m: received.append((p, m)), [updates.append],
+                                audio_duration=100.0, min_interval=10.0)
+    
+    reporter.update(0.0, "開始")
+    for i in range(1, 100):
+        reporter.update(i / 100.0)
+    # 間隔内の同じメッセージの通知は間引かれる
+    assert received == [(0.0, "開始")]
+    
+    child = reporter.sub(0.5, 1.0, 'child')
+    child.update(0.5, "子処理中")
+    assert received[-1] == (0.75, "子処理中")
+    assert updates[-1].stage == 'child'
+    
+    # 完了は必ず通知され、実時間比とスループットが計算される
+    time.sleep(0.01)
+    child.update(1.0)
+    assert received[-1][0] == 1.0
+    assert updates[-1].real_time_factor > 0
+    assert abs(updates[-1].throughput * updates[-1].real_time_factor - 1.0) < 1e-9
+    
+    # 上位から渡されたレポーターはそのまま使われる
+    assert ProgressReporter.ensure(child, 'other') is child
+
+
+def test_chunk_bounds_overlap():
+    """推論チャンクは重なりを持って全体を覆う"""
+    assert DemucsProcessor._chunk_bounds(100, 300, 10) == [(0, 100)]
+    
+    bounds = DemucsProcessor._chunk_bounds(1000, 300, 50)
+    assert bounds[0] == (0, 300) and bounds[-1][1] == 1000
+    for (_, prev_end), (start, _) in zip(bounds, bounds[1:]):
+        assert prev_end - start == 50
+
+
+def test_pipeline_reports_intermediate_progress(tmp_path):
+    """パイプラインはステージ内部の進捗を単調増加で通知する"""
+    fixture = write_fixture(tmp_path / "fixtures", 8.0, 2)
+    
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    force_offline(pipeline.demucs_processor, pipeline.speaker_processor)
+    
+    updates = []
+    pipeline.run(str(fixture['path']), str(tmp_path / "out"), update_callback=updates.append)
+    
+    progresses = [u.progress for u in updates]
+    assert progresses == sorted(progresses)
+    assert progresses[-1] == 1.0
+    
+    # BGM分離と話者分離の間（0.4-1.0）にも通知がある
+    assert any(0.4 < p < 1.0 for p in progresses)
+    assert {'bgm_separation', 'speaker.diarize', 'speaker.extract'} <= {u.stage for u in updates}
+    assert updates[-1].audio_duration == fixture['duration']
+    assert updates[-1].throughput is not None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+ワーカースレッドからGUIへの進捗通知のテスト
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.gui.utils.progress_bus import ProgressBus
+from src.audio_separator.gui.models.gui_model import ProcessingProgress
+
+
+class ManualScheduler:
+    """after() を記録し、テストから手動で実行するスケジューラ"""
+    
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+    
+    def after(self, ms, callback, *args):
+        self._next_id += 1
+        timer_id = f"after#{self._next_id}"
+        self.pending[timer_id] = (callback, args)
+        return timer_id
+    
+    def after_cancel(self, timer_id):
+        self.pending.pop(timer_id, None)
+    
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for callback, args in pending.values():
+            callback(*args)
+
+
+def test_publish_coalesces_to_latest_value():
+    """表示間隔の間に何度通知しても、最新の値が1回だけ届く"""
+    bus = ProgressBus()
+    received = []
+    bus.subscribe('progress', received.append)
+    
+    def worker(offset):
+        for i in range(25000):
+            bus.publish('progress', ProcessingProgress(offset + i * 0.001, "処理中", stage='demucs.inference'))
+    
+    threads = [threading.Thread(target=worker, args=(n * 25,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert bus.published_count == 100000
+    assert bus.flush() == 1
+    assert len(received) == 1
+    assert received[0].stage == 'demucs.inference'
+    
+    # 新しい通知が無ければ何も届かない
+    assert bus.flush() == 0
+    assert len(received) == 1
+
+
+def test_publish_is_cheap():
+    """処理側の通知は画面を更新せず、1回あたり数マイクロ秒で終わる"""
+    bus = ProgressBus()
+    bus.subscribe('progress', lambda progress: time.sleep(0.01))
+    progress = ProcessingProgress(50.0, "処理中")
+    
+    count = 100000
+    start = time.perf_counter()
+    for _ in range(count):
+        bus.publish('progress', progress)
+    per_call = (time.perf_counter() - start) / count
+    
+    assert per_call < 20e-6
+    assert bus.delivered_count == 0
+
+
+def test_events_run_in_order_after_latest_progress():
+    """完了通知は間引かれず、最後の進捗を反映した後に登録順で実行される"""
+    bus = ProgressBus()
+    log = []
+    bus.subscribe('progress', lambda progress: log.append(('progress', progress.percentage)))
+    bus.subscribe('model_state', lambda state: log.append(('model_state', state)))
+    
+    bus.publish('progress', ProcessingProgress(10.0))
+    bus.post(log.append, ('event', 1))
+    bus.publish('progress', ProcessingProgress(100.0))
+    bus.publish('model_state', 'warm')
+    bus.post(log.append, ('event', 2))
+    
+    assert bus.flush() == 4
+    assert log == [('progress', 100.0), ('model_state', 'warm'), ('event', 1), ('event', 2)]
+
+
+def test_timer_delivers_on_scheduler_and_stops():
+    """タイマーはスケジューラ上で反映して次回を予約し、stop() で止まる"""
+    scheduler = ManualScheduler()
+    bus = ProgressBus(scheduler, interval_ms=50)
+    received = []
+    bus.subscribe('progress', received.append)
+    
+    bus.start()
+    bus.start()
+    assert len(scheduler.pending) == 1
+    
+    # 別スレッドからの通知は、スケジューラで実行されるまで届かない
+    thread = threading.Thread(target=lambda: [bus.publish('progress', n) for n in range(1000)])
+    thread.start()
+    thread.join()
+    assert received == []
+    
+    scheduler.run_pending()
+    assert received == [999]
+    assert len(scheduler.pending) == 1
+    
+    # コールバックが失敗してもタイマーは続く
+    bus.subscribe('progress', lambda value: 1 / 0)
+    bus.publish('progress', 1000)
+    scheduler.run_pending()
+    assert received == [999, 1000]
+    assert len(scheduler.pending) == 1
+    
+    bus.stop()
+    assert scheduler.pending == {}
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+話者セグメントのコンテナ出力のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import SegmentContainer, SegmentContainerWriter, SpeakerProcessor
+from benchmarks.fixtures import write_fixture
+
+SAMPLE_RATE = 16000
+
+
+def test_write_and_seek_segments(tmp_path):
+    """連続して書き込んだセグメントを番号から個別に読み出せる"""
+    rng = np.random.default_rng(0)
+    clips = [rng.uniform(-0.5, 0.5, length).astype(np.float32) for length in (1600, 4000, 800)]
+    path = tmp_path / "speaker_segments.wav"
+    
+    with SegmentContainerWriter(path, SAMPLE_RATE, speaker_id='SPEAKER_00', source_file='talk.wav') as writer:
+        for i, clip in enumerate(clips):
+            assert writer.add(clip, start_time=i * 2.0, end_time=i * 2.0 + len(clip) / SAMPLE_RATE, confidence=0.5) == i
+    
+    container = SegmentContainer(path)
+    
+    assert len(container) == 3
+    assert container.speaker_id == 'SPEAKER_00' and container.source_file == 'talk.wav'
+    assert container.offsets.tolist() == [0, 1600, 5600]
+    assert container.segments.starts.tolist() == [0.0, 2.0, 4.0]
+    # WAV（16bit）に保存するため量子化の誤差だけ異なる
+    assert np.allclose(container.read(1), clips[1], atol=1e-4)
+    assert np.allclose(container.read(-1), clips[2], atol=1e-4)
+    assert [len(audio) for audio in container] == [1600, 4000, 800]
+    with pytest.raises(IndexError):
+        container.read(3)
+    
+    # 索引ファイルからも開け、個別ファイルとして書き出せる
+    exported = SegmentContainer(container.index_path).export(0, tmp_path / "first.wav")
+    assert exported.exists()
+
+
+def test_extract_into_containers(tmp_path):
+    """コンテナ出力では話者ごとに音声ファイルと索引ファイルだけを作成する"""
+    fixture = write_fixture(tmp_path / "fixtures", 6.0, 2)
+    processor = SpeakerProcessor(device='cpu')
+    processor.pipeline = None
+    processor._pyannote_available = False
+    processor._is_initialized = True
+    
+    separate = processor.separate_speakers(fixture['path'], tmp_path / "files", min_segment_length=0.5, create_combined=False)
+    result = processor.extract_from_segment_file(
+        separate['segments_file'], tmp_path / "containers", create_combined=False, segment_container=True
+    )
+    
+    for speaker_id, files in result['output_files'].items():
+        assert len(files) == 1 and files[0].endswith('_segments.wav')
+        container = SegmentContainer(files[0])
+        assert len(list(Path(files[0]).parent.iterdir())) == 2
+        
+        # 個別ファイル出力と同じ音声をセグメント単位で読み出せる
+        individual = sorted(Path(f) for f in separate['output_files'][speaker_id])
+        assert len(container) == len(individual)
+        assert np.allclose(container.read(0), sf.read(str(individual[0]), dtype='float32')[0], atol=1e-4)
+
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+話者セグメントの区間インデックスのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors.segment_index import IntervalIndex, SpeakerTimelineIndex
+from src.audio_separator.processors.speaker_processor import SpeakerSegment
+
+
+def test_query_matches_linear_scan():
+    """重なる区間を含む場合でも、範囲検索の結果が全件走査と一致する"""
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, 1000, 2000)
+    ends = starts + rng.exponential(3.0, 2000)
+    ends[::97] += 50.0  # 長い区間を混ぜる
+    index = IntervalIndex(starts, ends)
+    
+    for lo, hi in [(0, 10), (100.5, 101.0), (500, 700), (990, 1100), (-10, 0)]:
+        found_starts, found_ends = index.query(lo, hi)
+        expected = (ends > lo) & (starts < hi)
+        assert len(found_starts) == expected.sum()
+        assert np.all(np.diff(found_starts) >= 0)
+        assert sorted(index.query_indices(lo, hi).tolist()) == np.flatnonzero(expected).tolist()
+    
+    times = rng.uniform(-5, 1100, 500)
+    expected = np.array([np.any((starts <= t) & (t < ends)) for t in times])
+    np.testing.assert_array_equal(index.contains(times), expected)
+
+
+def test_coalesce_merges_subpixel_gaps():
+    """min_gap 未満の隙間で隣り合う区間をまとめる"""
+    index = IntervalIndex(np.array([0.0, 1.05, 2.0, 5.0, 5.2]), np.array([1.0, 1.9, 2.5, 5.1, 6.0]))
+    
+    starts, ends = index.query_coalesced(0, 10, 0.2)
+    assert starts.tolist() == [0.0, 5.0]
+    assert ends.tolist() == [2.5, 6.0]
+    
+    starts, ends = index.query_coalesced(0, 10, 0.01)
+    assert len(starts) == 5
+
+
+def test_speaker_timeline_from_segments():
+    """SpeakerSegment・辞書のどちらからも話者ごとのインデックスを作成できる"""
+    segments = [
+        SpeakerSegment(0.0, 2.0, "SPEAKER_01"),
+        SpeakerSegment(1.5, 3.0, "SPEAKER_00"),
+        SpeakerSegment(4.0, 6.0, "SPEAKER_01"),
+    ]
+    for source in (segments, [seg.to_dict() for seg in segments]):
+        timeline = SpeakerTimelineIndex.from_segments(source)
+        assert timeline.speakers == ["SPEAKER_00", "SPEAKER_01"]
+        assert timeline.duration == 6.0
+        assert timeline.speakers_at(1.8) == ["SPEAKER_00", "SPEAKER_01"]
+        assert timeline.speakers_at(3.5) == []
+        assert len(timeline.query(2.5, 4.5)["SPEAKER_01"][0]) == 1
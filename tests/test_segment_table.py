@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+話者セグメントの列指向テーブルのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import SegmentTable, SpeakerProcessor, SpeakerSegment, SpeakerTimelineIndex
+
+
+def _random_segments(count: int, num_speakers: int, seed: int = 0):
+    """重なりを含むランダムなセグメントを作成"""
+    rng = np.random.default_rng(seed)
+    starts = np.round(np.sort(rng.uniform(0, count * 0.8, count)), 2)
+    durations = np.round(rng.uniform(0.2, 4.0, count), 2)
+    speakers = rng.integers(0, num_speakers, count)
+    return [
+        SpeakerSegment(float(start), float(start + duration), f"SPEAKER_{speaker:02d}", 1.0)
+        for start, duration, speaker in zip(starts, durations, speakers)
+    ]
+
+
+def _remove_overlapping_reference(segments, overlap_threshold=0.1):
+    """リストで全件比較する従来の重複除去"""
+    filtered = []
+    for current in sorted(segments, key=lambda x: x.start_time):
+        overlapping = False
+        for existing in filtered:
+            overlap = max(0, min(current.end_time, existing.end_time) - max(current.start_time, existing.start_time))
+            if overlap > overlap_threshold:
+                if current.duration > existing.duration:
+                    filtered.remove(existing)
+                else:
+                    overlapping = True
+                break
+        if not overlapping:
+            filtered.append(current)
+    return sorted(filtered, key=lambda x: x.start_time)
+
+
+def test_remove_overlapping_speech_matches_reference():
+    """重複除去は従来の全件比較と同じセグメントを残す"""
+    processor = SpeakerProcessor()
+    for seed in range(5):
+        segments = _random_segments(600, 4, seed)
+        
+        result = processor._remove_overlapping_speech(segments)
+        expected = _remove_overlapping_reference(segments)
+        
+        assert isinstance(result, SegmentTable)
+        assert [seg.to_dict() for seg in result] == [seg.to_dict() for seg in expected]
+
+
+def test_speaker_operations():
+    """話者の絞り込み・グループ化・強制分割は行の順序を保つ"""
+    table = SegmentTable.from_segments([
+        {'start': 0.0, 'end': 1.0, 'speaker': 'B'},
+        {'start': 1.0, 'end': 5.0, 'speaker': 'A', 'confidence': 0.5},
+        {'start': 5.0, 'end': 6.0, 'speaker': 'C'},
+        {'start': 6.0, 'end': 7.5, 'speaker': 'B'},
+    ])
+    
+    assert len(table) == 4
+    assert table.speakers == ['B', 'A', 'C']
+    assert table.select_speakers(['B', 'A']).speaker_ids.tolist() == ['B', 'A', 'B']
+    assert table.filter_min_duration(1.5).speaker_ids.tolist() == ['A', 'B']
+    
+    groups = table.group_by_speaker()
+    assert list(groups) == ['B', 'A', 'C']
+    assert groups['B'].starts.tolist() == [0.0, 6.0]
+    assert groups['A'][0].confidence == 0.5
+    
+    # 行は SpeakerSegment と同じ属性で読める
+    row = table[-1]
+    assert (row.speaker_id, row.duration) == ('B', 1.5)
+    assert row.to_dict() == table.to_segments()[-1].to_dict()
+    assert SpeakerTimelineIndex.from_segments(table).speakers == ['A', 'B', 'C']
+    
+    split = SpeakerProcessor()._force_split_speakers(table[::-1], 3)
+    assert split.starts.tolist() == [0.0, 1.0, 5.0, 6.0]
+    assert split.speaker_ids.tolist() == ['SPEAKER_00', 'SPEAKER_00', 'SPEAKER_01', 'SPEAKER_02']
+
+
+def test_million_segments_are_compact():
+    """100万セグメントを1セグメントあたり約25バイトで保持し、配列演算で集計できる"""
+    count = 1_000_000
+    rng = np.random.default_rng(0)
+    starts = np.cumsum(rng.uniform(0.1, 1.0, count))
+    labels = np.array([f"SPEAKER_{i:02d}" for i in range(8)], dtype=object)[rng.integers(0, 8, count)]
+    
+    table = SegmentTable.from_arrays(starts, starts + 0.5, labels, rng.uniform(0, 1, count))
+    
+    assert table.nbytes <= 25 * count
+    assert table.num_speakers == 8
+    assert abs(table.total_duration - 0.5 * count) < 1e-3
+    assert sum(len(group) for group in table.group_by_speaker().values()) == count
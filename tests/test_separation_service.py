@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ローカル分離サービスのテスト
+
+合成音声を使い、サービス起動→ジョブ投入→SSE進捗受信→結果取得までを確認する
+（Demucs/pyannoteが利用できない環境では簡易分離にフォールバックして動作）
+"""
+
+import sys
+import json
+from pathlib import Path
+from urllib import request, error
+
+import numpy as np
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.service import SeparationServer, SeparationClient, JobManager
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+
+
+def _create_test_audio(path: Path, duration: float = 12.0, sample_rate: int = 16000):
+    """話者交代を模した合成音声を作成"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    audio = np.zeros_like(t)
+    for i, freq in enumerate([180.0, 260.0, 180.0, 260.0]):
+        start, end = i * 3.0 + 0.5, i * 3.0 + 2.5
+        mask = (t >= start) & (t < end)
+        audio[mask] = 0.5 * np.sin(2 * np.pi * freq * t[mask])
+    sf.write(str(path), audio.astype(np.float32), sample_rate)
+
+
+def test_service_round_trip(tmp_path):
+    """ジョブ投入から結果取得までの一連の流れ"""
+    input_file = tmp_path / "input.wav"
+    _create_test_audio(input_file)
+    
+    server = SeparationServer('127.0.0.1', 0, JobManager(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl")), allowed_roots=[tmp_path])
+    server.start_background(warmup=True)
+    try:
+        client = SeparationClient(server.url)
+        assert client.is_available()
+        assert client.health()['models']['demucs']['is_warm']
+        
+        job = client.submit(str(input_file), str(tmp_path / "out"), {'min_segment_length': 0.5})
+        progress_values = []
+        result = client.wait(job['job_id'], lambda p, m: progress_values.append(p))
+        
+        assert progress_values and progress_values[-1] == 1.0
+        assert progress_values == sorted(progress_values)
+        assert len(result['bgm_files']) == 2
+        assert result['speakers_detected'] >= 1
+        assert Path(result['trace_file']).exists()
+        assert any(row['stage'] == 'pipeline.speaker_separation' for row in result['profile'])
+        
+        vocals_name = Path(result['bgm_files'][0]).name
+        downloaded = client.download(job['job_id'], f"bgm_separated/{vocals_name}", str(tmp_path / "dl.wav"))
+        assert downloaded.stat().st_size > 0
+    finally:
+        server.stop()
+
+
+def test_file_access_outside_output_dir_is_rejected(tmp_path):
+    """出力ディレクトリ外のファイルは取得できない"""
+    input_file = tmp_path / "input.wav"
+    _create_test_audio(input_file, duration=4.0)
+    
+    server = SeparationServer('127.0.0.1', 0, JobManager(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl")), allowed_roots=[tmp_path])
+    server.start_background(warmup=False)
+    try:
+        client = SeparationClient(server.url)
+        job = client.submit(str(input_file), str(tmp_path / "out"))
+        client.wait(job['job_id'])
+        
+        try:
+            client.download(job['job_id'], "../input.wav", str(tmp_path / "leak.wav"))
+            assert False, "出力ディレクトリ外のファイルが取得できてしまった"
+        except Exception:
+            pass
+    finally:
+        server.stop()
+
+
+def _post(url: str, payload, headers):
+    """ヘッダーを指定してPOSTし、ステータスコードを返す"""
+    req = request.Request(url, data=json.dumps(payload).encode('utf-8'), headers=headers, method='POST')
+    try:
+        with request.urlopen(req, timeout=10) as response:
+            return response.status
+    except error.HTTPError as e:
+        return e.code
+
+
+def test_cross_site_and_outside_paths_are_rejected(tmp_path):
+    """他のサイトからのリクエスト・JSON以外の本文・許可ディレクトリ外のパスは受け付けない"""
+    allowed = tmp_path / "allowed"
+    allowed.mkdir()
+    input_file = allowed / "input.wav"
+    _create_test_audio(input_file, duration=2.0)
+    outside = tmp_path / "outside"
+    
+    server = SeparationServer('127.0.0.1', 0, JobManager(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl")), allowed_roots=[allowed])
+    server.start_background(warmup=False)
+    try:
+        url = f"{server.url}/jobs"
+        json_headers = {'Content-Type': 'application/json'}
+        payload = {'input_path': str(input_file), 'output_dir': str(allowed / "out")}
+        
+        assert _post(url, payload, {'Content-Type': 'text/plain'}) == 415
+        assert _post(url, payload, {**json_headers, 'Origin': 'http://evil.example'}) == 403
+        assert _post(url, payload, {**json_headers, 'Host': 'evil.example:8765'}) == 403
+        assert _post(url, {**payload, 'output_dir': str(outside)}, json_headers) == 403
+        assert _post(url, {**payload, 'output_dir': str(allowed / ".." / "outside")}, json_headers) == 403
+        assert _post(url, {**payload, 'params': {'speaker_registry': str(outside)}}, json_headers) == 403
+        assert not outside.exists()
+        assert server.job_manager.list_jobs() == []
+        
+        # 自身のOriginからのリクエストは受け付ける
+        assert _post(url, payload, {**json_headers, 'Origin': server.url}) == 202
+    finally:
+        server.stop()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+ファイルをまたいだ話者登録簿のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import SegmentTable, SpeakerEmbedder, SpeakerProcessor, SpeakerRegistry
+from benchmarks.fixtures import _speaker_voice, SPEAKER_F0
+
+SAMPLE_RATE = 16000
+
+
+def _session(speakers, seed: int):
+    """話者が交代する収録回（音声、セグメント、話者ID → 話者番号）"""
+    rng = np.random.default_rng(seed)
+    parts, starts, ends, ids, current = [], [], [], [], 0
+    for turn in range(12):
+        index = turn % len(speakers)
+        voice = _speaker_voice(rng, SPEAKER_F0[speakers[index]], rng.uniform(2.0, 3.5), SAMPLE_RATE)
+        starts.append(current / SAMPLE_RATE)
+        current += len(voice)
+        ends.append(current / SAMPLE_RATE)
+        ids.append(f"SPEAKER_{index:02d}")
+        gap = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+        parts += [voice, gap]
+        current += len(gap)
+    truth = {f"SPEAKER_{i:02d}": speaker for i, speaker in enumerate(speakers)}
+    return np.concatenate(parts), SegmentTable.from_arrays(starts, ends, ids), truth
+
+
+def test_identifies_enrolled_speakers_across_sessions(tmp_path):
+    """ある回で登録した話者を、別の回で話者IDに関係なく識別し、未登録の話者は置き換えない"""
+    embedder = SpeakerEmbedder(SAMPLE_RATE)
+    registry = SpeakerRegistry(tmp_path / "registry")
+    
+    audio, segments, truth = _session([0, 1], seed=1)
+    embeddings = embedder.embed_speakers(audio, segments)
+    for local_id, embedding in embeddings.items():
+        registry.enroll(f"host{truth[local_id]}", embedding)
+    for speakers, seed in [([2, 3], 2), ([4, 5], 3)]:
+        audio, segments, _ = _session(speakers, seed)
+        registry.observe(embedder.embed_speakers(audio, segments).values())
+    
+    audio, segments, truth = _session([1, 2, 0], seed=4)
+    embeddings = embedder.embed_speakers(audio, segments)
+    mapping = registry.identify(embeddings)
+    
+    assert mapping == {local_id: f"host{speaker}" for local_id, speaker in truth.items() if speaker in (0, 1)}
+    relabeled = registry.relabel(segments, mapping)
+    assert set(relabeled.speakers) == {'host0', 'host1', 'SPEAKER_01'}
+    assert relabeled.total_duration == pytest.approx(segments.total_duration)
+
+
+def test_save_and_reload(tmp_path):
+    """保存した登録簿を読み込むと同じ検索結果になり、登録の更新・削除も保存される"""
+    rng = np.random.default_rng(0)
+    registry = SpeakerRegistry(tmp_path)
+    vectors = rng.normal(size=(6, SpeakerEmbedder.NUM_BANDS))
+    for i, vector in enumerate(vectors):
+        registry.enroll(f"speaker{i}", vector)
+    assert registry.enroll('speaker0', vectors[0]) == 0
+    registry.remove('speaker5')
+    registry.save()
+    
+    loaded = SpeakerRegistry(tmp_path)
+    
+    assert loaded.names == registry.names
+    assert loaded.counts == [2, 1, 1, 1, 1]
+    indices, scores = loaded.search(vectors[:5])
+    assert indices[:, 0].tolist() == list(range(5))
+    assert np.allclose(scores, registry.search(vectors[:5])[1], atol=1e-2)
+    with pytest.raises(KeyError):
+        loaded.remove('speaker5')
+    with pytest.raises(ValueError):
+        loaded.enroll('bad', np.ones(3))
+
+
+def test_approximate_search_matches_exact(tmp_path):
+    """転置リストによる近似検索は、近傍のリストを探して完全検索と同じ最上位を返す"""
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(50, SpeakerEmbedder.NUM_BANDS))
+    vectors = centers[rng.integers(0, 50, 3000)] + 0.1 * rng.normal(size=(3000, SpeakerEmbedder.NUM_BANDS))
+    registry = SpeakerRegistry(tmp_path)
+    for i, vector in enumerate(vectors):
+        registry.enroll(f"speaker{i}", vector)
+    registry.build_index()
+    
+    queries = vectors[rng.choice(len(vectors), 20, replace=False)] + 0.01 * rng.normal(size=(20, SpeakerEmbedder.NUM_BANDS))
+    exact_indices, exact_scores = registry.search(queries, k=3, approximate=False)
+    approximate_indices, approximate_scores = registry.search(queries, k=3, approximate=True)
+    
+    assert (approximate_indices[:, 0] == exact_indices[:, 0]).mean() >= 0.9
+    assert np.all(np.diff(exact_scores, axis=1) <= 1e-6)
+
+
+def test_separate_speakers_uses_registry(tmp_path):
+    """話者分離に登録簿を指定すると、登録済みの話者名で書き出す"""
+    audio, segments, truth = _session([0, 1], seed=5)
+    audio_path = tmp_path / "session.wav"
+    sf.write(audio_path, audio, SAMPLE_RATE)
+    registry = SpeakerRegistry(tmp_path / "registry")
+    enrolled, enrolled_segments, enrolled_truth = _session([0, 1], seed=6)
+    embedder = SpeakerEmbedder(SAMPLE_RATE)
+    for local_id, embedding in embedder.embed_speakers(enrolled, enrolled_segments).items():
+        registry.enroll(f"host{enrolled_truth[local_id]}", embedding)
+    for speakers, seed in [([2, 3], 7), ([4, 5], 8)]:
+        other, other_segments, _ = _session(speakers, seed)
+        registry.observe(embedder.embed_speakers(other, other_segments).values())
+    registry.save()
+    
+    processor = SpeakerProcessor(device='cpu')
+    processor.pipeline = None
+    processor._pyannote_available = False
+    processor._is_initialized = True
+    processor.diarize = lambda **kwargs: segments
+    result = processor.separate_speakers(
+        audio_path, tmp_path / "output", min_segment_length=0.5, speaker_registry=tmp_path / "registry"
+    )
+    
+    assert result['speaker_identities'] == {local_id: f"host{speaker}" for local_id, speaker in truth.items()}
+    assert set(result['output_files']) == {'host0', 'host1'}
+    assert {segment['speaker'] for segment in result['segments']} == {'host0', 'host1'}
+
+
+@pytest.mark.parametrize('naming_style', ['detailed', 'simple'])
+def test_named_speakers_are_written_separately(tmp_path, naming_style):
+    """話者名に置き換えた話者は、それぞれ別のディレクトリ・ファイルに書き出す"""
+    audio, segments, _ = _session([0, 1, 2], seed=9)
+    audio_path = tmp_path / "session.wav"
+    sf.write(audio_path, audio, SAMPLE_RATE)
+    segments = SpeakerRegistry.relabel(segments, {'SPEAKER_00': 'Alice', 'SPEAKER_01': 'Bob/Guest'})
+    
+    output_files = SpeakerProcessor(device='cpu').extract_speaker_audio(
+        str(audio_path), segments, str(tmp_path / "output"), naming_style=naming_style
+    )
+    
+    assert set(output_files) == {'Alice', 'Bob/Guest', 'SPEAKER_02'}
+    directories = {speaker_id: {Path(f).parent for f in files} for speaker_id, files in output_files.items()}
+    assert all(len(parents) == 1 for parents in directories.values())
+    assert len(set.union(*directories.values())) == 3
+    for speaker_id, files in output_files.items():
+        assert len(files) == len(segments.select_speakers([speaker_id])) + 1
+        assert all(Path(f).exists() for f in files)
+        assert all(Path(f).parent.parent == tmp_path / "output" for f in files)
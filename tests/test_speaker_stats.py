@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+話者統計のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import SegmentTable, SpeakerProcessor, SpeakerSegment, SpeakerStatistics
+
+
+def test_statistics_in_one_pass():
+    """話者ごとのセグメント数・発話時間・信頼度・割合・ターン数を集計する"""
+    segments = [
+        SpeakerSegment(0.0, 2.0, 'SPEAKER_01', 0.9),
+        SpeakerSegment(2.0, 3.0, 'SPEAKER_01', 0.5),
+        SpeakerSegment(3.0, 7.0, 'SPEAKER_00', 0.7),
+        SpeakerSegment(8.0, 9.0, 'SPEAKER_01', 1.0),
+        SpeakerSegment(9.0, 11.0, 'SPEAKER_00', 0.6),
+    ]
+    
+    result = SpeakerProcessor().analyze_speakers(segments[::-1])
+    
+    assert result['num_speakers'] == 2
+    assert result['num_segments'] == 5
+    assert result['total_duration'] == 10.0
+    assert result['num_turns'] == 4
+    assert result['speaker_changes'] == 3
+    
+    # 話者は入力で最初に現れた順
+    assert list(result['speakers']) == ['SPEAKER_00', 'SPEAKER_01']
+    speaker = result['speakers']['SPEAKER_01']
+    # 信頼度はfloat32で保持するため近似で比較する
+    assert speaker == {
+        'segments': 3,
+        'total_duration': 4.0,
+        'avg_confidence': pytest.approx(0.8),
+        'min_confidence': pytest.approx(0.5),
+        'max_confidence': pytest.approx(1.0),
+        'share': 0.4,
+        'turns': 2,
+        'avg_turn_duration': 2.0
+    }
+    assert result['speakers']['SPEAKER_00']['turns'] == 2
+    assert result['speakers']['SPEAKER_00']['avg_confidence'] == pytest.approx(0.65)
+
+
+def test_top_speakers_and_empty():
+    """上位話者は発話時間の長い順（同じなら先に現れた順）で、空の入力も扱える"""
+    stats = SpeakerStatistics(SegmentTable.from_arrays(
+        [0.0, 1.0, 2.0, 4.0, 6.0], [1.0, 2.0, 4.0, 6.0, 6.5], ['C', 'A', 'B', 'A', 'D']
+    ))
+    
+    assert stats.speakers == ['C', 'A', 'B', 'D']
+    assert stats.top_speakers(2) == ['A', 'B']
+    assert stats.top_speakers(10) == ['A', 'B', 'C', 'D']
+    
+    empty = SpeakerStatistics([])
+    assert empty.to_dict() == {
+        'num_speakers': 0, 'total_duration': 0.0, 'num_segments': 0,
+        'num_turns': 0, 'speaker_changes': 0, 'speakers': {}
+    }
+
+
+def test_matches_per_speaker_loops():
+    """大量のセグメントでも話者ごとに絞り込んだ集計と一致する"""
+    rng = np.random.default_rng(1)
+    count = 200_000
+    starts = np.cumsum(rng.uniform(0.1, 1.0, count))
+    labels = np.array([f"SPEAKER_{i:02d}" for i in range(6)], dtype=object)[rng.integers(0, 6, count)]
+    table = SegmentTable.from_arrays(starts, starts + rng.uniform(0.1, 2.0, count), labels, rng.uniform(0, 1, count))
+    
+    stats = SpeakerStatistics(table)
+    
+    for i, speaker_id in enumerate(stats.speakers):
+        mask = table.speaker_ids == speaker_id
+        assert stats.segment_counts[i] == mask.sum()
+        assert abs(stats.durations[i] - table.durations[mask].sum()) < 1e-6
+        assert stats.confidence_min[i] == table.confidences[mask].min()
+        assert stats.confidence_max[i] == table.confidences[mask].max()
+    assert abs(stats.shares.sum() - 1.0) < 1e-9
+    assert stats.turns.sum() == stats.num_turns
+
+
+def test_summary_for_many_speakers():
+    """話者が多くても話者ごとの統計を話者IDから引ける（含まれない話者はエラー）"""
+    count = 20_000
+    speaker_ids = [f"SPEAKER_{i:05d}" for i in range(count)][::-1]
+    starts = np.arange(count, dtype=np.float64)
+    stats = SpeakerStatistics(SegmentTable.from_arrays(starts, starts + 0.5, speaker_ids))
+    
+    speakers = stats.to_dict()['speakers']
+    
+    assert list(speakers) == speaker_ids
+    assert all(summary['segments'] == 1 and summary['turns'] == 1 for summary in speakers.values())
+    with pytest.raises(ValueError):
+        stats.speaker_summary('SPEAKER_X')
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+音声区間検出（無音の事前除去）のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors import SegmentTable
+from src.audio_separator.utils.speech_activity import SpeechActivityDetector, SpeechActivityMap
+
+SAMPLE_RATE = 16000
+
+
+def _meeting_audio():
+    """発話（0-10秒、14-15秒、30-40秒）の間に長い無音と短い無音がある音声"""
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 1e-4, 40 * SAMPLE_RATE)  # 無音部分の小さな雑音
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    for start, end in [(0, 10), (14, 15), (30, 40)]:
+        for second in range(start, end):
+            audio[second * SAMPLE_RATE:(second + 1) * SAMPLE_RATE] += 0.3 * np.sin(2 * np.pi * (150 + 20 * second) * t)
+    return audio
+
+
+def test_detect_skips_long_silence_with_padding():
+    """長い無音だけを除き、音のある区間には前後の余白を付ける"""
+    audio = _meeting_audio()
+    activity = SpeechActivityDetector(padding=0.5, min_silence=2.0).detect(audio, SAMPLE_RATE)
+    
+    regions = activity.regions / SAMPLE_RATE
+    assert np.allclose(regions, [[0.0, 10.5], [13.5, 15.5], [29.5, 40.0]], atol=0.06)
+    assert 0.5 < activity.active_ratio < 0.6
+    
+    # 詰めた音声を戻すと、音のある区間は元のまま、除去した区間は0になる
+    compact = activity.compact(audio)
+    assert len(compact) == activity.active_samples
+    restored = activity.expand(compact)
+    for start, end in activity.regions:
+        assert np.array_equal(restored[start:end], audio[start:end])
+    assert not restored[int(20 * SAMPLE_RATE):int(25 * SAMPLE_RATE)].any()
+    
+    # 複数チャンネルは最後の軸で詰める
+    stereo = np.stack([audio, audio])
+    assert activity.compact(stereo).shape == (2, activity.active_samples)
+
+
+def test_silent_and_continuous_audio_are_kept_whole():
+    """全体が無音、または無音が無い音声は詰めない"""
+    detector = SpeechActivityDetector()
+    for audio in (np.zeros(5 * SAMPLE_RATE), 0.3 * np.sin(np.arange(5 * SAMPLE_RATE) * 0.05)):
+        activity = detector.detect(audio, SAMPLE_RATE)
+        assert activity.is_full
+        assert activity.compact(audio) is audio
+
+
+def test_map_segments_back_to_original_time():
+    """詰めた時刻のセグメントを元の時刻に写し、除去した区間をまたぐものは分割する"""
+    activity = SpeechActivityMap(np.array([[0, 10], [20, 25], [40, 50]]) * SAMPLE_RATE, 60 * SAMPLE_RATE, SAMPLE_RATE)
+    segments = SegmentTable.from_arrays(
+        [1.0, 9.0, 12.0, 15.0], [3.0, 12.0, 15.0, 18.0], ['A', 'B', 'A', 'B'], [0.9, 0.8, 0.7, 0.6]
+    )
+    
+    mapped = activity.map_segments(segments)
+    
+    assert mapped.starts.tolist() == [1.0, 9.0, 20.0, 22.0, 40.0]
+    assert mapped.ends.tolist() == [3.0, 10.0, 22.0, 25.0, 43.0]
+    assert mapped.speaker_ids.tolist() == ['A', 'B', 'B', 'A', 'B']
+    assert mapped.confidences.tolist() == pytest.approx([0.9, 0.8, 0.8, 0.7, 0.6])
+    assert activity.to_original_time([0.0, 12.5, 16.0]).tolist() == [0.0, 22.5, 41.0]
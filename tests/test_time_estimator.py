@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+処理時間推定のテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.processors.separation_pipeline import SeparationPipeline
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+
+
+def test_estimate_from_records_with_interval(tmp_path):
+    """記録から処理速度を学習し、信頼区間付きで推定する"""
+    records_file = tmp_path / "records.jsonl"
+    estimator = ProcessingTimeEstimator(records_file)
+    
+    # 記録が無い場合は既定係数
+    default = estimator.estimate('bgm_separation', 'htdemucs', 'cpu', 100.0, default_factor=4.0)
+    assert default.source == 'default' and default.estimate == 400.0
+    
+    for rate in [0.18, 0.2, 0.22, 0.2]:
+        estimator.record('bgm_separation', 'htdemucs', 'cpu', 50.0, 50.0 * rate)
+    
+    # 別のプロセスからも記録を読み込める
+    estimate = ProcessingTimeEstimator(records_file).estimate('bgm_separation', 'htdemucs', 'cpu', 100.0, default_factor=4.0)
+    assert estimate.source == 'history' and estimate.samples == 4
+    assert 19.0 < estimate.estimate < 21.0
+    assert estimate.lower < estimate.estimate < estimate.upper
+    assert estimate.upper < 30.0
+    
+    # 設定が異なる記録は使わない
+    other = estimator.estimate('bgm_separation', 'htdemucs', 'cuda', 100.0, default_factor=1.0)
+    assert other.source == 'default'
+
+
+def test_estimate_remaining_blends_prior_and_observed():
+    """開始直後は事前推定、終盤は実測の進み具合を重視する"""
+    assert ProcessingTimeEstimator.estimate_remaining(100.0, 0.0, 0.0) == 100.0
+    assert ProcessingTimeEstimator.estimate_remaining(100.0, 50.0, 1.0) == 0.0
+    
+    # 事前推定より2倍遅く進んでいる場合、残り時間は事前推定より長くなる
+    remaining = ProcessingTimeEstimator.estimate_remaining(100.0, 100.0, 0.5)
+    assert remaining == 0.5 * 0.0 + 0.5 * 100.0
+
+
+def test_pipeline_records_stage_times(tmp_path):
+    """パイプライン実行後は実測記録から推定される"""
+    audio_path = tmp_path / "input.wav"
+    t = np.arange(16000 * 6) / 16000
+    sf.write(str(audio_path), (0.4 * np.sin(2 * np.pi * 200 * t)).astype(np.float32), 16000)
+    
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    assert pipeline.estimate_time(6.0)['total'].source == 'default'
+    
+    pipeline.run(str(audio_path), str(tmp_path / "out"), {'min_segment_length': 0.5})
+    
+    estimates = pipeline.estimate_time(6.0)
+    assert estimates['bgm_separation'].source == 'history'
+    assert estimates['speaker_separation'].source == 'history'
+    assert estimates['total'].estimate > 0
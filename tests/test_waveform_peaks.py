@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+波形ピークピラミッドのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_separator.utils.waveform_peaks import PeakPyramid
+from src.audio_separator.processors.separation_pipeline import SeparationPipeline
+from src.audio_separator.utils.time_estimator import ProcessingTimeEstimator
+from benchmarks.fixtures import write_fixture
+from benchmarks.run_benchmarks import force_offline
+
+
+def test_pyramid_levels_and_peaks():
+    """段ごとに解像度が1/2になり、取得したピークが元音声の最小値・最大値と一致する"""
+    sr = 16000
+    rng = np.random.default_rng(0)
+    audio = (rng.uniform(-0.5, 0.5, sr * 60)).astype(np.float32)
+    audio[sr * 10] = 0.9
+    
+    pyramid = PeakPyramid.from_audio(audio, sr, samples_per_peak=256)
+    spps = [spp for spp, _ in pyramid.levels]
+    assert spps == [256 * 2 ** i for i in range(len(spps))]
+    assert len(pyramid.levels[-1][1]) <= PeakPyramid.MIN_LEVEL_LENGTH
+    
+    # 全体表示（粗い段）でも最大値が失われない
+    mins, maxs = pyramid.get_peaks(0.0, 60.0, 500)
+    assert abs(maxs.max() - 0.9) < 1e-3
+    assert abs(mins.min() - audio.min()) < 1e-3
+    
+    # ズーム時は表示範囲の値だけを集計する
+    mins, maxs = pyramid.get_peaks(9.5, 10.5, 100)
+    assert abs(maxs.max() - 0.9) < 1e-3
+    _, maxs = pyramid.get_peaks(20.0, 21.0, 100)
+    assert maxs.max() <= 0.5 + 1e-3
+    
+    # 音声の範囲外は0
+    mins, maxs = pyramid.get_peaks(55.0, 65.0, 100)
+    assert np.all(maxs[60:] == 0) and np.all(mins[60:] == 0)
+
+
+def test_sidecar_roundtrip(tmp_path):
+    """サイドカーはメモリマップで読み込まれ、作成済みなら再利用される"""
+    audio_path = tmp_path / "tone.wav"
+    t = np.arange(16000 * 5) / 16000
+    sf.write(str(audio_path), (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), 16000)
+    
+    sidecar = PeakPyramid.ensure_for_file(audio_path)
+    assert sidecar == PeakPyramid.sidecar_path(audio_path)
+    
+    original = PeakPyramid.from_file(audio_path)
+    loaded = PeakPyramid.load(sidecar)
+    assert isinstance(loaded.levels[0][1], np.memmap)
+    assert loaded.sample_rate == 16000 and loaded.total_samples == len(t)
+    for (spp_a, peaks_a), (spp_b, peaks_b) in zip(original.levels, loaded.levels):
+        assert spp_a == spp_b
+        np.testing.assert_array_equal(peaks_a, peaks_b)
+    
+    mtime = sidecar.stat().st_mtime_ns
+    PeakPyramid.ensure_for_file(audio_path)
+    assert sidecar.stat().st_mtime_ns == mtime
+
+
+def test_pipeline_writes_peak_files(tmp_path):
+    """パイプラインは入力・ボーカル・BGM・話者ごとのピークファイルと区間情報を返す"""
+    fixture = write_fixture(tmp_path / "fixtures", 8.0, 2)
+    
+    pipeline = SeparationPipeline(device='cpu', time_estimator=ProcessingTimeEstimator(tmp_path / "records.jsonl"))
+    force_offline(pipeline.demucs_processor, pipeline.speaker_processor)
+    result = pipeline.run(str(fixture['path']), str(tmp_path / "out"))
+    
+    peak_files = result['peak_files']
+    for kind in ('input', 'vocals', 'bgm'):
+        assert Path(peak_files[kind]).exists()
+    assert set(peak_files['speakers']) == set(result['output_files'])
+    assert {seg['speaker'] for seg in result['segments']} == set(result['output_files'])
+    
+    pyramid = PeakPyramid.load(peak_files['input'])
+    assert abs(pyramid.duration - fixture['duration']) < 0.01